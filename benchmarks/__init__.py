@@ -0,0 +1,9 @@
+"""
+End-to-end performance benchmarks.
+
+This package drives the agent, streaming service, MCP registry and chat
+widgets against local fakes including:
+- A deterministic model stub with a configurable token rate
+- Stub stdio and HTTP MCP servers with injectable latency
+- A results recorder comparing each run with the previous one
+"""
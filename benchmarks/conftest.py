@@ -0,0 +1,126 @@
+"""
+Pytest configuration for the benchmark suite.
+
+Provides:
+- Command line options for the results directory and regression threshold
+- A session-wide recorder that benchmarks report their metrics to
+- Saving results and reporting regressions against the previous run
+- A headless QApplication for the UI benchmarks
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from benchmarks.results import BenchmarkRecorder, Regression
+
+DEFAULT_RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+recorder_key = pytest.StashKey[BenchmarkRecorder]()
+regressions_key = pytest.StashKey[list[Regression]]()
+saved_path_key = pytest.StashKey["Path | None"]()
+baseline_key = pytest.StashKey["str | None"]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--bench-results-dir",
+        default=str(DEFAULT_RESULTS_DIR),
+        help="Directory storing one JSON result file per run",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.2,
+        help="Relative change counted as a regression (default: 0.2)",
+    )
+    group.addoption(
+        "--bench-fail-on-regression",
+        action="store_true",
+        help="Exit with a failure status when a metric regressed",
+    )
+    group.addoption(
+        "--bench-no-save",
+        action="store_true",
+        help="Compare with the previous run without storing this one",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Create the session recorder."""
+    config.stash[recorder_key] = BenchmarkRecorder(
+        results_dir=Path(config.getoption("--bench-results-dir")),
+        threshold=config.getoption("--bench-threshold"),
+    )
+
+
+@pytest.fixture(scope="session")
+def bench_recorder(pytestconfig: pytest.Config) -> BenchmarkRecorder:
+    """Recorder collecting the metrics of every benchmark in the session."""
+    return pytestconfig.stash[recorder_key]
+
+
+@pytest.fixture(scope="session")
+def qapp() -> Generator[object, None, None]:
+    """Create a headless QApplication for the UI benchmarks."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    yield app
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Compare with the previous run, then store this run's results."""
+    config = session.config
+    recorder = config.stash[recorder_key]
+
+    previous = recorder.load_previous()
+    regressions = recorder.compare(previous)
+    config.stash[regressions_key] = regressions
+    config.stash[baseline_key] = previous.get("commit") if previous else None
+    config.stash[saved_path_key] = (
+        None if config.getoption("--bench-no-save") else recorder.save()
+    )
+
+    if regressions and config.getoption("--bench-fail-on-regression"):
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """Print the recorded metrics and any regressions."""
+    config = terminalreporter.config
+    recorder = config.stash[recorder_key]
+    if not recorder.results:
+        return
+
+    terminalreporter.section("benchmark results")
+    for name, result in sorted(recorder.results.items()):
+        terminalreporter.write_line(name)
+        for metric, value in sorted(result["metrics"].items()):
+            terminalreporter.write_line(f"    {metric:<40} {value:>14.6g}")
+
+    saved_path = config.stash.get(saved_path_key, None)
+    if saved_path is not None:
+        terminalreporter.write_line(f"Results saved to {saved_path}")
+
+    baseline = config.stash.get(baseline_key, None)
+    regressions = config.stash.get(regressions_key, [])
+    if baseline is None:
+        terminalreporter.write_line("No previous run to compare with")
+    elif regressions:
+        terminalreporter.section("benchmark regressions", red=True)
+        terminalreporter.write_line(
+            f"Compared with {baseline} (threshold {recorder.threshold:.0%}):",
+        )
+        for regression in regressions:
+            terminalreporter.write_line(f"    {regression}", red=True)
+    else:
+        terminalreporter.write_line(f"No regressions compared with {baseline}")
@@ -0,0 +1,75 @@
+"""
+Stub MCP server with injectable latency.
+
+Run as a script to serve over stdio or streamable HTTP:
+
+    python benchmarks/fake_mcp_server.py --transport http --port 8765 --latency 0.01
+
+Every tool call sleeps for the configured latency before answering, so the
+benchmarks measure client and registry overhead on top of a known delay.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from fastmcp import FastMCP
+
+SERVER_NAME = "benchmark"
+
+
+def create_server(latency: float = 0.0) -> FastMCP:
+    """
+    Create the stub server.
+
+    Args:
+        latency: Seconds each tool call waits before answering
+
+    Returns:
+        FastMCP server exposing the echo and read_blob tools
+    """
+    server = FastMCP(SERVER_NAME)
+
+    @server.tool()
+    async def echo(text: str) -> str:
+        """Return the given text."""
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return text
+
+    @server.tool()
+    async def read_blob(size: int) -> str:
+        """Return a payload of the given size in bytes."""
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return "x" * size
+
+    return server
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse arguments and run the stub server until it is stopped."""
+    parser = argparse.ArgumentParser(description="Stub MCP server for benchmarks")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to each tool call"
+    )
+    args = parser.parse_args(argv)
+
+    server = create_server(args.latency)
+    if args.transport == "http":
+        server.run(
+            transport="streamable-http",
+            host=args.host,
+            port=args.port,
+            log_level="warning",
+        )
+    else:
+        server.run(transport="stdio")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Deterministic local stand-ins for the model and MCP servers.
+
+This module provides:
+- A pydantic-ai FunctionModel emitting tokens at a configurable rate
+- MCP client configurations for stub stdio servers
+- A context manager running a stub HTTP MCP server in a subprocess
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FAKE_SERVER_SCRIPT = Path(__file__).resolve().parent / "fake_mcp_server.py"
+
+
+@dataclass
+class FakeLLMConfig:
+    """Shape of the responses produced by the fake model."""
+
+    response_tokens: int = 200
+    tokens_per_second: float = 2000.0
+    first_token_delay: float = 0.05
+    token_text: str = "token "
+
+    @property
+    def response_text(self) -> str:
+        """Full text of one response."""
+        return self.token_text * self.response_tokens
+
+
+def create_fake_model(config: FakeLLMConfig | None = None) -> FunctionModel:
+    """
+    Create a model stub that answers every request with the same text.
+
+    Streaming responses wait first_token_delay, then emit one token at a time
+    paced against a fixed schedule so the rate does not drift with sleep
+    overhead. Non-streaming responses wait for the whole schedule.
+
+    Args:
+        config: Response shape, defaults to FakeLLMConfig()
+
+    Returns:
+        FunctionModel usable with Agent.override(model=...)
+    """
+    config = config or FakeLLMConfig()
+    interval = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(
+            config.first_token_delay + interval * config.response_tokens
+        )
+        return ModelResponse(parts=[TextPart(config.response_text)])
+
+    async def stream(
+        messages: list[ModelMessage], info: AgentInfo
+    ) -> AsyncIterator[str]:
+        start = time.perf_counter() + config.first_token_delay
+        await asyncio.sleep(config.first_token_delay)
+        for index in range(config.response_tokens):
+            delay = start + index * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield config.token_text
+
+    return FunctionModel(respond, stream_function=stream)
+
+
+def create_stdio_server_config(
+    work_dir: Path, latency: float = 0.0, server_name: str = "bench-stdio"
+) -> dict[str, Any]:
+    """
+    Create an MCPClient configuration for a stub stdio server.
+
+    MCPClient launches stdio servers by script path without arguments, so the
+    latency is baked into a small launcher script written to work_dir.
+
+    Args:
+        work_dir: Directory for the launcher script
+        latency: Seconds each tool call waits before answering
+        server_name: Name the server is registered under
+
+    Returns:
+        MCPClient configuration
+    """
+    script = work_dir / f"fake_mcp_stdio_{int(latency * 1e6)}us.py"
+    script.write_text(
+        "import sys\n"
+        f"sys.path.insert(0, {str(REPO_ROOT)!r})\n"
+        "from benchmarks.fake_mcp_server import main\n"
+        f"main(['--transport', 'stdio', '--latency', {str(latency)!r}])\n",
+        encoding="utf-8",
+    )
+    return {
+        "server_name": server_name,
+        "transport": "stdio",
+        "command": sys.executable,
+        "args": [str(script)],
+    }
+
+
+def _free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def run_http_server(
+    latency: float = 0.0, startup_timeout: float = 20.0
+) -> Iterator[str]:
+    """
+    Run a stub streamable HTTP server in a subprocess.
+
+    Args:
+        latency: Seconds each tool call waits before answering
+        startup_timeout: Seconds to wait for the server to accept connections
+
+    Yields:
+        URL of the server's MCP endpoint
+
+    Raises:
+        RuntimeError: If the server exits or does not start in time
+    """
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(FAKE_SERVER_SCRIPT),
+            "--transport",
+            "http",
+            "--port",
+            str(port),
+            "--latency",
+            str(latency),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"Stub MCP server exited with code {process.returncode}"
+                )
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                    break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(
+                        f"Stub MCP server did not start within {startup_timeout}s"
+                    ) from None
+                time.sleep(0.05)
+        yield f"http://127.0.0.1:{port}/mcp/"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
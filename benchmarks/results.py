@@ -0,0 +1,209 @@
+"""
+Benchmark result storage and regression detection.
+
+This module provides:
+- A recorder collecting named metric sets during a benchmark session
+- JSON result files tagged with the git commit and Python version
+- Comparison against the most recent earlier run
+- Percentile summaries of duration samples
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.my_coding_agent.core.metrics import LatencyHistogram
+
+RESULTS_FORMAT_VERSION = 1
+
+# Metrics with these suffixes improve when they grow; all others when they shrink
+HIGHER_IS_BETTER_SUFFIXES = ("_per_second", "_recall")
+
+
+def is_higher_better(metric: str) -> bool:
+    """Check whether a larger value of the metric is an improvement."""
+    return metric.endswith(HIGHER_IS_BETTER_SUFFIXES)
+
+
+def get_git_commit(cwd: Path | None = None) -> str:
+    """
+    Get the short hash of the checked out commit.
+
+    Args:
+        cwd: Directory inside the repository
+
+    Returns:
+        Short commit hash, with a "-dirty" suffix for uncommitted changes, or
+        "unknown" outside a git checkout
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if status else commit
+
+
+@dataclass
+class Regression:
+    """A metric that got worse than the previous run by more than the threshold."""
+
+    benchmark: str
+    metric: str
+    previous: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change from the previous value."""
+        if self.previous == 0:
+            return 0.0 if self.current == 0 else float("inf")
+        return (self.current - self.previous) / abs(self.previous)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.benchmark}.{self.metric}: {self.previous:.6g} -> "
+            f"{self.current:.6g} ({self.change:+.1%})"
+        )
+
+
+@dataclass
+class BenchmarkRecorder:
+    """
+    Collects benchmark metrics and stores them as one JSON file per run.
+
+    Result files are named by timestamp and commit, so the newest earlier
+    file is the baseline each run is compared with.
+    """
+
+    results_dir: Path
+    threshold: float = 0.2
+    results: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def record(self, name: str, metrics: dict[str, float], **params: object) -> None:
+        """
+        Record the metrics of one benchmark.
+
+        Args:
+            name: Benchmark name, unique within the session
+            metrics: Metric values; names ending in _per_second or _recall
+                are higher-is-better, everything else lower-is-better
+            **params: Parameters the benchmark ran with
+        """
+        self.results[name] = {
+            "metrics": {key: float(value) for key, value in metrics.items()},
+            "params": params,
+        }
+
+    def load_previous(self) -> dict[str, Any] | None:
+        """
+        Load the most recent stored run.
+
+        Returns:
+            Stored run, or None if there is none
+        """
+        if not self.results_dir.is_dir():
+            return None
+        for path in sorted(self.results_dir.glob("*.json"), reverse=True):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if data.get("format_version") == RESULTS_FORMAT_VERSION:
+                data["path"] = str(path)
+                return data
+        return None
+
+    def compare(self, previous: dict[str, Any] | None) -> list[Regression]:
+        """
+        Find metrics that regressed against a stored run.
+
+        Args:
+            previous: Stored run from load_previous
+
+        Returns:
+            Regressions larger than the threshold
+        """
+        if not previous:
+            return []
+
+        regressions = []
+        previous_results = previous.get("results", {})
+        for name, result in self.results.items():
+            previous_metrics = previous_results.get(name, {}).get("metrics", {})
+            for metric, current in result["metrics"].items():
+                if metric not in previous_metrics:
+                    continue
+                regression = Regression(name, metric, previous_metrics[metric], current)
+                if is_higher_better(metric):
+                    worse = -regression.change
+                else:
+                    worse = regression.change
+                if worse > self.threshold:
+                    regressions.append(regression)
+        return regressions
+
+    def save(self) -> Path | None:
+        """
+        Store this run's results.
+
+        Returns:
+            Path of the result file, or None if nothing was recorded
+        """
+        if not self.results:
+            return None
+
+        commit = get_git_commit(Path(__file__).resolve().parent)
+        timestamp = time.strftime("%Y%m%dT%H%M%S")
+        data = {
+            "format_version": RESULTS_FORMAT_VERSION,
+            "commit": commit,
+            "timestamp": timestamp,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": self.results,
+        }
+
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        path = self.results_dir / f"{timestamp}-{commit}.json"
+        path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        return path
+
+
+def summarize_durations(prefix: str, samples: list[float]) -> dict[str, float]:
+    """
+    Summarize duration samples as percentile metrics.
+
+    Args:
+        prefix: Metric name prefix
+        samples: Durations in seconds
+
+    Returns:
+        p50, p95 and max metrics named <prefix>_<stat>_seconds
+    """
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+    return {
+        f"{prefix}_p50_seconds": histogram.percentile(50),
+        f"{prefix}_p95_seconds": histogram.percentile(95),
+        f"{prefix}_max_seconds": histogram.max,
+    }
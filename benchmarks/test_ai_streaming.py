@@ -0,0 +1,181 @@
+"""
+Benchmarks for the AI request paths.
+
+This module measures, against a local model stub:
+- AIAgent message throughput and per-message overhead
+- StreamingResponseService time to first chunk and token throughput
+- Peak memory while streaming a long response
+"""
+
+import statistics
+import time
+import tracemalloc
+
+import pytest
+from pydantic_ai.models.test import TestModel
+from src.my_coding_agent.core.ai_agent import AIAgent, AIAgentConfig
+from src.my_coding_agent.core.ai_services.streaming_response_service import (
+    StreamingResponseService,
+)
+
+from benchmarks.fakes import FakeLLMConfig, create_fake_model
+from benchmarks.results import BenchmarkRecorder, summarize_durations
+
+
+@pytest.fixture
+def agent() -> AIAgent:
+    """AIAgent configured for a fake endpoint without tools."""
+    config = AIAgentConfig(
+        azure_endpoint="https://bench.openai.azure.com/",
+        azure_api_key="bench-key",
+        deployment_name="bench",
+        api_version="2024-02-15-preview",
+    )
+    return AIAgent(config, enable_filesystem_tools=False)
+
+
+class TestAgentThroughput:
+    """Benchmark non-streaming messages through AIAgent."""
+
+    @pytest.mark.asyncio
+    async def test_send_message_overhead(
+        self, agent: AIAgent, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure per-message overhead with an instant model."""
+        iterations = 50
+        model = TestModel(call_tools=[], custom_output_text="ok " * 50)
+        durations = []
+
+        with agent._agent.override(model=model):
+            await agent.send_message("warm up")
+            start = time.perf_counter()
+            for index in range(iterations):
+                sent_at = time.perf_counter()
+                response = await agent.send_message(f"message {index}")
+                durations.append(time.perf_counter() - sent_at)
+                assert response.success, response.error
+            elapsed = time.perf_counter() - start
+
+        bench_recorder.record(
+            "agent.send_message.overhead",
+            {
+                "messages_per_second": iterations / elapsed,
+                **summarize_durations("latency", durations),
+            },
+            iterations=iterations,
+        )
+
+    @pytest.mark.asyncio
+    async def test_send_message_paced_model(
+        self, agent: AIAgent, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure overhead on top of a model with a realistic token rate."""
+        fake = FakeLLMConfig(
+            response_tokens=100, tokens_per_second=5000.0, first_token_delay=0.01
+        )
+        ideal = fake.first_token_delay + fake.response_tokens / fake.tokens_per_second
+        iterations = 10
+        durations = []
+
+        with agent._agent.override(model=create_fake_model(fake)):
+            for index in range(iterations):
+                sent_at = time.perf_counter()
+                response = await agent.send_message(f"message {index}")
+                durations.append(time.perf_counter() - sent_at)
+                assert response.success, response.error
+
+        bench_recorder.record(
+            "agent.send_message.paced",
+            {
+                "overhead_p50_seconds": statistics.median(durations) - ideal,
+                **summarize_durations("latency", durations),
+            },
+            iterations=iterations,
+            response_tokens=fake.response_tokens,
+            tokens_per_second=fake.tokens_per_second,
+        )
+
+
+class TestStreamingService:
+    """Benchmark streaming through StreamingResponseService."""
+
+    @pytest.mark.asyncio
+    async def test_time_to_first_chunk_and_throughput(
+        self, agent: AIAgent, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure time to first chunk and delivered token rate."""
+        fake = FakeLLMConfig(
+            response_tokens=300, tokens_per_second=2000.0, first_token_delay=0.05
+        )
+        service = StreamingResponseService(agent)
+        iterations = 5
+        first_chunk_times = []
+        totals = []
+        chunk_counts = []
+
+        with agent._agent.override(model=create_fake_model(fake)):
+            for index in range(iterations):
+                first_chunk_at = None
+                chunks = 0
+
+                def on_chunk(chunk: str, is_final: bool) -> None:
+                    nonlocal first_chunk_at, chunks
+                    if chunk and first_chunk_at is None:
+                        first_chunk_at = time.perf_counter()
+                    chunks += 1
+
+                sent_at = time.perf_counter()
+                response = await service.send_message_with_tools_stream(
+                    f"message {index}", on_chunk, enable_filesystem=False
+                )
+                totals.append(time.perf_counter() - sent_at)
+                assert response.success, response.error
+                assert response.content == fake.response_text
+                assert first_chunk_at is not None
+                first_chunk_times.append(first_chunk_at - sent_at)
+                chunk_counts.append(chunks)
+
+        bench_recorder.record(
+            "streaming_service.stream",
+            {
+                "tokens_per_second": fake.response_tokens / statistics.median(totals),
+                "chunks_per_response": statistics.median(chunk_counts),
+                **summarize_durations("time_to_first_chunk", first_chunk_times),
+                **summarize_durations("total", totals),
+            },
+            iterations=iterations,
+            response_tokens=fake.response_tokens,
+            model_tokens_per_second=fake.tokens_per_second,
+            first_token_delay=fake.first_token_delay,
+        )
+
+    @pytest.mark.asyncio
+    async def test_streaming_peak_memory(
+        self, agent: AIAgent, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure peak allocations while streaming a long response."""
+        fake = FakeLLMConfig(
+            response_tokens=5000, tokens_per_second=0.0, first_token_delay=0.0
+        )
+        service = StreamingResponseService(agent)
+        response_bytes = len(fake.response_text.encode())
+
+        with agent._agent.override(model=create_fake_model(fake)):
+            tracemalloc.start()
+            try:
+                response = await service.send_message_with_tools_stream(
+                    "long answer", lambda chunk, is_final: None, enable_filesystem=False
+                )
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        assert response.success, response.error
+        bench_recorder.record(
+            "streaming_service.memory",
+            {
+                "peak_memory_bytes": peak,
+                "peak_memory_per_response_byte": peak / response_bytes,
+            },
+            response_tokens=fake.response_tokens,
+        )
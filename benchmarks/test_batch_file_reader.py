@@ -0,0 +1,95 @@
+"""
+Benchmarks for batched multi-file reads.
+
+This module measures:
+- Reading 40 files through a remote reader with per-call latency,
+  sequentially and as one batch
+- Reading many local workspace files on the thread pool
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+from src.my_coding_agent.core.batch_file_reader import BatchFileReader, read_local_file
+
+from benchmarks.results import BenchmarkRecorder
+
+REMOTE_FILES = 40
+REMOTE_LATENCY = 0.01
+LOCAL_FILES = 500
+LOCAL_FILE_BYTES = 16 * 1024
+
+
+class TestRemoteBatchReads:
+    """Benchmark reads through a reader with MCP-like latency."""
+
+    def test_sequential_vs_batched(self, bench_recorder: BenchmarkRecorder) -> None:
+        """Measure one round of parallel reads against one read per file."""
+        paths = [f"src/module_{i}.py" for i in range(REMOTE_FILES)]
+
+        async def read(path: str) -> str:
+            await asyncio.sleep(REMOTE_LATENCY)
+            return f"# {path}\n" * 50
+
+        async def sequential() -> None:
+            for path in paths:
+                await read(path)
+
+        reader = BatchFileReader(max_concurrency=REMOTE_FILES)
+
+        started = time.perf_counter()
+        asyncio.run(sequential())
+        sequential_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        asyncio.run(reader.read_all(paths, read=read))
+        batch_seconds = time.perf_counter() - started
+
+        bench_recorder.record(
+            "batch_file_reader.remote",
+            {
+                "sequential_seconds": sequential_seconds,
+                "batch_seconds": batch_seconds,
+                "batch_to_sequential_ratio": batch_seconds / sequential_seconds,
+            },
+            files=REMOTE_FILES,
+            latency=REMOTE_LATENCY,
+        )
+
+
+class TestLocalBatchReads:
+    """Benchmark local reads on the thread pool."""
+
+    def test_local_reads(
+        self, tmp_path: Path, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure reading workspace files one by one and as one batch."""
+        paths = []
+        for i in range(LOCAL_FILES):
+            path = tmp_path / f"file_{i}.py"
+            path.write_text("x = 1\n" * (LOCAL_FILE_BYTES // 6))
+            paths.append(str(path))
+
+        reader = BatchFileReader()
+
+        started = time.perf_counter()
+        for path in paths:
+            read_local_file(path, reader.max_file_bytes)
+        sequential_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        reader.read_all_sync(paths)
+        batch_seconds = time.perf_counter() - started
+        reader.close()
+
+        bench_recorder.record(
+            "batch_file_reader.local",
+            {
+                "sequential_files_per_second": LOCAL_FILES / sequential_seconds,
+                "batch_files_per_second": LOCAL_FILES / batch_seconds,
+            },
+            files=LOCAL_FILES,
+            file_bytes=LOCAL_FILE_BYTES,
+            max_concurrency=reader.max_concurrency,
+        )
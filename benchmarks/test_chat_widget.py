@@ -0,0 +1,100 @@
+"""
+Benchmarks for the chat widget's UI responsiveness.
+
+This module measures, on a headless Qt platform:
+- Frame time while a streamed response grows chunk by chunk
+- Time to populate a long conversation
+"""
+
+import time
+
+from PyQt6.QtWidgets import QApplication
+from src.my_coding_agent.gui.chat_widget_v2 import SimplifiedChatWidget
+
+from benchmarks.results import BenchmarkRecorder, summarize_durations
+
+# One frame at 60 Hz
+FRAME_BUDGET_SECONDS = 1 / 60
+
+STREAM_CHUNK = (
+    "Here is a sentence of a streamed answer with `inline code` and **bold** "
+)
+
+
+def build_widget() -> SimplifiedChatWidget:
+    """Create and show a chat widget at a typical window size."""
+    widget = SimplifiedChatWidget()
+    widget.resize(900, 700)
+    widget.show()
+    return widget
+
+
+class TestChatWidgetFrames:
+    """Benchmark chat widget updates."""
+
+    def test_streaming_frame_time(
+        self, qapp: QApplication, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure the time to apply each streamed chunk and repaint."""
+        chunks = 200
+        widget = build_widget()
+        qapp.processEvents()
+        frame_times = []
+
+        try:
+            widget.start_streaming_response("bench-stream")
+            content = ""
+            for _ in range(chunks):
+                content += STREAM_CHUNK
+                started = time.perf_counter()
+                widget.append_streaming_chunk(content)
+                qapp.processEvents()
+                frame_times.append(time.perf_counter() - started)
+            widget.complete_streaming_response()
+            qapp.processEvents()
+        finally:
+            widget.close()
+            widget.deleteLater()
+            qapp.processEvents()
+
+        over_budget = sum(1 for frame in frame_times if frame > FRAME_BUDGET_SECONDS)
+        bench_recorder.record(
+            "chat_widget.streaming",
+            {
+                **summarize_durations("frame", frame_times),
+                "frames_over_budget_ratio": over_budget / chunks,
+            },
+            chunks=chunks,
+            final_content_chars=len(content),
+        )
+
+    def test_populate_conversation(
+        self, qapp: QApplication, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure the time to add a long conversation to the widget."""
+        messages = 100
+        widget = build_widget()
+        qapp.processEvents()
+
+        try:
+            started = time.perf_counter()
+            for index in range(messages):
+                if index % 2:
+                    widget.add_assistant_message(STREAM_CHUNK * 5)
+                else:
+                    widget.add_user_message(f"Question {index}")
+                qapp.processEvents()
+            elapsed = time.perf_counter() - started
+        finally:
+            widget.close()
+            widget.deleteLater()
+            qapp.processEvents()
+
+        bench_recorder.record(
+            "chat_widget.populate",
+            {
+                "messages_per_second": messages / elapsed,
+                "total_seconds": elapsed,
+            },
+            messages=messages,
+        )
@@ -0,0 +1,96 @@
+"""
+Benchmarks for MCP tool calls through the server registry.
+
+This module measures, against stub servers with a known latency:
+- Sequential call latency and the overhead above the injected latency
+- Concurrent call throughput through the registry's bulkheads
+- Both the stdio and streamable HTTP transports
+"""
+
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+from src.my_coding_agent.core.mcp.mcp_client import MCPClient
+from src.my_coding_agent.core.mcp.server_registry import MCPServerRegistry
+
+from benchmarks.fakes import create_stdio_server_config, run_http_server
+from benchmarks.results import BenchmarkRecorder, summarize_durations
+
+SERVER_LATENCY = 0.01
+
+
+async def run_registry_benchmark(
+    config: dict, name: str, recorder: BenchmarkRecorder, sequential_calls: int = 10
+) -> None:
+    """
+    Call the stub server's tools through a registry and record the results.
+
+    Args:
+        config: MCPClient configuration of the stub server
+        name: Benchmark name prefix
+        recorder: Session recorder
+        sequential_calls: Calls made one after another
+    """
+    registry = MCPServerRegistry()
+    registry.register_server(MCPClient(config))
+    await registry.connect_all_servers()
+    try:
+        await registry.update_tools_cache()
+        assert registry.get_tool("echo") is not None
+
+        durations = []
+        for index in range(sequential_calls):
+            started = time.perf_counter()
+            result = await registry.call_tool("echo", {"text": f"call {index}"})
+            durations.append(time.perf_counter() - started)
+            assert result
+
+        concurrent_calls = registry.get_call_guard(
+            config["server_name"], "echo"
+        ).bulkhead.max_concurrent
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                registry.call_tool("read_blob", {"size": 4096})
+                for _ in range(concurrent_calls)
+            )
+        )
+        concurrent_elapsed = time.perf_counter() - started
+        assert all(results)
+    finally:
+        await registry.disconnect_all_servers()
+
+    recorder.record(
+        f"{name}.call_tool",
+        {
+            "calls_per_second": sequential_calls / sum(durations),
+            "overhead_p50_seconds": statistics.median(durations) - SERVER_LATENCY,
+            **summarize_durations("latency", durations),
+            "concurrent_calls_per_second": concurrent_calls / concurrent_elapsed,
+        },
+        server_latency=SERVER_LATENCY,
+        sequential_calls=sequential_calls,
+        concurrent_calls=concurrent_calls,
+    )
+
+
+class TestRegistryToolCalls:
+    """Benchmark tool calls over each transport."""
+
+    @pytest.mark.asyncio
+    async def test_stdio_server(
+        self, tmp_path: Path, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure tool calls to a stub stdio server."""
+        config = create_stdio_server_config(tmp_path, latency=SERVER_LATENCY)
+        await run_registry_benchmark(config, "mcp.stdio", bench_recorder)
+
+    @pytest.mark.asyncio
+    async def test_http_server(self, bench_recorder: BenchmarkRecorder) -> None:
+        """Measure tool calls to a stub streamable HTTP server."""
+        with run_http_server(latency=SERVER_LATENCY) as url:
+            config = {"server_name": "bench-http", "transport": "http", "url": url}
+            await run_registry_benchmark(config, "mcp.http", bench_recorder)
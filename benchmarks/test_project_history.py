@@ -0,0 +1,106 @@
+"""
+Benchmarks for project history queries.
+
+This module measures, over six months of edits:
+- Recording changes
+- Timeline queries, capped and uncapped, first build and from cached
+  day segments
+- Paged file history and recent change queries
+"""
+
+import time
+
+from src.my_coding_agent.core.project_history import HistoryRecord, ProjectHistoryStore
+
+from benchmarks.results import BenchmarkRecorder, summarize_durations
+
+DAYS = 180
+EDITS_PER_DAY = 500
+FILES = 300
+QUERIES = 50
+DAY = 86400
+
+
+def build_records(end: float) -> list[HistoryRecord]:
+    """Create edits spread evenly over the days before end."""
+    step = DAY / EDITS_PER_DAY
+    start = end - DAYS * DAY
+    return [
+        HistoryRecord(
+            timestamp=start + index * step,
+            file_path=f"src/module_{index % FILES}.py",
+            event_type="modified",
+            summary=f"Modified module_{index % FILES}.py: +{index % 7}/-{index % 3} lines",
+        )
+        for index in range(DAYS * EDITS_PER_DAY)
+    ]
+
+
+class TestProjectHistoryQueries:
+    """Benchmark the time-indexed store."""
+
+    def test_timeline_and_range_queries(
+        self, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure queries the project history tools make."""
+        end = time.time()
+        records = build_records(end)
+        store = ProjectHistoryStore()
+
+        started = time.perf_counter()
+        store.extend(records)
+        insert_seconds = time.perf_counter() - started
+
+        month_start = end - 30 * DAY
+        started = time.perf_counter()
+        store.timeline(month_start, end, max_events=200)
+        first_timeline_seconds = time.perf_counter() - started
+
+        timeline_times = []
+        for _ in range(QUERIES):
+            started = time.perf_counter()
+            store.timeline(month_start, end, max_events=200)
+            timeline_times.append(time.perf_counter() - started)
+
+        # Without a cap every day is shown; whole days come from the cache
+        started = time.perf_counter()
+        store.timeline(month_start, end)
+        full_first_seconds = time.perf_counter() - started
+        full_times = []
+        for _ in range(QUERIES):
+            started = time.perf_counter()
+            store.timeline(month_start, end)
+            full_times.append(time.perf_counter() - started)
+
+        file_timeline_times, file_page_times, recent_times = [], [], []
+        for query in range(QUERIES):
+            path = f"src/module_{query * 7 % FILES}.py"
+
+            started = time.perf_counter()
+            store.timeline(end - DAYS * DAY, end, file_path=path, max_events=200)
+            file_timeline_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            store.query(file_path=path, offset=query, limit=20)
+            file_page_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            store.recent(hours=24, limit=15)
+            recent_times.append(time.perf_counter() - started)
+
+        bench_recorder.record(
+            "project_history.queries",
+            {
+                "records_added_per_second": len(records) / insert_seconds,
+                "first_timeline_seconds": first_timeline_seconds,
+                **summarize_durations("timeline", timeline_times),
+                "full_timeline_first_seconds": full_first_seconds,
+                **summarize_durations("full_timeline", full_times),
+                **summarize_durations("file_timeline", file_timeline_times),
+                **summarize_durations("file_page", file_page_times),
+                **summarize_durations("recent", recent_times),
+            },
+            records=len(records),
+            days=DAYS,
+            files=FILES,
+        )
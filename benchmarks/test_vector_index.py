@@ -0,0 +1,115 @@
+"""
+Benchmarks for local vector search and long-term memory recall.
+
+This module measures:
+- Exact and IVF query latency over 100k clustered vectors
+- How many of the exact top 10 results the IVF index finds
+- Embedding throughput and recall latency of the memory store
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+from src.my_coding_agent.core.long_term_memory import LongTermMemoryStore
+from src.my_coding_agent.core.vector_index import HashingEmbedding, VectorIndex
+
+from benchmarks.results import BenchmarkRecorder, summarize_durations
+
+VECTORS = 100_000
+DIM = 384
+QUERIES = 50
+
+TOPICS = ["python", "testing", "deploy", "database", "ui", "theme", "git", "docs"]
+
+
+def clustered_vectors(count: int, dim: int, clusters: int = 500) -> np.ndarray:
+    """Create vectors scattered around random centers, like topical memories."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=count)
+    noise = rng.normal(scale=0.5, size=(count, dim)).astype(np.float32)
+    return centers[labels] + noise
+
+
+class TestVectorIndexSearch:
+    """Benchmark vector index queries."""
+
+    def test_search_latency_and_recall(
+        self, tmp_path: Path, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure exact and IVF search over a large index."""
+        vectors = clustered_vectors(VECTORS, DIM)
+        index = VectorIndex(tmp_path, HashingEmbedding(dim=DIM))
+
+        started = time.perf_counter()
+        index.add_vectors([str(row) for row in range(VECTORS)], vectors)
+        add_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index.build_ivf()
+        build_seconds = time.perf_counter() - started
+
+        queries = vectors[:: VECTORS // QUERIES][:QUERIES]
+        exact_times, ivf_times = [], []
+        hits = 0
+        for query in queries:
+            started = time.perf_counter()
+            exact = index.search(query, k=10, exact=True)
+            exact_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            approximate = index.search(query, k=10)
+            ivf_times.append(time.perf_counter() - started)
+
+            hits += len({r.id for r in exact} & {r.id for r in approximate})
+
+        bench_recorder.record(
+            "vector_index.search",
+            {
+                **summarize_durations("exact_query", exact_times),
+                **summarize_durations("ivf_query", ivf_times),
+                "ivf_top10_recall": hits / (10 * QUERIES),
+                "vectors_added_per_second": VECTORS / add_seconds,
+                "ivf_build_seconds": build_seconds,
+            },
+            vectors=VECTORS,
+            dim=DIM,
+            clusters=index.get_stats()["ivf_clusters"],
+            nprobe=index.nprobe,
+        )
+
+
+class TestLongTermMemoryRecall:
+    """Benchmark the memory store with the hashing embedding."""
+
+    def test_embed_and_recall(
+        self, tmp_path: Path, bench_recorder: BenchmarkRecorder
+    ) -> None:
+        """Measure storing memories in batches and recalling them."""
+        memories = 5000
+        store = LongTermMemoryStore(tmp_path)
+        texts = [
+            f"Note {i} about {TOPICS[i % len(TOPICS)]} and "
+            f"{TOPICS[(i * 7) % len(TOPICS)]} in module_{i % 97}.py"
+            for i in range(memories)
+        ]
+
+        started = time.perf_counter()
+        store.store_many([{"content": text} for text in texts])
+        store_seconds = time.perf_counter() - started
+
+        recall_times = []
+        for i in range(QUERIES):
+            started = time.perf_counter()
+            store.recall(f"what did we decide about {TOPICS[i % len(TOPICS)]}?")
+            recall_times.append(time.perf_counter() - started)
+
+        bench_recorder.record(
+            "long_term_memory.recall",
+            {
+                **summarize_durations("recall", recall_times),
+                "memories_stored_per_second": memories / store_seconds,
+            },
+            memories=memories,
+        )
@@ -1,11 +1,20 @@
 """
 Agent Architecture Library
 
-A simple chatbot agent architecture using PydanticAI and Azure OpenAI.
+A multi-agent architecture using PydanticAI and Azure OpenAI.
 """
 
-from .agents import BaseAgent, ChatbotAgent
-from .orchestrator import AgentOrchestrator
+from .agents import (
+    BaseAgent,
+    ChatbotAgent,
+    CodeAnalysisAgent,
+    DocumentationAgent,
+    RefactoringAgent,
+    SpecialistAgent,
+    TestGenerationAgent,
+)
+from .model_pool import AzureSettings, ModelClientPool, get_default_pool
+from .orchestrator import AgentOrchestrator, merge_responses
 from .types import AgentRequest, AgentResponse, AgentType
 
 __version__ = "0.1.0"
@@ -13,6 +22,15 @@ __all__ = [
     "AgentOrchestrator",
     "BaseAgent",
     "ChatbotAgent",
+    "CodeAnalysisAgent",
+    "DocumentationAgent",
+    "RefactoringAgent",
+    "SpecialistAgent",
+    "TestGenerationAgent",
+    "AzureSettings",
+    "ModelClientPool",
+    "get_default_pool",
+    "merge_responses",
     "AgentRequest",
     "AgentResponse",
     "AgentType",
@@ -4,8 +4,22 @@ Agent implementations for the agent architecture library.
 
 from .base_agent import BaseAgent
 from .chatbot_agent import ChatbotAgent
+from .specialist_agents import (
+    SPECIALIST_AGENTS,
+    CodeAnalysisAgent,
+    DocumentationAgent,
+    RefactoringAgent,
+    SpecialistAgent,
+    TestGenerationAgent,
+)
 
 __all__ = [
     "BaseAgent",
     "ChatbotAgent",
+    "CodeAnalysisAgent",
+    "DocumentationAgent",
+    "RefactoringAgent",
+    "SPECIALIST_AGENTS",
+    "SpecialistAgent",
+    "TestGenerationAgent",
 ]
@@ -10,7 +10,7 @@ from ..types import AgentRequest, AgentResponse, AgentType
 class BaseAgent(ABC):
     """Base class for all agents."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize the base agent."""
         self.agent_type: AgentType = AgentType.CHATBOT
 
@@ -26,6 +26,20 @@ class BaseAgent(ABC):
         """
         pass
 
+    def score_task(self, request: AgentRequest) -> float:
+        """Rate how well this agent suits the given request.
+
+        The orchestrator routes requests to the best scoring agents.
+        Override this for finer ranking than can_handle_task gives.
+
+        Args:
+            request: The request to evaluate
+
+        Returns:
+            Score from 0.0 (cannot handle) to 1.0 (best suited)
+        """
+        return 1.0 if self.can_handle_task(request) else 0.0
+
     @abstractmethod
     async def process_task(self, request: AgentRequest) -> AgentResponse:
         """Process a request and return a response.
@@ -37,3 +51,9 @@ class BaseAgent(ABC):
             Agent response with results
         """
         pass
+
+    async def start(self) -> None:  # noqa: B027 - optional hook
+        """Prepare the agent before it receives requests."""
+
+    async def stop(self) -> None:  # noqa: B027 - optional hook
+        """Release resources held by the agent."""
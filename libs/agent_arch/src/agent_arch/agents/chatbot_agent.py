@@ -2,12 +2,10 @@
 Simple chatbot agent using PydanticAI with Azure OpenAI.
 """
 
-import os
-
 from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.azure import AzureProvider
+from pydantic_ai.models import Model
 
+from ..model_pool import ModelClientPool, get_default_pool
 from ..types import AgentRequest, AgentResponse, AgentType
 from .base_agent import BaseAgent
 
@@ -15,43 +13,42 @@ from .base_agent import BaseAgent
 class ChatbotAgent(BaseAgent):
     """Simple chatbot agent using PydanticAI with Azure OpenAI."""
 
-    def __init__(self):
-        """Initialize the chatbot agent."""
-        super().__init__()
-        self.agent_type = AgentType.CHATBOT
+    system_prompt = (
+        "You are a helpful AI assistant. Provide clear, concise, and helpful "
+        "responses to user questions."
+    )
 
-        # Get Azure OpenAI configuration from environment
-        api_version = os.getenv("API_VERSION")
-        endpoint = os.getenv("ENDPOINT")
-        api_key = os.getenv("API_KEY")
-        model = os.getenv("MODEL")
+    # Generalist fallback: any specialist that matches ranks higher
+    fallback_score = 0.1
 
-        if not all([api_version, endpoint, api_key, model]):
-            raise ValueError(
-                "Missing Azure OpenAI configuration. Please set API_VERSION, "
-                "ENDPOINT, API_KEY, and MODEL environment variables."
-            )
+    def __init__(
+        self, model: Model | None = None, pool: ModelClientPool | None = None
+    ) -> None:
+        """Initialize the chatbot agent.
 
-        # Create Azure OpenAI model using AzureProvider
-        self.model = OpenAIModel(
-            model,  # type: ignore
-            provider=AzureProvider(
-                azure_endpoint=endpoint,
-                api_version=api_version,
-                api_key=api_key,
-            ),
-        )
+        Args:
+            model: Model to use; defaults to the pooled Azure OpenAI model
+                configured by API_VERSION, ENDPOINT, API_KEY and MODEL
+            pool: Pool to take the Azure OpenAI model from; defaults to the
+                process-wide pool
+        """
+        super().__init__()
+        self.agent_type = AgentType.CHATBOT
+
+        # Agents share one model and connection pool per deployment
+        self.model = model or (pool or get_default_pool()).get_model()
 
         # Create PydanticAI agent
-        self.ai_agent = Agent(
-            model=self.model,
-            system_prompt="You are a helpful AI assistant. Provide clear, concise, and helpful responses to user questions.",
-        )
+        self.ai_agent = Agent(model=self.model, system_prompt=self.system_prompt)
 
     def can_handle_task(self, request: AgentRequest) -> bool:
         """This chatbot can handle any task."""
         return True
 
+    def score_task(self, request: AgentRequest) -> float:
+        """Rank the chatbot below any matching specialist."""
+        return self.fallback_score
+
     async def process_task(self, request: AgentRequest) -> AgentResponse:
         """Process a chat request using PydanticAI."""
         try:
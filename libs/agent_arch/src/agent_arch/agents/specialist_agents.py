@@ -0,0 +1,136 @@
+"""
+Specialized coding agents built on the chatbot agent.
+
+Each specialist has its own system prompt and scores requests by the
+whole-word keywords that signal its kind of task.
+"""
+
+import re
+
+from pydantic_ai.models import Model
+
+from ..model_pool import ModelClientPool
+from ..types import AgentRequest, AgentType
+from .chatbot_agent import ChatbotAgent
+
+
+def _compile_keywords(keywords: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Compile keywords into one pattern that matches them as whole words."""
+    if not keywords:
+        return None
+    alternatives = "|".join(re.escape(keyword) for keyword in keywords)
+    return re.compile(rf"\b(?:{alternatives})\b")
+
+
+class SpecialistAgent(ChatbotAgent):
+    """Chatbot agent focused on one kind of coding task."""
+
+    specialist_type: AgentType = AgentType.CHATBOT
+    keywords: tuple[str, ...] = ()
+    _keyword_pattern: re.Pattern[str] | None = None
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        """Precompile the keyword pattern of each specialist class."""
+        super().__init_subclass__(**kwargs)
+        cls._keyword_pattern = _compile_keywords(cls.keywords)
+
+    def __init__(
+        self, model: Model | None = None, pool: ModelClientPool | None = None
+    ) -> None:
+        """Initialize the specialist; arguments are as for ChatbotAgent."""
+        super().__init__(model=model, pool=pool)
+        self.agent_type = self.specialist_type
+
+    def score_task(self, request: AgentRequest) -> float:
+        """Score by how many distinct keywords the message contains as words."""
+        if self._keyword_pattern is None:
+            return 0.0
+        hits = len(set(self._keyword_pattern.findall(request.message.lower())))
+        if not hits:
+            return 0.0
+        return min(1.0, 0.4 + 0.2 * hits)
+
+    def can_handle_task(self, request: AgentRequest) -> bool:
+        """Handle requests that mention the specialist's keywords."""
+        return self.score_task(request) > 0
+
+
+class CodeAnalysisAgent(SpecialistAgent):
+    """Analyzes code structure, quality and bugs."""
+
+    specialist_type = AgentType.CODE_ANALYSIS
+    keywords = (
+        "analyze",
+        "analyse",
+        "analysis",
+        "review",
+        "bug",
+        "bugs",
+        "quality",
+        "complexity",
+        "explain",
+    )
+    system_prompt = (
+        "You are a code analysis expert. Examine code structure and patterns, "
+        "point out bugs and quality issues, and explain your findings concisely."
+    )
+
+
+class RefactoringAgent(SpecialistAgent):
+    """Restructures code to improve readability and design."""
+
+    specialist_type = AgentType.REFACTORING
+    keywords = (
+        "refactor",
+        "clean up",
+        "simplify",
+        "readability",
+        "readable",
+        "restructure",
+        "rename",
+    )
+    system_prompt = (
+        "You are a refactoring expert. Improve code structure and readability "
+        "without changing behavior, and show the refactored code."
+    )
+
+
+class TestGenerationAgent(SpecialistAgent):
+    """Writes unit and integration tests."""
+
+    __test__ = False  # Not a pytest test class
+
+    specialist_type = AgentType.TEST_GENERATION
+    keywords = ("test", "tests", "testing", "coverage", "pytest", "unit", "mock")
+    system_prompt = (
+        "You are a testing expert. Write focused unit and integration tests "
+        "with pytest that cover normal cases, edge cases and errors."
+    )
+
+
+class DocumentationAgent(SpecialistAgent):
+    """Writes docstrings, API docs and READMEs."""
+
+    specialist_type = AgentType.DOCUMENTATION
+    keywords = (
+        "document",
+        "documentation",
+        "docstring",
+        "docstrings",
+        "readme",
+        "comment",
+        "comments",
+        "docs",
+    )
+    system_prompt = (
+        "You are a documentation expert. Write clear docstrings, API "
+        "documentation and README sections that match the code."
+    )
+
+
+SPECIALIST_AGENTS: tuple[type[SpecialistAgent], ...] = (
+    CodeAnalysisAgent,
+    RefactoringAgent,
+    TestGenerationAgent,
+    DocumentationAgent,
+)
@@ -4,43 +4,119 @@ Command-line interface for the agent architecture.
 
 import argparse
 import asyncio
+import time
+from pathlib import Path
 
 from .orchestrator import AgentOrchestrator
+from .types import AgentResponse, AgentType
 
 
-async def async_main():
-    """Async main function."""
+def read_batch_file(path: str | Path) -> list[str]:
+    """Read one query per line, skipping blank lines and # comments."""
+    queries = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        query = line.strip()
+        if query and not query.startswith("#"):
+            queries.append(query)
+    return queries
+
+
+def positive_int(value: str) -> int:
+    """Parse a command-line integer that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(description="Agent Architecture CLI")
     parser.add_argument("--query", "-q", help="Query to process")
     parser.add_argument("--files", "-f", nargs="*", help="Files to include")
     parser.add_argument("--working-dir", "-w", default=".", help="Working directory")
+    parser.add_argument(
+        "--batch", "-b", help="File with one query per line to process in parallel"
+    )
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=positive_int,
+        default=8,
+        help="Maximum queries processed at once in batch mode",
+    )
+    parser.add_argument(
+        "--agent",
+        "-a",
+        action="append",
+        choices=[agent_type.value for agent_type in AgentType],
+        help="Agent to use instead of automatic routing (repeatable)",
+    )
+    return parser
+
 
-    args = parser.parse_args()
+def print_response(response: AgentResponse) -> None:
+    """Print an agent response."""
+    print(f"Agent: {response.agent_type.value}")
+    print(f"Status: {'success' if response.success else 'error'}")
+    print(f"Response: {response.response}")
 
-    if not args.query:
-        print("Please provide a query with --query")
+    if response.error_message:
+        print(f"Error: {response.error_message}")
+    if response.metadata:
+        print(f"Metadata: {response.metadata}")
+
+
+async def async_main(argv: list[str] | None = None) -> None:
+    """Async main function."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.query and not args.batch:
+        print("Please provide a query with --query or a query file with --batch")
         return
 
+    agent_types = [AgentType(value) for value in args.agent] if args.agent else None
+
     # Initialize orchestrator
-    orchestrator = AgentOrchestrator(working_directory=args.working_dir)
+    orchestrator = AgentOrchestrator(
+        working_directory=args.working_dir, max_concurrency=args.concurrency
+    )
     await orchestrator.start_all_agents()
 
     try:
-        # Process query
-        response = await orchestrator.process_query(query=args.query, files=args.files)
+        if args.batch:
+            queries = read_batch_file(args.batch)
+            started = time.perf_counter()
+            responses = await orchestrator.process_batch(
+                queries, files=args.files, agent_types=agent_types
+            )
+            elapsed = time.perf_counter() - started
 
-        print(f"Agent: {response.agent_type.value}")
-        print(f"Status: {response.status.value}")
-        print(f"Response: {response.content}")
+            for index, (query, response) in enumerate(
+                zip(queries, responses, strict=True), start=1
+            ):
+                print(f"=== [{index}/{len(queries)}] {query}")
+                print_response(response)
+                print()
 
-        if response.metadata:
-            print(f"Metadata: {response.metadata}")
+            succeeded = sum(1 for response in responses if response.success)
+            print(
+                f"Processed {len(queries)} queries ({succeeded} succeeded) "
+                f"in {elapsed:.2f}s with concurrency {args.concurrency}"
+            )
+        else:
+            # Process query
+            response = await orchestrator.process_query(
+                query=args.query, files=args.files, agent_types=agent_types
+            )
+            print_response(response)
 
     finally:
         await orchestrator.stop_all_agents()
 
 
-def main():
+def main() -> None:
     """CLI entry point for console scripts."""
     asyncio.run(async_main())
 
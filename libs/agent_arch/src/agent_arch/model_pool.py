@@ -0,0 +1,126 @@
+"""
+Shared Azure OpenAI model clients for agents.
+
+Agents that talk to the same deployment share one model and one HTTP
+connection pool instead of each opening their own, so many agents and
+parallel queries reuse warm connections.
+"""
+
+import os
+from dataclasses import dataclass
+
+import httpx
+from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.providers.azure import AzureProvider
+
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_TIMEOUT = 600.0
+
+
+@dataclass(frozen=True)
+class AzureSettings:
+    """Azure OpenAI deployment settings."""
+
+    endpoint: str
+    api_version: str
+    api_key: str
+    model: str
+
+    @classmethod
+    def from_env(cls) -> "AzureSettings":
+        """Read settings from the API_VERSION, ENDPOINT, API_KEY and MODEL variables.
+
+        Raises:
+            ValueError: If any of the variables is missing
+        """
+        api_version = os.getenv("API_VERSION")
+        endpoint = os.getenv("ENDPOINT")
+        api_key = os.getenv("API_KEY")
+        model = os.getenv("MODEL")
+
+        if not api_version or not endpoint or not api_key or not model:
+            raise ValueError(
+                "Missing Azure OpenAI configuration. Please set API_VERSION, "
+                "ENDPOINT, API_KEY, and MODEL environment variables."
+            )
+
+        return cls(
+            endpoint=endpoint, api_version=api_version, api_key=api_key, model=model
+        )
+
+
+class ModelClientPool:
+    """Creates one model per deployment, backed by a bounded connection pool."""
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_connections: Maximum open connections per deployment; further
+                requests wait for a free connection
+            timeout: Request timeout in seconds
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._models: dict[AzureSettings, OpenAIModel] = {}
+        self._clients: dict[AzureSettings, httpx.AsyncClient] = {}
+
+    def get_model(self, settings: AzureSettings | None = None) -> OpenAIModel:
+        """Get the shared model for a deployment, creating it on first use.
+
+        Args:
+            settings: Deployment to use; read from the environment if None
+
+        Returns:
+            Model shared by every caller with the same settings
+        """
+        settings = settings or AzureSettings.from_env()
+        model = self._models.get(settings)
+        if model is not None and not self._clients[settings].is_closed:
+            return model
+
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            # Requests queue for a free connection instead of timing out
+            timeout=httpx.Timeout(self.timeout, connect=5.0, pool=None),
+        )
+        model = OpenAIModel(
+            settings.model,
+            provider=AzureProvider(
+                azure_endpoint=settings.endpoint,
+                api_version=settings.api_version,
+                api_key=settings.api_key,
+                http_client=client,
+            ),
+        )
+        self._clients[settings] = client
+        self._models[settings] = model
+        return model
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    async def aclose(self) -> None:
+        """Close every connection pool."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._models.clear()
+
+
+_default_pool: ModelClientPool | None = None
+
+
+def get_default_pool() -> ModelClientPool:
+    """Get the process-wide model client pool."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ModelClientPool()
+    return _default_pool
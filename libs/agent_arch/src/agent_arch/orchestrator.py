@@ -1,33 +1,303 @@
 """
 Agent orchestrator for managing and routing requests to agents.
+
+Agents are registered by AgentType. Each request is scored by every agent;
+the best matches run concurrently and their answers are merged into one
+response. Batches of requests run in parallel with bounded concurrency.
 """
 
+import asyncio
+import logging
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+from pydantic_ai.models import Model
+
+from .agents import SPECIALIST_AGENTS, BaseAgent, ChatbotAgent
+from .model_pool import ModelClientPool
+from .types import AgentRequest, AgentResponse, AgentType
+
+logger = logging.getLogger(__name__)
+
+
+def merge_responses(responses: Sequence[AgentResponse]) -> AgentResponse:
+    """Combine the answers of several agents into one response.
+
+    Args:
+        responses: Responses in ranking order, best agent first
 
-from .agents import ChatbotAgent
-from .types import AgentRequest, AgentResponse
+    Returns:
+        The single response if there is one, otherwise a response with a
+        section per successful agent; failed agents are listed in metadata
+    """
+    if len(responses) == 1:
+        return responses[0]
+
+    succeeded = [response for response in responses if response.success]
+    summary = [
+        {
+            "agent_type": response.agent_type.value,
+            "success": response.success,
+            "error_message": response.error_message,
+        }
+        for response in responses
+    ]
+
+    if not succeeded:
+        return AgentResponse(
+            response=responses[0].response,
+            agent_type=responses[0].agent_type,
+            success=False,
+            error_message="; ".join(
+                f"{response.agent_type.value}: {response.error_message}"
+                for response in responses
+            ),
+            metadata={"agents": summary},
+        )
+
+    if len(succeeded) == 1:
+        text = succeeded[0].response
+    else:
+        text = "\n\n".join(
+            f"## {response.agent_type.value.replace('_', ' ').title()}\n\n"
+            f"{response.response}"
+            for response in succeeded
+        )
+
+    return AgentResponse(
+        response=text,
+        agent_type=succeeded[0].agent_type,
+        success=True,
+        metadata={"agents": summary},
+    )
 
 
 class AgentOrchestrator:
     """Orchestrator for managing and routing requests to agents."""
 
-    def __init__(self):
-        """Initialize the orchestrator with the chatbot agent."""
-        self.chatbot_agent = ChatbotAgent()
+    def __init__(
+        self,
+        agents: Iterable[BaseAgent] | None = None,
+        working_directory: str | Path = ".",
+        max_fan_out: int = 3,
+        max_concurrency: int = 8,
+        model: Model | None = None,
+        pool: ModelClientPool | None = None,
+    ) -> None:
+        """Initialize the orchestrator and register its agents.
+
+        Args:
+            agents: Agents to register; defaults to the chatbot and the
+                specialist agents, all sharing one pooled model
+            working_directory: Directory that query files are relative to
+            max_fan_out: Maximum number of agents that answer one request
+            max_concurrency: Maximum number of requests processed at once
+                in a batch
+            model: Model for the default agents; defaults to the pooled
+                Azure OpenAI model
+            pool: Pool to take the default model from, left open on stop;
+                without one the orchestrator creates a pool it closes itself
+        """
+        self.working_directory = Path(working_directory)
+        self.max_fan_out = max_fan_out
+        self.max_concurrency = max_concurrency
+        self._owned_pool: ModelClientPool | None = None
+        self._agents: dict[AgentType, BaseAgent] = {}
+
+        if agents is None:
+            if model is None:
+                if pool is None:
+                    # Connections belong to the event loop we run on, so they
+                    # are not shared with orchestrators on other loops
+                    self._owned_pool = pool = ModelClientPool()
+                model = pool.get_model()
+            agents = [ChatbotAgent(model=model)] + [
+                agent_class(model=model) for agent_class in SPECIALIST_AGENTS
+            ]
+
+        for agent in agents:
+            self.register_agent(agent)
+
+    @property
+    def agents(self) -> dict[AgentType, BaseAgent]:
+        """Get the registered agents by type."""
+        return dict(self._agents)
+
+    @property
+    def chatbot_agent(self) -> BaseAgent | None:
+        """Get the general chatbot agent, if registered."""
+        return self._agents.get(AgentType.CHATBOT)
+
+    def register_agent(self, agent: BaseAgent) -> None:
+        """Register an agent, replacing any agent of the same type."""
+        if agent.agent_type in self._agents:
+            logger.info(f"Replacing registered {agent.agent_type.value} agent")
+        self._agents[agent.agent_type] = agent
+
+    def unregister_agent(self, agent_type: AgentType) -> BaseAgent | None:
+        """Remove and return the agent of the given type."""
+        return self._agents.pop(agent_type, None)
+
+    def get_agent(self, agent_type: AgentType) -> BaseAgent | None:
+        """Get the agent of the given type."""
+        return self._agents.get(agent_type)
+
+    def rank_agents(self, request: AgentRequest) -> list[tuple[float, BaseAgent]]:
+        """Score every agent for a request, best first, dropping zero scores."""
+        ranked = []
+        for agent in self._agents.values():
+            try:
+                score = agent.score_task(request)
+            except Exception as e:
+                logger.warning(f"{agent.agent_type.value} agent failed to score: {e}")
+                continue
+            if score > 0:
+                ranked.append((score, agent))
+
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return ranked
+
+    def select_agents(self, request: AgentRequest) -> list[BaseAgent]:
+        """Pick the agents that should answer a request.
+
+        Every agent that scores at least half of the best score answers, up
+        to max_fan_out agents; weaker fallbacks are left out when a better
+        agent matched.
+        """
+        ranked = self.rank_agents(request)
+        if not ranked:
+            return []
+
+        best = ranked[0][0]
+        selected = [agent for score, agent in ranked if score >= best / 2]
+        return selected[: self.max_fan_out]
+
+    async def _run_agent(
+        self, agent: BaseAgent, request: AgentRequest
+    ) -> AgentResponse:
+        """Run one agent, turning unexpected errors into a failed response."""
+        try:
+            return await agent.process_task(request)
+        except Exception as e:
+            logger.error(f"{agent.agent_type.value} agent failed: {e}")
+            return AgentResponse(
+                response="I'm sorry, I encountered an error while processing your request.",
+                agent_type=agent.agent_type,
+                success=False,
+                error_message=str(e),
+            )
 
     async def process_request(
-        self, message: str, context: dict | None = None
+        self,
+        message: str,
+        context: dict | None = None,
+        agent_types: Sequence[AgentType] | None = None,
     ) -> AgentResponse:
         """
-        Process a request by routing it to the chatbot agent.
+        Process a request with the best suited agents.
 
         Args:
             message: The user's message
             context: Optional context information
+            agent_types: Agents to use instead of choosing them by score
 
         Returns:
-            AgentResponse: The response from the chatbot agent
+            AgentResponse: The merged response of the agents that ran
         """
         request = AgentRequest(message=message, context=context)
 
-        # Always route to the chatbot agent since it can handle any task
-        return await self.chatbot_agent.process_task(request)
+        if agent_types:
+            missing = [t.value for t in agent_types if t not in self._agents]
+            if missing:
+                raise ValueError(f"No agent registered for: {', '.join(missing)}")
+            agents = [self._agents[agent_type] for agent_type in agent_types]
+        else:
+            agents = self.select_agents(request)
+
+        if not agents:
+            return AgentResponse(
+                response="No agent is available to handle this request.",
+                agent_type=AgentType.CHATBOT,
+                success=False,
+                error_message="No registered agent can handle the request",
+            )
+
+        # Selected agents answer concurrently
+        responses = await asyncio.gather(
+            *(self._run_agent(agent, request) for agent in agents)
+        )
+        return merge_responses(responses)
+
+    async def process_query(
+        self,
+        query: str,
+        files: Sequence[str] | None = None,
+        agent_types: Sequence[AgentType] | None = None,
+    ) -> AgentResponse:
+        """
+        Process a query, including the contents of the given files.
+
+        Args:
+            query: The user's query
+            files: Paths relative to the working directory to include
+            agent_types: Agents to use instead of choosing them by score
+
+        Returns:
+            AgentResponse: The merged response of the agents that ran
+        """
+        if not files:
+            return await self.process_request(query, agent_types=agent_types)
+
+        sections = [query]
+        for name in files:
+            path = self.working_directory / name
+            try:
+                content = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError) as e:
+                content = f"Error reading file: {e}"
+            sections.append(f"--- {name} ---\n{content}")
+
+        return await self.process_request(
+            "\n\n".join(sections),
+            context={"files": list(files)},
+            agent_types=agent_types,
+        )
+
+    async def process_batch(
+        self,
+        queries: Sequence[str],
+        files: Sequence[str] | None = None,
+        agent_types: Sequence[AgentType] | None = None,
+    ) -> list[AgentResponse]:
+        """
+        Process many queries in parallel.
+
+        Args:
+            queries: Queries to process
+            files: Files included with every query
+            agent_types: Agents to use instead of choosing them by score
+
+        Returns:
+            One response per query, in the order of the queries
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(query: str) -> AgentResponse:
+            async with semaphore:
+                return await self.process_query(query, files, agent_types)
+
+        return list(await asyncio.gather(*(bounded(query) for query in queries)))
+
+    async def start_all_agents(self) -> None:
+        """Start every registered agent."""
+        await asyncio.gather(*(agent.start() for agent in self._agents.values()))
+
+    async def stop_all_agents(self) -> None:
+        """Stop every registered agent and close the pool this orchestrator created."""
+        await asyncio.gather(*(agent.stop() for agent in self._agents.values()))
+        if self._owned_pool is not None:
+            await self._owned_pool.aclose()
+
+    async def cleanup(self) -> None:
+        """Release all resources; used by integrations such as the agent bridge."""
+        await self.stop_all_agents()
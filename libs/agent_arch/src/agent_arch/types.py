@@ -12,6 +12,10 @@ class AgentType(Enum):
     """Types of agents available in the system."""
 
     CHATBOT = "chatbot"
+    CODE_ANALYSIS = "code_analysis"
+    REFACTORING = "refactoring"
+    TEST_GENERATION = "test_generation"
+    DOCUMENTATION = "documentation"
 
 
 class AgentRequest(BaseModel):
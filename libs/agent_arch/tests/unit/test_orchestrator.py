@@ -0,0 +1,383 @@
+"""
+Tests for the agent orchestrator.
+
+This module tests:
+- Agent scoring and selection
+- Concurrent fan-out to several agents and response merging
+- Parallel batch processing
+- Queries with files and the command-line interface
+- Shared model clients
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from agent_arch import (
+    AgentOrchestrator,
+    AgentRequest,
+    AgentResponse,
+    AgentType,
+    AzureSettings,
+    BaseAgent,
+    ChatbotAgent,
+    CodeAnalysisAgent,
+    ModelClientPool,
+    TestGenerationAgent,
+    merge_responses,
+)
+from agent_arch.cli import build_parser, read_batch_file
+from pydantic_ai.models.test import TestModel
+
+
+class SlowAgent(BaseAgent):
+    """Agent that records how many requests it is processing at once."""
+
+    def __init__(
+        self, agent_type: AgentType, delay: float = 0.05, fail: bool = False
+    ) -> None:
+        super().__init__()
+        self.agent_type = agent_type
+        self.delay = delay
+        self.fail = fail
+        self.active = 0
+        self.peak = 0
+        self.messages: list[str] = []
+
+    def can_handle_task(self, request: AgentRequest) -> bool:
+        return True
+
+    async def process_task(self, request: AgentRequest) -> AgentResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.messages.append(request.message)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("agent crashed")
+            return AgentResponse(
+                response=f"{self.agent_type.value}: {request.message}",
+                agent_type=self.agent_type,
+            )
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def model() -> TestModel:
+    """Offline model shared by the default agents."""
+    return TestModel(custom_output_text="model answer")
+
+
+class TestAgentSelection:
+    """Test scoring and routing of requests."""
+
+    def test_default_agents_registered_by_type(self, model: TestModel) -> None:
+        """Test that the chatbot and every specialist are registered."""
+        orchestrator = AgentOrchestrator(model=model)
+
+        assert set(orchestrator.agents) == set(AgentType)
+        assert isinstance(orchestrator.chatbot_agent, ChatbotAgent)
+        assert all(
+            isinstance(agent, ChatbotAgent) and agent.model is model
+            for agent in orchestrator.agents.values()
+        )
+
+    def test_specialist_outranks_chatbot(self, model: TestModel) -> None:
+        """Test that a matching specialist is chosen over the chatbot."""
+        orchestrator = AgentOrchestrator(model=model)
+
+        selected = orchestrator.select_agents(
+            AgentRequest(message="Please refactor this function")
+        )
+
+        assert [agent.agent_type for agent in selected] == [AgentType.REFACTORING]
+
+    def test_chatbot_is_fallback(self, model: TestModel) -> None:
+        """Test that the chatbot answers when no specialist matches."""
+        orchestrator = AgentOrchestrator(model=model)
+
+        selected = orchestrator.select_agents(AgentRequest(message="Hello there"))
+
+        assert [agent.agent_type for agent in selected] == [AgentType.CHATBOT]
+
+    def test_fan_out_is_capped(self, model: TestModel) -> None:
+        """Test that at most max_fan_out agents are selected."""
+        orchestrator = AgentOrchestrator(model=model, max_fan_out=2)
+
+        selected = orchestrator.select_agents(
+            AgentRequest(message="review, refactor, test and document this code")
+        )
+
+        assert len(selected) == 2
+        assert AgentType.CHATBOT not in {agent.agent_type for agent in selected}
+
+    def test_register_replaces_and_unregister_removes(self, model: TestModel) -> None:
+        """Test the agent registry operations."""
+        orchestrator = AgentOrchestrator(agents=[ChatbotAgent(model=model)])
+        replacement = ChatbotAgent(model=model)
+
+        orchestrator.register_agent(replacement)
+        assert orchestrator.get_agent(AgentType.CHATBOT) is replacement
+
+        assert orchestrator.unregister_agent(AgentType.CHATBOT) is replacement
+        assert orchestrator.agents == {}
+
+    def test_specialist_keyword_scores(self, model: TestModel) -> None:
+        """Test that more keyword hits give a higher score."""
+        agent = CodeAnalysisAgent(model=model)
+
+        one = agent.score_task(AgentRequest(message="review this"))
+        two = agent.score_task(AgentRequest(message="review this bug"))
+
+        assert agent.score_task(AgentRequest(message="hello")) == 0.0
+        assert 0 < one < two <= 1.0
+        assert agent.can_handle_task(AgentRequest(message="find the bug"))
+
+    def test_specialist_keywords_match_whole_words(self, model: TestModel) -> None:
+        """Test that keywords inside longer words do not count."""
+        agent = TestGenerationAgent(model=model)
+
+        unrelated = AgentRequest(message="the latest contest in our community")
+
+        assert agent.score_task(unrelated) == 0.0
+        assert agent.score_task(AgentRequest(message="write unit tests")) > 0
+
+
+class TestProcessRequest:
+    """Test processing a request with one or more agents."""
+
+    @pytest.mark.asyncio
+    async def test_single_agent_response(self, model: TestModel) -> None:
+        """Test that a single selected agent's response is returned as is."""
+        orchestrator = AgentOrchestrator(model=model)
+
+        response = await orchestrator.process_request("Hello")
+
+        assert response.success
+        assert response.agent_type == AgentType.CHATBOT
+        assert response.response == "model answer"
+
+    @pytest.mark.asyncio
+    async def test_fan_out_runs_agents_concurrently(self) -> None:
+        """Test that selected agents run at the same time and are merged."""
+        agents = [
+            SlowAgent(AgentType.CODE_ANALYSIS, delay=0.2),
+            SlowAgent(AgentType.REFACTORING, delay=0.2),
+            SlowAgent(AgentType.DOCUMENTATION, delay=0.2),
+        ]
+        orchestrator = AgentOrchestrator(agents=agents)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        response = await orchestrator.process_request("improve this")
+        elapsed = loop.time() - started
+
+        assert elapsed < 0.5
+        assert response.success
+        assert "## Code Analysis" in response.response
+        assert "## Refactoring" in response.response
+        assert "## Documentation" in response.response
+        assert response.metadata is not None
+        assert len(response.metadata["agents"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_explicit_agent_types(self, model: TestModel) -> None:
+        """Test that requested agent types bypass scoring."""
+        orchestrator = AgentOrchestrator(model=model)
+
+        response = await orchestrator.process_request(
+            "Hello", agent_types=[AgentType.TEST_GENERATION]
+        )
+
+        assert response.agent_type == AgentType.TEST_GENERATION
+
+    @pytest.mark.asyncio
+    async def test_unknown_agent_type_raises(self, model: TestModel) -> None:
+        """Test that requesting an unregistered agent raises ValueError."""
+        orchestrator = AgentOrchestrator(agents=[ChatbotAgent(model=model)])
+
+        with pytest.raises(ValueError, match="refactoring"):
+            await orchestrator.process_request(
+                "Hello", agent_types=[AgentType.REFACTORING]
+            )
+
+    @pytest.mark.asyncio
+    async def test_failed_agent_does_not_sink_others(self) -> None:
+        """Test that one crashing agent leaves the other answers intact."""
+        orchestrator = AgentOrchestrator(
+            agents=[
+                SlowAgent(AgentType.CODE_ANALYSIS),
+                SlowAgent(AgentType.REFACTORING, fail=True),
+            ]
+        )
+
+        response = await orchestrator.process_request("improve this")
+
+        assert response.success
+        assert response.agent_type == AgentType.CODE_ANALYSIS
+        assert response.response == "code_analysis: improve this"
+        assert response.metadata is not None
+        failed = [a for a in response.metadata["agents"] if not a["success"]]
+        assert failed[0]["error_message"] == "agent crashed"
+
+    @pytest.mark.asyncio
+    async def test_no_agents_returns_error(self) -> None:
+        """Test that an empty registry gives an error response."""
+        response = await AgentOrchestrator(agents=[]).process_request("Hello")
+
+        assert not response.success
+
+    def test_merge_all_failed_combines_errors(self) -> None:
+        """Test merging responses when every agent failed."""
+        merged = merge_responses(
+            [
+                AgentResponse(
+                    response="sorry",
+                    agent_type=AgentType.REFACTORING,
+                    success=False,
+                    error_message="timeout",
+                ),
+                AgentResponse(
+                    response="sorry",
+                    agent_type=AgentType.DOCUMENTATION,
+                    success=False,
+                    error_message="rate limited",
+                ),
+            ]
+        )
+
+        assert not merged.success
+        assert merged.error_message == (
+            "refactoring: timeout; documentation: rate limited"
+        )
+
+
+class TestBatchProcessing:
+    """Test parallel processing of many queries."""
+
+    @pytest.mark.asyncio
+    async def test_batch_keeps_order_and_bounds_concurrency(self) -> None:
+        """Test that batch responses keep query order within the limit."""
+        agent = SlowAgent(AgentType.CHATBOT, delay=0.02)
+        orchestrator = AgentOrchestrator(agents=[agent], max_concurrency=3)
+        queries = [f"query {i}" for i in range(10)]
+
+        responses = await orchestrator.process_batch(queries)
+
+        assert [r.response for r in responses] == [f"chatbot: {q}" for q in queries]
+        assert agent.peak == 3
+
+    @pytest.mark.asyncio
+    async def test_process_query_includes_files(self, tmp_path: Path) -> None:
+        """Test that file contents are appended to the query."""
+        (tmp_path / "main.py").write_text("print('hi')\n")
+        agent = SlowAgent(AgentType.CHATBOT, delay=0)
+        orchestrator = AgentOrchestrator(agents=[agent], working_directory=tmp_path)
+
+        await orchestrator.process_query("explain", files=["main.py", "missing.py"])
+
+        message = agent.messages[0]
+        assert message.startswith("explain")
+        assert "--- main.py ---\nprint('hi')" in message
+        assert "--- missing.py ---\nError reading file:" in message
+
+    @pytest.mark.asyncio
+    async def test_lifecycle_and_cleanup(self, model: TestModel) -> None:
+        """Test that the bridge-facing lifecycle methods run without error."""
+        orchestrator = AgentOrchestrator(model=model)
+
+        await orchestrator.start_all_agents()
+        await orchestrator.cleanup()
+
+
+class TestModelClientPool:
+    """Test sharing of model clients."""
+
+    SETTINGS = AzureSettings(
+        endpoint="https://example.openai.azure.com",
+        api_version="2024-10-21",
+        api_key="test-key",
+        model="gpt-4o",
+    )
+
+    @pytest.mark.asyncio
+    async def test_one_model_per_deployment(self) -> None:
+        """Test that agents for one deployment share a model and client."""
+        pool = ModelClientPool(max_connections=4)
+        other = AzureSettings(
+            endpoint=self.SETTINGS.endpoint,
+            api_version=self.SETTINGS.api_version,
+            api_key=self.SETTINGS.api_key,
+            model="gpt-4o-mini",
+        )
+
+        shared = pool.get_model(self.SETTINGS)
+
+        assert pool.get_model(self.SETTINGS) is shared
+        assert pool.get_model(other) is not shared
+        assert len(pool) == 2
+
+        await pool.aclose()
+        assert len(pool) == 0
+
+    def test_missing_settings_raise(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that missing environment variables raise ValueError."""
+        for name in ("API_VERSION", "ENDPOINT", "API_KEY", "MODEL"):
+            monkeypatch.delenv(name, raising=False)
+
+        with pytest.raises(ValueError, match="Missing Azure OpenAI configuration"):
+            AzureSettings.from_env()
+
+    @pytest.mark.asyncio
+    async def test_only_own_pool_closed_on_stop(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that stopping closes the orchestrator's own pool, not a shared one."""
+        for name, value in (
+            ("API_VERSION", self.SETTINGS.api_version),
+            ("ENDPOINT", self.SETTINGS.endpoint),
+            ("API_KEY", self.SETTINGS.api_key),
+            ("MODEL", self.SETTINGS.model),
+        ):
+            monkeypatch.setenv(name, value)
+        shared = ModelClientPool()
+
+        owner = AgentOrchestrator()
+        borrower = AgentOrchestrator(pool=shared)
+        assert len(shared) == 1
+
+        await owner.stop_all_agents()
+        await borrower.stop_all_agents()
+
+        assert owner._owned_pool is not None
+        assert len(owner._owned_pool) == 0
+        assert len(shared) == 1
+        await shared.aclose()
+
+
+class TestCommandLine:
+    """Test command-line helpers."""
+
+    def test_read_batch_file_skips_blanks_and_comments(self, tmp_path: Path) -> None:
+        """Test that batch files give one query per non-comment line."""
+        batch = tmp_path / "queries.txt"
+        batch.write_text("# queries\nexplain main.py\n\n  write tests  \n")
+
+        assert read_batch_file(batch) == ["explain main.py", "write tests"]
+
+    def test_parser_accepts_batch_options(self) -> None:
+        """Test the batch, concurrency and agent options."""
+        args = build_parser().parse_args(
+            ["-b", "queries.txt", "-c", "4", "-a", "refactoring", "-a", "chatbot"]
+        )
+
+        assert args.batch == "queries.txt"
+        assert args.concurrency == 4
+        assert args.agent == ["refactoring", "chatbot"]
+
+    @pytest.mark.parametrize("value", ["0", "-2"])
+    def test_parser_rejects_non_positive_concurrency(self, value: str) -> None:
+        """Test that batch concurrency must be at least one."""
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["-b", "queries.txt", "-c", value])
@@ -40,6 +40,7 @@ Attributes:
 
 from __future__ import annotations
 
+import importlib
 from typing import TYPE_CHECKING
 
 try:
@@ -52,11 +53,13 @@ __author__ = "Randy Herritt"
 __email__ = "randy.herritt@gmail.com"
 __license__ = "Proprietary"
 
-# Import submodules
-from . import core, gui
+# Submodules are imported on first access (PEP 562) so that importing the
+# package, e.g. for ``--version``, does not load the GUI and AI stacks
+_LAZY_SUBMODULES = {"core", "gui"}
 
 # Type checking imports to avoid circular dependencies
 if TYPE_CHECKING:
+    from . import core, gui
     from .agents.base import AIAgent
     from .core.viewer import CodeViewer
 
@@ -73,6 +76,18 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str) -> object:
+    """Import a submodule on first attribute access."""
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    """List module attributes including lazily imported submodules."""
+    return sorted(set(globals()) | _LAZY_SUBMODULES)
+
+
 def get_version() -> str:
     """Get the current version of My Coding Agent.
 
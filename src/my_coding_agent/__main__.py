@@ -13,16 +13,82 @@ Example:
 
     Open with specific directory:
         $ python -m my_coding_agent /path/to/code
+
+    Report import and initialization timings:
+        $ python -m my_coding_agent --profile-startup
 """
 
 from __future__ import annotations
 
 import argparse
+import importlib
 import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
 
 from .config.settings import Settings, get_settings
 
+if TYPE_CHECKING:
+    from .core.ai_services.logging_utils import AsyncLogPipeline
+
+
+class StartupProfiler:
+    """Collects wall-clock timings for application startup phases."""
+
+    def __init__(self, enabled: bool = False) -> None:
+        """Initialize the profiler.
+
+        Args:
+            enabled: Whether timings should be recorded
+        """
+        self.enabled = enabled
+        self.timings: list[tuple[str, float]] = []
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record the duration of a phase that was timed externally.
+
+        Args:
+            name: Name of the startup phase
+            seconds: Duration of the phase in seconds
+        """
+        if self.enabled:
+            self.timings.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a named startup phase.
+
+        Args:
+            name: Name of the startup phase
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self, stream: TextIO | None = None) -> None:
+        """Print recorded timings, slowest phases being easy to spot.
+
+        Args:
+            stream: Output stream (defaults to stderr)
+        """
+        if not self.enabled:
+            return
+
+        stream = stream if stream is not None else sys.stderr
+        width = max((len(name) for name, _ in self.timings), default=0)
+        width = max(width, len("total"))
+
+        print("Startup profile:", file=stream)
+        for name, seconds in self.timings:
+            print(f"  {name:<{width}}  {seconds * 1000:9.1f} ms", file=stream)
+        total = sum(seconds for _, seconds in self.timings)
+        print(f"  {'total':<{width}}  {total * 1000:9.1f} ms", file=stream)
+
 
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create and configure the command-line argument parser.
@@ -94,6 +160,24 @@ Examples:
         "--debug", action="store_true", help="Enable debug mode with verbose logging"
     )
 
+    parser.add_argument(
+        "--log-file",
+        type=Path,
+        help="Write AI service logs as JSON lines to this file, rotated by size",
+    )
+
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import and initialization timings per subsystem",
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve latency metrics in Prometheus format on this local port",
+    )
+
     parser.add_argument(
         "--version", action="version", version=f"%(prog)s {_get_version()}"
     )
@@ -238,6 +322,32 @@ def setup_debug_logging(debug: bool) -> None:
         logging.getLogger("my_coding_agent").debug("Debug mode enabled")
 
 
+def start_log_pipeline(log_file: Path, debug: bool) -> AsyncLogPipeline:
+    """Start writing AI service logs as JSON lines from a background thread.
+
+    Args:
+        log_file: File to write, rotated by size
+        debug: Whether to record debug-level AI service events; they are
+            also still shown on the debug console
+
+    Returns:
+        The running pipeline, to be stopped on shutdown
+    """
+    import logging
+
+    from .core.ai_services.logging_utils import AsyncLogPipeline
+
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+
+    pipeline = AsyncLogPipeline(
+        log_file=log_file,
+        level=logging.DEBUG if debug else None,
+        propagate=debug,
+    )
+    pipeline.start()
+    return pipeline
+
+
 def main(argv: list[str] | None = None) -> None:
     """Main entry point for the application.
 
@@ -251,25 +361,53 @@ def main(argv: list[str] | None = None) -> None:
     4. Initializes and starts the GUI application
     """
     # Parse command-line arguments
+    parse_start = time.perf_counter()
     parser = create_argument_parser()
     args = parser.parse_args(argv)
 
+    profiler = StartupProfiler(enabled=args.profile_startup)
+    profiler.record("parse arguments", time.perf_counter() - parse_start)
+
     # Set up debug logging if requested
     setup_debug_logging(args.debug)
 
-    # Validate directory
-    directory = validate_directory(args.directory)
+    log_pipeline = None
+    if args.log_file is not None:
+        with profiler.phase("start log pipeline"):
+            log_pipeline = start_log_pipeline(args.log_file, args.debug)
+
+    metrics_server = None
+    if args.metrics_port is not None:
+        from .core.metrics import MetricsServer
+
+        metrics_server = MetricsServer(port=args.metrics_port)
+        metrics_server.start()
+
+    with profiler.phase("load settings"):
+        # Validate directory
+        directory = validate_directory(args.directory)
 
-    # Configure settings from arguments
-    settings = configure_settings_from_args(args)
+        # Configure settings from arguments
+        settings = configure_settings_from_args(args)
 
     # Import GUI components
-    from PyQt6.QtWidgets import QApplication
+    with profiler.phase("import Qt"):
+        from PyQt6.QtWidgets import QApplication
 
-    from .core.main_window import MainWindow
+    with profiler.phase("import main window"):
+        from .core.main_window import MainWindow
+
+    # The window loads these on first use; importing them here keeps their
+    # cost out of the window construction timing
+    with profiler.phase("import AI stack"):
+        importlib.import_module(".core.ai_agent", __package__)
+
+    with profiler.phase("import MCP stack"):
+        importlib.import_module(".core.mcp_client_coordinator", __package__)
 
     # Create QApplication
-    app = QApplication(sys.argv)
+    with profiler.phase("create QApplication"):
+        app = QApplication(sys.argv)
 
     # Print configuration info
     print("My Coding Agent - MCP Client Interface")
@@ -281,19 +419,35 @@ def main(argv: list[str] | None = None) -> None:
         f"MCP Streaming: {'enabled' if settings.mcp_enable_streaming else 'disabled'}"
     )
     print(f"Configuration: {settings.config_dir}")
+    if metrics_server is not None:
+        print(f"Metrics: {metrics_server.url}")
     print("Starting GUI...")
 
     # Create and show the main window
-    main_window = MainWindow(str(directory))
+    with profiler.phase("create main window"):
+        main_window = MainWindow(str(directory))
 
     # Apply settings to window
     if hasattr(settings, "window_width") and hasattr(settings, "window_height"):
         main_window.resize(settings.window_width, settings.window_height)
 
-    main_window.show()
+    with profiler.phase("show main window"):
+        main_window.show()
+
+    profiler.report()
 
     # Start the application event loop
-    sys.exit(app.exec())
+    exit_code = app.exec()
+
+    # Stop the shared asyncio loop used for agent and MCP I/O
+    from .core.async_loop import shutdown_shared_loop
+
+    shutdown_shared_loop()
+    if metrics_server is not None:
+        metrics_server.stop()
+    if log_pipeline is not None:
+        log_pipeline.stop()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -17,7 +17,16 @@ from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 from pydantic_ai.models.openai import OpenAIModel
 
+from .batch_file_reader import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_FILE_BYTES,
+    BatchFileReader,
+    FileReadResult,
+)
 from .mcp import MCPClient, MCPServerRegistry
+from .metrics import get_metrics_registry
+from .project_history import HistoryPage, ProjectHistoryStore, format_record
+from .response_cache import CachedModel, ResponseCache
 
 # from .mcp_file_server import FileOperationError, MCPFileConfig, MCPFileServer  # DELETED - file operations move to external AI agent
 
@@ -158,6 +167,26 @@ class AIAgentConfig(BaseModel):
     max_retries: int = Field(
         default=3, description="Maximum number of retries for failed requests"
     )
+    response_cache_dir: str | None = Field(
+        default=None,
+        description="Directory of the opt-in response cache, disabled if not set",
+    )
+    response_cache_replay: str = Field(
+        default="timed",
+        description="Replay cached streams with their original timing or 'fast'",
+    )
+    response_cache_offline: bool = Field(
+        default=False,
+        description="Fail on response cache misses instead of calling the model",
+    )
+    file_read_concurrency: int = Field(
+        default=DEFAULT_MAX_CONCURRENCY,
+        description="Maximum number of files read at once in a batch",
+    )
+    max_file_read_bytes: int = Field(
+        default=DEFAULT_MAX_FILE_BYTES,
+        description="Per-file size cap for batch reads; larger files keep head and tail",
+    )
 
     @classmethod
     def from_env(cls) -> AIAgentConfig:
@@ -190,6 +219,16 @@ class AIAgentConfig(BaseModel):
             temperature=float(os.getenv("AI_TEMPERATURE", "0.7")),
             request_timeout=int(os.getenv("AI_REQUEST_TIMEOUT", "30")),
             max_retries=int(os.getenv("AI_MAX_RETRIES", "3")),
+            response_cache_dir=os.getenv("AI_RESPONSE_CACHE_DIR") or None,
+            response_cache_replay=os.getenv("AI_RESPONSE_CACHE_REPLAY", "timed"),
+            response_cache_offline=os.getenv("AI_RESPONSE_CACHE_OFFLINE", "").lower()
+            in ("1", "true", "yes"),
+            file_read_concurrency=int(
+                os.getenv("AI_FILE_READ_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY))
+            ),
+            max_file_read_bytes=int(
+                os.getenv("AI_MAX_FILE_READ_BYTES", str(DEFAULT_MAX_FILE_BYTES))
+            ),
         )
 
 
@@ -236,6 +275,9 @@ class AIAgent:
         tool_registration_service=None,  # ToolRegistrationService for tool management
         memory_context_service=None,  # MemoryContextService for memory functionality
         project_history_service=None,  # ProjectHistoryService for project history functionality
+        project_history_store: ProjectHistoryStore | None = None,
+        symbol_index=None,  # SymbolIndex for structural code lookups
+        response_cache: ResponseCache | None = None,
     ) -> None:
         """
         Initialize the AI Agent.
@@ -257,6 +299,11 @@ class AIAgent:
             ai_messaging_service: AIMessagingService for enhanced messaging capabilities
             tool_registration_service: ToolRegistrationService for tool management
             memory_context_service: MemoryContextService for memory functionality
+            project_history_store: Time-indexed file change history answering
+                the project history tools
+            symbol_index: SymbolIndex backing the find_definition tool
+            response_cache: Cache answering repeated model requests; created
+                from config.response_cache_dir if not provided
         """
         # Handle service-oriented vs legacy configuration
         if config_service is not None:
@@ -291,6 +338,7 @@ class AIAgent:
         self.project_history_service = (
             project_history_service  # Can be None for legacy mode
         )
+        self.project_history_store = project_history_store
 
         self.mcp_config = mcp_config
         self.signal_handler = signal_handler
@@ -300,6 +348,14 @@ class AIAgent:
         self.mcp_tools_enabled = enable_mcp_tools
         self.mcp_file_server = None
         self.mcp_registry = None
+        self.file_reader = (
+            BatchFileReader(
+                max_concurrency=self.config.file_read_concurrency,
+                max_file_bytes=self.config.max_file_read_bytes,
+            )
+            if self.config is not None
+            else BatchFileReader()
+        )
         self.workspace_root = None  # Initialize workspace root as None
         self._mcp_servers_need_connection = False
         self._mcp_tools_registered = False  # Track if MCP tools have been registered
@@ -309,6 +365,9 @@ class AIAgent:
         self._environment_tool_registered = (
             False  # Track if environment tool has been registered
         )
+        self.symbol_index = symbol_index
+        self._symbol_tools_registered = False
+        self.response_cache = response_cache
 
         # Setup logging
         self._setup_logging()
@@ -324,8 +383,7 @@ class AIAgent:
             "mcp_"  # Prefix for MCP tools when they conflict with filesystem tools
         )
 
-        # Initialize project history cache
-        self._project_history_cache = {}
+        # Initialize project understanding cache
         self._project_understanding_cache = {}
 
         # Initialize memory system if requested
@@ -361,9 +419,13 @@ class AIAgent:
         self._register_tools()
 
         # Register project history tools if enabled
-        if self.project_history_enabled and self.memory_aware_enabled:
+        if self.project_history_enabled and self._has_project_history_source():
             self._register_project_history_tools()
 
+        # Register symbol lookup tools if an index was provided
+        if self.symbol_index is not None:
+            self._register_symbol_tools()
+
         # Register MCP tools if enabled
         if self.mcp_tools_enabled and self.mcp_registry:
             self._register_mcp_tools()  # Register empty tools list initially (will be re-registered after connection)
@@ -549,6 +611,7 @@ class AIAgent:
             )
 
             self._model = OpenAIModel(model_name=deployment_name, provider=provider)
+            self._apply_response_cache()
             logger.info(
                 "Azure OpenAI model created successfully: %s (endpoint: %s)",
                 deployment_name,
@@ -571,6 +634,28 @@ class AIAgent:
             )
             raise
 
+    def _apply_response_cache(self) -> None:
+        """Route model requests through the response cache if one is enabled."""
+        if (
+            self.response_cache is None
+            and self.config is not None
+            and self.config.response_cache_dir
+        ):
+            self.response_cache = ResponseCache(
+                self.config.response_cache_dir,
+                replay_mode=self.config.response_cache_replay,
+                offline=self.config.response_cache_offline,
+            )
+
+        if self.response_cache is not None:
+            self._model = CachedModel(self._model, self.response_cache)
+            logger.info(
+                "Response cache enabled: %s (replay: %s, offline: %s)",
+                self.response_cache.cache_dir,
+                self.response_cache.replay_mode.value,
+                self.response_cache.offline,
+            )
+
     def _create_agent(self) -> None:
         """Create the Pydantic AI Agent instance."""
         try:
@@ -689,6 +774,19 @@ class AIAgent:
                 """
                 return await self._tool_read_file(file_path)
 
+            # Read multiple files tool
+            @self._agent.tool_plain
+            async def read_multiple_files(file_paths: list[str]) -> str:
+                """Read several files in the workspace at once.
+
+                Args:
+                    file_paths: Relative paths to the files within workspace
+
+                Returns:
+                    Contents of each file under a header with its path
+                """
+                return await self._tool_read_multiple_files(file_paths)
+
             # Write file tool
             @self._agent.tool_plain
             async def write_file(file_path: str, content: str) -> str:
@@ -784,54 +882,65 @@ class AIAgent:
             return self.project_history_service.register_tools(self._agent)
 
         # Legacy implementation for backwards compatibility
-        if not self.memory_aware_enabled or not hasattr(self, "_memory_system"):
-            logger.warning("Project history tools require memory system")
+        if self.project_history_store is None and (
+            not self.memory_aware_enabled or not hasattr(self, "_memory_system")
+        ):
+            logger.warning("Project history tools require a history store")
             return
 
         try:
             # Project history for specific file tool
             @self._agent.tool_plain
-            async def get_file_project_history(file_path: str, limit: int = 20) -> str:
+            async def get_file_project_history(
+                file_path: str, limit: int = 20, offset: int = 0
+            ) -> str:
                 """Get project history for a specific file.
 
                 Args:
                     file_path: Path to the file to get history for
                     limit: Maximum number of history events to return (default: 20)
+                    offset: Number of newest events to skip, for paging (default: 0)
 
                 Returns:
                     Formatted project history for the file
                 """
-                return await self._tool_get_file_project_history(file_path, limit)
+                return await self._tool_get_file_project_history(
+                    file_path, limit, offset
+                )
 
             # Search project history tool
             @self._agent.tool_plain
-            async def search_project_history(query: str, limit: int = 25) -> str:
+            async def search_project_history(
+                query: str, limit: int = 25, offset: int = 0
+            ) -> str:
                 """Search project history using semantic and text search.
 
                 Args:
                     query: Search query for project history
                     limit: Maximum number of results to return (default: 25)
+                    offset: Number of newest results to skip, for paging (default: 0)
 
                 Returns:
                     Formatted search results from project history
                 """
-                return await self._tool_search_project_history(query, limit)
+                return await self._tool_search_project_history(query, limit, offset)
 
             # Get recent project changes tool
             @self._agent.tool_plain
             async def get_recent_project_changes(
-                hours: int = 24, limit: int = 15
+                hours: int = 24, limit: int = 15, offset: int = 0
             ) -> str:
                 """Get recent project changes within specified time period.
 
                 Args:
                     hours: Number of hours to look back (default: 24)
                     limit: Maximum number of changes to return (default: 15)
+                    offset: Number of newest changes to skip, for paging (default: 0)
 
                 Returns:
                     Formatted list of recent project changes
                 """
-                return await self._tool_get_recent_project_changes(hours, limit)
+                return await self._tool_get_recent_project_changes(hours, limit, offset)
 
             # Project timeline tool
             @self._agent.tool_plain
@@ -873,6 +982,7 @@ class AIAgent:
             tools.extend(
                 [
                     "read_file",
+                    "read_multiple_files",
                     "write_file",
                     "list_directory",
                     "create_directory",
@@ -889,7 +999,7 @@ class AIAgent:
             tools.append("get_mcp_server_status")
 
         # Add project history tools
-        if self.project_history_enabled and self.memory_aware_enabled:
+        if self.project_history_enabled and self._has_project_history_source():
             tools.extend(
                 [
                     "get_file_project_history",
@@ -899,6 +1009,10 @@ class AIAgent:
                 ]
             )
 
+        # Add symbol lookup tools
+        if self._symbol_tools_registered:
+            tools.append("find_definition")
+
         return tools
 
     def get_tool_descriptions(self) -> dict[str, str]:
@@ -914,6 +1028,7 @@ class AIAgent:
             descriptions.update(
                 {
                     "read_file": "Read the contents of a file in the workspace",
+                    "read_multiple_files": "Read several files in the workspace at once",
                     "write_file": "Write content to a file in the workspace",
                     "list_directory": "List contents of a directory in the workspace",
                     "create_directory": "Create a new directory in the workspace",
@@ -932,7 +1047,7 @@ class AIAgent:
             )
 
         # Add project history tool descriptions
-        if self.project_history_enabled and self.memory_aware_enabled:
+        if self.project_history_enabled and self._has_project_history_source():
             descriptions.update(
                 {
                     "get_file_project_history": "Get project history and evolution for a specific file",
@@ -942,6 +1057,12 @@ class AIAgent:
                 }
             )
 
+        # Add symbol lookup tool descriptions
+        if self._symbol_tools_registered:
+            descriptions["find_definition"] = (
+                "Find where a function, class or import is defined in the project"
+            )
+
         return descriptions
 
     # Filesystem tool implementation methods
@@ -962,6 +1083,21 @@ class AIAgent:
             logger.error(f"Unexpected error reading file {file_path}: {e}")
             return f"Error: {e}"
 
+    async def _tool_read_multiple_files(self, file_paths: list[str]) -> str:
+        """Internal implementation of read_multiple_files tool."""
+        try:
+            if not self.mcp_file_server or not self.mcp_file_server.is_connected:
+                return "Error: MCP file server not connected. Please connect first."
+
+            contents = await self.read_multiple_files_mcp(file_paths)
+            return "\n\n".join(
+                f"=== {path} ===\n{content}" for path, content in contents.items()
+            )
+
+        except Exception as e:
+            logger.error(f"Unexpected error reading files {file_paths}: {e}")
+            return f"Error: {e}"
+
     async def _tool_write_file(self, file_path: str, content: str) -> str:
         """Internal implementation of write_file tool."""
         try:
@@ -1072,8 +1208,31 @@ class AIAgent:
 
     # Project History Tool Implementation Methods
 
+    def _has_project_history_source(self) -> bool:
+        """Check whether project history tools have anything to query."""
+        return self.project_history_store is not None or self.memory_aware_enabled
+
+    def _format_history_page(
+        self, title: str, page: HistoryPage, include_path: bool = True
+    ) -> str:
+        """Format a page of project history records for the AI."""
+        entries = []
+        for record in page.records:
+            entry = format_record(record, include_path)
+            if record.content:
+                entry += f"\n  Details: {record.content[:200]}..."
+            entries.append(entry)
+
+        result = f"{title}:\n" + "=" * 50 + "\n" + "\n\n".join(entries)
+        first = page.offset + 1
+        last = page.offset + len(page.records)
+        result += f"\n\nShowing {first}-{last} of {page.total} changes"
+        if page.has_more:
+            result += f"; use offset={last} for more"
+        return result
+
     async def _tool_get_file_project_history(
-        self, file_path: str, limit: int = 20
+        self, file_path: str, limit: int = 20, offset: int = 0
     ) -> str:
         """Get project history for a specific file."""
         if self.project_history_service is not None:
@@ -1081,6 +1240,16 @@ class AIAgent:
                 file_path, limit
             )
 
+        if self.project_history_store is not None:
+            page = self.project_history_store.query(
+                file_path=file_path, offset=offset, limit=limit
+            )
+            if not page.records:
+                return f"No project history found for file: {file_path}"
+            return self._format_history_page(
+                f"Project History for {file_path}", page, include_path=False
+            )
+
         # Legacy implementation for backwards compatibility
         try:
             if not hasattr(self, "_memory_system") or not self._memory_system:
@@ -1129,13 +1298,21 @@ class AIAgent:
             logger.error(f"Error getting file project history: {e}")
             return f"Error retrieving project history for {file_path}: {e}"
 
-    async def _tool_search_project_history(self, query: str, limit: int = 25) -> str:
+    async def _tool_search_project_history(
+        self, query: str, limit: int = 25, offset: int = 0
+    ) -> str:
         """Search project history using semantic and text search."""
         if self.project_history_service is not None:
             return await self.project_history_service._tool_search_project_history(
                 query, limit
             )
 
+        if self.project_history_store is not None:
+            page = self.project_history_store.search(query, limit, offset)
+            if not page.records:
+                return f"No search results found for query: {query}"
+            return self._format_history_page(f"Search Results for '{query}'", page)
+
         # Legacy implementation for backwards compatibility
         try:
             if not hasattr(self, "_memory_system") or not self._memory_system:
@@ -1184,7 +1361,7 @@ class AIAgent:
             return f"Error searching project history for '{query}': {e}"
 
     async def _tool_get_recent_project_changes(
-        self, hours: int = 24, limit: int = 15
+        self, hours: int = 24, limit: int = 15, offset: int = 0
     ) -> str:
         """Get recent project changes within specified time period."""
         try:
@@ -1196,6 +1373,14 @@ class AIAgent:
                     )
                 )
 
+            if self.project_history_store is not None:
+                page = self.project_history_store.recent(hours, limit, offset)
+                if not page.records:
+                    return f"No project changes found in the last {hours} hours"
+                return self._format_history_page(
+                    f"Recent Project Changes (Last {hours} hours)", page
+                )
+
             # Legacy implementation for backwards compatibility
             if not hasattr(self, "_memory_system") or not self._memory_system:
                 return "Error: Memory system not available for recent changes"
@@ -1236,6 +1421,21 @@ class AIAgent:
                     file_path, days_back
                 )
 
+            if self.project_history_store is not None:
+                start = time.time() - days_back * 86400
+                # Whole past days come from the store's formatted segment cache
+                timeline = self.project_history_store.timeline(
+                    start, file_path=file_path or None, max_events=200
+                )
+                if not timeline:
+                    return "No timeline data found for the specified period"
+                title = (
+                    f"Timeline for {file_path} (Last {days_back} days)"
+                    if file_path
+                    else f"Project Timeline (Last {days_back} days)"
+                )
+                return f"{title}:\n" + "=" * 60 + "\n" + timeline
+
             # Legacy implementation for backwards compatibility
             if not hasattr(self, "_memory_system") or not self._memory_system:
                 return "Error: Memory system not available for project timeline"
@@ -1297,6 +1497,10 @@ class AIAgent:
         if self.project_history_service is not None:
             return self.project_history_service.get_recent_project_history(limit)
 
+        if self.project_history_store is not None:
+            page = self.project_history_store.query(limit=limit)
+            return [record.to_dict() for record in page.records]
+
         # Simple fallback when service not available
         return []
 
@@ -1385,6 +1589,7 @@ class AIAgent:
         if self.filesystem_tools_enabled:
             filesystem_tools = {
                 "read_file",
+                "read_multiple_files",
                 "write_file",
                 "list_directory",
                 "create_directory",
@@ -1420,6 +1625,7 @@ class AIAgent:
         if self.filesystem_tools_enabled:
             filesystem_tools = {
                 "read_file",
+                "read_multiple_files",
                 "write_file",
                 "list_directory",
                 "create_directory",
@@ -1454,6 +1660,7 @@ class AIAgent:
             if self.filesystem_tools_enabled:
                 filesystem_tools = {
                     "read_file",
+                    "read_multiple_files",
                     "write_file",
                     "list_directory",
                     "create_directory",
@@ -2137,6 +2344,72 @@ class AIAgent:
         except Exception as e:
             logger.error(f"Failed to register environment variable tool: {e}")
 
+    def set_symbol_index(self, symbol_index) -> None:
+        """Attach a symbol index and register the find_definition tool.
+
+        Args:
+            symbol_index: SymbolIndex shared with the code viewer and file watcher
+        """
+        self.symbol_index = symbol_index
+        if symbol_index is not None:
+            self._register_symbol_tools()
+
+    def _register_symbol_tools(self) -> None:
+        """Register symbol lookup tools with the agent."""
+        if self._symbol_tools_registered:
+            logger.debug("Symbol tools already registered, skipping")
+            return
+
+        try:
+
+            @self._agent.tool_plain
+            async def find_definition(name: str, kind: str = "") -> str:
+                """Find where a function, class or import is defined.
+
+                Args:
+                    name: Exact name of the symbol to look up
+                    kind: Optional kind filter: "function", "class" or "import"
+
+                Returns:
+                    File paths and line numbers of matching definitions
+                """
+                return await self._tool_find_definition(name, kind)
+
+            self._symbol_tools_registered = True
+            logger.info("Symbol lookup tools registered successfully")
+
+        except Exception as e:
+            logger.error(f"Failed to register symbol lookup tools: {e}")
+
+    async def _tool_find_definition(self, name: str, kind: str = "") -> str:
+        """Internal implementation of find_definition tool."""
+        try:
+            if self.symbol_index is None:
+                return "Error: Symbol index not available"
+
+            from .symbol_index import SymbolKind
+
+            symbol_kind = None
+            if kind:
+                try:
+                    symbol_kind = SymbolKind(kind.lower())
+                except ValueError:
+                    return f"Error: Unknown symbol kind '{kind}'. Use function, class or import."
+
+            matches = self.symbol_index.find_definition(name, symbol_kind)
+            if not matches:
+                return f"No definition found for '{name}'"
+
+            lines = [
+                f"- {symbol.kind.value} {symbol.name} at {symbol.file_path}:{symbol.line}"
+                for symbol in matches
+            ]
+            return f"Definitions of '{name}':\n" + "\n".join(lines)
+
+        except Exception as e:
+            logger.error(f"Error finding definition for {name}: {e}")
+            return f"Error: {e}"
+
     async def _tool_get_mcp_server_status(self) -> str:
         """Internal implementation of get_mcp_server_status tool."""
         try:
@@ -2862,6 +3135,12 @@ class AIAgent:
         else:
             health_status["mcp_enabled"] = False
 
+        # p50/p95/p99 latencies of AI requests, streaming and MCP calls
+        health_status["latency_metrics"] = get_metrics_registry().snapshot()
+
+        if self.response_cache is not None:
+            health_status["response_cache"] = self.response_cache.get_stats()
+
         return health_status
 
     def _get_mcp_server_status_sync(self) -> dict[str, Any]:
@@ -3092,29 +3371,58 @@ class AIAgent:
         return await self.mcp_file_server.search_files(pattern, directory)
 
     async def read_multiple_files_mcp(self, file_paths: list[str]) -> dict[str, str]:
-        """Read multiple files through MCP server.
+        """Read multiple files through MCP server concurrently.
+
+        Repeated paths are read once and files over the size cap keep only
+        their head and tail.
 
         Args:
             file_paths: List of file paths to read.
 
         Returns:
-            Dict[str, str]: Dictionary mapping file paths to their content.
+            Dict[str, str]: Dictionary mapping file paths to their content,
+                in request order.
 
         Raises:
-            FileOperationError: If files cannot be read or MCP not connected.
+            FileOperationError: If MCP not connected.
         """
         self._ensure_mcp_connected()
 
-        results = {}
-        for file_path in file_paths:
-            try:
-                content = await self.read_file(file_path)
-                results[file_path] = content
-            except FileOperationError as e:
-                logger.warning(f"Failed to read {file_path}: {e}")
-                results[file_path] = f"Error reading file: {e}"
+        results = await self.file_reader.read_all(file_paths, read=self.read_file)
+        return {path: result.as_text() for path, result in results.items()}
+
+    async def stream_multiple_files(
+        self, file_paths: list[str]
+    ) -> AsyncGenerator[FileReadResult, None]:
+        """Read multiple files concurrently, yielding each as soon as it is read.
+
+        Uses local reads within the workspace if a WorkspaceService is
+        configured, otherwise the MCP file server.
+
+        Args:
+            file_paths: List of file paths to read.
 
-        return results
+        Yields:
+            FileReadResult: One result per unique path, in completion order.
+
+        Raises:
+            ValueError: If neither WorkspaceService nor MCP is configured.
+            FileOperationError: If only MCP is configured and it is not connected.
+        """
+        if self.workspace_service is not None:
+            stream = self.file_reader.stream(
+                file_paths, resolve=self.workspace_service.resolve_workspace_path
+            )
+        elif self.mcp_file_server is not None:
+            self._ensure_mcp_connected()
+            stream = self.file_reader.stream(file_paths, read=self.read_file)
+        else:
+            raise ValueError(
+                "Neither WorkspaceService nor MCP is configured. Use service-oriented architecture or legacy AIAgentConfig."
+            )
+
+        async for result in stream:
+            yield result
 
     async def send_message_with_file_context(
         self, message: str, file_path: str
@@ -3489,44 +3797,48 @@ User message: {message}
         """Read multiple files with intelligent routing.
 
         Routes to either MCP or workspace implementation based on configuration.
-        If workspace service is available, uses workspace implementation (sync).
-        Otherwise, tries to use MCP implementation (async, but called synchronously).
+        If workspace service is available, files are resolved within the
+        workspace and read concurrently on a thread pool. Otherwise the MCP
+        implementation runs on the shared event loop.
 
         Args:
             file_paths: List of file paths to read.
-            fail_fast: If True, stop on first error. If False, continue and collect errors.
+            fail_fast: If True, raise for the first failed path in request order.
+                If False, continue and collect errors.
 
         Returns:
             Dict[str, str]: Mapping of file paths to content (or error messages).
 
         Raises:
-            ValueError: If neither WorkspaceService nor MCP is configured.
+            ValueError: If neither WorkspaceService nor MCP is configured, or if
+                MCP reads are requested from the shared event loop thread.
+            FileOperationError: If fail_fast is set and a file cannot be read.
         """
         # Prefer workspace service if available (service-oriented architecture)
         if self.workspace_service is not None:
-            return self.workspace_service.read_multiple_workspace_files(
-                file_paths, fail_fast
+            results = self.file_reader.read_all_sync(
+                file_paths, resolve=self.workspace_service.resolve_workspace_path
             )
+            if fail_fast:
+                for path, result in results.items():
+                    if not result.ok:
+                        raise FileOperationError(
+                            f"Failed to read {path}: {result.error}"
+                        )
+            return {path: result.as_text() for path, result in results.items()}
 
         # Fallback to MCP if available (legacy architecture)
         if self.mcp_file_server is not None:
-            # Note: This is a sync wrapper around async MCP method
-            # In practice, this should be avoided - use read_multiple_files_mcp directly for async code
-            import asyncio
+            from .async_loop import get_shared_loop
 
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # If we're already in an async context, we can't use asyncio.run
-                    # This is a limitation - async code should call read_multiple_files_mcp directly
-                    raise ValueError(
-                        "Cannot call sync read_multiple_files from async context when using MCP. Use read_multiple_files_mcp instead."
-                    )
-                else:
-                    return asyncio.run(self.read_multiple_files_mcp(file_paths))
-            except RuntimeError:
-                # No event loop running, safe to create one
-                return asyncio.run(self.read_multiple_files_mcp(file_paths))
+            # The MCP server lives on the shared loop; blocking that loop's own
+            # thread on it would deadlock, but any other thread can wait
+            shared_loop = get_shared_loop()
+            if shared_loop.in_loop_thread():
+                raise ValueError(
+                    "Cannot call sync read_multiple_files from the shared event loop when using MCP. Use read_multiple_files_mcp instead."
+                )
+            return shared_loop.run_sync(self.read_multiple_files_mcp(file_paths))
 
         raise ValueError(
             "Neither WorkspaceService nor MCP is configured. Use service-oriented architecture or legacy AIAgentConfig."
@@ -6,34 +6,67 @@ This package contains:
 - Streaming response handlers for real-time AI interactions
 """
 
-# Import modules (needed for test patching)
-from . import (
-    ai_service_adapter,
-    mcp_connection_service,
-    query_processor,
-    streaming_response_service,
-)
-from .ai_service_adapter import (
-    AIResponse,
-    AIServiceAdapter,
-    AIServiceConfig,
-    AIServiceConnectionError,
-    AIServiceError,
-    AIServiceRateLimitError,
-    AIServiceTimeoutError,
-    AIStreamingResponse,
-)
+from __future__ import annotations
 
-# Import classes for direct use
-from .mcp_connection_service import MCPConnectionService
-from .query_processor import (
-    QueryContext,
-    QueryProcessor,
-    QueryRequest,
-    ResponseValidator,
-    RetryPolicy,
-)
-from .streaming_response_service import StreamingResponseService
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Import modules (needed for test patching)
+    from . import (
+        ai_service_adapter,
+        mcp_connection_service,
+        query_processor,
+        streaming_response_service,
+    )
+    from .ai_service_adapter import (
+        AIResponse,
+        AIServiceAdapter,
+        AIServiceConfig,
+        AIServiceConnectionError,
+        AIServiceError,
+        AIServiceRateLimitError,
+        AIServiceTimeoutError,
+        AIStreamingResponse,
+    )
+
+    # Import classes for direct use
+    from .mcp_connection_service import MCPConnectionService
+    from .query_processor import (
+        QueryContext,
+        QueryProcessor,
+        QueryRequest,
+        ResponseValidator,
+        RetryPolicy,
+    )
+    from .streaming_response_service import StreamingResponseService
+
+# Submodules are imported on first attribute access (PEP 562), so using one
+# service does not import the MCP client stack behind the others
+_LAZY_SUBMODULES = {
+    "ai_service_adapter",
+    "mcp_connection_service",
+    "query_processor",
+    "streaming_response_service",
+}
+
+_LAZY_EXPORTS: dict[str, str] = {
+    "AIResponse": ".ai_service_adapter",
+    "AIServiceAdapter": ".ai_service_adapter",
+    "AIServiceConfig": ".ai_service_adapter",
+    "AIServiceConnectionError": ".ai_service_adapter",
+    "AIServiceError": ".ai_service_adapter",
+    "AIServiceRateLimitError": ".ai_service_adapter",
+    "AIServiceTimeoutError": ".ai_service_adapter",
+    "AIStreamingResponse": ".ai_service_adapter",
+    "MCPConnectionService": ".mcp_connection_service",
+    "QueryContext": ".query_processor",
+    "QueryProcessor": ".query_processor",
+    "QueryRequest": ".query_processor",
+    "ResponseValidator": ".query_processor",
+    "RetryPolicy": ".query_processor",
+    "StreamingResponseService": ".streaming_response_service",
+}
 
 # AI Service components (to be implemented)
 # from .azure_openai_provider import AzureOpenAIProvider
@@ -67,3 +100,23 @@ __all__ = [
     # "AzureOpenAIProvider",
     # "AIStreamingHandler",
 ]
+
+
+def __getattr__(name: str) -> object:
+    """Import a submodule or exported name on first access."""
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including lazily exported names."""
+    return sorted(set(globals()) | set(__all__))
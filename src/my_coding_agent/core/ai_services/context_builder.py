@@ -0,0 +1,476 @@
+"""Token-budgeted context assembly for memory-aware conversations.
+
+This module builds the memory context sent with each user message including:
+- Token counting with a local tokenizer, falling back to an estimate
+- A conversation history window that fits a token budget
+- Earlier messages and long-term memories chosen by relevance
+- A cached history prefix so each turn only renders the new tail
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "o200k_base"
+
+# Rough ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+_WORD_PATTERN = re.compile(r"[a-z0-9_]{3,}")
+
+# Encodings are loaded once per process on a background thread, since tiktoken
+# may download them; None marks one that failed to load
+_encodings: dict[str, Any] = {}
+_loaders: dict[str, threading.Thread] = {}
+_loaders_lock = threading.Lock()
+
+
+def _load_encoding(encoding_name: str) -> None:
+    """Load an encoding into the module cache."""
+    try:
+        _encodings[encoding_name] = tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(
+            f"Could not load tokenizer '{encoding_name}', "
+            f"estimating token counts instead: {e}"
+        )
+        _encodings[encoding_name] = None
+
+
+def _start_loader(encoding_name: str) -> threading.Thread:
+    """Start loading an encoding unless it is already loading or loaded."""
+    with _loaders_lock:
+        loader = _loaders.get(encoding_name)
+        if loader is None:
+            loader = threading.Thread(
+                target=_load_encoding,
+                args=(encoding_name,),
+                name=f"tiktoken-{encoding_name}",
+                daemon=True,
+            )
+            _loaders[encoding_name] = loader
+            loader.start()
+        return loader
+
+
+def message_key(message: dict[str, Any]) -> Hashable:
+    """
+    Identify a history message across turns.
+
+    Args:
+        message: Message as returned by the memory system
+
+    Returns:
+        The message id, or its role, content and timestamp if it has none
+    """
+    if message.get("id") is not None:
+        return message["id"]
+    return (
+        message.get("role"),
+        message.get("content"),
+        str(message.get("timestamp")),
+    )
+
+
+class TokenCounter:
+    """
+    Counts tokens with tiktoken, or estimates them from the text length.
+
+    The encoding loads on a background thread so counting never blocks the
+    event loop on a download; counts are estimated until it is ready.
+    """
+
+    def __init__(self, encoding_name: str | None = DEFAULT_ENCODING) -> None:
+        """
+        Initialize the token counter.
+
+        Args:
+            encoding_name: tiktoken encoding to use, or None to always estimate
+        """
+        self.encoding_name = encoding_name
+        self._encoding: Any = None
+        self._loader: threading.Thread | None = None
+        self._loaded = encoding_name is None or not TIKTOKEN_AVAILABLE
+
+    def _poll(self) -> None:
+        """Start loading the encoding, and pick it up once it has loaded."""
+        if self._loader is None:
+            self._loader = _start_loader(self.encoding_name)
+        if not self._loader.is_alive():
+            self._encoding = _encodings.get(self.encoding_name)
+            self._loaded = True
+
+    def wait_until_loaded(self, timeout: float | None = None) -> bool:
+        """
+        Block until the encoding has loaded or failed to load.
+
+        Must not be called from the event loop.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if loading has finished
+        """
+        if not self._loaded:
+            self._poll()
+        if not self._loaded and self._loader is not None:
+            self._loader.join(timeout)
+            self._poll()
+        return self._loaded
+
+    @property
+    def backend(self) -> str:
+        """Name of the counting method in use."""
+        if not self._loaded:
+            self._poll()
+        return "tiktoken" if self._encoding is not None else "estimate"
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens in a text.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens
+        """
+        if not text:
+            return 0
+        if not self._loaded:
+            self._poll()
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class ContextBudget:
+    """Token limits for the memory context of one message."""
+
+    max_tokens: int = 4000  # History, earlier messages and memories together
+    memory_tokens: int = 600  # Cap for long-term memories
+    relevant_tokens: int = 600  # Cap for relevant messages older than the window
+    min_recent_messages: int = 4  # Kept whenever they fit, regardless of relevance
+    # When the history window overflows, older messages are dropped until it
+    # uses this share of its budget, so the prefix stays stable for a few turns
+    refill_ratio: float = 0.75
+    history_limit: int = 100  # Messages fetched from the memory system
+    memory_limit: int = 10  # Long-term memories fetched from the memory system
+
+
+@dataclass
+class AssembledContext:
+    """Prompt built for one message and how it was filled."""
+
+    prompt: str
+    context_tokens: int
+    history_messages: int
+    relevant_messages: int
+    memories: int
+    reused_prefix: bool
+    summary_tokens: int = 0
+
+
+class ContextBuilder:
+    """
+    Assembles the memory context of each message within a token budget.
+
+    The history window runs from a start message to the newest message. The
+    start only moves when the window no longer fits, and then far enough to
+    leave headroom, so consecutive turns share the same rendered prefix and
+    only append their new tail.
+    """
+
+    def __init__(
+        self,
+        budget: ContextBudget | None = None,
+        token_counter: TokenCounter | None = None,
+        line_cache_size: int = 1000,
+    ) -> None:
+        """
+        Initialize the context builder.
+
+        Args:
+            budget: Token limits, defaults to ContextBudget()
+            token_counter: Counter for rendered lines, defaults to tiktoken
+            line_cache_size: Rendered messages kept with their token counts
+        """
+        self.budget = budget or ContextBudget()
+        self.token_counter = token_counter or TokenCounter()
+        self._line_cache_size = line_cache_size
+        self._line_cache: OrderedDict[Hashable, tuple[str, int]] = OrderedDict()
+        self._line_cache_backend = ""
+
+        # History prefix rendered on the previous turn
+        self._window_start: Hashable | None = None
+        self._prefix_keys: list[Hashable] = []
+        self._prefix_text = ""
+
+        # Statistics tracking
+        self.turns = 0
+        self.prefix_reuses = 0
+        self.window_moves = 0
+        self.last_context_tokens = 0
+
+    def _render(self, key: Hashable, message: dict[str, Any]) -> tuple[str, int]:
+        """Render a history message and count its tokens, using the cache."""
+        cached = self._line_cache.get(key)
+        if cached is not None:
+            self._line_cache.move_to_end(key)
+            return cached
+
+        line = f"{message.get('role', 'unknown')}: {message.get('content', '')}"
+        rendered = (line, self.token_counter.count(line) + 1)  # + newline
+        self._line_cache[key] = rendered
+        if len(self._line_cache) > self._line_cache_size:
+            self._line_cache.popitem(last=False)
+        return rendered
+
+    @staticmethod
+    def _terms(text: str) -> set[str]:
+        """Words used to compare a message with the current one."""
+        return set(_WORD_PATTERN.findall(text.lower()))
+
+    def _select_memories(self, memories: list[dict[str, Any]]) -> tuple[list[str], int]:
+        """Take the highest ranked memories that fit the memory budget."""
+        lines: list[str] = []
+        used = 0
+        for memory in memories:
+            line = (
+                f"- {memory.get('content', '')} "
+                f"(importance: {memory.get('importance_score', 'N/A')}, "
+                f"type: {memory.get('memory_type', 'unknown')})"
+            )
+            tokens = self.token_counter.count(line) + 1
+            if used + tokens > self.budget.memory_tokens:
+                continue
+            lines.append(line)
+            used += tokens
+        return lines, used
+
+    def _window_start_index(
+        self, keys: list[Hashable], rendered: list[tuple[str, int]], budget: int
+    ) -> int:
+        """Find where the history window starts this turn."""
+        start = 0
+        if self._window_start is not None and self._window_start in keys:
+            start = keys.index(self._window_start)
+
+        total = sum(tokens for _, tokens in rendered[start:])
+        if total <= budget:
+            return start
+
+        # Drop the oldest messages until the window leaves headroom
+        self.window_moves += 1
+        target = budget * self.budget.refill_ratio
+        newest_kept = max(len(rendered) - self.budget.min_recent_messages, start)
+        while start < newest_kept and total > target:
+            total -= rendered[start][1]
+            start += 1
+
+        # Even the most recent messages may not fit; keep what does
+        while start < len(rendered) and total > budget:
+            total -= rendered[start][1]
+            start += 1
+        return start
+
+    def _render_window(self, keys: list[Hashable], lines: list[str]) -> str:
+        """Join the window, reusing the previous turn's prefix when possible."""
+        prefix_length = len(self._prefix_keys)
+        if prefix_length and keys[:prefix_length] == self._prefix_keys:
+            self.prefix_reuses += 1
+            tail = lines[prefix_length:]
+            text = "\n".join([self._prefix_text, *tail]) if tail else self._prefix_text
+        else:
+            text = "\n".join(lines)
+
+        self._prefix_keys = keys
+        self._prefix_text = text
+        return text
+
+    def _select_relevant(
+        self,
+        message: str,
+        older: list[tuple[Hashable, tuple[str, int]]],
+        budget: int,
+    ) -> list[str]:
+        """Pick messages older than the window that share terms with the message."""
+        query_terms = self._terms(message)
+        if not query_terms or budget <= 0:
+            return []
+
+        scored = []
+        for position, (_, (line, tokens)) in enumerate(older):
+            overlap = len(query_terms & self._terms(line))
+            if overlap:
+                scored.append((overlap, position, line, tokens))
+
+        # Highest overlap first, newer messages winning ties
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        chosen = []
+        used = 0
+        for _, position, line, tokens in scored:
+            if used + tokens > budget:
+                continue
+            chosen.append((position, line))
+            used += tokens
+        return [line for _, line in sorted(chosen)]
+
+    def build(
+        self,
+        message: str,
+        history: list[dict[str, Any]],
+        memories: list[dict[str, Any]] | None = None,
+        summary: str | None = None,
+    ) -> AssembledContext:
+        """
+        Build the prompt for a message.
+
+        Args:
+            message: Current user message
+            history: Conversation messages, newest first, as returned by the
+                memory system; the current message may be included
+            memories: Long-term memories ranked by relevance to the message
+            summary: Rolling summary of the messages older than the history
+
+        Returns:
+            Prompt with the memory context and how much of it was used
+        """
+        self.turns += 1
+
+        # Counts estimated while the encoding was loading are recounted
+        backend = self.token_counter.backend
+        if backend != self._line_cache_backend:
+            self._line_cache.clear()
+            self._line_cache_backend = backend
+
+        chronological = list(reversed(history))
+        if (
+            chronological
+            and chronological[-1].get("role") == "user"
+            and chronological[-1].get("content") == message
+        ):
+            chronological.pop()
+
+        memory_lines, memory_tokens = self._select_memories(memories or [])
+        summary_tokens = self.token_counter.count(summary) if summary else 0
+        fixed_tokens = memory_tokens + summary_tokens
+
+        keys = [message_key(entry) for entry in chronological]
+        rendered = [
+            self._render(key, entry)
+            for key, entry in zip(keys, chronological, strict=True)
+        ]
+
+        history_budget = self.budget.max_tokens - fixed_tokens
+        start = self._window_start_index(keys, rendered, history_budget)
+        window_keys = keys[start:]
+        window = rendered[start:]
+        self._window_start = window_keys[0] if window_keys else None
+        history_tokens = sum(tokens for _, tokens in window)
+
+        reused = bool(self._prefix_keys) and (
+            window_keys[: len(self._prefix_keys)] == self._prefix_keys
+        )
+        history_text = self._render_window(window_keys, [line for line, _ in window])
+
+        relevant_budget = min(
+            self.budget.relevant_tokens,
+            self.budget.max_tokens - fixed_tokens - history_tokens,
+        )
+        relevant_lines = self._select_relevant(
+            message,
+            list(zip(keys[:start], rendered[:start], strict=True)),
+            relevant_budget,
+        )
+
+        # The summary and history go first so the rendered prefix stays
+        # identical between turns
+        sections = []
+        if summary:
+            sections.append(
+                "=== CONVERSATION SUMMARY (Earlier discussion, summarized) ===\n"
+                f"{summary}"
+            )
+        if history_text:
+            sections.append(
+                "=== CONVERSATION HISTORY (Recent messages in chronological order - "
+                f"this is your short-term memory) ===\n{history_text}"
+            )
+        if relevant_lines:
+            sections.append(
+                "=== RELEVANT EARLIER MESSAGES (Older messages related to the "
+                "current one) ===\n" + "\n".join(relevant_lines)
+            )
+        if memory_lines:
+            sections.append(
+                "=== LONG-TERM MEMORY (Persistent facts, preferences, and important "
+                "information) ===\n" + "\n".join(memory_lines)
+            )
+
+        if sections:
+            prompt = (
+                f"=== MEMORY CONTEXT ===\n"
+                f"{chr(10).join(sections)}\n\n"
+                f"=== CURRENT USER MESSAGE ===\n{message}\n\n"
+                f"Please respond to the current user message above, taking into "
+                f"account the conversation history and any relevant long-term "
+                f"memories. The conversation history shows the recent context of "
+                f"our discussion, so you can reference previous topics and "
+                f"maintain continuity."
+            )
+        else:
+            prompt = message
+
+        context_tokens = (
+            history_tokens
+            + fixed_tokens
+            + sum(self.token_counter.count(line) + 1 for line in relevant_lines)
+        )
+        self.last_context_tokens = context_tokens
+        return AssembledContext(
+            prompt=prompt,
+            context_tokens=context_tokens,
+            history_messages=len(window),
+            relevant_messages=len(relevant_lines),
+            memories=len(memory_lines),
+            reused_prefix=reused,
+            summary_tokens=summary_tokens,
+        )
+
+    def reset(self) -> None:
+        """Forget the history window, e.g. when a new session starts."""
+        self._window_start = None
+        self._prefix_keys = []
+        self._prefix_text = ""
+        self._line_cache.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get context assembly statistics."""
+        return {
+            "token_counter": self.token_counter.backend,
+            "max_tokens": self.budget.max_tokens,
+            "turns": self.turns,
+            "prefix_reuses": self.prefix_reuses,
+            "window_moves": self.window_moves,
+            "last_context_tokens": self.last_context_tokens,
+        }
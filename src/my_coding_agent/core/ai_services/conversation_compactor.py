@@ -0,0 +1,356 @@
+"""Background compaction of long conversations into rolling summaries.
+
+This module keeps memory-aware prompts small as a session grows including:
+- Folding older messages into a rolling summary once a token threshold is crossed
+- Summarizing with the agent's model, or extractively when no model is available
+- Running compaction as a background task after a response completes
+- Substituting the summary for the messages it covers during context assembly
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic_ai import Agent
+from pydantic_ai.models import Model
+
+from .context_builder import TokenCounter, message_key
+
+logger = logging.getLogger(__name__)
+
+# Summarizer signature: (previous summary, messages to fold) -> new summary
+Summarizer = Callable[[str | None, list[dict[str, Any]]], Awaitable[str]]
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain a rolling summary of a conversation between a user and a "
+    "coding assistant. Merge the previous summary with the new messages into "
+    "one concise summary. Keep facts, decisions, file names, open questions "
+    "and user preferences. Leave out greetings and filler. Reply with the "
+    "summary only."
+)
+
+# Characters kept per message by the extractive summarizer
+EXTRACT_CHARS = 200
+
+
+@dataclass
+class RollingSummary:
+    """Summary of the oldest messages of a session."""
+
+    content: str
+    covered_through: Hashable  # Key of the newest message folded into the summary
+    message_count: int
+    created_at: float = field(default_factory=time.time)
+
+
+def _format_messages(messages: list[dict[str, Any]]) -> str:
+    """Render messages as 'role: content' lines."""
+    return "\n".join(
+        f"{message.get('role', 'unknown')}: {message.get('content', '')}"
+        for message in messages
+    )
+
+
+def trim_summary(text: str, max_tokens: int, token_counter: TokenCounter) -> str:
+    """
+    Shorten a summary to a token budget, dropping its oldest lines first.
+
+    Args:
+        text: Summary to shorten
+        max_tokens: Largest allowed size of the summary
+        token_counter: Counter for the summary size
+
+    Returns:
+        The newest lines of the summary that fit in max_tokens
+    """
+    if token_counter.count(text) <= max_tokens:
+        return text
+
+    lines = text.splitlines()
+    kept: list[str] = []
+    used = 0
+    for line in reversed(lines):
+        cost = token_counter.count(line) + 1  # Plus the joining newline
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    if kept:
+        return "\n".join(reversed(kept))
+
+    # Not even the newest line fits, so keep as much of its start as does
+    trimmed = lines[-1] if lines else text
+    while trimmed and (tokens := token_counter.count(trimmed)) > max_tokens:
+        trimmed = trimmed[: int(len(trimmed) * max_tokens / tokens * 0.9)]
+    return trimmed
+
+
+async def extractive_summary(
+    previous: str | None, messages: list[dict[str, Any]]
+) -> str:
+    """
+    Summarize messages without a model by keeping the start of each one.
+
+    Args:
+        previous: Summary of earlier messages, if any
+        messages: Messages to fold into the summary, oldest first
+
+    Returns:
+        The previous summary followed by one shortened line per message
+    """
+    lines = [previous] if previous else []
+    for message in messages:
+        content = " ".join(str(message.get("content", "")).split())
+        if len(content) > EXTRACT_CHARS:
+            content = content[:EXTRACT_CHARS].rstrip() + "..."
+        lines.append(f"- {message.get('role', 'unknown')}: {content}")
+    return "\n".join(lines)
+
+
+async def summarize_with_model(
+    model: Model | str, previous: str | None, messages: list[dict[str, Any]]
+) -> str:
+    """
+    Summarize messages with a model, without tools or conversation history.
+
+    Args:
+        model: Model used for the summary
+        previous: Summary of earlier messages, if any
+        messages: Messages to fold into the summary, oldest first
+
+    Returns:
+        The merged summary
+    """
+    prompt = (
+        f"Previous summary:\n{previous or '(none)'}\n\n"
+        f"New messages:\n{_format_messages(messages)}"
+    )
+    result = await Agent(model, instructions=SUMMARY_INSTRUCTIONS).run(prompt)
+    return result.output.strip()
+
+
+class ConversationCompactor:
+    """
+    Folds older conversation messages into a rolling summary in the background.
+
+    After each response, schedule() starts a task that fetches the history and,
+    if the messages not yet summarized exceed threshold_tokens, folds all but
+    the most recent keep_recent_tokens of them into the session's summary.
+    apply() then replaces the folded messages with that summary when the next
+    prompt is assembled.
+    """
+
+    def __init__(
+        self,
+        summarizer: Summarizer | None = None,
+        token_counter: TokenCounter | None = None,
+        threshold_tokens: int = 3000,
+        keep_recent_tokens: int = 1000,
+        min_recent_messages: int = 4,
+        max_summary_tokens: int = 1000,
+        memory_system: object | None = None,
+    ) -> None:
+        """
+        Initialize the conversation compactor.
+
+        Args:
+            summarizer: Coroutine merging messages into a summary, defaults to
+                extractive_summary
+            token_counter: Counter for message sizes
+            threshold_tokens: Unsummarized tokens that trigger a compaction
+            keep_recent_tokens: Most recent tokens always left unsummarized
+            min_recent_messages: Most recent messages always left unsummarized
+            max_summary_tokens: Largest rolling summary kept; the oldest lines
+                are dropped when a compaction produces more
+            memory_system: Memory system that also stores the summaries, used if
+                it provides store_conversation_summary() and
+                get_conversation_summary()
+        """
+        self.summarizer = summarizer or extractive_summary
+        self.token_counter = token_counter or TokenCounter()
+        self.threshold_tokens = threshold_tokens
+        self.keep_recent_tokens = keep_recent_tokens
+        self.min_recent_messages = min_recent_messages
+        self.max_summary_tokens = max_summary_tokens
+        self.memory_system = memory_system
+
+        self._summaries: dict[str | None, RollingSummary | None] = {}
+        self._task: asyncio.Task[RollingSummary | None] | None = None
+
+        # Statistics tracking
+        self.compactions = 0
+        self.failures = 0
+        self.messages_compacted = 0
+
+    def _session_id(self) -> str | None:
+        """Get the memory system's current session, if it tracks sessions."""
+        get_session_id = getattr(self.memory_system, "get_current_session_id", None)
+        if get_session_id is None:
+            return None
+        try:
+            return get_session_id()
+        except Exception:
+            return None
+
+    def get_summary(self) -> RollingSummary | None:
+        """Get the rolling summary of the current session."""
+        session_id = self._session_id()
+        if session_id not in self._summaries:
+            self._summaries[session_id] = self._load()
+        return self._summaries[session_id]
+
+    def _load(self) -> RollingSummary | None:
+        """Load a stored summary if the memory system keeps them."""
+        load = getattr(self.memory_system, "get_conversation_summary", None)
+        if load is None:
+            return None
+        try:
+            stored = load()
+        except Exception as e:
+            logger.warning(f"Failed to load conversation summary: {e}")
+            return None
+        return RollingSummary(**stored) if stored else None
+
+    def apply(
+        self, history: list[dict[str, Any]]
+    ) -> tuple[str | None, list[dict[str, Any]]]:
+        """
+        Substitute the rolling summary for the messages it covers.
+
+        Args:
+            history: Conversation messages, newest first
+
+        Returns:
+            The summary text, if any, and the messages newer than the summary
+        """
+        summary = self.get_summary()
+        if summary is None:
+            return None, history
+
+        for index, entry in enumerate(history):
+            if message_key(entry) == summary.covered_through:
+                return summary.content, history[:index]
+        # The covered messages are all older than the fetched history
+        return summary.content, history
+
+    @property
+    def is_running(self) -> bool:
+        """Check if a compaction is in progress."""
+        return self._task is not None and not self._task.done()
+
+    def schedule(
+        self, fetch_history: Callable[[], list[dict[str, Any]]]
+    ) -> asyncio.Task[RollingSummary | None] | None:
+        """
+        Start a background compaction unless one is already running.
+
+        Args:
+            fetch_history: Returns the conversation messages, newest first
+
+        Returns:
+            The compaction task, or None if one was already running
+        """
+        if self.is_running:
+            return None
+        self._task = asyncio.create_task(self._compact(fetch_history))
+        self._task.add_done_callback(self._on_done)
+        return self._task
+
+    def _on_done(self, task: asyncio.Task[RollingSummary | None]) -> None:
+        """Log compaction failures instead of leaving them unretrieved."""
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.failures += 1
+            logger.warning(f"Conversation compaction failed: {error}")
+
+    async def wait(self) -> None:
+        """Wait for a running compaction to finish."""
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def cancel(self) -> None:
+        """Cancel a running compaction."""
+        if self.is_running:
+            self._task.cancel()
+        await self.wait()
+
+    async def _compact(
+        self, fetch_history: Callable[[], list[dict[str, Any]]]
+    ) -> RollingSummary | None:
+        """Fold the oldest unsummarized messages if over the threshold."""
+        session_id = self._session_id()
+        previous = self.get_summary()
+        _, pending = self.apply(fetch_history())
+        chronological = list(reversed(pending))
+
+        sizes = [
+            self.token_counter.count(_format_messages([entry]))
+            for entry in chronological
+        ]
+        if sum(sizes) <= self.threshold_tokens:
+            return None
+
+        # Keep the most recent messages, fold everything older
+        split = len(chronological)
+        kept_tokens = 0
+        while split > 0 and (
+            len(chronological) - split < self.min_recent_messages
+            or kept_tokens + sizes[split - 1] <= self.keep_recent_tokens
+        ):
+            split -= 1
+            kept_tokens += sizes[split]
+        to_fold = chronological[:split]
+        if not to_fold:
+            return None
+
+        started = time.perf_counter()
+        content = await self.summarizer(previous.content if previous else None, to_fold)
+        # Each summary includes the previous one, so cap it or it grows forever
+        content = trim_summary(content, self.max_summary_tokens, self.token_counter)
+        summary = RollingSummary(
+            content=content,
+            covered_through=message_key(to_fold[-1]),
+            message_count=(previous.message_count if previous else 0) + len(to_fold),
+        )
+        self._summaries[session_id] = summary
+        self._store(summary)
+
+        self.compactions += 1
+        self.messages_compacted += len(to_fold)
+        logger.info(
+            f"Compacted {len(to_fold)} messages into a rolling summary "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return summary
+
+    def _store(self, summary: RollingSummary) -> None:
+        """Store the summary next to the raw messages if the memory system can."""
+        store = getattr(self.memory_system, "store_conversation_summary", None)
+        if store is None:
+            return
+        try:
+            store(
+                content=summary.content,
+                covered_through=summary.covered_through,
+                message_count=summary.message_count,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store conversation summary: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get compaction statistics."""
+        summary = self.get_summary()
+        return {
+            "compactions": self.compactions,
+            "failures": self.failures,
+            "messages_compacted": self.messages_compacted,
+            "running": self.is_running,
+            "summarized_messages": summary.message_count if summary else 0,
+        }
@@ -4,19 +4,51 @@ Logging utilities for AI service interactions.
 This module provides comprehensive logging and debugging capabilities for
 AI service operations including structured logging, performance metrics,
 and sensitive data sanitization.
+
+Structured records are only built when their level is enabled, per-chunk
+streaming events are sampled, and AsyncLogPipeline writes records as JSON
+lines from a background thread so handlers never block the event loop.
 """
 
 import asyncio
+import json
 import logging
+import queue
+import re
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from contextlib import asynccontextmanager
 from dataclasses import asdict, dataclass, field
 from functools import wraps
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
 from typing import Any
 
+from ..metrics import MetricsRegistry, get_metrics_registry
 from .ai_service_adapter import AIResponse, AIServiceConfig, AIStreamingResponse
 
+# Log one streaming chunk in this many (plus the final chunk)
+DEFAULT_CHUNK_SAMPLE_INTERVAL = 10
+
+# Tracked operations not finished within this many seconds are discarded
+DEFAULT_MAX_TRACKING_AGE = 600.0
+
+# Log files are rotated at this size, keeping this many old files
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 3
+
+DEFAULT_SENSITIVE_KEYS = frozenset({
+    "api_key", "api-key", "apikey", "authorization", "auth", "token",
+    "secret", "password", "passwd", "pwd", "private_key", "privatekey",
+    "access_token", "refresh_token", "bearer", "x-api-key"
+})
+
+# Credentials embedded in free text, e.g. "Bearer abc" or "api_key=abc"
+_INLINE_SECRET_PATTERN = re.compile(
+    r"(?i)(\bbearer\s+|\b(?:api[_-]?key|access_token|refresh_token|password|secret)"
+    r"[\"']?\s*[:=]\s*[\"']?)[^\s\"',;&]+"
+)
+
 
 @dataclass
 class LogContext:
@@ -57,16 +89,14 @@ class SensitiveDataSanitizer:
     """Sanitizes sensitive data from logs."""
 
     def __init__(self) -> None:
-        self.sensitive_keys = {
-            "api_key", "api-key", "apikey", "authorization", "auth", "token",
-            "secret", "password", "passwd", "pwd", "private_key", "privatekey",
-            "access_token", "refresh_token", "bearer", "x-api-key"
-        }
+        self.sensitive_keys = set(DEFAULT_SENSITIVE_KEYS)
         self.sanitized_value = "***REDACTED***"
+        # Keys seen in logs repeat constantly, so remember each decision
+        self._key_cache: dict[str, bool] = {}
 
     def sanitize_dict(self, data: dict[str, Any]) -> dict[str, Any]:
         """Sanitize sensitive data from a dictionary."""
-        if not isinstance(data, dict):
+        if not isinstance(data, dict) or not data:
             return data
 
         sanitized = {}
@@ -99,22 +129,56 @@ class SensitiveDataSanitizer:
         if len(content) > max_length:
             content = content[:max_length] + "...[TRUNCATED]"
 
-        # Could add more content sanitization here if needed
-        return content
+        # Redact credentials pasted into the content
+        return _INLINE_SECRET_PATTERN.sub(
+            lambda match: match.group(1) + self.sanitized_value, content
+        )
 
     def _is_sensitive_key(self, key: str) -> bool:
         """Check if a key contains sensitive data."""
-        return key.lower() in self.sensitive_keys
+        cached = self._key_cache.get(key)
+        if cached is None:
+            if len(self._key_cache) >= 1024:
+                self._key_cache.clear()
+            cached = self._key_cache[key] = (
+                isinstance(key, str) and key.lower() in self.sensitive_keys
+            )
+        return cached
 
 
 class AIServiceLogger:
     """Enhanced logger for AI service operations with structured logging."""
 
-    def __init__(self, name: str) -> None:
+    def __init__(
+        self,
+        name: str,
+        chunk_sample_interval: int = DEFAULT_CHUNK_SAMPLE_INTERVAL,
+        metrics_registry: MetricsRegistry | None = None,
+        max_tracking_age: float = DEFAULT_MAX_TRACKING_AGE
+    ) -> None:
+        """Initialize the logger.
+
+        Args:
+            name: Name of the underlying standard library logger
+            chunk_sample_interval: Log every Nth streaming chunk; 1 logs all
+            metrics_registry: Registry receiving operation durations, defaults
+                to the process-wide registry
+            max_tracking_age: Seconds after which an unfinished tracked
+                operation is discarded
+        """
+        if chunk_sample_interval < 1:
+            raise ValueError("chunk_sample_interval must be at least 1")
         self.logger = logging.getLogger(name)
         self.sanitizer = SensitiveDataSanitizer()
+        self.chunk_sample_interval = chunk_sample_interval
+        self.metrics_registry = metrics_registry or get_metrics_registry()
+        self.max_tracking_age = max_tracking_age
         self._metrics: dict[str, PerformanceMetrics] = {}
 
+    def is_enabled_for(self, level: int) -> bool:
+        """Check whether messages at a level would be emitted."""
+        return self.logger.isEnabledFor(level)
+
     def _log_structured(
         self,
         level: int,
@@ -124,6 +188,10 @@ class AIServiceLogger:
         exception: Exception | None = None
     ) -> None:
         """Log a structured message with context and metadata."""
+        # Skip building and sanitizing the record when nobody would see it
+        if not self.logger.isEnabledFor(level):
+            return
+
         log_data = {
             "message": message,
             "timestamp": time.time(),
@@ -249,6 +317,9 @@ class AIServiceLogger:
         parameters: dict[str, Any] | None = None
     ) -> None:
         """Log a query request."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+
         sanitized_query = self.sanitizer.sanitize_content(query)
         sanitized_params = self.sanitizer.sanitize_dict(parameters or {})
 
@@ -269,6 +340,10 @@ class AIServiceLogger:
         duration_ms: float | None = None
     ) -> None:
         """Log a query response."""
+        level = logging.INFO if response.success else logging.WARNING
+        if not self.logger.isEnabledFor(level):
+            return
+
         sanitized_content = self.sanitizer.sanitize_content(response.content)
 
         log_data = {
@@ -289,7 +364,6 @@ class AIServiceLogger:
                 "error_type": response.error_type
             })
 
-        level = logging.INFO if response.success else logging.WARNING
         message = "Query completed successfully" if response.success else "Query failed"
 
         self._log_structured(level, message, context, log_data)
@@ -300,6 +374,9 @@ class AIServiceLogger:
         query: str
     ) -> None:
         """Log the start of a streaming query."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+
         sanitized_query = self.sanitizer.sanitize_content(query)
 
         self.debug(
@@ -316,7 +393,19 @@ class AIServiceLogger:
         context: LogContext,
         chunk: AIStreamingResponse
     ) -> None:
-        """Log a streaming response chunk."""
+        """Log a streaming response chunk.
+
+        Only every chunk_sample_interval-th chunk and the final chunk are
+        logged, since this is called for every chunk of every stream.
+        """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if (
+            not chunk.is_complete
+            and chunk.chunk_index % self.chunk_sample_interval != 0
+        ):
+            return
+
         sanitized_content = self.sanitizer.sanitize_content(chunk.content)
 
         self.debug(
@@ -328,7 +417,8 @@ class AIServiceLogger:
                 "content_preview": sanitized_content,
                 "content_length": len(chunk.content),
                 "timestamp": chunk.timestamp,
-                "metadata": self.sanitizer.sanitize_dict(chunk.metadata)
+                "metadata": self.sanitizer.sanitize_dict(chunk.metadata),
+                "sample_interval": self.chunk_sample_interval
             }
         )
 
@@ -376,11 +466,17 @@ class AIServiceLogger:
         context: LogContext | None = None
     ) -> str:
         """Start tracking performance for an operation."""
-        metrics_id = f"{operation}_{time.time()}_{id(context) if context else 'none'}"
+        now = time.time()
+        self._discard_stale_tracking(now)
+        metrics_id = f"{operation}_{now}_{id(context) if context else 'none'}"
 
         self._metrics[metrics_id] = PerformanceMetrics(
             operation=operation,
-            start_time=time.time()
+            start_time=now,
+            metadata={
+                "provider": context.provider if context else None,
+                "deployment": context.deployment_name if context else None,
+            }
         )
 
         self.debug(
@@ -411,6 +507,16 @@ class AIServiceLogger:
         metrics.finish(success=success, error_type=error_type)
         metrics.retry_count = retry_count
 
+        tags = {"operation": metrics.operation, **metrics.metadata}
+        self.metrics_registry.observe(
+            "ai_request_duration_seconds", metrics.duration_ms / 1000, **tags
+        )
+        self.metrics_registry.increment(
+            "ai_requests_total",
+            outcome="success" if success else "failure",
+            **tags
+        )
+
         self.info(
             f"Performance tracking completed for {metrics.operation}",
             context=context,
@@ -424,6 +530,22 @@ class AIServiceLogger:
 
         return metrics
 
+    def _discard_stale_tracking(self, now: float) -> None:
+        """Drop tracked operations that were started but never finished."""
+        # Entries are inserted in start order, so stale ones are at the front
+        while self._metrics:
+            metrics_id, metrics = next(iter(self._metrics.items()))
+            if now - metrics.start_time < self.max_tracking_age:
+                break
+            del self._metrics[metrics_id]
+            self.metrics_registry.increment(
+                "ai_abandoned_operations_total", operation=metrics.operation
+            )
+            self.debug(
+                f"Discarded unfinished performance tracking for {metrics.operation}",
+                extra_data={"metrics_id": metrics_id}
+            )
+
     @asynccontextmanager
     async def performance_context(
         self,
@@ -461,6 +583,157 @@ class AIServiceLogger:
         return endpoint
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """Formats log records as single-line JSON documents."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record, preferring its structured data when present."""
+        structured = getattr(record, "structured_data", None)
+        payload: dict[str, Any] = dict(structured) if structured else {
+            "message": record.getMessage(),
+            "timestamp": record.created,
+        }
+        payload["level"] = record.levelname
+        payload["logger"] = record.name
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when full."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue without waiting."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AsyncLogPipeline:
+    """
+    Writes log records as JSON lines from a background thread.
+
+    Loggers under logger_name only put records on a queue; a QueueListener
+    thread formats them and performs the file or stream I/O, keeping slow
+    handlers off the event loop. Log files are rotated by size. Unless
+    propagate is set, the logger stops propagating to the root handlers while
+    running so no I/O happens on the caller's thread. When the queue is full
+    records are dropped rather than blocking the caller.
+    """
+
+    def __init__(
+        self,
+        log_file: str | Path | None = None,
+        handlers: Sequence[logging.Handler] | None = None,
+        logger_name: str | None = None,
+        level: int | None = None,
+        max_queue_size: int = 10000,
+        max_bytes: int = DEFAULT_LOG_MAX_BYTES,
+        backup_count: int = DEFAULT_LOG_BACKUP_COUNT,
+        propagate: bool = False
+    ) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            log_file: File to append JSON lines to; stderr if neither this
+                nor handlers is given
+            handlers: Handlers to run on the listener thread
+            logger_name: Logger to attach to, defaults to the AI services package
+            level: Level to set on the logger, or None to leave it unchanged
+            max_queue_size: Maximum records waiting to be written
+            max_bytes: Size at which log_file is rotated
+            backup_count: Rotated log files to keep
+            propagate: Keep passing records to the root handlers, e.g. to
+                the debug console
+        """
+        self.log_file = Path(log_file) if log_file is not None else None
+        self.logger_name = logger_name or __name__.rpartition(".")[0]
+        self.level = level
+        self.max_queue_size = max_queue_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.propagate = propagate
+
+        self._handlers = list(handlers or [])
+        self._owned_handlers: list[logging.Handler] = []
+        self._queue_handler: _DroppingQueueHandler | None = None
+        self._listener: QueueListener | None = None
+        self._previous_propagate = True
+        self._previous_level = logging.NOTSET
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the listener thread is running."""
+        return self._listener is not None
+
+    def start(self) -> None:
+        """Attach the queue handler and start the listener thread."""
+        if self._listener is not None:
+            return
+
+        handlers = list(self._handlers)
+        if not handlers:
+            handler: logging.Handler = (
+                RotatingFileHandler(
+                    self.log_file,
+                    maxBytes=self.max_bytes,
+                    backupCount=self.backup_count,
+                    encoding="utf-8",
+                )
+                if self.log_file is not None
+                else logging.StreamHandler()
+            )
+            handler.setFormatter(JsonLinesFormatter())
+            self._owned_handlers = [handler]
+            handlers = [handler]
+
+        log_queue: queue.Queue = queue.Queue(maxsize=self.max_queue_size)
+        self._queue_handler = _DroppingQueueHandler(log_queue)
+        self._listener = QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+
+        target = logging.getLogger(self.logger_name)
+        self._previous_level = target.level
+        if self.level is not None:
+            target.setLevel(self.level)
+        target.addHandler(self._queue_handler)
+        self._previous_propagate = target.propagate
+        target.propagate = self.propagate
+
+    def stop(self) -> None:
+        """Flush queued records, stop the listener and detach the handler."""
+        if self._listener is None:
+            return
+
+        target = logging.getLogger(self.logger_name)
+        if self._queue_handler is not None:
+            target.removeHandler(self._queue_handler)
+        target.propagate = self._previous_propagate
+        target.setLevel(self._previous_level)
+        self._listener.stop()
+        self._listener = None
+
+        for handler in self._owned_handlers:
+            handler.close()
+        self._owned_handlers = []
+
+    def get_stats(self) -> dict[str, int]:
+        """Get queue depth and the number of dropped records."""
+        queue_handler = self._queue_handler
+        return {
+            "queued_records": queue_handler.queue.qsize() if queue_handler else 0,
+            "dropped_records": queue_handler.dropped if queue_handler else 0,
+        }
+
+
 def logged_operation(operation_name: str):
     """Decorator for automatically logging AI service operations."""
 
@@ -5,18 +5,18 @@ This module provides intelligent query processing with retry mechanisms,
 response validation, and comprehensive error handling for AI service interactions.
 """
 
-import asyncio
 import logging
 import time
 from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from typing import Any
 
+from ..metrics import get_metrics_registry
+from ..retry_engine import RetryBudget, RetryEngine
 from .ai_service_adapter import (
     AIResponse,
     AIServiceAdapter,
     AIServiceConnectionError,
-    AIServiceError,
     AIServiceRateLimitError,
     AIServiceTimeoutError,
     AIStreamingResponse,
@@ -59,6 +59,9 @@ class RetryPolicy:
     base_delay: float = 1.0
     max_delay: float = 30.0
     backoff_multiplier: float = 2.0
+    jitter: bool = True
+    total_timeout: float | None = None
+    retry_budget_ratio: float = 0.2
     retry_on_errors: list[type[Exception]] = field(
         default_factory=lambda: [
             AIServiceTimeoutError,
@@ -67,11 +70,6 @@ class RetryPolicy:
         ]
     )
 
-    def calculate_delay(self, attempt: int) -> float:
-        """Calculate delay for retry attempt using exponential backoff."""
-        delay = self.base_delay * (self.backoff_multiplier**attempt)
-        return min(delay, self.max_delay)
-
     def should_retry(self, error: Exception, attempt: int) -> bool:
         """Determine if error should trigger a retry."""
         if attempt >= self.max_retries:
@@ -79,6 +77,18 @@ class RetryPolicy:
 
         return any(isinstance(error, error_type) for error_type in self.retry_on_errors)
 
+    def create_engine(self) -> RetryEngine:
+        """Create a retry engine applying this policy."""
+        return RetryEngine(
+            max_attempts=self.max_retries + 1,
+            base_delay=self.base_delay,
+            max_delay=self.max_delay,
+            backoff_multiplier=self.backoff_multiplier,
+            jitter=self.jitter,
+            deadline=self.total_timeout,
+            retry_budget=RetryBudget(ratio=self.retry_budget_ratio),
+        )
+
 
 class ResponseValidator:
     """Validates AI service responses."""
@@ -129,6 +139,7 @@ class QueryProcessor:
     ) -> None:
         self.adapter = adapter
         self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_engine = self.retry_policy.create_engine()
         self.response_validator = response_validator or ResponseValidator()
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
@@ -164,6 +175,15 @@ class QueryProcessor:
             self._ai_logger = None
             self._base_context = None
 
+        # Latency metrics are tagged with the adapter's provider and deployment
+        self._metrics = get_metrics_registry()
+        self._metric_tags = {
+            "provider": self._base_context.provider if self._base_context else None,
+            "deployment": (
+                self._base_context.deployment_name if self._base_context else None
+            ),
+        }
+
         # Log processor initialization
         if self._ai_logger:
             self._ai_logger.info("Query processor initialized", context=self._base_context)
@@ -199,7 +219,6 @@ class QueryProcessor:
                 query_context = None
 
         attempt = 0
-        last_error = None
         start_time = time.time()
 
         # Log the query request
@@ -219,79 +238,27 @@ class QueryProcessor:
                 query_context
             )
 
-        while attempt <= self.retry_policy.max_retries:
-            try:
-                # Enhanced logging for attempt
-                if self._ai_logger and query_context:
-                    self._ai_logger.debug(
-                        f"Processing query attempt {attempt + 1}/{self.retry_policy.max_retries + 1}",
-                        context=query_context,
-                        extra_data={"attempt": attempt + 1, "max_attempts": self.retry_policy.max_retries + 1}
-                    )
-                else:
-                    self._logger.debug(f"Processing query attempt {attempt + 1}")
-
-                # Prepare query parameters
-                kwargs = self._prepare_query_kwargs(request)
-
-                # Send query to adapter
-                response = await self.adapter.send_query(request.query, **kwargs)
+        async def send_attempt(attempt_number: int) -> AIResponse:
+            nonlocal attempt
+            attempt = attempt_number
 
-                # Validate response
-                if not self.response_validator.validate_response(response):
-                    # Create error response for validation failure
-                    validation_response = AIResponse(
-                        content="",
-                        success=False,
-                        error="Response validation failed",
-                        error_type="validation_error",
-                        retry_count=attempt,
-                    )
-
-                    # Log validation failure
-                    if self._ai_logger and query_context:
-                        self._ai_logger.log_query_response(
-                            query_context,
-                            validation_response,
-                            (time.time() - start_time) * 1000
-                        )
-                        if metrics_id:
-                            self._ai_logger.finish_performance_tracking(
-                                metrics_id,
-                                query_context,
-                                success=False,
-                                error_type="validation_error",
-                                retry_count=attempt
-                            )
-
-                    return validation_response
-
-                # Add retry count to successful response
-                response.retry_count = attempt
-
-                # Log successful response
-                duration_ms = (time.time() - start_time) * 1000
-                if self._ai_logger and query_context:
-                    self._ai_logger.log_query_response(
-                        query_context,
-                        response,
-                        duration_ms
-                    )
-                    if metrics_id:
-                        self._ai_logger.finish_performance_tracking(
-                            metrics_id,
-                            query_context,
-                            success=True,
-                            retry_count=attempt
-                        )
-                else:
-                    self._logger.info(f"Query completed successfully in {duration_ms:.1f}ms")
+            # Enhanced logging for attempt
+            if self._ai_logger and query_context:
+                self._ai_logger.debug(
+                    f"Processing query attempt {attempt + 1}/{self.retry_policy.max_retries + 1}",
+                    context=query_context,
+                    extra_data={"attempt": attempt + 1, "max_attempts": self.retry_policy.max_retries + 1}
+                )
+            else:
+                self._logger.debug(f"Processing query attempt {attempt + 1}")
 
-                return response
+            # Prepare query parameters
+            kwargs = self._prepare_query_kwargs(request)
 
+            try:
+                # Send query to adapter
+                return await self.adapter.send_query(request.query, **kwargs)
             except Exception as error:
-                last_error = error
-
                 # Enhanced error logging
                 if self._ai_logger and query_context:
                     self._ai_logger.warning(
@@ -306,70 +273,98 @@ class QueryProcessor:
                     )
                 else:
                     self._logger.warning(f"Query attempt {attempt + 1} failed: {error}")
+                raise
+
+        def log_retry(error: Exception, next_attempt: int, delay: float) -> None:
+            if self._ai_logger and query_context:
+                self._ai_logger.info(
+                    f"Retrying query in {delay:.1f} seconds",
+                    context=query_context,
+                    extra_data={"retry_delay": delay, "attempt": next_attempt}
+                )
+            else:
+                self._logger.info(f"Retrying in {delay:.1f} seconds...")
 
-                # Check if we should retry
-                if not self.retry_policy.should_retry(error, attempt):
-                    # Final failure logging
-                    if self._ai_logger and query_context:
-                        self._ai_logger.error(
-                            f"Query failed after {attempt + 1} attempts",
-                            context=query_context,
-                            exception=error,
-                            extra_data={"total_attempts": attempt + 1}
-                        )
-                        if metrics_id:
-                            self._ai_logger.finish_performance_tracking(
-                                metrics_id,
-                                query_context,
-                                success=False,
-                                error_type=type(error).__name__,
-                                retry_count=attempt
-                            )
-                    else:
-                        self._logger.error(f"Query failed after {attempt + 1} attempts")
+        try:
+            # Retries use full-jitter backoff within the policy's total timeout
+            response = await self.retry_engine.run(
+                send_attempt,
+                should_retry=self.retry_policy.should_retry,
+                on_retry=log_retry,
+            )
+        except Exception as error:
+            # Final failure logging
+            if self._ai_logger and query_context:
+                self._ai_logger.error(
+                    f"Query failed after {attempt + 1} attempts",
+                    context=query_context,
+                    exception=error,
+                    extra_data={"total_attempts": attempt + 1}
+                )
+                if metrics_id:
+                    self._ai_logger.finish_performance_tracking(
+                        metrics_id,
+                        query_context,
+                        success=False,
+                        error_type=type(error).__name__,
+                        retry_count=attempt
+                    )
+            else:
+                self._logger.error(f"Query failed after {attempt + 1} attempts")
 
-                    raise error
+            raise
 
-                # Calculate delay and wait before retry
-                if attempt < self.retry_policy.max_retries:
-                    delay = self.retry_policy.calculate_delay(attempt)
+        # Validate response
+        if not self.response_validator.validate_response(response):
+            # Create error response for validation failure
+            validation_response = AIResponse(
+                content="",
+                success=False,
+                error="Response validation failed",
+                error_type="validation_error",
+                retry_count=attempt,
+            )
 
-                    if self._ai_logger and query_context:
-                        self._ai_logger.info(
-                            f"Retrying query in {delay:.1f} seconds",
-                            context=query_context,
-                            extra_data={"retry_delay": delay, "attempt": attempt + 1}
-                        )
-                    else:
-                        self._logger.info(f"Retrying in {delay:.1f} seconds...")
+            # Log validation failure
+            if self._ai_logger and query_context:
+                self._ai_logger.log_query_response(
+                    query_context,
+                    validation_response,
+                    (time.time() - start_time) * 1000
+                )
+                if metrics_id:
+                    self._ai_logger.finish_performance_tracking(
+                        metrics_id,
+                        query_context,
+                        success=False,
+                        error_type="validation_error",
+                        retry_count=attempt
+                    )
 
-                    await asyncio.sleep(delay)
+            return validation_response
 
-                attempt += 1
+        # Add retry count to successful response
+        response.retry_count = attempt
 
-        # This should not be reached, but just in case
-        if last_error:
-            # Final cleanup
-            if metrics_id and self._ai_logger and query_context:
+        # Log successful response
+        duration_ms = (time.time() - start_time) * 1000
+        if self._ai_logger and query_context:
+            self._ai_logger.log_query_response(
+                query_context,
+                response,
+                duration_ms
+            )
+            if metrics_id:
                 self._ai_logger.finish_performance_tracking(
                     metrics_id,
                     query_context,
-                    success=False,
-                    error_type=type(last_error).__name__,
+                    success=True,
                     retry_count=attempt
                 )
-            raise last_error
         else:
-            unknown_error = AIServiceError("Query processing failed for unknown reason")
-            if metrics_id and self._ai_logger and query_context:
-                self._ai_logger.finish_performance_tracking(
-                    metrics_id,
-                    query_context,
-                    success=False,
-                    error_type="unknown_error",
-                    retry_count=attempt
-                )
-            raise unknown_error
+            self._logger.info(f"Query completed successfully in {duration_ms:.1f}ms")
+
+        return response
 
     async def process_streaming_query(
         self, request: QueryRequest
@@ -421,6 +416,7 @@ class QueryProcessor:
         try:
             # Prepare query parameters
             kwargs = self._prepare_query_kwargs(request)
+            last_chunk_time = time.perf_counter()
 
             # Send streaming query to adapter
             async for chunk in self.adapter.send_streaming_query(
@@ -428,6 +424,17 @@ class QueryProcessor:
             ):
                 chunk_count += 1
 
+                # Time to first token, then the gaps between chunks
+                now = time.perf_counter()
+                self._metrics.observe(
+                    "ai_time_to_first_token_seconds"
+                    if chunk_count == 1
+                    else "ai_inter_chunk_gap_seconds",
+                    now - last_chunk_time,
+                    **self._metric_tags
+                )
+                last_chunk_time = now
+
                 # Validate streaming response
                 if self.response_validator.validate_streaming_response(chunk):
                     # Log valid chunk
@@ -451,6 +458,10 @@ class QueryProcessor:
                         self._logger.warning("Invalid streaming response chunk received")
                     # Continue processing other chunks
 
+            self._metrics.increment(
+                "ai_stream_chunks_total", chunk_count, **self._metric_tags
+            )
+
             # Log streaming completion
             duration_ms = (time.time() - start_time) * 1000
             if streaming_context and self._ai_logger:
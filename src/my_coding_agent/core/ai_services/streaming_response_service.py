@@ -9,14 +9,22 @@ This service handles all streaming-related functionality including:
 
 from __future__ import annotations
 
-import asyncio
 import logging
+import time
 from collections.abc import Callable
 from contextlib import suppress
 from typing import TYPE_CHECKING, Any
 
 from ..ai_agent import AIResponse
+from ..metrics import get_metrics_registry
+from ..retry_engine import RetryBudget, RetryEngine
 from ..streaming import StreamHandler
+from .context_builder import ContextBuilder
+from .conversation_compactor import (
+    ConversationCompactor,
+    extractive_summary,
+    summarize_with_model,
+)
 
 # TODO: Remove dependency on AIMessagingService during simplification
 # from .ai_messaging_service import AIMessagingService
@@ -40,6 +48,8 @@ class StreamingResponseService:
         | None = None,  # TODO: Remove during simplification
         memory_system: Any | None = None,  # noqa: ANN401  # noqa: ANN401
         enable_memory_awareness: bool = False,
+        context_builder: ContextBuilder | None = None,
+        compactor: ConversationCompactor | None = None,
     ) -> None:
         """Initialize the streaming response service.
 
@@ -47,6 +57,8 @@ class StreamingResponseService:
             ai_messaging_service: The AI messaging service for communication
             memory_system: Optional memory system for context-aware streaming
             enable_memory_awareness: Whether to enable memory-aware streaming
+            context_builder: Assembles memory context within a token budget
+            compactor: Summarizes older messages in the background
         """
         self._ai_messaging_service = ai_messaging_service
         self._memory_system = memory_system
@@ -54,6 +66,23 @@ class StreamingResponseService:
             enable_memory_awareness and memory_system is not None
         )
 
+        # Retries back off with full jitter within a total deadline
+        self._retry_engine = RetryEngine(
+            base_delay=1.0,
+            max_delay=30.0,
+            deadline=120.0,
+            retry_budget=RetryBudget(),
+        )
+
+        self._metrics = get_metrics_registry()
+
+        # Keeps the rendered history prefix between turns
+        self._context_builder = context_builder or ContextBuilder()
+        self._compactor = compactor or ConversationCompactor(
+            summarizer=self._summarize_conversation,
+            token_counter=self._context_builder.token_counter,
+        )
+
         # Stream management
         self._stream_handler: StreamHandler | None = None
         self.current_stream_handler: StreamHandler | None = None
@@ -92,57 +121,160 @@ class StreamingResponseService:
         Returns:
             AIResponse: The response from the AI with streaming support
         """
-        last_error = None
-        retry_count = 0
+        if self._stream_handler is None:
+            self._stream_handler = StreamHandler()
+        last_attempt = 0
+
+        async def stream_attempt(attempt: int) -> AIResponse:
+            nonlocal last_attempt
+            last_attempt = attempt
+            return await self._stream_attempt(
+                message, on_chunk, on_error, enable_filesystem, attempt
+            )
+
+        def log_retry(error: Exception, next_attempt: int, delay: float) -> None:
+            logger.warning(
+                f"Streaming attempt {next_attempt} failed: {error}. "
+                f"Retrying in {delay:.1f}s "
+                f"(attempt {next_attempt + 1}/{max_retries + 1})"
+            )
+
+        try:
+            # Interrupting the stream also cuts a pending retry backoff short
+            return await self._retry_engine.run(
+                stream_attempt,
+                bound_attempts=False,
+                on_retry=log_retry,
+                stop_event=self._stream_handler._interrupt_event,
+                max_attempts=max_retries + 1,
+            )
+        except Exception as e:
+            last_error = e
+            logger.error(
+                f"Streaming failed after {last_attempt + 1} attempts. Final error: {e}"
+            )
+
+        # All retries exhausted - return failure response
+        error_type, error_message = self._ai_messaging_service._categorize_error(
+            last_error
+        )
 
-        for attempt in range(max_retries + 1):
+        # Call error callback if provided
+        if on_error:
             try:
-                # Ensure MCP connection if filesystem tools are enabled
-                if enable_filesystem:
-                    await self._ensure_filesystem_connection()
+                on_error(last_error)
+            except Exception as callback_error:
+                logger.error(f"Error in error callback: {callback_error}")
 
-                # Create and track stream handler
-                if not hasattr(self, "_stream_handler") or self._stream_handler is None:
-                    self._stream_handler = StreamHandler()
+        return AIResponse(
+            success=False,
+            content=error_message,
+            error=str(last_error),
+            error_type=error_type,
+            retry_count=last_attempt,
+            stream_id=self.current_stream_id,
+        )
 
-                stream_handler = self._stream_handler
-                self.current_stream_handler = stream_handler
+    async def _stream_attempt(
+        self,
+        message: str,
+        on_chunk: ChunkCallback,
+        on_error: ErrorCallback,
+        enable_filesystem: bool,
+        attempt: int,
+    ) -> AIResponse:
+        """Run a single streaming attempt.
 
-                # Start streaming with our handler
-                stream_id = await stream_handler.start_stream(
-                    on_chunk, on_error=on_error
-                )
-                self.current_stream_id = stream_id
+        Args:
+            message: The message to send to the AI
+            on_chunk: Callback function called for each chunk
+            on_error: Optional callback function called on errors
+            enable_filesystem: Whether to enable filesystem tools
+            attempt: Zero-based attempt number, reported as the retry count
 
-                try:
-                    # Get the agent from the messaging service
-                    agent = self._ai_messaging_service._agent
+        Returns:
+            AIResponse: The successful response
 
-                    # Use Pydantic AI's streaming capabilities
-                    async with agent.run_stream(message) as response:
-                        # Stream the response text in real-time
-                        full_content = []
-                        chunk_count = 0
+        Raises:
+            Exception: Any error raised while streaming
+        """
+        # Ensure MCP connection if filesystem tools are enabled
+        if enable_filesystem:
+            await self._ensure_filesystem_connection()
 
-                        logger.debug(
-                            f"Starting stream for message: '{message[:100]}...'"
-                        )
+        # Create and track stream handler
+        if not hasattr(self, "_stream_handler") or self._stream_handler is None:
+            self._stream_handler = StreamHandler()
 
-                        # Get the stream text generator
-                        stream_text = response.stream_text()
-
-                        # Handle different stream text types
-                        if hasattr(stream_text, "__aiter__"):
-                            # This is an async generator, iterate through it
-                            async for chunk in stream_text:
-                                # Check for interruption
-                                if (
-                                    stream_handler._interrupt_event
-                                    and stream_handler._interrupt_event.is_set()
-                                ):
-                                    logger.info("Stream interrupted by user")
-                                    break
+        stream_handler = self._stream_handler
+        self.current_stream_handler = stream_handler
 
+        # Start streaming with our handler
+        stream_id = await stream_handler.start_stream(on_chunk, on_error=on_error)
+        self.current_stream_id = stream_id
+
+        try:
+            # Get the agent from the messaging service
+            agent = self._ai_messaging_service._agent
+
+            # Use Pydantic AI's streaming capabilities
+            metric_tags = self._get_metric_tags()
+            last_chunk_time = time.perf_counter()
+
+            async with agent.run_stream(message) as response:
+                # Stream the response text in real-time
+                full_content = []
+                chunk_count = 0
+
+                logger.debug(f"Starting stream for message: '{message[:100]}...'")
+
+                # Get the stream text generator
+                stream_text = response.stream_text()
+
+                # Handle different stream text types
+                if hasattr(stream_text, "__aiter__"):
+                    # This is an async generator, iterate through it
+                    async for chunk in stream_text:
+                        # Check for interruption
+                        if (
+                            stream_handler._interrupt_event
+                            and stream_handler._interrupt_event.is_set()
+                        ):
+                            logger.info("Stream interrupted by user")
+                            break
+
+                        full_content.append(chunk)
+                        chunk_count += 1
+
+                        # Time to first token, then the gaps between chunks
+                        now = time.perf_counter()
+                        self._metrics.observe(
+                            "ai_time_to_first_token_seconds"
+                            if chunk_count == 1
+                            else "ai_inter_chunk_gap_seconds",
+                            now - last_chunk_time,
+                            **metric_tags,
+                        )
+                        last_chunk_time = now
+
+                        # Call the external callback directly for each chunk
+                        try:
+                            callback_result = on_chunk(chunk, False)
+                            if hasattr(callback_result, "__await__"):
+                                await callback_result
+                        except Exception as callback_error:
+                            logger.error(
+                                f"Error in streaming callback: {callback_error}"
+                            )
+                            if on_error:
+                                with suppress(Exception):
+                                    on_error(callback_error)
+                else:
+                    # This might be a coroutine (in tests), await it
+                    try:
+                        chunks = await stream_text
+                        if isinstance(chunks, list | tuple):
+                            for chunk in chunks:
                                 full_content.append(chunk)
                                 chunk_count += 1
 
@@ -158,153 +290,65 @@ class StreamingResponseService:
                                     if on_error:
                                         with suppress(Exception):
                                             on_error(callback_error)
-                        else:
-                            # This might be a coroutine (in tests), await it
-                            try:
-                                chunks = await stream_text
-                                if isinstance(chunks, list | tuple):
-                                    for chunk in chunks:
-                                        full_content.append(chunk)
-                                        chunk_count += 1
-
-                                        # Call the external callback directly for each chunk
-                                        try:
-                                            callback_result = on_chunk(chunk, False)
-                                            if hasattr(callback_result, "__await__"):
-                                                await callback_result
-                                        except Exception as callback_error:
-                                            logger.error(
-                                                f"Error in streaming callback: {callback_error}"
-                                            )
-                                            if on_error:
-                                                with suppress(Exception):
-                                                    on_error(callback_error)
-                            except Exception as stream_await_error:
-                                logger.error(
-                                    f"Error awaiting stream: {stream_await_error}"
-                                )
-                                # Fallback - treat as empty stream
-                                pass
-
-                        # After all chunks are streamed, send a final empty chunk to mark completion
-                        try:
-                            callback_result = on_chunk(
-                                "", True
-                            )  # Empty chunk with is_final=True
-                            if hasattr(callback_result, "__await__"):
-                                await callback_result
-                        except Exception as callback_error:
-                            logger.error(
-                                f"Error in final streaming callback: {callback_error}"
-                            )
-
-                        # Get the final output
-                        try:
-                            final_output = await response.get_output()
-
-                            # Ensure final_output is a string
-                            if hasattr(final_output, "data"):
-                                final_output = str(final_output.data)
-                            elif not isinstance(final_output, str):
-                                final_output = str(final_output)
+                    except Exception as stream_await_error:
+                        logger.error(f"Error awaiting stream: {stream_await_error}")
+                        # Fallback - treat as empty stream
+                        pass
 
-                            logger.debug(
-                                f"Stream completed with output length: {len(final_output) if final_output else 0}"
-                            )
-                        except Exception as output_error:
-                            logger.warning(
-                                f"Error getting final output: {output_error}"
-                            )
-                            final_output = None
-
-                        full_text = "".join(str(chunk) for chunk in full_content)
-
-                        # Complete the stream in our handler (for internal tracking only)
-                        if stream_handler:
-                            await stream_handler.complete_stream(stream_id)
+                # After all chunks are streamed, send a final empty chunk to mark completion
+                try:
+                    callback_result = on_chunk(
+                        "", True
+                    )  # Empty chunk with is_final=True
+                    if hasattr(callback_result, "__await__"):
+                        await callback_result
+                except Exception as callback_error:
+                    logger.error(f"Error in final streaming callback: {callback_error}")
 
-                        # Clear current stream tracking
-                        self.current_stream_handler = None
-                        self.current_stream_id = None
+                # Get the final output
+                try:
+                    final_output = await response.get_output()
 
-                        # Ensure we have valid string content
-                        content = final_output or full_text or "Response completed"
+                    # Ensure final_output is a string
+                    if hasattr(final_output, "data"):
+                        final_output = str(final_output.data)
+                    elif not isinstance(final_output, str):
+                        final_output = str(final_output)
 
-                        return AIResponse(
-                            success=True,
-                            content=content,
-                            stream_id=stream_id,
-                            retry_count=retry_count,
-                        )
+                    logger.debug(
+                        f"Stream completed with output length: {len(final_output) if final_output else 0}"
+                    )
+                except Exception as output_error:
+                    logger.warning(f"Error getting final output: {output_error}")
+                    final_output = None
 
-                except Exception as stream_error:
-                    # Handle streaming errors
-                    await stream_handler.handle_error(stream_id, stream_error)
-                    # Clear current stream tracking on error
-                    self.current_stream_handler = None
-                    self.current_stream_id = None
-                    raise stream_error
+                full_text = "".join(str(chunk) for chunk in full_content)
 
-            except Exception as e:
-                last_error = e
-                retry_count = attempt
-
-                # Don't retry on the last attempt
-                if attempt < max_retries:
-                    # Calculate exponential backoff: 2^attempt seconds
-                    backoff_time = 2**attempt
-                    logger.warning(
-                        f"Streaming attempt {attempt + 1} failed: {e}. "
-                        f"Retrying in {backoff_time}s (attempt {attempt + 2}/{max_retries + 1})"
-                    )
+                # Complete the stream in our handler (for internal tracking only)
+                if stream_handler:
+                    await stream_handler.complete_stream(stream_id)
 
-                    # Wait before retrying with exponential backoff
-                    await asyncio.sleep(backoff_time)
-
-                    # Check if stream was interrupted during backoff
-                    if (
-                        hasattr(self, "current_stream_handler")
-                        and self.current_stream_handler
-                        and hasattr(self.current_stream_handler, "_interrupt_event")
-                        and self.current_stream_handler._interrupt_event.is_set()
-                    ):
-                        logger.info("Stream was interrupted during retry backoff")
-                        break
-                else:
-                    logger.error(
-                        f"All streaming attempts failed after {max_retries} retries. Final error: {e}"
-                    )
+                # Clear current stream tracking
+                self.current_stream_handler = None
+                self.current_stream_id = None
 
-        # All retries exhausted - return failure response
-        if last_error:
-            error_type, error_message = self._ai_messaging_service._categorize_error(
-                last_error
-            )
+                # Ensure we have valid string content
+                content = final_output or full_text or "Response completed"
 
-            # Call error callback if provided
-            if on_error:
-                try:
-                    on_error(last_error)
-                except Exception as callback_error:
-                    logger.error(f"Error in error callback: {callback_error}")
-
-            return AIResponse(
-                success=False,
-                content=error_message,
-                error=str(last_error),
-                error_type=error_type,
-                retry_count=retry_count,
-                stream_id=getattr(locals(), "stream_id", None),
-            )
+                return AIResponse(
+                    success=True,
+                    content=content,
+                    stream_id=stream_id,
+                    retry_count=attempt,
+                )
 
-        # This should not be reached, but handle edge case
-        return AIResponse(
-            success=False,
-            content="Unexpected error in retry logic",
-            error="No error captured in retry loop",
-            error_type="unknown",
-            retry_count=retry_count,
-        )
+        except Exception as stream_error:
+            # Handle streaming errors
+            await stream_handler.handle_error(stream_id, stream_error)
+            # Clear current stream tracking on error
+            self.current_stream_handler = None
+            self.current_stream_id = None
+            raise stream_error
 
     async def send_memory_aware_message_stream(
         self,
@@ -345,49 +389,30 @@ class StreamingResponseService:
                 )
 
             # Get conversation context and long-term memories for enhanced prompt
-            context = self._memory_system.get_conversation_context(limit=50)
+            budget = self._context_builder.budget
+            context = self._memory_system.get_conversation_context(
+                limit=budget.history_limit
+            )
             long_term_memories = self._memory_system.get_long_term_memories(
-                query=message, limit=5
+                query=message, limit=budget.memory_limit
             )
 
-            # Enhance message with context if available
-            enhanced_parts = []
-
-            # Add memory context with clear labels
-            if long_term_memories:
-                memory_text = "\n".join(
-                    [
-                        f"- {mem['content']} (importance: {mem.get('importance_score', 'N/A')}, type: {mem.get('memory_type', 'unknown')})"
-                        for mem in long_term_memories
-                    ]
-                )
-                enhanced_parts.append(
-                    f"=== LONG-TERM MEMORY (Persistent facts, preferences, and important information) ===\n{memory_text}"
-                )
+            # Replace compacted messages with their rolling summary
+            self._compactor.memory_system = self._memory_system
+            summary, context = self._compactor.apply(context)
 
-            if context:
-                # Reverse the context to show in chronological order (oldest first)
-                context_reversed = list(reversed(context))
-                context_text = "\n".join(
-                    [f"{msg['role']}: {msg['content']}" for msg in context_reversed]
-                )
-                enhanced_parts.append(
-                    f"=== CONVERSATION HISTORY (Recent messages in chronological order - this is your short-term memory) ===\n{context_text}"
-                )
-
-            if enhanced_parts:
-                enhanced_message = (
-                    f"=== MEMORY CONTEXT ===\n"
-                    f"{chr(10).join(enhanced_parts)}\n\n"
-                    f"=== CURRENT USER MESSAGE ===\n{message}\n\n"
-                    f"Please respond to the current user message above, taking into account the conversation history "
-                    f"and any relevant long-term memories. The conversation history shows the complete context of "
-                    f"our recent discussion, so you can reference previous topics and maintain continuity."
-                )
-            else:
-                enhanced_message = message
+            # Fit the context into the token budget
+            assembled = self._context_builder.build(
+                message, context, long_term_memories, summary=summary
+            )
+            enhanced_message = assembled.prompt
 
-            logger.info("Using memory-aware streaming with conversation context")
+            logger.info(
+                f"Using memory-aware streaming with {assembled.context_tokens} "
+                f"context tokens ({assembled.history_messages} recent messages, "
+                f"{assembled.relevant_messages} earlier messages, "
+                f"{assembled.memories} memories)"
+            )
 
             # Send the enhanced message
             response = await self.send_message_with_tools_stream(
@@ -398,6 +423,13 @@ class StreamingResponseService:
             if response.success and response.content:
                 self._memory_system.store_assistant_message(response.content)
 
+                # Summarize older messages after the turn, off the response path
+                self._compactor.schedule(
+                    lambda: self._memory_system.get_conversation_context(
+                        limit=budget.history_limit
+                    )
+                )
+
             return response
 
         except Exception as e:
@@ -450,11 +482,34 @@ class StreamingResponseService:
         Returns:
             dict: Health status information
         """
-        return {
+        status = {
             "service_name": "StreamingResponseService",
             "is_healthy": True,
             "streaming_enabled": True,
             "memory_aware_enabled": self.memory_aware_enabled,
             "current_streams": 1 if self.is_streaming else 0,
             "stream_handler_initialized": self._stream_handler is not None,
+            "latency_metrics": self._metrics.snapshot(),
         }
+        if self.memory_aware_enabled:
+            status["context_builder"] = self._context_builder.get_stats()
+            status["compaction"] = self._compactor.get_stats()
+        return status
+
+    async def _summarize_conversation(
+        self, previous: str | None, messages: list[dict[str, Any]]
+    ) -> str:
+        """Summarize messages with the agent's model, extractively without one."""
+        model = getattr(self._ai_messaging_service, "_model", None)
+        if model is not None:
+            try:
+                return await summarize_with_model(model, previous, messages)
+            except Exception as e:
+                logger.warning(f"Model summary failed, summarizing extractively: {e}")
+        return await extractive_summary(previous, messages)
+
+    def _get_metric_tags(self) -> dict[str, str | None]:
+        """Get the deployment tag for latency metrics."""
+        config = getattr(self._ai_messaging_service, "config", None)
+        deployment = getattr(config, "deployment_name", None)
+        return {"deployment": deployment if isinstance(deployment, str) else None}
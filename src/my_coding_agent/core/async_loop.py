@@ -0,0 +1,310 @@
+"""
+Persistent asyncio event loop shared by agent and MCP I/O.
+
+This module provides a single long-lived event loop running on a dedicated
+background thread including:
+- Thread-safe submission of coroutines from the GUI or worker threads
+- Synchronous helpers for code that must block on a result
+- A Qt bridge that delivers coroutine results back on the GUI thread
+- Orderly shutdown that cancels outstanding tasks before closing the loop
+
+Keeping one loop alive means MCP clients and aiohttp sessions are always
+used on the loop that created them, instead of a fresh loop per message.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from collections.abc import Callable, Coroutine
+from contextlib import suppress
+from typing import Any, TypeVar
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ResultCallback = Callable[[Any], None]
+ErrorCallback = Callable[[Exception], None]
+
+
+class AsyncLoopThread:
+    """Owns an asyncio event loop running forever on a daemon thread."""
+
+    def __init__(self, name: str = "asyncio-loop") -> None:
+        """
+        Initialize the loop thread without starting it.
+
+        Args:
+            name: Name given to the background thread
+        """
+        self._name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Get the running event loop, starting the thread if needed."""
+        return self.start()
+
+    @property
+    def is_running(self) -> bool:
+        """Check whether the loop thread is alive and running."""
+        return (
+            self._thread is not None
+            and self._thread.is_alive()
+            and self._loop is not None
+            and self._loop.is_running()
+        )
+
+    def in_loop_thread(self) -> bool:
+        """Check whether the caller is running on the loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        Start the loop thread if it is not already running.
+
+        Returns:
+            The event loop owned by the thread
+        """
+        with self._lock:
+            if self._loop is not None and self._thread and self._thread.is_alive():
+                return self._loop
+
+            self._started.clear()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run, name=self._name, daemon=True
+            )
+            self._thread.start()
+
+        self._started.wait()
+        return self._loop
+
+    def _run(self) -> None:
+        """Run the event loop until stop() is called."""
+        loop = self._loop
+        if loop is None:
+            return
+
+        asyncio.set_event_loop(loop)
+        loop.call_soon(self._started.set)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+                logger.debug("Event loop thread %s stopped", self._name)
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """
+        Schedule a coroutine on the loop from any thread.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Future that resolves with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run_sync(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the loop thread itself
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("run_sync() cannot be called from the loop thread")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Cancel outstanding tasks, stop the loop and join the thread.
+
+        Args:
+            timeout: Maximum seconds to wait for tasks and the thread
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+
+        if loop is None or thread is None or not thread.is_alive():
+            return
+
+        async def _cancel_tasks() -> None:
+            current = asyncio.current_task()
+            tasks = [task for task in asyncio.all_tasks() if task is not current]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        in_loop_thread = threading.current_thread() is thread
+        if not in_loop_thread:
+            try:
+                asyncio.run_coroutine_threadsafe(_cancel_tasks(), loop).result(timeout)
+            except Exception as e:
+                logger.warning("Timed out cancelling event loop tasks: %s", e)
+
+        loop.call_soon_threadsafe(loop.stop)
+        if not in_loop_thread:
+            thread.join(timeout)
+
+
+class QtFutureBridge(QObject):
+    """Runs coroutines on an AsyncLoopThread and reports back on the Qt thread."""
+
+    # callback, value
+    _deliver = pyqtSignal(object, object)
+
+    def __init__(
+        self, loop_thread: AsyncLoopThread | None = None, parent: QObject | None = None
+    ) -> None:
+        """
+        Initialize the bridge.
+
+        Args:
+            loop_thread: Loop to run coroutines on; defaults to the shared loop
+            parent: Parent QObject controlling the bridge lifetime
+        """
+        super().__init__(parent)
+        self._loop_thread = loop_thread
+        self._pending: set[concurrent.futures.Future[Any]] = set()
+        self._pending_lock = threading.Lock()
+        self._deliver.connect(self._on_deliver)
+
+    @property
+    def loop_thread(self) -> AsyncLoopThread:
+        """Get the loop thread used by this bridge."""
+        return self._loop_thread or get_shared_loop()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of submitted coroutines that have not finished."""
+        with self._pending_lock:
+            return len(self._pending)
+
+    def submit(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        on_result: ResultCallback | None = None,
+        on_error: ErrorCallback | None = None,
+    ) -> concurrent.futures.Future[Any]:
+        """
+        Run a coroutine on the loop and deliver its outcome to the Qt thread.
+
+        Callbacks are invoked through a queued signal, so they always run on
+        the thread that owns this bridge. Cancelled work invokes neither.
+
+        Args:
+            coro: Coroutine to run
+            on_result: Called with the result on success
+            on_error: Called with the exception on failure
+
+        Returns:
+            Future tracking the coroutine
+        """
+        future = self.loop_thread.submit(coro)
+        with self._pending_lock:
+            self._pending.add(future)
+
+        def _done(done: concurrent.futures.Future[Any]) -> None:
+            with self._pending_lock:
+                self._pending.discard(done)
+            if done.cancelled():
+                return
+
+            error = done.exception()
+            callback: Callable[[Any], None] | None
+            if error is None:
+                callback, value = on_result, done.result()
+            else:
+                callback, value = on_error, error
+                if on_error is None:
+                    logger.error("Unhandled error in async task: %s", error)
+
+            if callback is not None:
+                # The bridge may already be deleted during shutdown
+                with suppress(RuntimeError):
+                    self._deliver.emit(callback, value)
+
+        future.add_done_callback(_done)
+        return future
+
+    def cancel_all(self) -> int:
+        """
+        Cancel every coroutine submitted through this bridge.
+
+        Returns:
+            Number of futures that were cancelled
+        """
+        with self._pending_lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        return sum(1 for future in pending if future.cancel())
+
+    def _on_deliver(self, callback: Callable[[object], None], value: object) -> None:
+        """Invoke a completion callback on the bridge's thread."""
+        try:
+            callback(value)
+        except Exception as e:
+            logger.error("Error in async completion callback: %s", e)
+
+
+_shared_loop: AsyncLoopThread | None = None
+_shared_loop_lock = threading.Lock()
+
+
+def get_shared_loop() -> AsyncLoopThread:
+    """
+    Get the process-wide loop thread, starting it on first use.
+
+    Returns:
+        The shared AsyncLoopThread
+    """
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = AsyncLoopThread(name="my-coding-agent-asyncio")
+        loop_thread = _shared_loop
+    loop_thread.start()
+    return loop_thread
+
+
+def shutdown_shared_loop(timeout: float = 5.0) -> None:
+    """
+    Stop the process-wide loop thread if it was started.
+
+    Args:
+        timeout: Maximum seconds to wait for shutdown
+    """
+    global _shared_loop
+    with _shared_loop_lock:
+        loop_thread, _shared_loop = _shared_loop, None
+    if loop_thread is not None:
+        loop_thread.stop(timeout)
@@ -0,0 +1,308 @@
+"""
+Concurrent, size-aware reading of many files at once.
+
+This module provides batched file reads for the agent including:
+- Bounded concurrency for reads that go through an async reader such as MCP
+- Local reads on a thread pool using positional reads (pread)
+- Per-file size caps that keep the head and tail of large files
+- Deduplication of repeated paths within a batch
+- Streaming results in the order reads finish
+
+Reviewing many files then takes one round of parallel I/O instead of one
+sequential read per file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import stat
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_FILE_BYTES = 256 * 1024
+
+AsyncReader = Callable[[str], Awaitable[str]]
+PathResolver = Callable[[str], Path]
+
+
+@dataclass
+class FileReadResult:
+    """Outcome of reading one file in a batch."""
+
+    path: str
+    content: str = ""
+    error: str | None = None
+    size: int = 0
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Check whether the file was read successfully."""
+        return self.error is None
+
+    def as_text(self) -> str:
+        """Get the content, or an error message if the read failed."""
+        if self.error is not None:
+            return f"Error reading file: {self.error}"
+        return self.content
+
+
+def omission_marker(omitted: int, unit: str) -> str:
+    """Build the marker placed where the middle of a file was cut out."""
+    return f"\n\n... [{omitted} {unit} omitted] ...\n\n"
+
+
+def truncate_head_tail(text: str, max_chars: int) -> tuple[str, bool]:
+    """
+    Keep the start and end of text that is longer than max_chars.
+
+    Args:
+        text: Text to truncate
+        max_chars: Maximum number of characters of the original to keep
+
+    Returns:
+        The possibly truncated text and whether anything was removed
+    """
+    if len(text) <= max_chars:
+        return text, False
+
+    head = max_chars // 2
+    tail = max_chars - head
+    omitted = len(text) - head - tail
+    end = text[len(text) - tail :] if tail else ""
+    return text[:head] + omission_marker(omitted, "characters") + end, True
+
+
+def _pread(fd: int, length: int, offset: int) -> bytes:
+    """Read up to length bytes at offset without moving a shared file position."""
+    chunks = []
+    while length > 0:
+        if hasattr(os, "pread"):
+            chunk = os.pread(fd, length, offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            chunk = os.read(fd, length)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        length -= len(chunk)
+        offset += len(chunk)
+    return b"".join(chunks)
+
+
+def read_local_file(path: str | Path, max_bytes: int) -> FileReadResult:
+    """
+    Read a local file, keeping only its head and tail if it is too large.
+
+    Large files are never read in full: the head and tail are fetched with
+    two positional reads.
+
+    Args:
+        path: File to read
+        max_bytes: Maximum number of bytes of the file to keep
+
+    Returns:
+        The read result; errors are reported in the result, not raised
+    """
+    name = str(path)
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError as e:
+        return FileReadResult(name, error=e.strerror or str(e))
+
+    try:
+        info = os.fstat(fd)
+        if not stat.S_ISREG(info.st_mode):
+            return FileReadResult(name, error="Not a regular file")
+
+        size = info.st_size
+        if size <= max_bytes:
+            content = _pread(fd, size, 0).decode("utf-8", errors="replace")
+            return FileReadResult(name, content=content, size=size)
+
+        head_bytes = max_bytes // 2
+        tail_bytes = max_bytes - head_bytes
+        head = _pread(fd, head_bytes, 0).decode("utf-8", errors="replace")
+        tail = _pread(fd, tail_bytes, size - tail_bytes).decode(
+            "utf-8", errors="replace"
+        )
+        # Cuts can split multi-byte characters; drop the broken pieces
+        head = head.rstrip("�")
+        tail = tail.lstrip("�")
+        content = head + omission_marker(size - max_bytes, "bytes") + tail
+        return FileReadResult(name, content=content, size=size, truncated=True)
+    except OSError as e:
+        return FileReadResult(name, error=e.strerror or str(e))
+    finally:
+        os.close(fd)
+
+
+class BatchFileReader:
+    """Reads batches of files concurrently with per-file size caps."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    ) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            max_concurrency: Maximum number of reads in flight at once
+            max_file_bytes: Size cap per file; larger files keep head and tail
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_file_bytes < 1:
+            raise ValueError("max_file_bytes must be at least 1")
+
+        self.max_concurrency = max_concurrency
+        self.max_file_bytes = max_file_bytes
+        self._executor: ThreadPoolExecutor | None = None
+
+    @staticmethod
+    def unique_paths(paths: Iterable[str]) -> list[str]:
+        """Remove repeated paths, keeping the order of first appearance."""
+        return list(dict.fromkeys(paths))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for local reads, creating it if needed."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="file-read"
+            )
+        return self._executor
+
+    def _read_local(self, path: str, resolve: PathResolver | None) -> FileReadResult:
+        """Resolve and read one local file, reporting it under its given path."""
+        try:
+            target = resolve(path) if resolve is not None else Path(path)
+        except Exception as e:
+            return FileReadResult(path, error=str(e))
+
+        result = read_local_file(target, self.max_file_bytes)
+        result.path = path
+        return result
+
+    async def _read_one(
+        self, path: str, read: AsyncReader | None, resolve: PathResolver | None
+    ) -> FileReadResult:
+        """Read one file locally or through the async reader."""
+        if read is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), self._read_local, path, resolve
+            )
+
+        try:
+            text = await read(path)
+        except Exception as e:
+            logger.warning(f"Failed to read {path}: {e}")
+            return FileReadResult(path, error=str(e))
+
+        content, truncated = truncate_head_tail(text, self.max_file_bytes)
+        return FileReadResult(
+            path, content=content, size=len(text), truncated=truncated
+        )
+
+    async def stream(
+        self,
+        paths: Iterable[str],
+        read: AsyncReader | None = None,
+        resolve: PathResolver | None = None,
+    ) -> AsyncIterator[FileReadResult]:
+        """
+        Read files concurrently and yield each result as soon as it is ready.
+
+        Args:
+            paths: Paths to read; repeated paths are read once
+            read: Async reader such as an MCP read_file; local reads if None
+            resolve: Maps a path to the local file to read, e.g. within a
+                workspace; only used for local reads
+
+        Yields:
+            One result per unique path, in the order the reads finish
+        """
+        unique = self.unique_paths(paths)
+        if not unique:
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(path: str) -> FileReadResult:
+            async with semaphore:
+                return await self._read_one(path, read, resolve)
+
+        tasks = [asyncio.create_task(bounded(path)) for path in unique]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # Stop outstanding reads if the consumer stops early
+            for task in tasks:
+                task.cancel()
+
+    async def read_all(
+        self,
+        paths: Iterable[str],
+        read: AsyncReader | None = None,
+        resolve: PathResolver | None = None,
+    ) -> dict[str, FileReadResult]:
+        """
+        Read files concurrently and return all results.
+
+        Args:
+            paths: Paths to read; repeated paths are read once
+            read: Async reader such as an MCP read_file; local reads if None
+            resolve: Maps a path to the local file to read
+
+        Returns:
+            Results keyed by path, in the order paths were first requested
+        """
+        unique = self.unique_paths(paths)
+        results = {
+            result.path: result async for result in self.stream(unique, read, resolve)
+        }
+        return {path: results[path] for path in unique}
+
+    def read_all_sync(
+        self, paths: Iterable[str], resolve: PathResolver | None = None
+    ) -> dict[str, FileReadResult]:
+        """
+        Read local files on the thread pool without needing an event loop.
+
+        Args:
+            paths: Paths to read; repeated paths are read once
+            resolve: Maps a path to the local file to read
+
+        Returns:
+            Results keyed by path, in the order paths were first requested
+        """
+        unique = self.unique_paths(paths)
+
+        # One task per worker keeps scheduling overhead low for small files
+        def read_chunk(chunk: list[str]) -> list[FileReadResult]:
+            return [self._read_local(path, resolve) for path in chunk]
+
+        workers = min(self.max_concurrency, len(unique))
+        chunks = [unique[start::workers] for start in range(workers)]
+        results = {
+            result.path: result
+            for chunk_results in self._get_executor().map(read_chunk, chunks)
+            for result in chunk_results
+        }
+        return {path: results[path] for path in unique}
+
+    def close(self) -> None:
+        """Shut down the thread pool used for local reads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -5,6 +5,7 @@ Code viewer widget for displaying source code with syntax highlighting.
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Import pygments with type ignores for stub warnings
 from pygments.lexers import (  # type: ignore
@@ -26,6 +27,9 @@ from PyQt6.QtGui import (
 )
 from PyQt6.QtWidgets import QHBoxLayout, QTextEdit, QWidget
 
+if TYPE_CHECKING:
+    from .symbol_index import Symbol, SymbolIndex
+
 
 class PygmentsSyntaxHighlighter(QSyntaxHighlighter):
     """Qt syntax highlighter using Pygments for token parsing."""
@@ -312,6 +316,9 @@ class CodeViewerWidget(QWidget):
         # Error tracking
         self._last_load_error: dict | None = None
 
+        # Optional shared symbol index for definition lookups
+        self._symbol_index: SymbolIndex | None = None
+
         # Large file handling
         self._large_file_threshold = 10 * 1024 * 1024  # 10MB
         self._is_large_file = False
@@ -507,6 +514,10 @@ class CodeViewerWidget(QWidget):
             self._current_file = file_path
             self._detect_and_set_language(file_path)
 
+            # Keep the symbol index current for fully loaded files
+            if self._symbol_index is not None and not self._is_lazy_loading:
+                self._symbol_index.update_file(file_path, content)
+
             # Optimize syntax highlighting for large files
             if (
                 self._is_large_file and self._file_size > self._large_file_threshold * 2
@@ -733,6 +744,76 @@ class CodeViewerWidget(QWidget):
             // self._chunk_size,
         }
 
+    def set_symbol_index(self, symbol_index: SymbolIndex | None) -> None:
+        """Attach a symbol index used for definition lookups."""
+        self._symbol_index = symbol_index
+
+    def get_symbol_index(self) -> SymbolIndex | None:
+        """Get the attached symbol index, if any."""
+        return self._symbol_index
+
+    def find_definition(self, name: str) -> list[Symbol]:
+        """
+        Find definitions of a symbol, preferring the current file.
+
+        Args:
+            name: Name of the function, class or import to look up
+
+        Returns:
+            list: Matching symbols, with those in the current file first
+        """
+        if self._symbol_index is None:
+            return []
+
+        matches = self._symbol_index.find_definition(name)
+        return sorted(
+            matches, key=lambda symbol: symbol.file_path != self._current_file
+        )
+
+    def go_to_line(self, line_number: int) -> bool:
+        """
+        Move the cursor to a line and scroll it into view.
+
+        Args:
+            line_number: 1-based line number
+
+        Returns:
+            bool: True if the line exists and the cursor was moved
+        """
+        document = self._text_edit.document()
+        if document is None or line_number < 1:
+            return False
+
+        block = document.findBlockByLineNumber(line_number - 1)
+        if not block.isValid():
+            return False
+
+        cursor = self._text_edit.textCursor()
+        cursor.setPosition(block.position())
+        self._text_edit.setTextCursor(cursor)
+        self._text_edit.ensureCursorVisible()
+        return True
+
+    def go_to_definition(self, name: str) -> bool:
+        """
+        Jump to the definition of a symbol, opening its file if needed.
+
+        Args:
+            name: Name of the function, class or import to jump to
+
+        Returns:
+            bool: True if a definition was found and shown
+        """
+        for symbol in self.find_definition(name):
+            if symbol.file_path is None:
+                continue
+            if symbol.file_path != self._current_file and not self.load_file(
+                symbol.file_path
+            ):
+                continue
+            return self.go_to_line(symbol.line)
+        return False
+
     def get_last_load_error(self) -> dict | None:
         """
         Get detailed information about the last file loading error.
@@ -10,9 +10,10 @@ This module provides comprehensive file change detection including:
 
 from __future__ import annotations
 
-import difflib
 import re
+import threading
 import time
+from contextlib import suppress
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -29,7 +30,10 @@ except ImportError:
     FileSystemEventHandler = object
     FileSystemEvent = object
 
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from .line_diff import DEFAULT_MAX_COST, LazyUnifiedDiff, diff_lines
+from .symbol_index import SymbolIndex, SymbolTable
 
 
 class ChangeType(Enum):
@@ -146,25 +150,20 @@ class FileChangeFilter:
 class FileChangeAnalyzer:
     """Analyzes file changes to extract meaningful information."""
 
-    def __init__(self):
-        """Initialize the file change analyzer."""
-        self.code_patterns = {
-            "function": [
-                r"def\s+(\w+)\s*\(",
-                r"function\s+(\w+)\s*\(",
-                r"(\w+)\s*=\s*function\s*\(",
-                r"(\w+)\s*=>\s*",
-            ],
-            "class": [
-                r"class\s+(\w+)\s*[\(\:]",
-                r"interface\s+(\w+)\s*\{",
-            ],
-            "import": [
-                r"from\s+(\S+)\s+import",
-                r"import\s+(\S+)",
-                r'require\s*\(\s*[\'"]([^\'"]+)[\'"]',
-            ],
-        }
+    def __init__(
+        self,
+        symbol_index: SymbolIndex | None = None,
+        max_diff_cost: int = DEFAULT_MAX_COST,
+    ):
+        """
+        Initialize the file change analyzer.
+
+        Args:
+            symbol_index: Optional shared symbol index to keep up to date
+            max_diff_cost: Work budget for exact line counts before estimating
+        """
+        self.symbol_index = symbol_index if symbol_index is not None else SymbolIndex()
+        self.max_diff_cost = max_diff_cost
 
     def analyze_change(
         self,
@@ -254,7 +253,9 @@ class FileChangeAnalyzer:
     def _analyze_creation(self, file_path: Path, content: str) -> dict[str, Any]:
         """Analyze file creation."""
         lines = content.splitlines() if content else []
-        code_elements = self._extract_code_elements(content or "")
+        code_elements = self._elements_from_table(
+            self.symbol_index.update_file(file_path, content or "")
+        )
 
         return {
             "lines_added": len(lines),
@@ -273,7 +274,11 @@ class FileChangeAnalyzer:
     def _analyze_deletion(self, file_path: Path, content: str) -> dict[str, Any]:
         """Analyze file deletion."""
         lines = content.splitlines() if content else []
-        code_elements = self._extract_code_elements(content or "")
+        table = self.symbol_index.get_file_symbols(file_path, content or "")
+        if table is None:
+            table = self.symbol_index.build_table(content or "", file_path)
+        self.symbol_index.remove_file(file_path)
+        code_elements = self._elements_from_table(table)
 
         return {
             "lines_removed": len(lines),
@@ -296,25 +301,24 @@ class FileChangeAnalyzer:
         old_lines = old_content.splitlines() if old_content else []
         new_lines = new_content.splitlines() if new_content else []
 
-        diff = list(
-            difflib.unified_diff(
-                old_lines,
-                new_lines,
-                fromfile=f"a/{file_path.name}",
-                tofile=f"b/{file_path.name}",
-                lineterm="",
-            )
+        # Counts come from a hashed-line Myers pass; the diff text itself is
+        # only rendered if a consumer reads diff_lines
+        line_diff = diff_lines(old_lines, new_lines, max_cost=self.max_diff_cost)
+        lines_added = line_diff.lines_added
+        lines_removed = line_diff.lines_removed
+        diff = LazyUnifiedDiff(
+            line_diff, fromfile=f"a/{file_path.name}", tofile=f"b/{file_path.name}"
         )
 
-        lines_added = sum(
-            1 for line in diff if line.startswith("+") and not line.startswith("+++")
-        )
-        lines_removed = sum(
-            1 for line in diff if line.startswith("-") and not line.startswith("---")
-        )
+        # Reuse the indexed table for the old content when it is still current,
+        # so only the new content needs to be parsed
+        old_table = self.symbol_index.get_file_symbols(file_path, old_content or "")
+        if old_table is None:
+            old_table = self.symbol_index.build_table(old_content or "", file_path)
+        new_table = self.symbol_index.update_file(file_path, new_content or "")
 
-        old_elements = self._extract_code_elements(old_content or "")
-        new_elements = self._extract_code_elements(new_content or "")
+        old_elements = self._elements_from_table(old_table)
+        new_elements = self._elements_from_table(new_table)
 
         functions_added = len(new_elements["functions"]) - len(
             old_elements["functions"]
@@ -361,7 +365,7 @@ class FileChangeAnalyzer:
         return {
             "lines_added": lines_added,
             "lines_removed": lines_removed,
-            "lines_changed": min(lines_added, lines_removed),
+            "lines_changed": line_diff.lines_changed,
             "diff_lines": diff,
             "summary": " ".join(summary_parts),
             "code_elements": {
@@ -374,25 +378,25 @@ class FileChangeAnalyzer:
             },
         }
 
-    def _extract_code_elements(self, content: str) -> dict[str, list[str]]:
+    def _extract_code_elements(
+        self, content: str, file_path: Path | None = None
+    ) -> dict[str, list[str]]:
         """Extract code elements (functions, classes, imports) from content."""
-        elements = {"functions": [], "classes": [], "imports": []}
-
-        # Map singular pattern keys to plural element keys
-        key_mapping = {"function": "functions", "class": "classes", "import": "imports"}
-
         try:
-            for element_type, patterns in self.code_patterns.items():
-                element_key = key_mapping.get(element_type, element_type)
-                for pattern in patterns:
-                    matches = re.findall(pattern, content, re.MULTILINE)
-                    if matches:
-                        elements[element_key].extend(matches)
+            return self._elements_from_table(
+                self.symbol_index.build_table(content, file_path)
+            )
         except Exception:
-            # Don't let regex errors break the analysis
-            pass
+            # Don't let extraction errors break the analysis
+            return {"functions": [], "classes": [], "imports": []}
 
-        return elements
+    def _elements_from_table(self, table: SymbolTable) -> dict[str, list[str]]:
+        """Convert a symbol table into element name lists."""
+        return {
+            "functions": table.functions,
+            "classes": table.classes,
+            "imports": table.imports,
+        }
 
     def _format_code_elements_summary(
         self, elements: dict[str, list[str]], action: str
@@ -532,19 +536,82 @@ else:
             self.detector = detector
 
 
+class ChangeAnalysisTask(QRunnable):
+    """Runs change analysis for a single event on a worker thread."""
+
+    def __init__(
+        self,
+        analyzer: FileChangeAnalyzer,
+        event: FileChangeEvent,
+        is_current: Any,
+        on_finished: Any,
+        on_failed: Any,
+    ):
+        """
+        Initialize the analysis task.
+
+        Args:
+            analyzer: Analyzer used to inspect the change
+            event: File change event to analyze
+            is_current: Callable returning False once the event is superseded
+            on_finished: Callable receiving (event, analysis) on success
+            on_failed: Callable receiving (event, error message) on failure
+        """
+        super().__init__()
+        self.analyzer = analyzer
+        self.event = event
+        self._is_current = is_current
+        self._on_finished = on_finished
+        self._on_failed = on_failed
+
+    def run(self) -> None:
+        """Analyze the change and post the result back."""
+        try:
+            # Skip work for events superseded while waiting in the pool
+            if not self._is_current(self.event):
+                return
+
+            analysis = self.analyzer.analyze_change(
+                self.event.file_path, self.event.old_content, self.event.new_content
+            )
+        except Exception as e:
+            self._post(self._on_failed, str(e))
+            return
+
+        self._post(self._on_finished, analysis)
+
+    def _post(self, callback: Any, result: Any) -> None:
+        """Deliver a result, tolerating a detector that was already destroyed."""
+        # Exceptions must not escape a worker thread
+        with suppress(RuntimeError):
+            callback(self.event, result)
+
+
 class FileChangeDetector(QObject):
     """Main file change detector that coordinates all components."""
 
     # Qt signals
     file_changed = pyqtSignal(FileChangeEvent)
 
-    def __init__(self, watch_directory: Path, parent: QObject | None = None):
+    # Internal signals used to hand worker results back to the detector's thread
+    _analysis_finished = pyqtSignal(object, object)
+    _analysis_failed = pyqtSignal(object, str)
+
+    def __init__(
+        self,
+        watch_directory: Path,
+        parent: QObject | None = None,
+        symbol_index: SymbolIndex | None = None,
+        max_workers: int = 1,
+    ):
         """
         Initialize the file change detector.
 
         Args:
             watch_directory: Directory to watch for changes
             parent: Optional parent QObject
+            symbol_index: Optional shared symbol index fed by detected changes
+            max_workers: Number of threads used for change analysis
         """
         super().__init__(parent)
 
@@ -553,7 +620,7 @@ class FileChangeDetector(QObject):
 
         # Initialize components
         self.file_filter = FileChangeFilter()
-        self.analyzer = FileChangeAnalyzer()
+        self.analyzer = FileChangeAnalyzer(symbol_index)
 
         # Watchdog components
         self.observer = None
@@ -562,8 +629,18 @@ class FileChangeDetector(QObject):
         # File tree integration
         self._file_tree_widget = None
 
-        # Event processing queue to avoid overwhelming the system
+        # Event processing queue, filled from the watchdog thread
         self._event_queue: list[FileChangeEvent] = []
+        self._queue_lock = threading.Lock()
+
+        # Analysis runs on a dedicated pool; the latest task per path wins.
+        # One worker by default keeps symbol index updates in event order.
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(max(1, max_workers))
+        self._pending_events: dict[str, FileChangeEvent] = {}
+        self._analysis_finished.connect(self._on_analysis_finished)
+        self._analysis_failed.connect(self._on_analysis_failed)
+
         self._processing_timer = QTimer()
         self._processing_timer.timeout.connect(self._process_event_queue)
         self._processing_timer.setInterval(100)  # Process every 100ms
@@ -572,6 +649,11 @@ class FileChangeDetector(QObject):
         self._test_mode = False
         self._immediate_emit = False
 
+    @property
+    def symbol_index(self) -> SymbolIndex:
+        """Get the symbol index maintained from detected changes."""
+        return self.analyzer.symbol_index
+
     def start_watching(self) -> None:
         """Start watching for file changes."""
         if self.is_watching:
@@ -610,6 +692,7 @@ class FileChangeDetector(QObject):
 
         try:
             self._processing_timer.stop()
+            self.cancel_pending_analysis()
 
             if self.observer:
                 self.observer.stop()
@@ -676,10 +759,34 @@ class FileChangeDetector(QObject):
         except Exception as e:
             print(f"Error triggering test file event for {file_path}: {e}")
 
+    def cancel_pending_analysis(self) -> None:
+        """Drop queued events and cancel analysis that has not reported yet."""
+        with self._queue_lock:
+            self._event_queue.clear()
+
+        # Queued tasks see they are no longer current and return immediately
+        self._pending_events.clear()
+
+    def wait_for_analysis(self, timeout_ms: int = -1) -> bool:
+        """
+        Block until all submitted analysis tasks have run.
+
+        Results are delivered through queued signals, so the Qt event loop
+        must still be processed afterwards for file_changed to be emitted.
+
+        Args:
+            timeout_ms: Maximum time to wait, or -1 to wait indefinitely
+
+        Returns:
+            True if all tasks finished within the timeout
+        """
+        return self._thread_pool.waitForDone(timeout_ms)
+
     def _emit_change_event(self, event: FileChangeEvent) -> None:
         """Emit a file change event (called by FileSystemWatcher)."""
         # Add to queue for batch processing
-        self._event_queue.append(event)
+        with self._queue_lock:
+            self._event_queue.append(event)
 
         # For immediate processing in tests, also emit directly
         # This helps with Qt signal spy tests
@@ -700,31 +807,51 @@ class FileChangeDetector(QObject):
                 print(f"Error emitting immediate event: {e}")
 
     def _process_event_queue(self) -> None:
-        """Process queued file change events."""
-        if not self._event_queue:
-            return
-
-        # Process events in batches to avoid overwhelming
-        batch_size = 10
-        batch = self._event_queue[:batch_size]
-        self._event_queue = self._event_queue[batch_size:]
+        """Hand queued file change events to the analysis pool."""
+        with self._queue_lock:
+            if not self._event_queue:
+                return
+            batch, self._event_queue = self._event_queue, []
 
         for event in batch:
-            try:
-                # Analyze the change
-                analysis = self.analyzer.analyze_change(
-                    event.file_path, event.old_content, event.new_content
-                )
+            self._submit_analysis(event)
+
+    def _submit_analysis(self, event: FileChangeEvent) -> None:
+        """Start analyzing an event, superseding older work for the same path."""
+        self._pending_events[str(event.file_path)] = event
+        task = ChangeAnalysisTask(
+            self.analyzer,
+            event,
+            self._is_current_event,
+            self._analysis_finished.emit,
+            self._analysis_failed.emit,
+        )
+        self._thread_pool.start(task)
 
-                # Add analysis to event metadata
-                for key, value in analysis.items():
-                    event.metadata[key] = value
+    def _is_current_event(self, event: FileChangeEvent) -> bool:
+        """Check whether an event is still the latest one for its path."""
+        return self._pending_events.get(str(event.file_path)) is event
 
-                # Emit the signal
-                self.file_changed.emit(event)
+    def _on_analysis_finished(
+        self, event: FileChangeEvent, analysis: dict[str, Any]
+    ) -> None:
+        """Attach analysis results to the event and emit it."""
+        # A newer event for this path may have arrived while the task ran
+        if not self._is_current_event(event):
+            return
+        del self._pending_events[str(event.file_path)]
 
-            except Exception as e:
-                print(f"Error processing file change event: {e}")
+        # Add analysis to event metadata
+        for key, value in analysis.items():
+            event.metadata[key] = value
+
+        self.file_changed.emit(event)
+
+    def _on_analysis_failed(self, event: FileChangeEvent, error: str) -> None:
+        """Report a failed analysis and forget the event."""
+        if self._is_current_event(event):
+            del self._pending_events[str(event.file_path)]
+        print(f"Error processing file change event: {error}")
 
     def _on_file_selected(self, file_path: Path) -> None:
         """Handle file selection from file tree."""
@@ -0,0 +1,402 @@
+"""
+Line diff engine for fast change analysis on large files.
+
+This module provides a line-based diff used by the file change analyzer:
+- Lines are interned to integer hashes so comparisons are cheap
+- Common prefixes and suffixes are trimmed before diffing
+- A Myers O(ND) pass counts additions and removals without building a diff
+- A line cutoff and a work budget bound the cost on large or rewritten files
+- The unified diff text is only produced when a consumer asks for it
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import overload
+
+# Upper bound on Myers diagonal steps before falling back to estimated counts
+DEFAULT_MAX_COST = 200_000
+
+# Changed regions with more lines than this (old plus new) are estimated
+# without attempting the Myers pass at all
+DEFAULT_MAX_LINES = 20_000
+
+Opcode = tuple[str, int, int, int, int]
+
+
+def _intern_lines(
+    old_lines: Sequence[str], new_lines: Sequence[str]
+) -> tuple[list[int], list[int]]:
+    """Map each distinct line to a small integer so comparisons are O(1)."""
+    ids: dict[str, int] = {}
+    old_ids = [ids.setdefault(line, len(ids)) for line in old_lines]
+    new_ids = [ids.setdefault(line, len(ids)) for line in new_lines]
+    return old_ids, new_ids
+
+
+def _common_affixes(a: Sequence[int], b: Sequence[int]) -> tuple[int, int]:
+    """Return the lengths of the common prefix and suffix of two sequences."""
+    limit = min(len(a), len(b))
+    prefix = 0
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+
+    return prefix, suffix
+
+
+def _myers(
+    a: Sequence[int], b: Sequence[int], max_cost: int, keep_trace: bool
+) -> tuple[int, list[list[int]]] | None:
+    """Run the greedy Myers algorithm.
+
+    Args:
+        a: Old sequence
+        b: New sequence
+        max_cost: Maximum number of diagonals to explore
+        keep_trace: Whether to record the frontier for backtracking
+
+    Returns:
+        The edit distance and the recorded trace, or None if over budget
+    """
+    n, m = len(a), len(b)
+    max_d = n + m
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace: list[list[int]] = []
+    cost = 0
+
+    for d in range(max_d + 1):
+        if keep_trace:
+            # Only diagonals -d-1..d+1 are read when backtracking step d
+            trace.append(v[offset - d - 1 : offset + d + 2])
+
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return d, trace
+
+        cost += d + 1
+        if cost > max_cost:
+            return None
+
+    return max_d, trace
+
+
+def _backtrack(n: int, m: int, trace: list[list[int]]) -> list[str]:
+    """Recover the per-line edit script from a Myers trace."""
+    moves: list[str] = []
+    x, y = n, m
+
+    for d in range(len(trace) - 1, -1, -1):
+        window = trace[d]
+        k = x - y
+        # window[i] holds the frontier for diagonal i - d - 1
+        if k == -d or (k != d and window[k + d] < window[k + d + 2]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = window[prev_k + d + 1]
+        prev_y = prev_x - prev_k
+
+        while x > prev_x and y > prev_y:
+            moves.append("equal")
+            x -= 1
+            y -= 1
+
+        if d > 0:
+            moves.append("insert" if x == prev_x else "delete")
+
+        x, y = prev_x, prev_y
+
+    moves.reverse()
+    return moves
+
+
+def _moves_to_opcodes(moves: list[str], i: int = 0, j: int = 0) -> list[Opcode]:
+    """Collapse single-line moves into difflib-style opcodes."""
+    opcodes: list[Opcode] = []
+
+    for move in moves:
+        if move == "equal":
+            di, dj, tag = 1, 1, "equal"
+        elif move == "delete":
+            di, dj, tag = 1, 0, "delete"
+        else:
+            di, dj, tag = 0, 1, "insert"
+
+        if opcodes:
+            last_tag, i1, i2, j1, j2 = opcodes[-1]
+            if last_tag == tag or (last_tag != "equal" and tag != "equal"):
+                merged = tag if last_tag == tag else "replace"
+                opcodes[-1] = (merged, i1, i2 + di, j1, j2 + dj)
+                i += di
+                j += dj
+                continue
+
+        opcodes.append((tag, i, i + di, j, j + dj))
+        i += di
+        j += dj
+
+    return opcodes
+
+
+def _group_opcodes(opcodes: list[Opcode], context: int) -> Iterator[list[Opcode]]:
+    """Group opcodes into hunks with surrounding context lines."""
+    if not opcodes:
+        opcodes = [("equal", 0, 1, 0, 1)]
+
+    # Trim leading and trailing context
+    if opcodes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = opcodes[0]
+        opcodes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if opcodes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = opcodes[-1]
+        opcodes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    span = context + context
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        # Split long unchanged runs into separate hunks
+        if tag == "equal" and i2 - i1 > span:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a hunk range in unified diff notation."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+@dataclass
+class LineDiff:
+    """Result of diffing two versions of a file."""
+
+    old_lines: Sequence[str]
+    new_lines: Sequence[str]
+    lines_added: int = 0
+    lines_removed: int = 0
+    approximate: bool = False
+    _opcodes: list[Opcode] | None = field(default=None, repr=False)
+
+    @property
+    def lines_changed(self) -> int:
+        """Number of lines that were modified in place."""
+        return min(self.lines_added, self.lines_removed)
+
+    def unified_diff(
+        self,
+        fromfile: str = "",
+        tofile: str = "",
+        context: int = 3,
+        max_cost: int = DEFAULT_MAX_COST,
+    ) -> list[str]:
+        """Produce the unified diff text for this change.
+
+        Args:
+            fromfile: Label for the old version
+            tofile: Label for the new version
+            context: Number of unchanged lines around each hunk
+            max_cost: Work budget for computing the edit script
+
+        Returns:
+            Diff lines without trailing newlines, as difflib with lineterm=""
+        """
+        # Counts were already estimated, so the search would only fail again
+        opcodes = None if self.approximate else self._get_opcodes(max_cost)
+        if opcodes is None:
+            return [
+                f"--- {fromfile}",
+                f"+++ {tofile}",
+                f"@@ diff omitted: +{self.lines_added}/-{self.lines_removed} "
+                f"lines (approximate) @@",
+            ]
+
+        diff: list[str] = []
+        for group in _group_opcodes(opcodes, context):
+            if not diff:
+                diff.append(f"--- {fromfile}")
+                diff.append(f"+++ {tofile}")
+
+            first, last = group[0], group[-1]
+            old_range = _format_range(first[1], last[2])
+            new_range = _format_range(first[3], last[4])
+            diff.append(f"@@ -{old_range} +{new_range} @@")
+
+            for tag, i1, i2, j1, j2 in group:
+                if tag == "equal":
+                    diff.extend(" " + line for line in self.old_lines[i1:i2])
+                    continue
+                if tag in ("replace", "delete"):
+                    diff.extend("-" + line for line in self.old_lines[i1:i2])
+                if tag in ("replace", "insert"):
+                    diff.extend("+" + line for line in self.new_lines[j1:j2])
+
+        return diff
+
+    def _get_opcodes(self, max_cost: int) -> list[Opcode] | None:
+        """Compute and cache the edit script as opcodes."""
+        if self._opcodes is not None:
+            return self._opcodes
+
+        a, b = _intern_lines(self.old_lines, self.new_lines)
+        prefix, suffix = _common_affixes(a, b)
+        middle_a = a[prefix : len(a) - suffix]
+        middle_b = b[prefix : len(b) - suffix]
+
+        result = _myers(middle_a, middle_b, max_cost, keep_trace=True)
+        if result is None:
+            return None
+
+        _, trace = result
+        moves = ["equal"] * prefix
+        moves.extend(_backtrack(len(middle_a), len(middle_b), trace))
+        moves.extend(["equal"] * suffix)
+        self._opcodes = _moves_to_opcodes(moves)
+        return self._opcodes
+
+
+class LazyUnifiedDiff(Sequence[str]):
+    """Read-only sequence of unified diff lines computed on first access."""
+
+    def __init__(
+        self, line_diff: LineDiff, fromfile: str = "", tofile: str = ""
+    ) -> None:
+        """
+        Initialize the lazy diff view.
+
+        Args:
+            line_diff: Diff result to render
+            fromfile: Label for the old version
+            tofile: Label for the new version
+        """
+        self._line_diff = line_diff
+        self._fromfile = fromfile
+        self._tofile = tofile
+        self._lines: list[str] | None = None
+
+    @property
+    def is_materialized(self) -> bool:
+        """Check whether the diff text has been generated yet."""
+        return self._lines is not None
+
+    def _materialize(self) -> list[str]:
+        """Generate the diff text once and cache it."""
+        if self._lines is None:
+            self._lines = self._line_diff.unified_diff(self._fromfile, self._tofile)
+        return self._lines
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        """Get a diff line or slice of lines."""
+        return self._materialize()[index]
+
+    def __len__(self) -> int:
+        """Get the number of diff lines."""
+        return len(self._materialize())
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over diff lines."""
+        return iter(self._materialize())
+
+    def __eq__(self, other: object) -> bool:
+        """Compare diff lines with another sequence."""
+        if isinstance(other, LazyUnifiedDiff | list):
+            return self._materialize() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Describe the diff without forcing it to be generated."""
+        state = "materialized" if self.is_materialized else "pending"
+        return f"LazyUnifiedDiff({self._fromfile!r}, {self._tofile!r}, {state})"
+
+
+def diff_lines(
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    max_cost: int = DEFAULT_MAX_COST,
+    max_lines: int = DEFAULT_MAX_LINES,
+) -> LineDiff:
+    """Count added and removed lines between two versions of a file.
+
+    Uses a Myers diff over hashed lines when the changed region is small
+    enough and the work fits in the budget, otherwise falls back to a linear
+    multiset comparison of the lines.
+
+    Args:
+        old_lines: Lines of the old version
+        new_lines: Lines of the new version
+        max_cost: Work budget for the Myers pass
+        max_lines: Largest changed region, in old plus new lines, to search
+
+    Returns:
+        LineDiff with counts; diff text is produced on demand
+    """
+    a, b = _intern_lines(old_lines, new_lines)
+    prefix, suffix = _common_affixes(a, b)
+    middle_a = a[prefix : len(a) - suffix]
+    middle_b = b[prefix : len(b) - suffix]
+    n, m = len(middle_a), len(middle_b)
+
+    if n == 0 or m == 0:
+        # Pure insertion or deletion needs no search
+        return LineDiff(old_lines, new_lines, lines_added=m, lines_removed=n)
+
+    result = (
+        _myers(middle_a, middle_b, max_cost, keep_trace=False)
+        if n + m <= max_lines
+        else None
+    )
+    if result is not None:
+        distance, _ = result
+        # D = inserts + deletes and n - m = deletes - inserts
+        return LineDiff(
+            old_lines,
+            new_lines,
+            lines_added=(distance - n + m) // 2,
+            lines_removed=(distance + n - m) // 2,
+        )
+
+    # Too large or over budget: count lines whose multiplicity changed
+    old_counts = Counter(middle_a)
+    new_counts = Counter(middle_b)
+    return LineDiff(
+        old_lines,
+        new_lines,
+        lines_added=sum((new_counts - old_counts).values()),
+        lines_removed=sum((old_counts - new_counts).values()),
+        approximate=True,
+    )
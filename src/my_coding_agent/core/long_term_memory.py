@@ -0,0 +1,187 @@
+"""
+Long-term memory recall backed by the local vector index.
+
+This module provides persistent, offline memory storage including:
+- Storing memories with a type and importance score
+- Batched embedding when many memories are stored at once
+- Recall ranked by similarity to the query and by importance
+- Filtering recalled memories by type
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from .vector_index import EmbeddingFunction, VectorIndex
+
+
+class LongTermMemoryStore:
+    """Stores long-term memories and recalls the ones relevant to a query."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        embedding_function: EmbeddingFunction | None = None,
+        importance_weight: float = 0.2,
+        **index_options: Any,  # noqa: ANN401
+    ) -> None:
+        """
+        Open or create a memory store.
+
+        Args:
+            directory: Directory holding the vector index
+            embedding_function: Embeds memory texts, defaults to the index's
+                hashing embedding
+            importance_weight: Weight of the importance score next to the
+                similarity when ranking recalled memories
+            **index_options: Further VectorIndex options, e.g. ivf_threshold
+        """
+        self.index = VectorIndex(directory, embedding_function, **index_options)
+        self.importance_weight = importance_weight
+
+    def __len__(self) -> int:
+        """Number of stored memories."""
+        return len(self.index)
+
+    def store(
+        self,
+        content: str,
+        memory_type: str = "user_info",
+        importance_score: float = 0.8,
+        metadata: dict[str, Any] | None = None,
+    ) -> str:
+        """
+        Store one memory.
+
+        Args:
+            content: Text of the memory
+            memory_type: Category such as "user_info" or "preference"
+            importance_score: Importance between 0 and 1
+            metadata: Additional data stored with the memory
+
+        Returns:
+            Id of the stored memory
+        """
+        return self.store_many(
+            [
+                {
+                    "content": content,
+                    "memory_type": memory_type,
+                    "importance_score": importance_score,
+                    "metadata": metadata or {},
+                }
+            ]
+        )[0]
+
+    def store_many(self, memories: list[dict[str, Any]]) -> list[str]:
+        """
+        Store several memories, embedding them in batches.
+
+        Args:
+            memories: Dicts with "content" and optionally "memory_type",
+                "importance_score", "metadata" and "id"
+
+        Returns:
+            Ids of the stored memories
+        """
+        ids = [memory.get("id") or str(uuid.uuid4()) for memory in memories]
+        now = time.time()
+        records = [
+            {
+                "content": memory["content"],
+                "memory_type": memory.get("memory_type", "user_info"),
+                "importance_score": memory.get("importance_score", 0.8),
+                "created_at": memory.get("created_at", now),
+                "metadata": memory.get("metadata", {}),
+            }
+            for memory in memories
+        ]
+        self.index.add(ids, [memory["content"] for memory in memories], records)
+        return ids
+
+    def _as_result(
+        self, memory_id: str, record: dict[str, Any], relevance: float | None
+    ) -> dict[str, Any]:
+        """Build the dict returned for a recalled memory."""
+        return {"id": memory_id, **record, "relevance": relevance}
+
+    def recall(
+        self, query: str = "", limit: int = 10, memory_type: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Recall the memories most relevant to a query.
+
+        Args:
+            query: Text to match; without one the most important memories
+                are returned
+            limit: Maximum number of memories
+            memory_type: Only return memories of this type
+
+        Returns:
+            Memory dicts with content, memory_type, importance_score,
+            created_at, metadata, id and relevance, best match first
+        """
+        if limit <= 0 or len(self.index) == 0:
+            return []
+
+        if not query.strip():
+            records = [
+                (memory_id, record)
+                for memory_id, record in self.index.items()
+                if memory_type is None or record["memory_type"] == memory_type
+            ]
+            records.sort(
+                key=lambda item: (item[1]["importance_score"], item[1]["created_at"]),
+                reverse=True,
+            )
+            return [self._as_result(*item, None) for item in records[:limit]]
+
+        # Over-fetch so importance and type filtering can still fill the limit
+        candidates = limit * 4
+        while True:
+            results = self.index.search(query, k=candidates)
+            if memory_type is not None:
+                results = [
+                    result
+                    for result in results
+                    if result.metadata["memory_type"] == memory_type
+                ]
+            if len(results) >= limit or candidates >= len(self.index):
+                break
+            candidates *= 4
+
+        ranked = sorted(
+            results,
+            key=lambda result: (
+                result.score
+                + self.importance_weight * result.metadata["importance_score"]
+            ),
+            reverse=True,
+        )
+        return [
+            self._as_result(result.id, result.metadata, result.score)
+            for result in ranked[:limit]
+        ]
+
+    def delete(self, memory_id: str) -> bool:
+        """
+        Delete a memory.
+
+        Args:
+            memory_id: Id of the memory
+
+        Returns:
+            True if the memory existed
+        """
+        return self.index.delete([memory_id]) == 1
+
+    def clear(self) -> None:
+        """Delete all memories."""
+        self.index.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get memory store statistics."""
+        return {"memories": len(self), **self.index.get_stats()}
@@ -8,200 +8,86 @@ and will later host the file tree and code viewer components.
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import os
-import threading
 import uuid
+from concurrent.futures import Future
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
 
 if TYPE_CHECKING:
+    from .ai_agent import AIAgent
     from .code_viewer import CodeViewerWidget
     from .file_tree import FileTreeWidget
+    from .mcp_client_coordinator import (
+        CancellationToken,
+        MCPClientCoordinator,
+        MCPResponse,
+    )
 
-from PyQt6.QtCore import QSettings, QSize, QThread, QTimer, pyqtSignal
+from PyQt6.QtCore import QObject, QSettings, QSize, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction, QCloseEvent, QKeySequence
 from PyQt6.QtWidgets import QApplication, QLabel, QMainWindow, QVBoxLayout
 
 from ..gui.chat_widget_v2 import SimplifiedChatWidget
-from .ai_agent import AIAgent, AIAgentConfig, MCPFileConfig
-from .ai_services.streaming_response_service import StreamingResponseService
-from .mcp_client_coordinator import MCPClientCoordinator, MCPCoordinatorConfig
+from .async_loop import QtFutureBridge
+from .symbol_index import SymbolIndex
 from .theme_manager import ThemeManager
 
 logger = logging.getLogger(__name__)
 
 
-class MCPWorkerThread(QThread):
-    """Worker thread for handling MCP requests asynchronously."""
+class MCPWorkerThread(QObject):
+    """Worker for handling MCP requests on the shared asyncio loop.
+
+    Keeps the start()/response_ready interface of the former QThread worker,
+    but runs the request on the persistent event loop instead of creating a
+    thread and event loop per message.
+    """
 
     response_ready = pyqtSignal(str, bool, str)  # content, success, error
 
-    def __init__(self, coordinator: MCPClientCoordinator, message: str) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        coordinator: MCPClientCoordinator,
+        message: str,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
         self.coordinator = coordinator
         self.message = message
+        self._bridge = QtFutureBridge(parent=self)
+        self._future: Future[Any] | None = None
+        self._cancel_token: CancellationToken | None = None
+
+    def start(self) -> None:
+        """Submit the MCP request to the shared event loop."""
+        from .mcp_client_coordinator import CancellationToken
+
+        self._cancel_token = CancellationToken()
+        self._future = self._bridge.submit(
+            self.coordinator.send_message(self.message, self._cancel_token),
+            on_result=self._on_response,
+            on_error=self._on_error,
+        )
 
-    def run(self) -> None:
-        """Execute the MCP request in the background thread."""
-        loop = None
-        try:
-            # Create event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            # Send message and get response
-            response = loop.run_until_complete(
-                self.coordinator.send_message(self.message)
-            )
-
-            # Emit success signal
-            self.response_ready.emit(response.content, True, "")
-
-        except Exception as e:
-            # Emit error signal
-            self.response_ready.emit("", False, str(e))
-        finally:
-            if loop:
-                loop.close()
-
-    def _initialize_mcp_connection(self) -> None:
-        """Initialize MCP connection asynchronously after GUI startup."""
-        if not self._mcp_coordinator:
-            return
-
-        def run_mcp_initialization():
-            """Run MCP connection initialization in a separate thread with event loop."""
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                logger.info("Connecting to MCP server...")
-                # Connect to MCP server
-                loop.run_until_complete(self._mcp_coordinator.connect())
-                logger.info("MCP server connected successfully")
-
-                # Update chat widget with connection status
-                if hasattr(self, "_chat_widget") and self._chat_widget:
-                    QTimer.singleShot(
-                        0,
-                        lambda: self._chat_widget.add_system_message(
-                            "Connected to MCP server successfully"
-                        ),
-                    )
-
-            except Exception as e:
-                error_msg = f"Failed to connect to MCP server: {e}"
-                logger.error(error_msg)
-                if hasattr(self, "_chat_widget") and self._chat_widget:
-                    # Capture the error message in the lambda to avoid variable scope issues
-                    error_message = f"MCP server connection failed: {str(e)}"
-                    QTimer.singleShot(
-                        0,
-                        lambda msg=error_message: self._chat_widget.add_system_message(
-                            msg
-                        ),
-                    )
-            finally:
-                loop.close()
-
-        # Start initialization in background thread
-        thread = threading.Thread(target=run_mcp_initialization, daemon=True)
-        thread.start()
-
-    def _handle_chat_message(self, message: str) -> None:
-        """Handle messages from the chat widget and generate MCP responses with streaming."""
-        if not self._mcp_coordinator:
-            # If no MCP coordinator, show a simple message
-            self._chat_widget.add_assistant_message(
-                "MCP client is not available. Please check configuration."
-            )
-            return
-
-        # Show thinking indicator
-        self._chat_widget.show_ai_thinking(animated=True)
-
-        # Start streaming MCP response asynchronously
-        QTimer.singleShot(10, lambda: self._start_streaming_response(message))
-
-    def _start_streaming_response(self, message: str) -> None:
-        """Start the streaming MCP response."""
-
-        # Create a new thread for the async operation
-        def run_async_response():
-            # Create a new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                # Run the streaming response
-                loop.run_until_complete(self._stream_mcp_response(message))
-            except Exception as error:
-                # Handle any errors - capture exception variable properly
-                self.streaming_error_signal.emit(error)
-            finally:
-                loop.close()
-
-        # Start the thread
-        thread = threading.Thread(target=run_async_response, daemon=True)
-        thread.start()
-
-    async def _stream_mcp_response(self, message: str) -> None:
-        """Generate streaming MCP response."""
-        logger.info(f"Starting MCP stream for message: '{message}'")
-
-        # Add None check for MCP coordinator
-        if not self._mcp_coordinator:
-            logger.error("No MCP coordinator available")
-            self.streaming_error_signal.emit(Exception("MCP coordinator not available"))
-            return
-
-        try:
-            logger.info("Hiding typing indicator and starting stream")
-            # Hide thinking indicator and start streaming response
-            QTimer.singleShot(0, lambda: self._chat_widget.hide_typing_indicator())
-
-            # Generate a unique stream ID
-            stream_id = str(uuid.uuid4())
-            logger.info(f"Stream ID: {stream_id}")
-
-            # Track response content
-            response_content = ""
-
-            # Start streaming response
-            self.start_streaming_signal.emit(stream_id)
-            _message_started = True
-
-            # Send message with streaming support
-            logger.info(
-                f"Sending message to MCP server. Message length: {len(message)}"
-            )
-
-            async for chunk in self._mcp_coordinator.send_message_streaming(message):
-                logger.info(
-                    f"Received chunk: content='{chunk.content}', complete={chunk.is_complete}"
-                )
-
-                # Accumulate response content
-                if chunk.content:
-                    response_content += chunk.content
-                    self.append_chunk_signal.emit(chunk.content)
+    def is_running(self) -> bool:
+        """Check whether the request is still in flight."""
+        return self._future is not None and not self._future.done()
 
-                # Check if streaming is complete
-                if chunk.is_complete:
-                    logger.info("Streaming response complete")
-                    self.complete_streaming_signal.emit()
-                    break
+    def cancel(self) -> None:
+        """Cancel the request if it has not finished."""
+        if self._cancel_token is not None:
+            self._cancel_token.cancel()
+        self._bridge.cancel_all()
 
-            logger.info(
-                f"MCP response completed. Total content length: {len(response_content)}"
-            )
+    def _on_response(self, response: MCPResponse) -> None:
+        """Emit the response content on the GUI thread."""
+        self.response_ready.emit(response.content, True, "")
 
-        except Exception as error:
-            # Handle any unexpected errors
-            logger.error(f"MCP streaming error: {error}")
-            self.streaming_error_signal.emit(error)
+    def _on_error(self, error: Exception) -> None:
+        """Emit the failure on the GUI thread."""
+        self.response_ready.emit("", False, str(error))
 
 
 class MainWindow(QMainWindow):
@@ -248,10 +134,16 @@ class MainWindow(QMainWindow):
         self._ai_agent: AIAgent | None = None
         self._chat_widget: SimplifiedChatWidget | None = None
 
+        # Shared symbol index for code navigation and agent lookups
+        self._symbol_index = SymbolIndex()
+
         # Initialize MCP coordinator
         self._mcp_coordinator: MCPClientCoordinator | None = None
         self._mcp_worker_thread: MCPWorkerThread | None = None
 
+        # All agent and MCP I/O runs on one persistent asyncio loop
+        self._async_bridge = QtFutureBridge(parent=self)
+
         # Set up the user interface
         self._setup_ui()
 
@@ -364,6 +256,7 @@ class MainWindow(QMainWindow):
         center_layout.setContentsMargins(5, 5, 5, 5)  # Small margins
 
         self._code_viewer = CodeViewerWidget()
+        self._code_viewer.set_symbol_index(self._symbol_index)
         center_layout.addWidget(self._code_viewer)
 
         # Apply current theme to code viewer if theme manager is available
@@ -691,6 +584,20 @@ class MainWindow(QMainWindow):
         # Save current window state before closing
         self.save_window_state()
 
+        # Stop any in-flight agent or MCP work on the shared event loop
+        bridge = getattr(self, "_async_bridge", None)
+        if bridge is not None:
+            bridge.cancel_all()
+
+        # Store queued conversation memory before the process exits
+        if getattr(self, "_ai_agent", None) is not None and bridge is not None:
+            try:
+                bridge.loop_thread.run_sync(
+                    self._ai_agent.close_memory_service(), timeout=10
+                )
+            except Exception as e:
+                logger.error(f"Failed to close memory service: {e}")
+
         # Accept the close event
         if a0 is not None:
             a0.accept()
@@ -699,6 +606,14 @@ class MainWindow(QMainWindow):
         """Set up AI integration and connect chat widget."""
         print("DEBUG: [MainWindow] Running _setup_ai_integration...")  # Debug statement
         try:
+            # The AI stack (pydantic-ai, fastmcp, aiohttp) is imported on first use
+            # so importing the window module stays cheap
+            from .ai_agent import AIAgent, AIAgentConfig, MCPFileConfig
+            from .ai_services.streaming_response_service import (
+                StreamingResponseService,
+            )
+            from .memory_service import MemoryContextService
+
             # Initialize AI agent with configuration
             print(
                 "DEBUG: [MainWindow] Initializing AIAgentConfig..."
@@ -729,27 +644,29 @@ class MainWindow(QMainWindow):
                 max_file_size=5 * 1024 * 1024,  # 5MB limit
             )
 
-            # Create and connect services
-            streaming_service = StreamingResponseService(enable_memory_awareness=True)
+            # Create and connect services; memory writes are persisted in the
+            # background so they stay off the chat turn's path
+            self._memory_service = MemoryContextService()
+            streaming_service = StreamingResponseService(
+                memory_system=self._memory_service, enable_memory_awareness=True
+            )
 
             # Initialize AI agent with MCP support and memory awareness
             self._ai_agent = AIAgent(
                 config=self._ai_config,
                 mcp_config=mcp_config,
                 streaming_response_service=streaming_service,
+                memory_context_service=self._memory_service,
                 enable_filesystem_tools=True,
                 enable_memory_awareness=True,
                 enable_mcp_tools=True,
                 auto_discover_mcp_servers=True,
                 signal_handler=self,  # Pass MainWindow as signal handler for MCP tool visualization
+                symbol_index=self._symbol_index,
             )
 
             # Set circular dependencies for services
             streaming_service._ai_messaging_service = self._ai_agent
-            if self._ai_agent.memory_context_service:
-                streaming_service._memory_system = (
-                    self._ai_agent.memory_context_service
-                )
 
             print("DEBUG: [MainWindow] AIAgent initialized.")  # Debug statement
 
@@ -793,66 +710,50 @@ class MainWindow(QMainWindow):
             self._ai_agent = None
 
     def _initialize_mcp_servers(self) -> None:
-        """Initialize MCP servers asynchronously after GUI startup."""
+        """Initialize MCP servers on the shared event loop after GUI startup."""
         if not self._ai_agent or not self._ai_agent.mcp_tools_enabled:
             return
 
-        def run_mcp_initialization():
-            """Run MCP server initialization in a separate thread with event loop."""
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        logger.info("Initializing MCP servers...")
+        self._async_bridge.submit(
+            self._ai_agent._connect_mcp_servers_on_startup(),
+            on_result=self._on_mcp_servers_initialized,
+            on_error=self._on_mcp_servers_failed,
+        )
 
-            try:
-                logger.info("Initializing MCP servers...")
-                # Connect to MCP servers using the startup method
-                loop.run_until_complete(
-                    self._ai_agent._connect_mcp_servers_on_startup()
-                )
-                logger.info("MCP servers initialized successfully")
-
-                # Update chat widget with MCP tool availability
-                if hasattr(self, "_chat_widget") and self._chat_widget:
-                    available_tools = self._ai_agent.get_available_tools()
-                    mcp_tools = [
-                        tool
-                        for tool in available_tools
-                        if not tool.startswith(
-                            (
-                                "read_file",
-                                "write_file",
-                                "list_directory",
-                                "create_directory",
-                                "get_file_info",
-                                "search_files",
-                            )
-                        )
-                    ]
-                    if mcp_tools:
-                        QTimer.singleShot(
-                            0,
-                            lambda: self._chat_widget.add_system_message(
-                                f"MCP tools are now available: {', '.join(mcp_tools)}"
-                            ),
-                        )
+    def _on_mcp_servers_initialized(self, _result: object) -> None:
+        """Report newly available MCP tools in the chat."""
+        logger.info("MCP servers initialized successfully")
+        if not self._ai_agent or not self._chat_widget:
+            return
 
-            except Exception as e:
-                error_msg = f"Failed to initialize MCP servers: {e}"
-                logger.error(error_msg)
-                if hasattr(self, "_chat_widget") and self._chat_widget:
-                    # Capture the error message in the lambda to avoid variable scope issues
-                    error_message = f"MCP server initialization failed: {str(e)}"
-                    QTimer.singleShot(
-                        0,
-                        lambda msg=error_message: self._chat_widget.add_system_message(
-                            msg
-                        ),
-                    )
-            finally:
-                loop.close()
+        available_tools = self._ai_agent.get_available_tools()
+        mcp_tools = [
+            tool
+            for tool in available_tools
+            if not tool.startswith(
+                (
+                    "read_file",
+                    "write_file",
+                    "list_directory",
+                    "create_directory",
+                    "get_file_info",
+                    "search_files",
+                )
+            )
+        ]
+        if mcp_tools:
+            self._chat_widget.add_system_message(
+                f"MCP tools are now available: {', '.join(mcp_tools)}"
+            )
 
-        # Start initialization in background thread
-        thread = threading.Thread(target=run_mcp_initialization, daemon=True)
-        thread.start()
+    def _on_mcp_servers_failed(self, error: Exception) -> None:
+        """Report a failed MCP server initialization in the chat."""
+        logger.error(f"Failed to initialize MCP servers: {error}")
+        if self._chat_widget:
+            self._chat_widget.add_system_message(
+                f"MCP server initialization failed: {str(error)}"
+            )
 
     def _handle_chat_message(self, message: str) -> None:
         """Handle messages from the chat widget and generate AI responses with streaming."""
@@ -888,27 +789,11 @@ class MainWindow(QMainWindow):
             "DEBUG: [MainWindow] _start_streaming_response_with_context called"
         )  # Debug statement
 
-        # Create a new thread for the async operation
-        def run_async_response():
-            logger.info(
-                "DEBUG: [MainWindow] run_async_response thread started"
-            )  # Debug statement
-            # Create a new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                # Run the streaming response with context
-                loop.run_until_complete(self._stream_ai_response_with_context(message))
-            except Exception as error:
-                # Handle any errors - capture exception variable properly
-                self.streaming_error_signal.emit(error)
-            finally:
-                loop.close()
-
-        # Start the thread
-        thread = threading.Thread(target=run_async_response, daemon=True)
-        thread.start()
+        # Run on the shared event loop so MCP clients stay bound to one loop
+        self._async_bridge.submit(
+            self._stream_ai_response_with_context(message),
+            on_error=self.streaming_error_signal.emit,
+        )
 
     async def _stream_ai_response_with_context(self, message: str) -> None:
         """Generate streaming AI response with conversation context."""
@@ -1031,17 +916,9 @@ class MainWindow(QMainWindow):
                 self._chat_widget._is_streaming = False
 
             # Start a new memory session to properly separate conversations
-            if (
-                hasattr(self, "_ai_agent")
-                and self._ai_agent
-                and hasattr(self._ai_agent, "_memory_system")
-                and self._ai_agent._memory_system
-            ):
-                try:
-                    self._ai_agent._memory_system.start_new_session()
-                    # Memory session started successfully
-                except Exception as e:
-                    logger.error(f"Failed to start new memory session: {e}")
+            if hasattr(self, "_ai_agent") and self._ai_agent:
+                if self._ai_agent.start_new_session() is None:
+                    logger.error("Failed to start new memory session")
             else:
                 logger.info(
                     "💾 AI agent's memory system will handle new conversation context"
@@ -1083,6 +960,11 @@ class MainWindow(QMainWindow):
         if self._ai_agent and self._ai_agent.mcp_tools_enabled:
             # Use a more robust check for attribute existence
             if not getattr(self, "_mcp_coordinator", None):
+                from .mcp_client_coordinator import (
+                    MCPClientCoordinator,
+                    MCPCoordinatorConfig,
+                )
+
                 mcp_config = MCPCoordinatorConfig(
                     mcp_server_url=os.getenv("MCP_SERVER_URL"),
                     mcp_timeout=int(os.getenv("MCP_TIMEOUT", 30)),
@@ -1091,6 +973,95 @@ class MainWindow(QMainWindow):
                 self._mcp_coordinator = MCPClientCoordinator(mcp_config)
                 self._initialize_mcp_connection()
 
+    def _initialize_mcp_connection(self) -> None:
+        """Connect the MCP coordinator on the shared event loop."""
+        if not self._mcp_coordinator:
+            return
+
+        logger.info("Connecting to MCP server...")
+        self._async_bridge.submit(
+            self._mcp_coordinator.connect(),
+            on_result=self._on_mcp_connected,
+            on_error=self._on_mcp_connection_failed,
+        )
+
+    def _on_mcp_connected(self, _result: object) -> None:
+        """Report a successful MCP connection in the chat."""
+        logger.info("MCP server connected successfully")
+        if self._chat_widget:
+            self._chat_widget.add_system_message("Connected to MCP server successfully")
+
+    def _on_mcp_connection_failed(self, error: Exception) -> None:
+        """Report a failed MCP connection in the chat."""
+        logger.error(f"Failed to connect to MCP server: {error}")
+        if self._chat_widget:
+            self._chat_widget.add_system_message(
+                f"MCP server connection failed: {str(error)}"
+            )
+
+    def _start_streaming_response(self, message: str) -> None:
+        """Start the streaming MCP response on the shared event loop."""
+        self._async_bridge.submit(
+            self._stream_mcp_response(message),
+            on_error=self.streaming_error_signal.emit,
+        )
+
+    async def _stream_mcp_response(self, message: str) -> None:
+        """Generate streaming MCP response."""
+        logger.info(f"Starting MCP stream for message: '{message}'")
+
+        # Add None check for MCP coordinator
+        if not self._mcp_coordinator:
+            logger.error("No MCP coordinator available")
+            self.streaming_error_signal.emit(Exception("MCP coordinator not available"))
+            return
+
+        try:
+            logger.info("Hiding typing indicator and starting stream")
+            # Hide thinking indicator and start streaming response
+            QTimer.singleShot(0, lambda: self._chat_widget.hide_typing_indicator())
+
+            # Generate a unique stream ID
+            stream_id = str(uuid.uuid4())
+            logger.info(f"Stream ID: {stream_id}")
+
+            # Track response content
+            response_content = ""
+
+            # Start streaming response
+            self.start_streaming_signal.emit(stream_id)
+            _message_started = True
+
+            # Send message with streaming support
+            logger.info(
+                f"Sending message to MCP server. Message length: {len(message)}"
+            )
+
+            async for chunk in self._mcp_coordinator.send_message_streaming(message):
+                logger.info(
+                    f"Received chunk: content='{chunk.content}', complete={chunk.is_complete}"
+                )
+
+                # Accumulate response content
+                if chunk.content:
+                    response_content += chunk.content
+                    self.append_chunk_signal.emit(chunk.content)
+
+                # Check if streaming is complete
+                if chunk.is_complete:
+                    logger.info("Streaming response complete")
+                    self.complete_streaming_signal.emit()
+                    break
+
+            logger.info(
+                f"MCP response completed. Total content length: {len(response_content)}"
+            )
+
+        except Exception as error:
+            # Handle any unexpected errors
+            logger.error(f"MCP streaming error: {error}")
+            self.streaming_error_signal.emit(error)
+
     def _connect_streaming_signals(self) -> None:
         """Connect streaming signals between main window and chat widget."""
         if not self._chat_widget:
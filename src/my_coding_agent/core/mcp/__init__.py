@@ -10,41 +10,99 @@ This module provides comprehensive Model Context Protocol (MCP) support includin
 - Error handling and recovery
 """
 
-from .connection_manager import ConnectionEvent, ConnectionManager, ConnectionMetrics
-from .error_handler import (
-    CircuitBreakerState,
-    ErrorCategory,
-    ErrorRecoveryStrategy,
-    ErrorSeverity,
-    MCPCircuitBreaker,
-    MCPErrorContext,
-    MCPErrorHandler,
-    MCPErrorMetrics,
-)
-from .mcp_client import (
-    MCPClient,
-    MCPConnectionError,
-    MCPError,
-    MCPProtocolError,
-    MCPResource,
-    MCPTimeoutError,
-    MCPTool,
-)
-from .mcp_config import (
-    MCPConfig,
-    MCPServerConfig,
-    create_sample_config,
-    load_default_mcp_config,
-)
-from .oauth2_auth import (
-    OAuth2AuthenticationError,
-    OAuth2Authenticator,
-    OAuth2Config,
-    OAuth2Error,
-    OAuth2Token,
-    OAuth2TokenExpiredError,
-)
-from .server_registry import MCPServerRegistry, ServerStatus, ToolRegistry
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .connection_manager import (
+        ConnectionEvent,
+        ConnectionManager,
+        ConnectionMetrics,
+    )
+    from .error_handler import (
+        CircuitBreakerState,
+        ErrorCategory,
+        ErrorRecoveryStrategy,
+        ErrorSeverity,
+        MCPCircuitBreaker,
+        MCPErrorContext,
+        MCPErrorHandler,
+        MCPErrorMetrics,
+    )
+    from .mcp_client import (
+        MCPClient,
+        MCPConnectionError,
+        MCPError,
+        MCPProtocolError,
+        MCPResource,
+        MCPTimeoutError,
+        MCPTool,
+    )
+    from .mcp_config import (
+        MCPConfig,
+        MCPServerConfig,
+        create_sample_config,
+        load_default_mcp_config,
+    )
+    from .oauth2_auth import (
+        OAuth2AuthenticationError,
+        OAuth2Authenticator,
+        OAuth2Config,
+        OAuth2Error,
+        OAuth2Token,
+        OAuth2TokenCache,
+        OAuth2TokenExpiredError,
+    )
+    from .resilience import (
+        MCPBulkhead,
+        MCPBulkheadFullError,
+        MCPCallGuard,
+        MCPCircuitOpenError,
+    )
+    from .server_registry import MCPServerRegistry, ServerStatus, ToolRegistry
+
+# Submodules are imported on first attribute access (PEP 562) so that importing
+# one part of the package does not pull in fastmcp, aiohttp and friends.
+_LAZY_EXPORTS: dict[str, str] = {
+    "ConnectionEvent": ".connection_manager",
+    "ConnectionManager": ".connection_manager",
+    "ConnectionMetrics": ".connection_manager",
+    "CircuitBreakerState": ".error_handler",
+    "ErrorCategory": ".error_handler",
+    "ErrorRecoveryStrategy": ".error_handler",
+    "ErrorSeverity": ".error_handler",
+    "MCPCircuitBreaker": ".error_handler",
+    "MCPErrorContext": ".error_handler",
+    "MCPErrorHandler": ".error_handler",
+    "MCPErrorMetrics": ".error_handler",
+    "MCPClient": ".mcp_client",
+    "MCPConnectionError": ".mcp_client",
+    "MCPError": ".mcp_client",
+    "MCPProtocolError": ".mcp_client",
+    "MCPResource": ".mcp_client",
+    "MCPTimeoutError": ".mcp_client",
+    "MCPTool": ".mcp_client",
+    "MCPConfig": ".mcp_config",
+    "MCPServerConfig": ".mcp_config",
+    "create_sample_config": ".mcp_config",
+    "load_default_mcp_config": ".mcp_config",
+    "OAuth2AuthenticationError": ".oauth2_auth",
+    "OAuth2Authenticator": ".oauth2_auth",
+    "OAuth2Config": ".oauth2_auth",
+    "OAuth2Error": ".oauth2_auth",
+    "OAuth2Token": ".oauth2_auth",
+    "OAuth2TokenCache": ".oauth2_auth",
+    "OAuth2TokenExpiredError": ".oauth2_auth",
+    "MCPBulkhead": ".resilience",
+    "MCPBulkheadFullError": ".resilience",
+    "MCPCallGuard": ".resilience",
+    "MCPCircuitOpenError": ".resilience",
+    "MCPServerRegistry": ".server_registry",
+    "ServerStatus": ".server_registry",
+    "ToolRegistry": ".server_registry",
+}
 
 __all__ = [
     # Core client
@@ -56,6 +114,8 @@ __all__ = [
     "MCPConnectionError",
     "MCPProtocolError",
     "MCPTimeoutError",
+    "MCPCircuitOpenError",
+    "MCPBulkheadFullError",
     # Server registry
     "MCPServerRegistry",
     "ServerStatus",
@@ -72,6 +132,7 @@ __all__ = [
     # OAuth 2.0 authentication
     "OAuth2Config",
     "OAuth2Token",
+    "OAuth2TokenCache",
     "OAuth2Authenticator",
     "OAuth2Error",
     "OAuth2AuthenticationError",
@@ -85,4 +146,24 @@ __all__ = [
     "ErrorSeverity",
     "ErrorRecoveryStrategy",
     "CircuitBreakerState",
+    # Fault isolation
+    "MCPCallGuard",
+    "MCPBulkhead",
 ]
+
+
+def __getattr__(name: str) -> object:
+    """Import an exported name from its submodule on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including lazily exported names."""
+    return sorted(set(globals()) | set(__all__))
@@ -4,7 +4,7 @@ Connection lifecycle management for MCP clients.
 This module provides comprehensive connection lifecycle management including:
 - Automatic reconnection with exponential backoff
 - Connection state monitoring and recovery
-- Health checking and status monitoring
+- Traffic-aware health checking with adaptive probe scheduling
 - Graceful handling of transient network issues
 - Connection pooling and event emission
 """
@@ -12,6 +12,7 @@ This module provides comprehensive connection lifecycle management including:
 import asyncio
 import contextlib
 import logging
+import time
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -34,6 +35,16 @@ class ConnectionMetrics:
     reconnection_count: int = 0
     last_error: str | None = None
     status: str = "disconnected"  # disconnected, connecting, connected, degraded
+    last_activity: datetime | None = None
+    consecutive_failures: int = 0
+
+
+@dataclass
+class _HealthSchedule:
+    """Scheduling state for the next health probe of one client."""
+
+    next_check: float = 0.0  # time.monotonic() deadline
+    idle_checks: int = 0
 
 
 @dataclass
@@ -52,6 +63,13 @@ class ConnectionManager:
 
     Provides automatic reconnection, health monitoring, and graceful degradation
     for MCP client connections.
+
+    Health checks are scheduled per client rather than in fixed rounds.
+    Successful calls reported through record_activity() count as heartbeats,
+    idle clients are pinged with exponentially growing spacing, and failing
+    clients are probed on a separate, faster cadence. Clients that have never
+    connected are not pinged, so idle stdio servers are not spawned just to
+    check their health.
     """
 
     def __init__(self, config: dict[str, Any] | None = None):
@@ -63,6 +81,8 @@ class ConnectionManager:
         """
         self._clients: dict[str, list[MCPClient]] = {}  # server_name -> [clients]
         self._client_metrics: dict[MCPClient, ConnectionMetrics] = {}
+        self._schedules: dict[MCPClient, _HealthSchedule] = {}
+        self._schedule_changed: asyncio.Event | None = None
         self._event_listeners: dict[str, list[Callable]] = {}
         self._monitoring_task: asyncio.Task | None = None
         self._reconnection_tasks: dict[MCPClient, asyncio.Task] = {}
@@ -78,6 +98,9 @@ class ConnectionManager:
             "reconnection_backoff_base", 2.0
         )
         self._health_check_timeout: float = config.get("health_check_timeout", 10.0)
+        self._idle_backoff_factor: float = config.get("idle_backoff_factor", 2.0)
+        self._max_idle_interval: float = config.get("max_idle_interval", 300.0)
+        self._failure_probe_interval: float = config.get("failure_probe_interval", 5.0)
         self._transient_error_threshold: int = config.get(
             "transient_error_threshold", 3
         )
@@ -112,6 +135,24 @@ class ConnectionManager:
                 raise ValueError("reconnection_backoff_base must be greater than 1.0")
             self._reconnection_backoff_base = backoff
 
+        if "idle_backoff_factor" in config:
+            factor = config["idle_backoff_factor"]
+            if factor < 1.0:
+                raise ValueError("idle_backoff_factor must be at least 1.0")
+            self._idle_backoff_factor = factor
+
+        if "max_idle_interval" in config:
+            max_idle = config["max_idle_interval"]
+            if max_idle <= 0:
+                raise ValueError("max_idle_interval must be positive")
+            self._max_idle_interval = max_idle
+
+        if "failure_probe_interval" in config:
+            probe = config["failure_probe_interval"]
+            if probe <= 0:
+                raise ValueError("failure_probe_interval must be positive")
+            self._failure_probe_interval = probe
+
     def add_client(self, client: MCPClient) -> None:
         """
         Add a client to be managed by the connection manager.
@@ -127,6 +168,8 @@ class ConnectionManager:
         if client not in self._clients[server_name]:
             self._clients[server_name].append(client)
             self._client_metrics[client] = ConnectionMetrics()
+            self._schedules[client] = _HealthSchedule(next_check=time.monotonic())
+            self._wake_scheduler()
 
             logger.info(f"Added client for server: {server_name}")
             self.emit_event(
@@ -165,6 +208,7 @@ class ConnectionManager:
             # Clean up metrics
             if client in self._client_metrics:
                 del self._client_metrics[client]
+            self._schedules.pop(client, None)
 
             logger.info(f"Removed client for server: {server_name}")
             self.emit_event(
@@ -238,6 +282,11 @@ class ConnectionManager:
             "reconnection_count": metrics.reconnection_count,
         }
 
+    @property
+    def is_monitoring(self) -> bool:
+        """Check whether the health scheduler is running."""
+        return self._monitoring_task is not None
+
     async def start_monitoring(self) -> None:
         """Start connection monitoring task."""
         if self._monitoring_task is not None:
@@ -262,23 +311,127 @@ class ConnectionManager:
         self._monitoring_task = None
         logger.info("Stopped connection monitoring")
 
+    def record_activity(
+        self, client: MCPClient, success: bool = True, error: str | None = None
+    ) -> None:
+        """
+        Record the outcome of a real request made through a client.
+
+        A successful call is treated as a heartbeat and postpones the next
+        ping by a full monitoring interval. A failed call switches the client
+        to the fast-probe cadence so the failure is confirmed quickly.
+
+        Args:
+            client: Client that served the request
+            success: Whether the request succeeded at the transport level
+            error: Error message for a failed request
+        """
+        metrics = self._client_metrics.get(client)
+        schedule = self._schedules.get(client)
+        if metrics is None or schedule is None:
+            return
+
+        now = time.monotonic()
+        if success:
+            metrics.last_activity = datetime.now()
+            metrics.consecutive_failures = 0
+            if metrics.status != "connecting":
+                metrics.status = "connected"
+            schedule.idle_checks = 0
+            schedule.next_check = now + self._monitoring_interval
+            return
+
+        metrics.consecutive_failures += 1
+        if error is not None:
+            metrics.last_error = error
+        schedule.next_check = min(
+            schedule.next_check, now + self._get_probe_delay(metrics)
+        )
+        self._wake_scheduler()
+
+    def mark_disconnected(self, client: MCPClient) -> None:
+        """
+        Record that a client was disconnected on purpose.
+
+        The client is no longer pinged or reconnected until it reports
+        activity again.
+
+        Args:
+            client: Client that was disconnected
+        """
+        metrics = self._client_metrics.get(client)
+        if metrics is not None:
+            metrics.status = "disconnected"
+            metrics.consecutive_failures = 0
+
+        task = self._reconnection_tasks.pop(client, None)
+        if task is not None:
+            task.cancel()
+
+    def get_next_check_delay(self, client: MCPClient) -> float | None:
+        """
+        Get the seconds remaining until a client's next health probe.
+
+        Args:
+            client: Client to inspect
+
+        Returns:
+            Seconds until the next probe, or None if the client is not managed
+        """
+        schedule = self._schedules.get(client)
+        if schedule is None:
+            return None
+        return max(0.0, schedule.next_check - time.monotonic())
+
+    def _get_idle_delay(self, idle_checks: int) -> float:
+        """Spacing before the next ping of a healthy client with no traffic."""
+        exponent = max(idle_checks - 1, 0)
+        return min(
+            self._monitoring_interval * self._idle_backoff_factor**exponent,
+            max(self._max_idle_interval, self._monitoring_interval),
+        )
+
+    def _get_probe_delay(self, metrics: ConnectionMetrics) -> float:
+        """Spacing before the next probe of a failing client."""
+        exponent = max(metrics.consecutive_failures - 1, 0)
+        return min(
+            self._failure_probe_interval * self._reconnection_backoff_base**exponent,
+            max(self._monitoring_interval, self._failure_probe_interval),
+        )
+
+    def _wake_scheduler(self) -> None:
+        """Wake the monitoring loop so it recomputes its next deadline."""
+        if self._schedule_changed is not None:
+            self._schedule_changed.set()
+
     async def _monitoring_loop(self) -> None:
-        """Main monitoring loop."""
+        """Main monitoring loop, sleeping until the earliest probe is due."""
+        self._schedule_changed = asyncio.Event()
         while self._monitoring_running:
             try:
-                # Check health of all clients
-                tasks = []
-                for clients in self._clients.values():
-                    for client in clients:
-                        tasks.append(
-                            asyncio.create_task(self._check_client_health(client))
-                        )
-
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                self._schedule_changed.clear()
+                now = time.monotonic()
+                due = [
+                    client
+                    for client, schedule in self._schedules.items()
+                    if schedule.next_check <= now
+                ]
+                if due:
+                    await asyncio.gather(
+                        *(self._run_scheduled_check(client) for client in due),
+                        return_exceptions=True,
+                    )
 
-                # Wait for next monitoring cycle
-                await asyncio.sleep(self._monitoring_interval)
+                # Sleep until the next probe is due or the schedule changes
+                delay = self._max_idle_interval
+                if self._schedules:
+                    next_check = min(s.next_check for s in self._schedules.values())
+                    delay = min(delay, next_check - time.monotonic())
+                if delay > 0:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(
+                            self._schedule_changed.wait(), timeout=delay
+                        )
 
             except asyncio.CancelledError:
                 break
@@ -286,6 +439,57 @@ class ConnectionManager:
                 logger.error(f"Error in monitoring loop: {e}")
                 await asyncio.sleep(self._monitoring_interval)
 
+    async def _run_scheduled_check(self, client: MCPClient) -> None:
+        """
+        Probe a client that is due and schedule its next probe.
+
+        Args:
+            client: Client whose probe is due
+        """
+        schedule = self._schedules.get(client)
+        metrics = self._client_metrics.get(client)
+        if schedule is None or metrics is None:
+            return
+
+        # Don't probe while a reconnection is already in progress
+        reconnection = self._reconnection_tasks.get(client)
+        if reconnection is not None and not reconnection.done():
+            schedule.next_check = time.monotonic() + self._get_probe_delay(metrics)
+            return
+
+        # Never-connected clients are not started just to be pinged
+        if metrics.status == "disconnected" and not client.is_connected():
+            schedule.idle_checks += 1
+            schedule.next_check = time.monotonic() + self._get_idle_delay(
+                schedule.idle_checks
+            )
+            return
+
+        healthy = await self._check_client_health(client)
+        if client not in self._schedules:
+            return
+
+        if healthy:
+            metrics.consecutive_failures = 0
+            schedule.idle_checks += 1
+            delay = self._get_idle_delay(schedule.idle_checks)
+        else:
+            metrics.consecutive_failures += 1
+            schedule.idle_checks = 0
+            delay = self._get_probe_delay(metrics)
+        schedule.next_check = time.monotonic() + delay
+
+        self.emit_event(
+            "health_checked",
+            {
+                "client": client,
+                "event_type": "health_checked",
+                "server_name": client.server_name,
+                "healthy": healthy,
+                "next_check_in": delay,
+            },
+        )
+
     async def _check_client_health(self, client: MCPClient) -> bool:
         """
         Check health of a specific client.
@@ -485,6 +689,7 @@ class ConnectionManager:
         # Clear all data
         self._clients.clear()
         self._client_metrics.clear()
+        self._schedules.clear()
         self._reconnection_tasks.clear()
 
         logger.info("Connection manager shutdown complete")
@@ -587,4 +792,9 @@ class ConnectionManager:
             "active_reconnection_tasks": len(
                 [task for task in self._reconnection_tasks.values() if not task.done()]
             ),
+            "probing_clients": sum(
+                1
+                for metrics in self._client_metrics.values()
+                if metrics.consecutive_failures > 0
+            ),
         }
@@ -4,15 +4,16 @@ Comprehensive error handling and graceful degradation for MCP failures.
 This module provides:
 - Error categorization and severity assessment
 - Circuit breaker pattern for fault tolerance
-- Retry mechanisms with exponential backoff
+- Deadline-aware retries with jitter, retry budgets and hedging
 - Graceful degradation strategies
-- Error metrics and monitoring
+- Error metrics with constant-time sliding-window rates
 - Recovery strategies for different error types
 """
 
 import asyncio
 import logging
-import random
+import math
+import time
 from collections import defaultdict, deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
@@ -20,6 +21,7 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
 
+from ..retry_engine import RetryBudget, RetryEngine
 from .oauth2_auth import OAuth2AuthenticationError, OAuth2TokenExpiredError
 
 logger = logging.getLogger(__name__)
@@ -82,6 +84,134 @@ class MCPErrorContext:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+class SlidingWindowCounter:
+    """
+    Event counter over a sliding time window backed by ring buckets.
+
+    Events are added to fixed-width time buckets in a ring that is reused
+    as time moves on, so memory is bounded and neither recording nor
+    querying depends on how many events were recorded.
+    """
+
+    def __init__(self, bucket_seconds: float, bucket_count: int):
+        """
+        Initialize counter.
+
+        Args:
+            bucket_seconds: Width of each bucket in seconds
+            bucket_count: Number of buckets kept in the ring
+        """
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = bucket_count
+        self._counts = [0] * bucket_count
+        self._slots = [-1] * bucket_count
+        self._latest_slot = -1
+
+    @property
+    def span_seconds(self) -> float:
+        """Longest window the counter can answer for."""
+        return self.bucket_seconds * self.bucket_count
+
+    def add(self, timestamp: float | None = None, count: int = 1) -> None:
+        """
+        Record events at a point in time.
+
+        Args:
+            timestamp: Unix time of the events, defaults to now
+            count: Number of events
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        slot = int(timestamp // self.bucket_seconds)
+        if slot <= self._latest_slot - self.bucket_count:
+            return  # Older than the ring retains
+        self._latest_slot = max(self._latest_slot, slot)
+
+        index = slot % self.bucket_count
+        if self._slots[index] != slot:
+            if self._slots[index] > slot:
+                return  # Bucket already reused for a newer slot
+            self._slots[index] = slot
+            self._counts[index] = 0
+        self._counts[index] += count
+
+    def clear(self) -> None:
+        """Forget every recorded event."""
+        self._counts = [0] * self.bucket_count
+        self._slots = [-1] * self.bucket_count
+        self._latest_slot = -1
+
+    def count(self, window_seconds: float, now: float | None = None) -> int:
+        """
+        Count events in the trailing window, to bucket resolution.
+
+        Args:
+            window_seconds: Window length, capped at span_seconds
+            now: Unix time the window ends at, defaults to now
+
+        Returns:
+            Number of events recorded in the window
+        """
+        if now is None:
+            now = time.time()
+        current = int(now // self.bucket_seconds)
+        buckets = min(
+            self.bucket_count, max(1, math.ceil(window_seconds / self.bucket_seconds))
+        )
+
+        total = 0
+        for slot in range(current - buckets + 1, current + 1):
+            index = slot % self.bucket_count
+            if self._slots[index] == slot:
+                total += self._counts[index]
+        return total
+
+
+class ErrorRateCounter:
+    """
+    Multi-resolution event counter for error rates.
+
+    Keeps per-second, per-minute and per-hour rings and answers each query
+    from the finest ring that covers the window, so short windows stay
+    precise and windows of up to a day cost a bounded number of steps.
+    """
+
+    def __init__(self) -> None:
+        """Initialize per-second, per-minute and per-hour rings."""
+        self._levels = (
+            SlidingWindowCounter(1.0, 60),
+            SlidingWindowCounter(60.0, 60),
+            SlidingWindowCounter(3600.0, 24),
+        )
+
+    def add(self, timestamp: float | None = None, count: int = 1) -> None:
+        """
+        Record events at a point in time.
+
+        Args:
+            timestamp: Unix time of the events, defaults to now
+            count: Number of events
+        """
+        for level in self._levels:
+            level.add(timestamp, count)
+
+    def count(self, window_seconds: float) -> int:
+        """
+        Count events in the trailing window.
+
+        Args:
+            window_seconds: Window length in seconds, capped at one day
+
+        Returns:
+            Number of events in the window
+        """
+        for level in self._levels:
+            if window_seconds <= level.span_seconds:
+                return level.count(window_seconds)
+        return self._levels[-1].count(window_seconds)
+
+
 @dataclass
 class MCPErrorMetrics:
     """Metrics for tracking MCP errors."""
@@ -97,6 +227,11 @@ class MCPErrorMetrics:
     recent_errors: deque = field(default_factory=lambda: deque(maxlen=100))
     first_error_time: datetime | None = None
     last_error_time: datetime | None = None
+    # Windowed counts keyed by ("all",), ("server", name), ("category", value),
+    # ("severity", value) and ("server_category", name, value)
+    rate_counters: dict[tuple[str, ...], ErrorRateCounter] = field(
+        default_factory=dict, repr=False
+    )
 
     def record_error(self, context: MCPErrorContext) -> None:
         """Record an error in metrics."""
@@ -110,38 +245,96 @@ class MCPErrorMetrics:
             self.first_error_time = context.timestamp
         self.last_error_time = context.timestamp
 
+        timestamp = context.timestamp.timestamp()
+        for key in (
+            ("all",),
+            ("server", context.server_name),
+            ("category", context.category.value),
+            ("severity", context.severity.value),
+            ("server_category", context.server_name, context.category.value),
+        ):
+            counter = self.rate_counters.get(key)
+            if counter is None:
+                counter = self.rate_counters[key] = ErrorRateCounter()
+            counter.add(timestamp)
+
+    def get_error_count(
+        self,
+        window: timedelta,
+        server_name: str | None = None,
+        category: ErrorCategory | None = None,
+        severity: ErrorSeverity | None = None,
+    ) -> int:
+        """
+        Count errors in a trailing window without scanning recorded errors.
+
+        Args:
+            window: Window length, up to one day
+            server_name: Only count errors from this server
+            category: Only count errors of this category
+            severity: Only count errors of this severity (ignores the others)
+
+        Returns:
+            Number of matching errors in the window
+        """
+        key: tuple[str, ...]
+        if severity is not None:
+            key = ("severity", severity.value)
+        elif server_name is not None and category is not None:
+            key = ("server_category", server_name, category.value)
+        elif server_name is not None:
+            key = ("server", server_name)
+        elif category is not None:
+            key = ("category", category.value)
+        else:
+            key = ("all",)
+
+        counter = self.rate_counters.get(key)
+        if counter is None:
+            return 0
+        return counter.count(window.total_seconds())
+
     def get_error_rate(self, window_minutes: int = 60) -> float:
         """Get error rate per minute in the specified window."""
-        if not self.recent_errors:
+        if window_minutes <= 0:
             return 0.0
-
-        cutoff_time = datetime.now() - timedelta(minutes=window_minutes)
-        recent_count = sum(
-            1 for error in self.recent_errors if error.timestamp >= cutoff_time
-        )
-
-        return recent_count / window_minutes if window_minutes > 0 else 0.0
+        return self.get_error_count(timedelta(minutes=window_minutes)) / window_minutes
 
     def get_errors_in_window(self, window: timedelta) -> list[MCPErrorContext]:
-        """Get errors within the specified time window."""
+        """Get the retained recent errors within the specified time window."""
         cutoff_time = datetime.now() - window
         return [error for error in self.recent_errors if error.timestamp >= cutoff_time]
 
     def get_server_error_rate(
         self, server_name: str, window_minutes: int = 60
     ) -> float:
-        """Get error rate for a specific server."""
-        if not self.recent_errors:
+        """Get error rate per minute for a specific server."""
+        if window_minutes <= 0:
             return 0.0
+        count = self.get_error_count(
+            timedelta(minutes=window_minutes), server_name=server_name
+        )
+        return count / window_minutes
 
-        cutoff_time = datetime.now() - timedelta(minutes=window_minutes)
-        server_errors = sum(
-            1
-            for error in self.recent_errors
-            if error.server_name == server_name and error.timestamp >= cutoff_time
+    def get_category_error_rate(
+        self,
+        category: ErrorCategory,
+        window_minutes: int = 60,
+        server_name: str | None = None,
+    ) -> float:
+        """Get error rate per minute for a category, optionally for one server."""
+        if window_minutes <= 0:
+            return 0.0
+        count = self.get_error_count(
+            timedelta(minutes=window_minutes),
+            server_name=server_name,
+            category=category,
         )
+        return count / window_minutes
+
 
-        return server_errors / window_minutes if window_minutes > 0 else 0.0
+class CircuitBreakerOpenError(Exception):
+    """Raised when an operation is rejected by an open circuit breaker."""
 
 
 class MCPCircuitBreaker:
@@ -152,18 +345,28 @@ class MCPCircuitBreaker:
         failure_threshold: int = 5,
         recovery_timeout: float = 60.0,
         half_open_max_calls: int = 3,
+        window_failure_threshold: int | None = None,
+        failure_window: float = 60.0,
     ):
         """
         Initialize circuit breaker.
 
         Args:
-            failure_threshold: Number of failures before opening circuit
+            failure_threshold: Number of consecutive failures before opening circuit
             recovery_timeout: Time to wait before attempting recovery
             half_open_max_calls: Max calls allowed in half-open state
+            window_failure_threshold: Failures within failure_window that open
+                the circuit even when successes are interleaved; None disables
+            failure_window: Length of the failure window in seconds
         """
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.half_open_max_calls = half_open_max_calls
+        self.window_failure_threshold = window_failure_threshold
+        self.failure_window = failure_window
+        self._window_failures = SlidingWindowCounter(
+            1.0, max(1, math.ceil(failure_window))
+        )
 
         self.state = CircuitBreakerState.CLOSED
         self.failure_count = 0
@@ -194,6 +397,8 @@ class MCPCircuitBreaker:
         """Record successful operation."""
         if self.state == CircuitBreakerState.HALF_OPEN:
             self.state = CircuitBreakerState.CLOSED
+            # Failures that opened the circuit must not count after recovery
+            self._window_failures.clear()
 
         self.failure_count = 0
         self.half_open_calls = 0
@@ -202,16 +407,25 @@ class MCPCircuitBreaker:
         """Record failed operation."""
         self.failure_count += 1
         self.last_failure_time = datetime.now()
+        self._window_failures.add()
 
         if (
             self.state == CircuitBreakerState.HALF_OPEN
             or self.failure_count >= self.failure_threshold
+            or (
+                self.window_failure_threshold is not None
+                and self.get_window_failures() >= self.window_failure_threshold
+            )
         ):
             self.state = CircuitBreakerState.OPEN
 
         if self.state == CircuitBreakerState.HALF_OPEN:
             self.half_open_calls += 1
 
+    def get_window_failures(self) -> int:
+        """Get the number of failures within the failure window."""
+        return self._window_failures.count(self.failure_window)
+
 
 class MCPErrorHandler:
     """Comprehensive error handler for MCP operations."""
@@ -230,7 +444,20 @@ class MCPErrorHandler:
         self.base_backoff = config.get("base_backoff", 1.0)
         self.max_backoff = config.get("max_backoff", 60.0)
         self.backoff_multiplier = config.get("backoff_multiplier", 2.0)
-        self.jitter = config.get("jitter", True)
+        self.retry_engine = RetryEngine(
+            max_attempts=max(self.max_retries, 1),
+            base_delay=self.base_backoff,
+            max_delay=self.max_backoff,
+            backoff_multiplier=self.backoff_multiplier,
+            jitter=config.get("jitter", True),
+            deadline=config.get("retry_deadline"),
+            retry_budget=RetryBudget(
+                ratio=config.get("retry_budget_ratio", 0.2),
+                reserve=config.get("retry_budget_reserve", 10.0),
+            ),
+            hedge_delay=config.get("hedge_delay"),
+            max_hedged_attempts=config.get("max_hedged_attempts", 2),
+        )
 
         # Circuit breaker configuration
         self.enable_circuit_breaker = config.get("enable_circuit_breaker", True)
@@ -248,6 +475,16 @@ class MCPErrorHandler:
             failure_threshold=failure_threshold,
             recovery_timeout=recovery_timeout,
             half_open_max_calls=circuit_breaker_config.get("half_open_max_calls", 3),
+            window_failure_threshold=circuit_breaker_config.get(
+                "window_failure_threshold"
+            ),
+            failure_window=circuit_breaker_config.get("failure_window", 60.0),
+        )
+
+        # Stop retrying a server whose error rate (errors per minute over the
+        # last minute) is already at or above this level; None disables
+        self.retry_error_rate_limit: float | None = config.get(
+            "retry_error_rate_limit"
         )
 
         # Fallback configuration
@@ -261,6 +498,15 @@ class MCPErrorHandler:
 
         logger.info("MCP error handler initialized with configuration")
 
+    @property
+    def jitter(self) -> bool:
+        """Whether retry backoff uses full jitter."""
+        return self.retry_engine.jitter
+
+    @jitter.setter
+    def jitter(self, value: bool) -> None:
+        self.retry_engine.jitter = value
+
     def _validate_config(self) -> None:
         """Validate error handler configuration."""
         if self.max_retries < 0:
@@ -377,18 +623,8 @@ class MCPErrorHandler:
         )
 
     def calculate_backoff(self, attempt: int) -> float:
-        """Calculate backoff time with exponential backoff and jitter."""
-        backoff = min(
-            self.base_backoff * (self.backoff_multiplier ** (attempt - 1)),
-            self.max_backoff,
-        )
-
-        if self.jitter:
-            # Add random jitter (±25%)
-            jitter_range = backoff * 0.25
-            backoff += random.uniform(-jitter_range, jitter_range)
-
-        return max(backoff, 0.1)  # Minimum 100ms  # type: ignore[no-any-return]
+        """Calculate backoff time with exponential backoff and full jitter."""
+        return max(self.retry_engine.calculate_delay(attempt - 1), 0.1)
 
     async def execute_with_retry(
         self,
@@ -396,73 +632,97 @@ class MCPErrorHandler:
         server_name: str,
         operation_name: str,
         max_attempts: int | None = None,
+        deadline: float | None = None,
+        idempotent: bool = False,
         **kwargs: Any,
     ) -> dict[str, Any] | list[Any] | str | None:
-        """Execute operation with retry logic."""
+        """
+        Execute operation with retry logic.
+
+        Retries share the handler's RetryEngine, so they use full-jitter
+        backoff, stop at the request deadline and draw from a common retry
+        budget. Idempotent reads may be hedged when hedge_delay is set.
+
+        Args:
+            operation: Coroutine function to call
+            server_name: Server the operation targets
+            operation_name: Operation name for metrics and logs
+            max_attempts: Total attempts, defaults to max_retries
+            deadline: Total seconds for all attempts, defaults to retry_deadline
+            idempotent: Whether the operation is safe to hedge
+            **kwargs: Arguments passed to the operation
+
+        Returns:
+            Result of the operation
+
+        Raises:
+            CircuitBreakerOpenError: If the circuit breaker rejects the call
+            Exception: The last error once retries stop
+        """
         max_attempts = max_attempts if max_attempts is not None else self.max_retries
-        last_error = None
+        attempts = max(max_attempts, 1)
 
-        # Type assertion to help type checker
-        assert max_attempts is not None
+        async def attempt_operation(attempt: int) -> object:
+            # Check circuit breaker
+            if self.enable_circuit_breaker and not self.circuit_breaker.can_execute():
+                raise CircuitBreakerOpenError("Circuit breaker is open")
 
-        for attempt in range(1, max_attempts + 1):
             try:
-                # Check circuit breaker
-                if (
-                    self.enable_circuit_breaker
-                    and not self.circuit_breaker.can_execute()
-                ):
-                    raise Exception("Circuit breaker is open")
-
-                # Execute operation
                 result = await operation(**kwargs)
-
-                # Record success
-                if self.enable_circuit_breaker:
-                    self.circuit_breaker.record_success()
-
-                return result  # type: ignore[no-any-return]
-
             except Exception as error:
-                last_error = error
-
-                # Create error context
+                # Record error in metrics and the circuit breaker
                 context = self.create_error_context(
                     error=error,
                     server_name=server_name,
                     operation=operation_name,
-                    attempt_count=attempt,
+                    attempt_count=attempt + 1,
                 )
-
-                # Record error in metrics
                 self.metrics.record_error(context)
-
-                # Record circuit breaker failure
                 if self.enable_circuit_breaker:
                     self.circuit_breaker.record_failure()
 
-                # Log error
                 logger.warning(
-                    f"MCP operation failed (attempt {attempt}/{max_attempts}): "
+                    f"MCP operation failed (attempt {attempt + 1}/{attempts}): "
                     f"{operation_name} on {server_name} - {error}"
                 )
+                raise
+
+            if self.enable_circuit_breaker:
+                self.circuit_breaker.record_success()
+            return result
+
+        def should_retry(error: Exception, attempt: int) -> bool:
+            if isinstance(error, CircuitBreakerOpenError):
+                return False
+            # Retrying a server that is already failing at a high rate only
+            # amplifies the outage
+            if self._is_retry_suppressed(server_name):
+                logger.warning(
+                    f"Not retrying {operation_name} on {server_name}: "
+                    f"error rate above {self.retry_error_rate_limit}/min"
+                )
+                return False
+            return True
 
-                # Don't retry on last attempt
-                if attempt >= max_attempts:
-                    break
-
-                # Calculate backoff and wait
-                backoff_time = self.calculate_backoff(attempt)
-                logger.debug(f"Retrying in {backoff_time:.2f} seconds...")
-                await asyncio.sleep(backoff_time)
+        return await self.retry_engine.run(  # type: ignore[return-value]
+            attempt_operation,
+            should_retry=should_retry,
+            max_attempts=attempts,
+            deadline=deadline,
+            idempotent=idempotent,
+            on_retry=lambda error, attempt, delay: logger.debug(
+                f"Retrying in {delay:.2f} seconds..."
+            ),
+        )
 
-        # All attempts failed
-        if last_error:
-            raise last_error
-        else:
-            raise Exception(
-                f"Operation {operation_name} failed after {max_attempts} attempts"
-            )
+    def _is_retry_suppressed(self, server_name: str) -> bool:
+        """Check whether the server's recent error rate rules out retries."""
+        if self.retry_error_rate_limit is None:
+            return False
+        return (
+            self.metrics.get_server_error_rate(server_name, window_minutes=1)
+            >= self.retry_error_rate_limit
+        )
 
     async def execute_recovery(
         self,
@@ -560,6 +820,12 @@ class MCPErrorHandler:
                 for severity, count in self.metrics.errors_by_severity.items()
             },
             "error_rate_per_minute": self.metrics.get_error_rate(),
+            "error_rate_last_minute": self.metrics.get_error_rate(window_minutes=1),
+            "error_rate_by_server": {
+                server: self.metrics.get_server_error_rate(server, window_minutes=5)
+                for server in self.metrics.errors_by_server
+            },
+            "retry_stats": self.retry_engine.get_stats(),
             "circuit_breaker_state": self.circuit_breaker.state.value,
             "circuit_breaker_failure_count": self.circuit_breaker.failure_count,
             "recent_errors": [
@@ -575,6 +841,7 @@ class MCPErrorHandler:
             ],
             "configuration": {
                 "max_retries": self.max_retries,
+                "retry_deadline": self.retry_engine.deadline,
                 "base_backoff": self.base_backoff,
                 "max_backoff": self.max_backoff,
                 "circuit_breaker_enabled": self.enable_circuit_breaker,
@@ -609,9 +876,8 @@ class MCPErrorHandler:
             return False
 
         # Check for recent critical errors
-        recent_errors = self.metrics.get_errors_in_window(timedelta(minutes=5))
-        critical_errors = [
-            error for error in recent_errors if error.severity == ErrorSeverity.CRITICAL
-        ]
+        critical_errors = self.metrics.get_error_count(
+            timedelta(minutes=5), severity=ErrorSeverity.CRITICAL
+        )
 
-        return not len(critical_errors) > 0
+        return critical_errors == 0
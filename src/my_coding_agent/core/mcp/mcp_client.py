@@ -8,13 +8,23 @@ transport protocols (stdio, HTTP, SSE, WebSocket) and OAuth 2.0 authentication.
 
 import asyncio
 import logging
+from collections.abc import AsyncGenerator, Generator
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Optional
 
+import httpx
 from fastmcp import Client
 
 from .error_handler import MCPErrorHandler
-from .oauth2_auth import OAuth2AuthenticationError, OAuth2Authenticator, OAuth2Config
+from .oauth2_auth import (
+    CRYPTOGRAPHY_AVAILABLE,
+    OAuth2AuthenticationError,
+    OAuth2Authenticator,
+    OAuth2Config,
+    OAuth2Error,
+    OAuth2TokenCache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +53,45 @@ class MCPTimeoutError(MCPError):
     pass
 
 
+class OAuth2BearerAuth(httpx.Auth):
+    """
+    httpx authentication that reads the bearer token on every request.
+
+    Transports keep this object rather than a copied header, so tokens
+    renewed by the authenticator are used as soon as they are current.
+    """
+
+    def __init__(self, authenticator: OAuth2Authenticator):
+        """
+        Initialize the request authentication.
+
+        Args:
+            authenticator: Authenticator owning the current token
+        """
+        self.authenticator = authenticator
+
+    def auth_flow(
+        self, request: httpx.Request
+    ) -> Generator[httpx.Request, httpx.Response, None]:
+        """Attach the current token without refreshing it."""
+        auth_header = self.authenticator.to_authorization_header()
+        if auth_header:
+            request.headers.update(auth_header)
+        yield request
+
+    async def async_auth_flow(
+        self, request: httpx.Request
+    ) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        """Attach the current token, refreshing it first if it is due."""
+        try:
+            request.headers["Authorization"] = (
+                await self.authenticator.get_authorization_header()
+            )
+        except OAuth2Error as e:
+            logger.warning(f"Sending MCP request without OAuth 2.0 token: {e}")
+        yield request
+
+
 @dataclass
 class MCPTool:
     """Represents an MCP tool with its metadata."""
@@ -122,8 +171,15 @@ class MCPClient:
     def _initialize_oauth2_authenticator(self) -> None:
         """Initialize OAuth 2.0 authenticator from configuration."""
         try:
-            oauth2_config = OAuth2Config.from_dict(self.config["oauth2"])
-            self.oauth2_authenticator = OAuth2Authenticator(oauth2_config)
+            oauth2_settings = self.config["oauth2"]
+            oauth2_config = OAuth2Config.from_dict(oauth2_settings)
+            self.oauth2_authenticator = OAuth2Authenticator(
+                oauth2_config,
+                token_cache=self._create_token_cache(
+                    oauth2_settings.get("token_cache")
+                ),
+                auto_refresh=oauth2_settings.get("auto_refresh", True),
+            )
             logger.info(
                 f"OAuth 2.0 authenticator initialized for server: {self.server_name}"
             )
@@ -131,6 +187,33 @@ class MCPClient:
             logger.error(f"Failed to initialize OAuth 2.0 authenticator: {e}")
             raise ValueError(f"Invalid OAuth 2.0 configuration: {e}") from e
 
+    def _create_token_cache(
+        self, cache_setting: bool | str | None
+    ) -> OAuth2TokenCache | None:
+        """
+        Create the encrypted token cache requested by the configuration.
+
+        Args:
+            cache_setting: True for the default location, or a cache file path
+
+        Returns:
+            Token cache, or None if disabled or unavailable
+        """
+        if not cache_setting:
+            return None
+        if not CRYPTOGRAPHY_AVAILABLE:
+            logger.warning(
+                "OAuth 2.0 token cache requested but cryptography is not installed"
+            )
+            return None
+
+        path = (
+            OAuth2TokenCache.default_path()
+            if cache_setting is True
+            else Path(cache_setting).expanduser()
+        )
+        return OAuth2TokenCache(path)
+
     def _detect_transport_from_config(self) -> str:
         """Auto-detect transport type from configuration."""
         if "url" in self.config:
@@ -227,36 +310,34 @@ class MCPClient:
             # Fallback to command if no args
             self._client = Client(command)
 
+    def _create_transport_auth(self) -> OAuth2BearerAuth | None:
+        """Create per-request OAuth 2.0 authentication for HTTP transports."""
+        if self.oauth2_authenticator is None:
+            return None
+        return OAuth2BearerAuth(self.oauth2_authenticator)
+
     def _create_http_client(self) -> None:
         """Create HTTP transport client."""
         url = self.config.get("url")
-        headers = self.config.get("headers", {})
+        headers = dict(self.config.get("headers", {}))
 
-        # Add OAuth 2.0 authentication header if available
-        if self.oauth2_authenticator and self.oauth2_authenticator.is_authenticated():
-            auth_header = self.oauth2_authenticator.to_authorization_header()
-            if auth_header:
-                headers.update(auth_header)
+        from fastmcp.client.transports import StreamableHttpTransport
 
-        from fastmcp.client.transports import HttpTransport
-
-        transport = HttpTransport(url=url, headers=headers)
+        transport = StreamableHttpTransport(
+            url=url, headers=headers, auth=self._create_transport_auth()
+        )
         self._client = Client(transport=transport)
 
     def _create_sse_client(self) -> None:
         """Create Server-Sent Events transport client."""
         url = self.config.get("url")
-        headers = self.config.get("headers", {})
+        headers = dict(self.config.get("headers", {}))
 
-        # Add OAuth 2.0 authentication header if available
-        if self.oauth2_authenticator and self.oauth2_authenticator.is_authenticated():
-            auth_header = self.oauth2_authenticator.to_authorization_header()
-            if auth_header:
-                headers.update(auth_header)
+        from fastmcp.client.transports import SSETransport
 
-        from fastmcp.client.transports import SseTransport
-
-        transport = SseTransport(url=url, headers=headers)
+        transport = SSETransport(
+            url=url, headers=headers, auth=self._create_transport_auth()
+        )
         self._client = Client(transport=transport)
 
     def _create_websocket_client(self) -> None:
@@ -318,6 +399,10 @@ class MCPClient:
 
     async def disconnect(self) -> None:
         """Disconnect from the MCP server."""
+        if self.oauth2_authenticator:
+            # Stop background token renewal and release the token session
+            await self.oauth2_authenticator.cleanup()
+
         if not self._client:
             return
 
@@ -807,6 +892,7 @@ class MCPClient:
             server_name=server_name,
             operation_name="list_tools",
             max_attempts=max_attempts,
+            idempotent=True,
         )
 
     async def list_tools_with_fallback(self) -> "list[MCPTool]":
@@ -5,6 +5,8 @@ This module provides comprehensive OAuth 2.0 authentication including:
 - Authorization Code Flow with PKCE support
 - Client Credentials Flow
 - Token lifecycle management and automatic refresh
+- Proactive background refresh with single-flight renewal
+- Encrypted on-disk token cache for warm restarts
 - Security best practices implementation
 - Integration with MCP client connections
 """
@@ -12,15 +14,29 @@ This module provides comprehensive OAuth 2.0 authentication including:
 import asyncio
 import base64
 import hashlib
+import json
 import logging
+import os
 import secrets
 import urllib.parse
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 import aiohttp
 
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+    Fernet = None
+    InvalidToken = Exception
+
 logger = logging.getLogger(__name__)
 
 
@@ -160,6 +176,31 @@ class OAuth2Token:
         """Create authorization header value."""
         return f"{self.token_type} {self.access_token}"
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert OAuth2Token to a dictionary, keeping the absolute expiry."""
+        return {
+            "access_token": self.access_token,
+            "token_type": self.token_type,
+            "expires_in": self.expires_in,
+            "refresh_token": self.refresh_token,
+            "scope": self.scope,
+            "expires_at": self.expires_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, token_dict: dict[str, Any]) -> "OAuth2Token":
+        """Create OAuth2Token from a dictionary produced by to_dict()."""
+        token = cls(
+            access_token=token_dict["access_token"],
+            token_type=token_dict.get("token_type", "Bearer"),
+            expires_in=token_dict.get("expires_in"),
+            refresh_token=token_dict.get("refresh_token"),
+            scope=token_dict.get("scope"),
+        )
+        if token_dict.get("expires_at"):
+            token.expires_at = datetime.fromisoformat(token_dict["expires_at"])
+        return token
+
     @classmethod
     def from_response(cls, response_data: dict[str, Any]) -> "OAuth2Token":
         """Create OAuth2Token from token response."""
@@ -172,6 +213,175 @@ class OAuth2Token:
         )
 
 
+class OAuth2TokenCache:
+    """
+    Encrypted on-disk cache of OAuth 2.0 tokens.
+
+    Tokens are stored as a Fernet-encrypted JSON document keyed by client.
+    The encryption key comes from the MY_CODING_AGENT_TOKEN_KEY environment
+    variable or, failing that, a key file created next to the cache with
+    owner-only permissions.
+    """
+
+    KEY_ENV_VAR = "MY_CODING_AGENT_TOKEN_KEY"
+
+    def __init__(self, path: Path | str, key: bytes | None = None):
+        """
+        Initialize the token cache.
+
+        Args:
+            path: Location of the encrypted cache file
+            key: Fernet key; read from the environment or key file if omitted
+
+        Raises:
+            OAuth2Error: If the cryptography package is not installed
+        """
+        if not CRYPTOGRAPHY_AVAILABLE:
+            raise OAuth2Error(
+                "The cryptography package is required for the encrypted token cache"
+            )
+
+        self.path = Path(path)
+        self._key = key
+        self._fernet: Any = None
+
+    @classmethod
+    def default_path(cls) -> Path:
+        """Get the default cache location in the application cache directory."""
+        from ...config.settings import _get_cache_dir
+
+        return _get_cache_dir() / "oauth2_tokens.enc"
+
+    @staticmethod
+    def cache_key(config: OAuth2Config) -> str:
+        """
+        Build the cache key identifying tokens for a configuration.
+
+        Args:
+            config: OAuth 2.0 configuration
+
+        Returns:
+            Stable key derived from the client and token endpoint
+        """
+        identity = "|".join(
+            [
+                config.token_url,
+                config.client_id,
+                config.scope or "",
+                config.audience or "",
+            ]
+        )
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def load(self, cache_key: str) -> OAuth2Token | None:
+        """
+        Load a cached token.
+
+        Args:
+            cache_key: Key returned by cache_key()
+
+        Returns:
+            Cached token, or None if absent or unreadable
+        """
+        entry = self.load_entry(cache_key)
+        return entry[0] if entry else None
+
+    def load_entry(self, cache_key: str) -> tuple[OAuth2Token, str | None] | None:
+        """
+        Load a cached token together with the grant that issued it.
+
+        Args:
+            cache_key: Key returned by cache_key()
+
+        Returns:
+            Cached token and grant type, or None if absent or unreadable
+        """
+        entry = self._read_entries().get(cache_key)
+        if not entry:
+            return None
+        try:
+            return OAuth2Token.from_dict(entry), entry.get("grant_type")
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring invalid cached OAuth 2.0 token: {e}")
+            return None
+
+    def save(
+        self, cache_key: str, token: OAuth2Token, grant_type: str | None = None
+    ) -> None:
+        """
+        Store a token in the cache.
+
+        Args:
+            cache_key: Key returned by cache_key()
+            token: Token to persist
+            grant_type: Grant that issued the token, used to renew it later
+        """
+        entries = self._read_entries()
+        entry = token.to_dict()
+        if grant_type:
+            entry["grant_type"] = grant_type
+        entries[cache_key] = entry
+        self._write_entries(entries)
+
+    def remove(self, cache_key: str) -> None:
+        """
+        Remove a token from the cache.
+
+        Args:
+            cache_key: Key returned by cache_key()
+        """
+        entries = self._read_entries()
+        if entries.pop(cache_key, None) is not None:
+            self._write_entries(entries)
+
+    def _get_fernet(self) -> Any:
+        """Get the Fernet instance, loading or creating the key on first use."""
+        if self._fernet is None:
+            key = self._key or os.getenv(self.KEY_ENV_VAR, "").encode("utf-8")
+            if not key:
+                key = self._load_or_create_key_file()
+            self._fernet = Fernet(key)
+        return self._fernet
+
+    def _load_or_create_key_file(self) -> bytes:
+        """Read the key file, creating it with owner-only permissions if needed."""
+        key_path = self.path.with_suffix(".key")
+        if key_path.exists():
+            return key_path.read_bytes().strip()
+
+        key_path.parent.mkdir(parents=True, exist_ok=True)
+        key = Fernet.generate_key()
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as key_file:
+            key_file.write(key)
+        return key
+
+    def _read_entries(self) -> dict[str, dict[str, Any]]:
+        """Decrypt and parse the cache file."""
+        if not self.path.exists():
+            return {}
+        try:
+            plaintext = self._get_fernet().decrypt(self.path.read_bytes())
+            entries = json.loads(plaintext)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, InvalidToken, ValueError) as e:
+            logger.warning(f"Could not read OAuth 2.0 token cache: {e}")
+            return {}
+
+    def _write_entries(self, entries: dict[str, dict[str, Any]]) -> None:
+        """Encrypt and atomically replace the cache file."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            ciphertext = self._get_fernet().encrypt(json.dumps(entries).encode("utf-8"))
+            tmp_path = self.path.with_suffix(".tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as cache_file:
+                cache_file.write(ciphertext)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write OAuth 2.0 token cache: {e}")
+
+
 class OAuth2Authenticator:
     """
     OAuth 2.0 authenticator for MCP server authentication.
@@ -179,32 +389,71 @@ class OAuth2Authenticator:
     Supports multiple OAuth 2.0 flows and handles token lifecycle management.
     """
 
-    def __init__(self, config: OAuth2Config):
+    def __init__(
+        self,
+        config: OAuth2Config,
+        session: aiohttp.ClientSession | None = None,
+        token_cache: OAuth2TokenCache | None = None,
+        auto_refresh: bool = False,
+        refresh_margin_seconds: int = 300,
+    ):
         """
         Initialize OAuth 2.0 authenticator.
 
         Args:
             config: OAuth 2.0 configuration
+            session: Shared HTTP session; a pooled session is created if omitted
+            token_cache: Encrypted cache used to persist tokens across restarts
+            auto_refresh: Renew tokens in the background before they expire
+            refresh_margin_seconds: How long before expiry to renew a token
         """
         self.config = config
         self.current_token: OAuth2Token | None = None
-        self._session: aiohttp.ClientSession | None = None
+        self._session = session
+        self._owns_session = session is None
         self._states: dict[str, datetime] = {}  # For state validation
         self._code_verifiers: dict[str, str] = {}  # For PKCE
 
+        # Token renewal: one in-flight request shared by concurrent callers
+        self.auto_refresh = auto_refresh
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._renewal_task: asyncio.Task[OAuth2Token] | None = None
+        self._auto_refresh_task: asyncio.Task[None] | None = None
+        self._grant_type: str | None = None
+
+        # Warm start from the encrypted cache
+        self._token_cache = token_cache
+        self._cache_key = OAuth2TokenCache.cache_key(config)
+        if token_cache is not None:
+            cached = token_cache.load_entry(self._cache_key)
+            if cached is not None and not cached[0].is_expired():
+                # Auto refresh starts on first use, once an event loop is running
+                self.current_token, self._grant_type = cached
+                logger.info("Loaded OAuth 2.0 token from cache")
+
         logger.info(
             f"OAuth 2.0 authenticator initialized for client: {config.client_id}"
         )
 
     async def __aenter__(self) -> "OAuth2Authenticator":
         """Async context manager entry."""
-        self._session = aiohttp.ClientSession()
+        await self._get_session()
+        self._ensure_auto_refresh()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         """Async context manager exit."""
-        if self._session:
-            await self._session.close()
+        await self.cleanup()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session, creating a pooled keep-alive session if needed."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self._session
 
     def generate_authorization_url(
         self, state: str | None = None, use_pkce: bool = True
@@ -346,7 +595,7 @@ class OAuth2Authenticator:
         del self._states[state]
 
         token = await self._request_token(data)
-        self.current_token = token
+        self._set_token(token, "authorization_code")
         return token
 
     async def client_credentials_flow(self) -> OAuth2Token:
@@ -375,25 +624,32 @@ class OAuth2Authenticator:
             data["audience"] = self.config.audience
 
         token = await self._request_token(data)
-        self.current_token = token
+        self._set_token(token, "client_credentials")
         return token
 
     async def refresh_token(self) -> OAuth2Token:
         """
         Refresh current access token.
 
+        Concurrent callers share a single refresh request.
+
         Returns:
             New OAuth 2.0 token
 
         Raises:
             OAuth2AuthenticationError: If refresh fails
         """
+        return await self._single_flight(self._refresh_with_refresh_token)
+
+    async def _refresh_with_refresh_token(self) -> OAuth2Token:
+        """Exchange the current refresh token for a new access token."""
         if not self.current_token or not self.current_token.refresh_token:
             raise OAuth2AuthenticationError("No refresh token available")
 
+        refresh_token = self.current_token.refresh_token
         data = {
             "grant_type": "refresh_token",
-            "refresh_token": self.current_token.refresh_token,
+            "refresh_token": refresh_token,
             "client_id": self.config.client_id,
         }
 
@@ -404,9 +660,126 @@ class OAuth2Authenticator:
             data["scope"] = self.config.scope
 
         token = await self._request_token(data)
-        self.current_token = token
+        # Providers may omit the refresh token when it is not rotated
+        if token.refresh_token is None:
+            token.refresh_token = refresh_token
+        self._set_token(token, self._grant_type)
         return token
 
+    async def _single_flight(
+        self, renew: Callable[[], Awaitable[OAuth2Token]]
+    ) -> OAuth2Token:
+        """
+        Run a token renewal, or join the one already in progress.
+
+        Args:
+            renew: Coroutine function performing the renewal
+
+        Returns:
+            The renewed token
+        """
+        task = self._renewal_task
+        if task is None or task.done():
+            task = asyncio.ensure_future(renew())
+            self._renewal_task = task
+        # Shield so one caller's cancellation does not abort the shared refresh
+        return await asyncio.shield(task)
+
+    def _can_renew(self) -> bool:
+        """Check whether the current token can be renewed without user action."""
+        if self.current_token is None:
+            return False
+        if self.current_token.refresh_token:
+            return True
+        return (
+            self._grant_type == "client_credentials"
+            and self.config.client_secret is not None
+        )
+
+    async def _renew_token(self) -> OAuth2Token:
+        """Renew the current token using the best available grant."""
+        if self.current_token and self.current_token.refresh_token:
+            return await self.refresh_token()
+        return await self._single_flight(self.client_credentials_flow)
+
+    def _seconds_until_renewal(self) -> float | None:
+        """Seconds until the current token should be renewed, if renewable."""
+        if not self._can_renew() or self.current_token is None:
+            return None
+
+        token = self.current_token
+        lifetime = token.expires_in or 3600
+        # Never renew earlier than halfway through a short-lived token
+        margin = min(self.refresh_margin_seconds, lifetime / 2)
+        remaining = (token.expires_at - datetime.now()).total_seconds()
+        return max(0.0, remaining - margin)
+
+    def start_auto_refresh(self) -> None:
+        """
+        Start renewing tokens in the background before they expire.
+
+        Must be called from a running event loop.
+        """
+        if self._auto_refresh_task is not None and not self._auto_refresh_task.done():
+            return
+        self._auto_refresh_task = asyncio.get_running_loop().create_task(
+            self._auto_refresh_loop()
+        )
+
+    def _ensure_auto_refresh(self) -> None:
+        """Start auto refresh for a renewable token if a loop is running."""
+        if not self.auto_refresh or not self._can_renew():
+            return
+        if self._auto_refresh_task is not None and not self._auto_refresh_task.done():
+            return
+        # Without a running event loop tokens are refreshed lazily instead
+        with suppress(RuntimeError):
+            self.start_auto_refresh()
+
+    async def stop_auto_refresh(self) -> None:
+        """Stop the background refresh task if it is running."""
+        task = self._auto_refresh_task
+        self._auto_refresh_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def _auto_refresh_loop(self) -> None:
+        """Sleep until each token nears expiry, then renew it."""
+        failures = 0
+        while True:
+            delay = self._seconds_until_renewal()
+            if delay is None:
+                logger.debug("No renewable OAuth 2.0 token, stopping auto refresh")
+                return
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                await self._renew_token()
+                failures = 0
+                logger.info("OAuth 2.0 token renewed proactively")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Background token refresh failed: {e}")
+                if self.current_token is None or self.current_token.is_expired():
+                    logger.error("OAuth 2.0 token expired, stopping auto refresh")
+                    return
+                await asyncio.sleep(min(60.0, 2.0**failures))
+
+    def _set_token(self, token: OAuth2Token, grant_type: str | None) -> None:
+        """Make a token current, persist it, and schedule its renewal."""
+        self.current_token = token
+        self._grant_type = grant_type
+
+        if self._token_cache is not None:
+            self._token_cache.save(self._cache_key, token, grant_type)
+
+        self._ensure_auto_refresh()
+
     async def _request_token(self, data: dict[str, str]) -> OAuth2Token:
         """
         Make token request to OAuth provider.
@@ -420,11 +793,7 @@ class OAuth2Authenticator:
         Raises:
             OAuth2AuthenticationError: If request fails
         """
-        # Use existing session if available, otherwise create a temporary one
-        session_created = False
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-            session_created = True
+        session = await self._get_session()
 
         headers = {
             "Content-Type": "application/x-www-form-urlencoded",
@@ -432,7 +801,7 @@ class OAuth2Authenticator:
         }
 
         try:
-            async with self._session.post(
+            async with session.post(
                 self.config.token_url,
                 data=data,
                 headers=headers,
@@ -460,11 +829,6 @@ class OAuth2Authenticator:
             raise OAuth2Error(f"Network error during token request: {e}") from e
         except Exception as e:
             raise OAuth2Error(f"Unexpected error during token request: {e}") from e
-        finally:
-            # Close session if we created it temporarily
-            if session_created and self._session:
-                await self._session.close()
-                self._session = None
 
     async def get_authorization_header(self) -> str:
         """
@@ -479,7 +843,9 @@ class OAuth2Authenticator:
         if not self.current_token:
             raise OAuth2TokenExpiredError("No access token available")
 
-        # Check if token needs refresh
+        self._ensure_auto_refresh()
+
+        # Check if token needs refresh; joins any refresh already in progress
         if self.current_token.needs_refresh():
             logger.info("Token needs refresh, attempting to refresh")
             try:
@@ -494,6 +860,17 @@ class OAuth2Authenticator:
 
         return self.current_token.to_authorization_header()
 
+    def to_authorization_header(self) -> dict[str, str] | None:
+        """
+        Get the Authorization header for the current token without refreshing.
+
+        Returns:
+            Header mapping, or None if there is no valid token
+        """
+        if not self.is_authenticated() or self.current_token is None:
+            return None
+        return {"Authorization": self.current_token.to_authorization_header()}
+
     def store_token(self, token: OAuth2Token) -> None:
         """
         Store OAuth 2.0 token.
@@ -501,7 +878,7 @@ class OAuth2Authenticator:
         Args:
             token: Token to store
         """
-        self.current_token = token
+        self._set_token(token, self._grant_type)
         logger.info("OAuth 2.0 token stored successfully")
 
     def get_current_token(self) -> OAuth2Token | None:
@@ -542,11 +919,7 @@ class OAuth2Authenticator:
         # This is a best-effort implementation
         revoke_url = self.config.token_url.replace("/token", "/revoke")
 
-        # Use existing session if available, otherwise create a temporary one
-        session_created = False
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-            session_created = True
+        session = await self._get_session()
 
         data = {"token": token, "client_id": self.config.client_id}
 
@@ -554,37 +927,40 @@ class OAuth2Authenticator:
             data["client_secret"] = self.config.client_secret
 
         try:
-            async with self._session.post(revoke_url, data=data) as response:
+            async with session.post(revoke_url, data=data) as response:
                 success = response.status in [200, 204]
                 if success:
                     self.current_token = None
+                    if self._token_cache is not None:
+                        self._token_cache.remove(self._cache_key)
                     logger.info("Token revoked successfully")
                 return success
         except Exception as e:
             logger.warning(f"Token revocation failed: {e}")
             return False
-        finally:
-            # Close session if we created it temporarily
-            if session_created and self._session:
-                await self._session.close()
-                self._session = None
 
     def clear_authentication(self) -> None:
         """Clear current authentication state."""
         self.current_token = None
+        self._grant_type = None
         self._states.clear()
         self._code_verifiers.clear()
+        if self._token_cache is not None:
+            self._token_cache.remove(self._cache_key)
         logger.info("Authentication state cleared")
 
     async def cleanup(self) -> None:
         """Clean up resources, including closing any open sessions."""
-        if self._session and not self._session.closed:
+        await self.stop_auto_refresh()
+
+        # A shared session belongs to whoever passed it in
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
-            self._session = None
+        self._session = None
 
     def __del__(self) -> None:
         """Destructor to ensure session cleanup."""
-        if self._session and not self._session.closed:
+        if self._owns_session and self._session and not self._session.closed:
             # Note: This is a fallback - proper cleanup should use cleanup() method
             import warnings
             warnings.warn(
@@ -0,0 +1,233 @@
+"""
+Per-server fault isolation for MCP calls.
+
+This module provides:
+- Bulkheads limiting concurrent and queued calls per server or tool
+- Guards pairing a bulkhead with a circuit breaker
+- Fail-fast errors for open circuits and full bulkheads
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from ..metrics import MetricsRegistry, get_metrics_registry
+from .error_handler import CircuitBreakerState, MCPCircuitBreaker
+from .mcp_client import MCPError
+
+logger = logging.getLogger(__name__)
+
+
+class MCPCircuitOpenError(MCPError):
+    """Raised when a call is rejected because the server's circuit is open."""
+
+
+class MCPBulkheadFullError(MCPError):
+    """Raised when a server already has too many calls running and queued."""
+
+
+class MCPBulkhead:
+    """
+    Concurrency limit for calls to a single server or tool.
+
+    At most max_concurrent calls run at once and at most max_queue more may
+    wait for a slot; further calls are rejected immediately so a hung server
+    cannot absorb every pending request.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        max_queue: int = 16,
+        queue_timeout: float | None = 30.0,
+        metrics_registry: MetricsRegistry | None = None,
+    ):
+        """
+        Initialize bulkhead.
+
+        Args:
+            max_concurrent: Maximum calls running at the same time
+            max_queue: Maximum calls waiting for a free slot
+            queue_timeout: Maximum seconds a call may wait, or None for no limit
+            metrics_registry: Registry receiving queue wait times, defaults to
+                the process-wide registry
+        """
+        if max_concurrent <= 0:
+            raise ValueError("max_concurrent must be positive")
+        if max_queue < 0:
+            raise ValueError("max_queue must be non-negative")
+
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.metrics_registry = metrics_registry or get_metrics_registry()
+
+        self._semaphore: asyncio.Semaphore | None = None
+        self.active_calls = 0
+        self.queued_calls = 0
+        self.rejected_calls = 0
+
+    @asynccontextmanager
+    async def slot(self, name: str = "server") -> AsyncIterator[None]:
+        """
+        Hold a call slot for the duration of the block.
+
+        Args:
+            name: Server or tool name used in error messages
+
+        Raises:
+            MCPBulkheadFullError: If the queue is full or the wait times out
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        semaphore = self._semaphore
+
+        if semaphore.locked():
+            if self.queued_calls >= self.max_queue:
+                self.rejected_calls += 1
+                raise MCPBulkheadFullError(
+                    f"Too many pending calls to '{name}' "
+                    f"({self.active_calls} running, {self.queued_calls} queued)"
+                )
+
+            self.queued_calls += 1
+            queued_at = time.perf_counter()
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError as e:
+                self.rejected_calls += 1
+                raise MCPBulkheadFullError(
+                    f"Timed out waiting for a free call slot on '{name}'"
+                ) from e
+            finally:
+                self.queued_calls -= 1
+                self.metrics_registry.observe(
+                    "mcp_queue_wait_seconds",
+                    time.perf_counter() - queued_at,
+                    target=name,
+                )
+        else:
+            await semaphore.acquire()
+            self.metrics_registry.observe("mcp_queue_wait_seconds", 0.0, target=name)
+
+        self.active_calls += 1
+        try:
+            yield
+        finally:
+            self.active_calls -= 1
+            semaphore.release()
+
+    def get_stats(self) -> dict[str, int]:
+        """Get bulkhead usage counters."""
+        return {
+            "active_calls": self.active_calls,
+            "queued_calls": self.queued_calls,
+            "rejected_calls": self.rejected_calls,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+        }
+
+
+class MCPCallGuard:
+    """Circuit breaker and bulkhead protecting one server or tool."""
+
+    def __init__(self, name: str, config: dict[str, Any] | None = None):
+        """
+        Initialize call guard.
+
+        Args:
+            name: Server name, or "server:tool" for per-tool guards
+            config: Guard configuration, see MCPServerRegistry
+        """
+        config = config or {}
+        self.name = name
+        self.circuit_breaker = MCPCircuitBreaker(
+            failure_threshold=config.get("failure_threshold", 5),
+            recovery_timeout=config.get("recovery_timeout", 30.0),
+            half_open_max_calls=config.get("half_open_max_calls", 1),
+            window_failure_threshold=config.get("window_failure_threshold"),
+            failure_window=config.get("failure_window", 60.0),
+        )
+        self.bulkhead = MCPBulkhead(
+            max_concurrent=config.get("max_concurrent_calls", 4),
+            max_queue=config.get("max_queued_calls", 16),
+            queue_timeout=config.get("queue_timeout", 30.0),
+        )
+        self.call_timeout: float | None = config.get("call_timeout")
+        self.fast_failures = 0
+
+    def check_circuit(self) -> bool:
+        """
+        Admit a call through the circuit breaker.
+
+        Returns:
+            True if the call was admitted as a half-open trial call
+
+        Raises:
+            MCPCircuitOpenError: If the circuit is open or its half-open trial
+                calls are already in flight
+        """
+        breaker = self.circuit_breaker
+        if not breaker.can_execute():
+            self.fast_failures += 1
+            raise MCPCircuitOpenError(
+                f"Circuit for '{self.name}' is {breaker.state.value}; "
+                f"failing fast after {breaker.failure_count} failures"
+            )
+        if breaker.state == CircuitBreakerState.HALF_OPEN:
+            breaker.half_open_calls += 1
+            return True
+        return False
+
+    @asynccontextmanager
+    async def call(self) -> AsyncIterator[None]:
+        """
+        Guard one call: check the circuit, then hold a bulkhead slot.
+
+        Raises:
+            MCPCircuitOpenError: If the circuit rejects the call
+            MCPBulkheadFullError: If the bulkhead rejects the call
+        """
+        trial = self.check_circuit()
+        try:
+            async with self.bulkhead.slot(self.name):
+                yield
+        finally:
+            breaker = self.circuit_breaker
+            if trial and breaker.state == CircuitBreakerState.HALF_OPEN:
+                # No outcome was recorded (rejected or cancelled), free the trial
+                breaker.half_open_calls = max(breaker.half_open_calls - 1, 0)
+
+    def record_success(self) -> None:
+        """Record a call that reached the server and succeeded."""
+        self.circuit_breaker.record_success()
+
+    def record_failure(self) -> None:
+        """Record a call that failed at the transport level."""
+        previous = self.circuit_breaker.state
+        self.circuit_breaker.record_failure()
+        if (
+            previous != CircuitBreakerState.OPEN
+            and self.circuit_breaker.state == CircuitBreakerState.OPEN
+        ):
+            logger.warning(f"Circuit opened for MCP target '{self.name}'")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get circuit breaker and bulkhead state."""
+        breaker = self.circuit_breaker
+        retry_in = None
+        if breaker.state == CircuitBreakerState.OPEN and breaker.last_failure_time:
+            elapsed = time.time() - breaker.last_failure_time.timestamp()
+            retry_in = max(0.0, breaker.recovery_timeout - elapsed)
+
+        return {
+            "state": breaker.state.value,
+            "failure_count": breaker.failure_count,
+            "window_failures": breaker.get_window_failures(),
+            "fast_failures": self.fast_failures,
+            "retry_in_seconds": retry_in,
+            **self.bulkhead.get_stats(),
+        }
@@ -8,11 +8,24 @@ and resources across all connected servers.
 
 import asyncio
 import logging
+import time
+from collections.abc import Callable, Coroutine
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
-from .mcp_client import MCPClient, MCPError, MCPResource, MCPTool
+from ..metrics import get_metrics_registry
+from .connection_manager import ConnectionManager
+from .error_handler import CircuitBreakerState
+from .mcp_client import (
+    MCPClient,
+    MCPConnectionError,
+    MCPError,
+    MCPResource,
+    MCPTimeoutError,
+    MCPTool,
+)
+from .resilience import MCPCallGuard
 
 logger = logging.getLogger(__name__)
 
@@ -59,10 +72,27 @@ class MCPServerRegistry:
     - Cache and provide access to tools across all servers
     - Handle server failures and reconnection
     - Provide unified tool/resource discovery
+    - Isolate failing or hung servers with circuit breakers and bulkheads
     """
 
-    def __init__(self):
-        """Initialize the server registry."""
+    def __init__(
+        self,
+        connection_manager: ConnectionManager | None = None,
+        resilience_config: dict[str, Any] | None = None,
+    ):
+        """
+        Initialize the server registry.
+
+        Args:
+            connection_manager: Manager that schedules health checks for the
+                registered servers; one is created if not provided
+            resilience_config: Circuit breaker and bulkhead settings applied
+                to every server (failure_threshold, recovery_timeout,
+                half_open_max_calls, window_failure_threshold, failure_window,
+                max_concurrent_calls, max_queued_calls, queue_timeout,
+                call_timeout). Set per_tool to True to guard
+                each tool separately instead of each server.
+        """
         self._servers: dict[str, MCPClient] = {}
         self._server_status: dict[str, ServerStatus] = {}
         self._tools_cache: dict[str, ToolRegistry] = {}  # tool_name -> ToolRegistry
@@ -76,6 +106,24 @@ class MCPServerRegistry:
         self._cache_update_interval: float = 300.0  # 5 minutes
         self._last_cache_update: datetime | None = None
 
+        # A single scheduler pings servers for both the registry and reconnection
+        self._connection_manager = connection_manager or ConnectionManager(
+            {"monitoring_interval": self._health_check_interval}
+        )
+        self._connection_manager.add_event_listener(
+            "health_checked", self._on_health_checked
+        )
+
+        self._resilience_config = resilience_config or {}
+        self._per_tool_guards = bool(self._resilience_config.get("per_tool", False))
+        self._call_guards: dict[str, MCPCallGuard] = {}
+        self._metrics = get_metrics_registry()
+
+    @property
+    def connection_manager(self) -> ConnectionManager:
+        """Get the connection manager scheduling health checks."""
+        return self._connection_manager
+
     def register_server(self, client: MCPClient) -> None:
         """
         Register an MCP client with the registry.
@@ -90,8 +138,10 @@ class MCPServerRegistry:
 
         if server_name in self._servers:
             logger.warning(f"Server {server_name} is already registered, replacing")
+            self._connection_manager.remove_client(self._servers[server_name])
 
         self._servers[server_name] = client
+        self._connection_manager.add_client(client)
         self._server_status[server_name] = ServerStatus(
             name=server_name,
             connected=client.is_connected(),
@@ -114,7 +164,14 @@ class MCPServerRegistry:
             return False
 
         # Clean up server data
+        self._connection_manager.remove_client(self._servers[server_name])
         del self._servers[server_name]
+        for guard_name in [
+            name
+            for name in self._call_guards
+            if name == server_name or name.startswith(f"{server_name}:")
+        ]:
+            del self._call_guards[guard_name]
         del self._server_status[server_name]
 
         # Remove server's tools and resources from cache
@@ -212,6 +269,7 @@ class MCPServerRegistry:
                 status.connected = True
                 status.last_error = None
                 status.connection_attempts += 1
+                self._connection_manager.record_activity(client)
 
                 logger.info(f"Connected to server: {server_name}")
             except Exception as e:
@@ -230,6 +288,7 @@ class MCPServerRegistry:
     async def disconnect_all_servers(self) -> None:
         """Disconnect from all servers."""
         for server_name, client in self._servers.items():
+            self._connection_manager.mark_disconnected(client)
             try:
                 await client.disconnect()
                 self._server_status[server_name].connected = False
@@ -438,50 +497,32 @@ class MCPServerRegistry:
         if not server:
             raise MCPError(f"Server '{tool_registry.server_name}' not available")
 
-        # Check connection and attempt reconnection if needed
-        if not server.is_connected():
-            logger.warning(
-                f"Server '{tool_registry.server_name}' is not connected, attempting reconnection..."
-            )
-            try:
-                await server.reconnect()
-            except Exception as e:
-                logger.error(
-                    f"Failed to reconnect to server '{tool_registry.server_name}': {e}"
-                )
-                raise MCPError(
-                    f"Server '{tool_registry.server_name}' is not connected and reconnection failed: {e}"
-                ) from e
+        server_name = tool_registry.server_name
+        guard = self.get_call_guard(server_name, tool_name)
 
-        # Execute the tool call with error handling
-        try:
-            return await server.call_tool(tool_name, arguments)
-        except Exception as e:
-            # Check if this is an event loop issue
-            error_msg = str(e)
-            if "loop" in error_msg.lower() or "event" in error_msg.lower():
+        # An open circuit fails fast here, before any reconnection attempt
+        async with guard.call():
+            if not server.is_connected():
                 logger.warning(
-                    f"Event loop issue calling tool {tool_name} on server {tool_registry.server_name}: {e}"
+                    f"Server '{server_name}' is not connected, attempting reconnection..."
                 )
-                # Mark server as disconnected and attempt reconnection
-                server._connected = False
                 try:
-                    logger.info(
-                        f"Attempting to reconnect server {tool_registry.server_name} due to event loop issue"
-                    )
                     await server.reconnect()
-                    # Retry the tool call once after reconnection
-                    return await server.call_tool(tool_name, arguments)
-                except Exception as reconnect_error:
-                    logger.error(
-                        f"Failed to reconnect and retry tool call: {reconnect_error}"
-                    )
+                except Exception as e:
+                    guard.record_failure()
+                    logger.error(f"Failed to reconnect to server '{server_name}': {e}")
                     raise MCPError(
-                        f"Tool call failed due to event loop issue and reconnection failed: {reconnect_error}"
-                    ) from reconnect_error
-            else:
-                # Re-raise other errors
-                raise
+                        f"Server '{server_name}' is not connected and reconnection failed: {e}"
+                    ) from e
+
+            # Servers are owned by the shared event loop, so a failure here is a
+            # real tool error rather than a cross-loop artifact needing a reconnect
+            return await self._call_with_heartbeat(
+                server,
+                guard,
+                lambda: server.call_tool(tool_name, arguments),
+                tool_name=tool_name,
+            )
 
     async def read_resource(self, uri: str) -> list[dict[str, Any]]:
         """
@@ -512,7 +553,96 @@ class MCPServerRegistry:
         if not server.is_connected():
             raise MCPError(f"Server '{resource_registry.server_name}' is not connected")
 
-        return await server.read_resource(uri)
+        guard = self.get_call_guard(resource_registry.server_name)
+        async with guard.call():
+            return await self._call_with_heartbeat(
+                server,
+                guard,
+                lambda: server.read_resource(uri),
+                operation="read_resource",
+            )
+
+    def get_call_guard(
+        self, server_name: str, tool_name: str | None = None
+    ) -> MCPCallGuard:
+        """
+        Get the circuit breaker and bulkhead guarding calls to a server.
+
+        Args:
+            server_name: Name of the server
+            tool_name: Tool being called; only used when guards are per tool
+
+        Returns:
+            MCPCallGuard for the server, or for the tool if per_tool is set
+        """
+        name = server_name
+        if self._per_tool_guards and tool_name:
+            name = f"{server_name}:{tool_name}"
+
+        guard = self._call_guards.get(name)
+        if guard is None:
+            guard = MCPCallGuard(name, self._resilience_config)
+            self._call_guards[name] = guard
+        return guard
+
+    async def _call_with_heartbeat(
+        self,
+        server: MCPClient,
+        guard: MCPCallGuard,
+        request: Callable[[], Coroutine[Any, Any, list[dict[str, Any]]]],
+        operation: str = "call_tool",
+        tool_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Run a server request and report its outcome.
+
+        Successful requests close the circuit and count as heartbeats for the
+        health scheduler. Connection failures and timeouts count against the
+        circuit and move the server onto the fast-probe cadence. Protocol
+        errors show the server is reachable, so they are not counted. Every
+        request's latency is recorded in the metrics registry.
+
+        Args:
+            server: Server handling the request
+            guard: Guard whose circuit breaker records the outcome
+            request: Factory creating the request coroutine
+            operation: Operation name used to tag latency metrics
+            tool_name: Tool being called, used to tag latency metrics
+
+        Returns:
+            Result of the request
+
+        Raises:
+            MCPTimeoutError: If the guard's call_timeout expires
+        """
+        tags = {"server": server.server_name, "operation": operation, "tool": tool_name}
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            try:
+                result = await asyncio.wait_for(request(), timeout=guard.call_timeout)
+            except asyncio.TimeoutError as e:
+                raise MCPTimeoutError(
+                    f"Call to '{guard.name}' exceeded {guard.call_timeout}s"
+                ) from e
+        except (MCPConnectionError, MCPTimeoutError) as e:
+            outcome = "timeout" if isinstance(e, MCPTimeoutError) else "unreachable"
+            guard.record_failure()
+            self._connection_manager.record_activity(
+                server, success=False, error=str(e)
+            )
+            raise
+        else:
+            outcome = "success"
+        finally:
+            self._metrics.observe(
+                "mcp_call_duration_seconds", time.perf_counter() - start, **tags
+            )
+            self._metrics.increment("mcp_calls_total", outcome=outcome, **tags)
+
+        guard.record_success()
+        self._connection_manager.record_activity(server)
+        return result
 
     async def health_check(self) -> dict[str, bool]:
         """
@@ -542,17 +672,38 @@ class MCPServerRegistry:
         return results
 
     def start_health_monitoring(self) -> None:
-        """Start periodic health monitoring of servers."""
+        """
+        Start health monitoring of servers.
+
+        Pinging is delegated to the connection manager's adaptive scheduler,
+        so servers that carry traffic are not pinged and servers that were
+        never connected are not started. This task only refreshes the tool
+        and resource caches.
+        """
         if self._health_check_task is not None:
             logger.warning("Health monitoring already started")
             return
 
-        async def health_monitor():
+        self._health_check_task = asyncio.create_task(self._health_monitor())
+        logger.info("Started health monitoring")
+
+    def stop_health_monitoring(self) -> None:
+        """Stop health monitoring."""
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            self._health_check_task = None
+            logger.info("Stopped health monitoring")
+
+    async def _health_monitor(self) -> None:
+        """Run the shared health scheduler and refresh caches periodically."""
+        manager = self._connection_manager
+        owns_monitoring = not manager.is_monitoring
+        if owns_monitoring:
+            await manager.start_monitoring()
+
+        try:
             while True:
                 try:
-                    await self.health_check()
-
-                    # Update caches periodically
                     if (
                         self._last_cache_update is None
                         or datetime.now() - self._last_cache_update
@@ -560,23 +711,29 @@ class MCPServerRegistry:
                     ):
                         await self.update_tools_cache()
                         await self.update_resources_cache()
-
-                    await asyncio.sleep(self._health_check_interval)
-                except asyncio.CancelledError:
-                    break
                 except Exception as e:
                     logger.error(f"Error in health monitoring: {e}")
-                    await asyncio.sleep(self._health_check_interval)
 
-        self._health_check_task = asyncio.create_task(health_monitor())
-        logger.info("Started health monitoring")
+                await asyncio.sleep(self._cache_update_interval)
+        finally:
+            if owns_monitoring:
+                await manager.stop_monitoring()
 
-    def stop_health_monitoring(self) -> None:
-        """Stop periodic health monitoring."""
-        if self._health_check_task is not None:
-            self._health_check_task.cancel()
-            self._health_check_task = None
-            logger.info("Stopped health monitoring")
+    def _on_health_checked(self, event: dict[str, Any]) -> None:
+        """Mirror a scheduled health check result into the server status."""
+        status = self._server_status.get(event.get("server_name") or "")
+        client = event.get("client")
+        if status is None or client is None:
+            return
+
+        if event.get("healthy"):
+            status.connected = True
+            status.last_ping = datetime.now()
+            status.last_error = None
+        else:
+            status.connected = client.is_connected()
+            metrics = self._connection_manager.get_client_status(client)
+            status.last_error = metrics.get("last_error") or "Health check failed"
 
     def get_registry_stats(self) -> dict[str, Any]:
         """
@@ -600,4 +757,12 @@ class MCPServerRegistry:
             "total_resources": total_resources,
             "last_cache_update": self._last_cache_update,
             "health_monitoring_active": self._health_check_task is not None,
+            "circuit_breakers": {
+                name: guard.get_stats() for name, guard in self._call_guards.items()
+            },
+            "open_circuits": sum(
+                1
+                for guard in self._call_guards.values()
+                if guard.circuit_breaker.state == CircuitBreakerState.OPEN
+            ),
         }
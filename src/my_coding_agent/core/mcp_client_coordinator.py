@@ -3,19 +3,33 @@ MCP Client Coordinator - Simplified MCP communication interface.
 
 This module provides a focused, lightweight interface for communicating with
 MCP (Model Context Protocol) servers, replacing the complex AIAgent architecture.
+
+The HTTP transport keeps a pooled keep-alive connector with DNS caching,
+retries with jittered exponential backoff, and can gzip large requests.
+Many requests can be in flight at once over the shared session, bounded by
+a semaphore, individually cancellable, and streamed through bounded queues.
 """
 
 import asyncio
+import gzip
 import json
 import logging
-from collections.abc import AsyncIterator
+import random
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, TypeVar
 
 import aiohttp
 
+from .streaming.stream_decoder import StreamDecoder
+
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 @dataclass
 class MCPCoordinatorConfig:
@@ -27,6 +41,26 @@ class MCPCoordinatorConfig:
     max_retries: int = 3
     retry_delay: float = 1.0
 
+    # Backoff: retry_delay * 2**attempt capped at max_retry_delay, with jitter
+    max_retry_delay: float = 10.0
+    retry_jitter: float = 0.5
+
+    # Connection pooling
+    connection_limit: int = 100
+    connection_limit_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    connect_timeout: float | None = 10.0
+    dns_cache_ttl: int | None = 300
+
+    # Request compression for large messages
+    compress_requests: bool = False
+    compression_threshold: int = 8192
+    compression_level: int = 6
+
+    # Concurrency: requests sharing the session, and chunks buffered per stream
+    max_in_flight: int = 16
+    stream_queue_size: int = 64
+
 
 @dataclass
 class MCPResponse:
@@ -49,6 +83,78 @@ class StreamingMCPResponse:
     code_blocks: list[dict[str, str]] = field(default_factory=list)
 
 
+class MCPRequestCancelledError(Exception):
+    """Raised when a request is cancelled through its CancellationToken."""
+
+
+class CancellationToken:
+    """
+    Thread-safe handle for cancelling one or more coordinator requests.
+
+    The token may be cancelled from any thread, e.g. a GUI stop button,
+    while the request runs on the event loop.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an uncancelled token."""
+        self._cancelled = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Check whether cancellation has been requested."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation of every request using this token."""
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._cancelled.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raise if cancellation has been requested.
+
+        Raises:
+            MCPRequestCancelledError: If the token is cancelled
+        """
+        if self.cancelled:
+            raise MCPRequestCancelledError("Request was cancelled")
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Register a callback to run when the token is cancelled.
+
+        The callback runs immediately if the token is already cancelled.
+
+        Args:
+            callback: Function to call on cancellation
+
+        Returns:
+            Function that unregisters the callback
+        """
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        """Unregister a cancellation callback."""
+        with self._lock, suppress(ValueError):
+            self._callbacks.remove(callback)
+
+
+# Marks the end of a stream in the per-stream queue
+_STREAM_END = object()
+
+
 class MCPClientCoordinator:
     """
     Simplified MCP Client Coordinator.
@@ -69,6 +175,28 @@ class MCPClientCoordinator:
         self.enable_streaming = config.enable_streaming
         self.max_retries = config.max_retries
 
+        # Bounds concurrent requests sharing the pooled session
+        self._in_flight_limit = asyncio.Semaphore(max(1, config.max_in_flight))
+        self._in_flight = 0
+
+    @property
+    def in_flight_count(self) -> int:
+        """Number of requests currently holding an in-flight slot."""
+        return self._in_flight
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get request concurrency statistics.
+
+        Returns:
+            Dictionary with in-flight counts and limits
+        """
+        return {
+            "in_flight": self._in_flight,
+            "max_in_flight": self.config.max_in_flight,
+            "stream_queue_size": self.config.stream_queue_size,
+        }
+
     async def connect(self) -> bool:
         """
         Connect to the MCP server.
@@ -107,18 +235,22 @@ class MCPClientCoordinator:
                 stacklevel=2
             )
 
-    async def send_message(self, message: str) -> MCPResponse:
+    async def send_message(
+        self, message: str, cancel_token: CancellationToken | None = None
+    ) -> MCPResponse:
         """
         Send a message to the MCP server.
 
         Args:
             message: The message to send
+            cancel_token: Optional token for cancelling the request
 
         Returns:
             MCPResponse: The response from the server
 
         Raises:
             RuntimeError: If not connected to server or max retries exceeded
+            MCPRequestCancelledError: If the request was cancelled
         """
         if not self.is_connected:
             raise RuntimeError("Not connected to MCP server")
@@ -127,41 +259,228 @@ class MCPClientCoordinator:
         last_exception = None
         for attempt in range(self.max_retries):
             try:
-                return await self._send_mcp_message(message, streaming=False)
+                async with self._request_slot(cancel_token) as cancelled:
+                    return await self._until_cancelled(
+                        self._send_mcp_message(message, streaming=False), cancelled
+                    )
+            except MCPRequestCancelledError:
+                raise
             except Exception as e:
                 last_exception = e
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.config.retry_delay)
+                    await asyncio.sleep(self._get_retry_delay(attempt))
                     logger.warning(f"Retry {attempt + 1} after error: {e}")
 
         raise RuntimeError(f"Max retries exceeded. Last error: {last_exception}")
 
     async def send_message_streaming(
-        self, message: str
+        self, message: str, cancel_token: CancellationToken | None = None
     ) -> AsyncIterator[StreamingMCPResponse]:
         """
         Send a message with streaming response.
 
+        Chunks are read by a producer task into a bounded queue; when the
+        consumer falls behind, the producer stops reading from the socket.
+
         Args:
             message: The message to send
+            cancel_token: Optional token for cancelling the request
 
         Yields:
             StreamingMCPResponse: Streaming response chunks
 
         Raises:
             RuntimeError: If not connected to server
+            MCPRequestCancelledError: If the request was cancelled
         """
         if not self.is_connected:
             raise RuntimeError("Not connected to MCP server")
 
-        async for response in self._send_mcp_message_streaming(message):
-            yield response
+        queue: asyncio.Queue[Any] = asyncio.Queue(
+            maxsize=max(1, self.config.stream_queue_size)
+        )
+
+        async with self._request_slot(cancel_token) as cancelled:
+            producer = asyncio.create_task(self._pump_stream(message, queue))
+            try:
+                while True:
+                    # Also catches a cancel that landed while the consumer
+                    # was busy between chunks
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+                    if queue.empty():
+                        item = await self._until_cancelled(queue.get(), cancelled)
+                    else:
+                        item = queue.get_nowait()
+                    if item is _STREAM_END:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                producer.cancel()
+                with suppress(asyncio.CancelledError):
+                    await producer
+
+    async def _pump_stream(self, message: str, queue: asyncio.Queue[Any]) -> None:
+        """Read streamed chunks into a bounded queue, ending with a marker."""
+        try:
+            async for response in self._send_mcp_message_streaming(message):
+                await queue.put(response)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_STREAM_END)
+
+    @asynccontextmanager
+    async def _request_slot(
+        self, cancel_token: CancellationToken | None
+    ) -> AsyncIterator[asyncio.Future[None] | None]:
+        """
+        Hold an in-flight slot and link it to a cancel token.
+
+        Cancellation resolves the yielded future rather than cancelling the
+        calling task, so the caller sees MCPRequestCancelledError from
+        _until_cancelled() and its own task state is left untouched.
+
+        Args:
+            cancel_token: Optional token that cancels the request
+
+        Yields:
+            Future resolved on cancellation, or None without a token
+
+        Raises:
+            MCPRequestCancelledError: If the token is already cancelled
+        """
+        unregister = None
+        cancelled: asyncio.Future[None] | None = None
+
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+            loop = asyncio.get_running_loop()
+            future: asyncio.Future[None] = loop.create_future()
+            cancelled = future
+
+            def _resolve() -> None:
+                if not future.done():
+                    future.set_result(None)
+
+            unregister = cancel_token.add_callback(
+                lambda: loop.call_soon_threadsafe(_resolve)
+            )
+
+        try:
+            async with self._in_flight_limit:
+                self._in_flight += 1
+                try:
+                    yield cancelled
+                finally:
+                    self._in_flight -= 1
+        finally:
+            if unregister is not None:
+                unregister()
+
+    @staticmethod
+    async def _until_cancelled(
+        awaitable: Awaitable[_T], cancelled: asyncio.Future[None] | None
+    ) -> _T:
+        """
+        Await a result unless the request is cancelled first.
+
+        Args:
+            awaitable: Work to wait for
+            cancelled: Future from _request_slot(), or None
+
+        Returns:
+            The awaited result
+
+        Raises:
+            MCPRequestCancelledError: If cancellation wins the race
+        """
+        if cancelled is None:
+            return await awaitable
+
+        work = asyncio.ensure_future(awaitable)
+        try:
+            await asyncio.wait((work, cancelled), return_when=asyncio.FIRST_COMPLETED)
+            if work.done():
+                return work.result()
+            raise MCPRequestCancelledError("Request was cancelled")
+        finally:
+            if not work.done():
+                work.cancel()
+                with suppress(asyncio.CancelledError):
+                    await work
+
+    def _get_retry_delay(self, attempt: int) -> float:
+        """
+        Compute the backoff before the next retry.
+
+        Uses exponential backoff capped at max_retry_delay, scaled down by a
+        random jitter so concurrent clients do not retry in lockstep.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+
+        Returns:
+            float: Seconds to wait before retrying
+        """
+        delay = min(
+            self.config.retry_delay * (2**attempt), self.config.max_retry_delay
+        )
+        jitter = min(max(self.config.retry_jitter, 0.0), 1.0)
+        return delay * (1.0 - jitter * random.random())
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create an HTTP session backed by a pooled keep-alive connector."""
+        connector = aiohttp.TCPConnector(
+            limit=self.config.connection_limit,
+            limit_per_host=self.config.connection_limit_per_host,
+            keepalive_timeout=self.config.keepalive_timeout,
+            use_dns_cache=self.config.dns_cache_ttl is not None,
+            ttl_dns_cache=self.config.dns_cache_ttl,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.timeout, connect=self.config.connect_timeout
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"Content-Type": "application/json"},
+        )
+
+    def _encode_payload(self, payload: dict[str, Any]) -> tuple[bytes, dict[str, str]]:
+        """
+        Serialize a request payload, compressing it when large enough.
+
+        Args:
+            payload: JSON-serializable request body
+
+        Returns:
+            tuple: Encoded body and any extra request headers
+        """
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        if (
+            self.config.compress_requests
+            and len(body) >= self.config.compression_threshold
+        ):
+            body = gzip.compress(body, compresslevel=self.config.compression_level)
+            return body, {"Content-Encoding": "gzip"}
+        return body, {}
+
+    def _build_payload(self, message: str, streaming: bool) -> dict[str, Any]:
+        """Build the chat request payload for a message."""
+        return {
+            "message": message,
+            "streaming": streaming,
+            "timestamp": time.monotonic(),
+        }
 
     async def _establish_connection(self) -> None:
         """Establish connection to MCP server."""
-        # Create aiohttp session with timeout
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
-        self._session = aiohttp.ClientSession(timeout=timeout)
+        # Reuse the pooled session across reconnects while it is open
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
 
         # Test connection with a simple health check
         try:
@@ -194,17 +513,11 @@ class MCPClientCoordinator:
         if not self._session:
             raise RuntimeError("No active session")
 
-        payload = {
-            "message": message,
-            "streaming": streaming,
-            "timestamp": asyncio.get_event_loop().time(),
-        }
+        body, headers = self._encode_payload(self._build_payload(message, streaming))
 
         try:
             async with self._session.post(
-                f"{self.server_url}/chat",
-                json=payload,
-                headers={"Content-Type": "application/json"},
+                f"{self.server_url}/chat", data=body, headers=headers
             ) as response:
                 if response.status != 200:
                     raise Exception(f"Server error: {response.status}")
@@ -222,6 +535,56 @@ class MCPClientCoordinator:
             logger.error(f"Error sending MCP message: {e}")
             raise
 
+    @staticmethod
+    def _coalesce_frames(frames: list[Any]) -> list[StreamingMCPResponse]:
+        """
+        Turn decoded stream frames into response chunks.
+
+        Consecutive plain text deltas are merged into a single chunk and
+        empty deltas are dropped, so a burst of tokens read together costs
+        one chunk rather than one per frame.
+
+        Args:
+            frames: JSON values decoded from one read of the stream
+
+        Returns:
+            list: Streaming response chunks in order
+        """
+        responses: list[StreamingMCPResponse] = []
+        pending: list[str] = []
+
+        for data in frames:
+            if not isinstance(data, dict):
+                continue
+
+            content = data.get("content") or ""
+            is_complete = bool(data.get("is_complete", False))
+            metadata = data.get("metadata") or {}
+            tool_calls = data.get("tool_calls") or []
+            code_blocks = data.get("code_blocks") or []
+
+            if not (is_complete or metadata or tool_calls or code_blocks):
+                if content:
+                    pending.append(content)
+                continue
+
+            if pending:
+                responses.append(StreamingMCPResponse(content="".join(pending)))
+                pending = []
+            responses.append(
+                StreamingMCPResponse(
+                    content=content,
+                    is_complete=is_complete,
+                    metadata=metadata,
+                    tool_calls=tool_calls,
+                    code_blocks=code_blocks,
+                )
+            )
+
+        if pending:
+            responses.append(StreamingMCPResponse(content="".join(pending)))
+        return responses
+
     async def _send_mcp_message_streaming(
         self, message: str
     ) -> AsyncIterator[StreamingMCPResponse]:
@@ -237,35 +600,23 @@ class MCPClientCoordinator:
         if not self._session:
             raise RuntimeError("No active session")
 
-        payload = {
-            "message": message,
-            "streaming": True,
-            "timestamp": asyncio.get_event_loop().time(),
-        }
+        body, headers = self._encode_payload(self._build_payload(message, True))
 
         try:
             async with self._session.post(
-                f"{self.server_url}/chat/stream",
-                json=payload,
-                headers={"Content-Type": "application/json"},
+                f"{self.server_url}/chat/stream", data=body, headers=headers
             ) as response:
                 if response.status != 200:
                     raise Exception(f"Server error: {response.status}")
 
-                async for line in response.content:
-                    if line:
-                        try:
-                            data = json.loads(line.decode("utf-8").strip())
-                            yield StreamingMCPResponse(
-                                content=data.get("content", ""),
-                                is_complete=data.get("is_complete", False),
-                                metadata=data.get("metadata", {}),
-                                tool_calls=data.get("tool_calls", []),
-                                code_blocks=data.get("code_blocks", []),
-                            )
-                        except json.JSONDecodeError:
-                            # Skip invalid JSON lines
-                            continue
+                decoder = StreamDecoder(
+                    StreamDecoder.format_for_content_type(response.content_type)
+                )
+                async for chunk in response.content.iter_any():
+                    for item in self._coalesce_frames(decoder.feed(chunk)):
+                        yield item
+                for item in self._coalesce_frames(decoder.flush()):
+                    yield item
 
         except Exception as e:
             logger.error(f"Error in streaming MCP message: {e}")
@@ -0,0 +1,668 @@
+"""
+Conversation memory with batched, write-behind persistence.
+
+This module provides the memory service used by AIAgent including:
+- Conversation messages and rolling summaries stored in SQLite (WAL mode)
+- Long-term memories stored in the local vector index
+- A background writer applying queued writes in batched transactions
+- In-memory recent history so reads never wait for the database
+- A guaranteed flush when the service is closed
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .ai_services.context_builder import ContextBuilder
+from .long_term_memory import LongTermMemoryStore
+from .vector_index import EmbeddingFunction
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session
+    ON messages (session_id, timestamp);
+CREATE TABLE IF NOT EXISTS summaries (
+    session_id TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    covered_through TEXT NOT NULL,
+    message_count INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+def default_memory_dir() -> Path:
+    """Get the directory storing conversation memory.
+
+    Returns:
+        AI_MEMORY_DIR if set, otherwise my_coding_agent/memory in the user's
+        data directory
+    """
+    if memory_dir := os.getenv("AI_MEMORY_DIR"):
+        return Path(memory_dir)
+    if data_home := os.getenv("XDG_DATA_HOME"):
+        return Path(data_home) / "my_coding_agent" / "memory"
+    return Path.home() / ".local" / "share" / "my_coding_agent" / "memory"
+
+
+@dataclass
+class _Flush:
+    """Queue marker released once every earlier write has been applied."""
+
+    done: threading.Event
+    stop: bool = False
+
+
+class WriteBehindQueue:
+    """
+    Applies queued writes in batches on a background thread.
+
+    A batch is applied when it reaches max_batch items, flush_interval seconds
+    after its first item was queued, or when flush() or close() is called.
+    """
+
+    def __init__(
+        self,
+        apply_batch: Callable[[list[Any]], None],
+        flush_interval: float = 0.5,
+        max_batch: int = 200,
+        name: str = "memory-writer",
+    ) -> None:
+        """
+        Start the writer thread.
+
+        Args:
+            apply_batch: Applies a list of writes, called on the writer thread
+            flush_interval: Maximum seconds a write waits before being applied
+            max_batch: Maximum writes applied together
+            name: Name of the writer thread
+        """
+        self._apply_batch = apply_batch
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._closed = False
+
+        # Statistics tracking
+        self.batches = 0
+        self.writes = 0
+        self.failures = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Approximate number of queued writes."""
+        return self._queue.qsize()
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the writer thread is alive."""
+        return self._thread.is_alive()
+
+    def put(self, write: object) -> None:
+        """
+        Queue a write without waiting for it to be applied.
+
+        Raises:
+            RuntimeError: If the queue has been closed
+        """
+        if self._closed:
+            raise RuntimeError("Write queue is closed")
+        self._queue.put(write)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until every write queued so far has been applied.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the writes were applied within the timeout
+        """
+        if not self.is_running:
+            return self._queue.empty()
+        marker = _Flush(threading.Event())
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Apply the remaining writes and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the writes were applied within the timeout
+        """
+        if self._closed:
+            return self._queue.empty()
+        self._closed = True
+        marker = _Flush(threading.Event(), stop=True)
+        self._queue.put(marker)
+        flushed = marker.done.wait(timeout)
+        self._thread.join(timeout)
+        return flushed
+
+    def _run(self) -> None:
+        """Collect writes into batches and apply them."""
+        while True:
+            batch: list[Any] = []
+            marker = None
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, _Flush):
+                    marker = item
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.max_batch or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._apply_batch(batch)
+                    self.batches += 1
+                    self.writes += len(batch)
+                except Exception as e:
+                    self.failures += 1
+                    logger.error(f"Failed to persist {len(batch)} memory writes: {e}")
+
+            if marker is not None:
+                marker.done.set()
+                if marker.stop:
+                    return
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get writer statistics."""
+        return {
+            "pending": self.pending,
+            "batches": self.batches,
+            "writes": self.writes,
+            "failures": self.failures,
+            "running": self.is_running,
+        }
+
+
+class MemoryContextService:
+    """
+    Stores conversations and long-term memories off the chat turn's path.
+
+    Store calls only update in-memory state and queue the write. The writer
+    thread applies queued messages, summaries and memories in one SQLite
+    transaction and one batched embedding call per batch.
+    """
+
+    def __init__(
+        self,
+        memory_dir: str | Path | None = None,
+        flush_interval: float = 0.5,
+        max_batch: int = 200,
+        history_cache_size: int = 1000,
+        embedding_function: EmbeddingFunction | None = None,
+        context_builder: ContextBuilder | None = None,
+        enable_memory_awareness: bool = True,
+    ) -> None:
+        """
+        Open the memory database and resume the latest session.
+
+        Args:
+            memory_dir: Directory for the database and memory index, defaults
+                to default_memory_dir()
+            flush_interval: Maximum seconds a write waits before being stored
+            max_batch: Maximum writes stored in one transaction
+            history_cache_size: Recent messages of the session kept in memory
+            embedding_function: Embeds long-term memories for recall
+            context_builder: Assembles prompts for enhance_message_with_memory_context
+            enable_memory_awareness: Whether memory-aware conversations are on
+        """
+        self.memory_dir = Path(memory_dir) if memory_dir else default_memory_dir()
+        self.memory_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.memory_dir / "conversations.db"
+        self._memory_aware_enabled = enable_memory_awareness
+        self._context_builder = context_builder or ContextBuilder()
+
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._read_connection = self._connect()
+        self._read_connection.executescript(SCHEMA)
+        self._write_connection: sqlite3.Connection | None = None
+
+        self.long_term_store = LongTermMemoryStore(
+            self.memory_dir / "long_term", embedding_function
+        )
+        self._pending_memories: dict[str, dict[str, Any]] = {}
+
+        self._history_cache_size = history_cache_size
+        self._recent: deque[dict[str, Any]] = deque(maxlen=history_cache_size)
+        self._session_message_count = 0
+        self._summary: dict[str, Any] | None = None
+        self._session_id = self._resume_latest_session()
+
+        self._writer = WriteBehindQueue(
+            self._apply_writes, flush_interval=flush_interval, max_batch=max_batch
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a database connection in WAL mode."""
+        connection = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        return connection
+
+    def _resume_latest_session(self) -> str:
+        """Load the most recent session, or create one if there is none."""
+        row = self._read_connection.execute(
+            "SELECT id FROM sessions ORDER BY created_at DESC LIMIT 1"
+        ).fetchone()
+        if row is None:
+            session_id = uuid.uuid4().hex
+            self._read_connection.execute(
+                "INSERT INTO sessions (id, created_at) VALUES (?, ?)",
+                (session_id, time.time()),
+            )
+            return session_id
+
+        session_id = row[0]
+        self._session_message_count = self._read_connection.execute(
+            "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+        ).fetchone()[0]
+        self._recent.extend(
+            reversed(self._read_messages(session_id, self._recent.maxlen))
+        )
+        summary = self._read_connection.execute(
+            "SELECT content, covered_through, message_count, created_at "
+            "FROM summaries WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        if summary is not None:
+            self._summary = dict(
+                zip(
+                    ("content", "covered_through", "message_count", "created_at"),
+                    summary,
+                    strict=True,
+                )
+            )
+        return session_id
+
+    def _read_messages(self, session_id: str, limit: int) -> list[dict[str, Any]]:
+        """Read the newest stored messages of a session, newest first."""
+        with self._read_lock:
+            rows = self._read_connection.execute(
+                "SELECT id, role, content, metadata, timestamp FROM messages "
+                "WHERE session_id = ? ORDER BY timestamp DESC, rowid DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+        return [
+            {
+                "id": message_id,
+                "session_id": session_id,
+                "role": role,
+                "content": content,
+                "metadata": json.loads(metadata),
+                "timestamp": timestamp,
+            }
+            for message_id, role, content, metadata, timestamp in rows
+        ]
+
+    def _apply_writes(self, batch: list[tuple[str, Any]]) -> None:
+        """Apply a batch of queued writes; runs on the writer thread."""
+        if self._write_connection is None:
+            self._write_connection = self._connect()
+        connection = self._write_connection
+
+        memories = []
+        connection.execute("BEGIN")
+        try:
+            for kind, payload in batch:
+                if kind == "message":
+                    connection.execute(
+                        "INSERT OR REPLACE INTO messages "
+                        "(id, session_id, role, content, metadata, timestamp) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            payload["id"],
+                            payload["session_id"],
+                            payload["role"],
+                            payload["content"],
+                            json.dumps(payload["metadata"]),
+                            payload["timestamp"],
+                        ),
+                    )
+                elif kind == "session":
+                    connection.execute(
+                        "INSERT OR IGNORE INTO sessions (id, created_at) VALUES (?, ?)",
+                        payload,
+                    )
+                elif kind == "summary":
+                    connection.execute(
+                        "INSERT OR REPLACE INTO summaries (session_id, content, "
+                        "covered_through, message_count, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        payload,
+                    )
+                elif kind == "memory":
+                    memories.append(payload)
+                elif kind == "clear":
+                    connection.execute("DELETE FROM messages")
+                    connection.execute("DELETE FROM summaries")
+                    connection.execute("DELETE FROM sessions")
+                    connection.execute(
+                        "INSERT INTO sessions (id, created_at) VALUES (?, ?)", payload
+                    )
+                    memories.clear()
+                    self.long_term_store.clear()
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        if memories:
+            self.long_term_store.store_many(memories)
+            with self._lock:
+                for memory in memories:
+                    self._pending_memories.pop(memory["id"], None)
+
+    @property
+    def memory_aware_enabled(self) -> bool:
+        """Check if memory-aware conversations are enabled."""
+        return self._memory_aware_enabled
+
+    @memory_aware_enabled.setter
+    def memory_aware_enabled(self, value: bool) -> None:
+        self._memory_aware_enabled = value
+
+    def get_current_session_id(self) -> str:
+        """Get the id of the current conversation session."""
+        return self._session_id
+
+    def start_new_session(self) -> str:
+        """
+        Start a new conversation session.
+
+        Returns:
+            Id of the new session
+        """
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._session_id = session_id
+            self._recent.clear()
+            self._session_message_count = 0
+            self._summary = None
+        self._writer.put(("session", (session_id, time.time())))
+        return session_id
+
+    def _store_message(
+        self, role: str, content: str, metadata: dict[str, Any] | None
+    ) -> str:
+        """Record a message in the recent history and queue its write."""
+        message = {
+            "id": uuid.uuid4().hex,
+            "session_id": self._session_id,
+            "role": role,
+            "content": content,
+            "metadata": metadata or {},
+            "timestamp": time.time(),
+        }
+        with self._lock:
+            self._recent.append(message)
+            self._session_message_count += 1
+        self._writer.put(("message", message))
+        return message["id"]
+
+    def store_user_message(
+        self, message: str, metadata: dict[str, Any] | None = None
+    ) -> str:
+        """Store a user message; returns its id."""
+        return self._store_message("user", message, metadata)
+
+    def store_assistant_message(
+        self, message: str, metadata: dict[str, Any] | None = None
+    ) -> str:
+        """Store an assistant message; returns its id."""
+        return self._store_message("assistant", message, metadata)
+
+    def store_long_term_memory(
+        self,
+        content: str,
+        memory_type: str = "user_info",
+        importance_score: float = 0.8,
+    ) -> str:
+        """Store a long-term memory; returns its id."""
+        memory = {
+            "id": uuid.uuid4().hex,
+            "content": content,
+            "memory_type": memory_type,
+            "importance_score": importance_score,
+            "created_at": time.time(),
+        }
+        with self._lock:
+            self._pending_memories[memory["id"]] = memory
+        self._writer.put(("memory", memory))
+        return memory["id"]
+
+    def store_conversation_summary(
+        self, content: str, covered_through: str, message_count: int
+    ) -> None:
+        """Store the rolling summary of the current session."""
+        summary = {
+            "content": content,
+            "covered_through": covered_through,
+            "message_count": message_count,
+            "created_at": time.time(),
+        }
+        with self._lock:
+            self._summary = summary
+            session_id = self._session_id
+        self._writer.put(
+            (
+                "summary",
+                (session_id, content, covered_through, message_count, time.time()),
+            )
+        )
+
+    def get_conversation_summary(self) -> dict[str, Any] | None:
+        """Get the rolling summary of the current session, if any."""
+        return self._summary
+
+    def get_conversation_context(self, limit: int = 50) -> list[dict[str, Any]]:
+        """
+        Get the most recent messages of the current session.
+
+        Args:
+            limit: Maximum number of messages
+
+        Returns:
+            Message dicts, newest first
+        """
+        with self._lock:
+            cached = len(self._recent)
+            if limit <= cached or cached >= self._session_message_count:
+                return list(reversed(self._recent))[:limit]
+            session_id = self._session_id
+
+        # Older messages than the cache holds have to come from the database
+        self._writer.flush()
+        return self._read_messages(session_id, limit)
+
+    def get_long_term_memories(
+        self, query: str = "", limit: int = 10
+    ) -> list[dict[str, Any]]:
+        """
+        Get the long-term memories most relevant to a query.
+
+        Memories that are still queued are included first when they share a
+        word with the query.
+
+        Args:
+            query: Text to match
+            limit: Maximum number of memories
+
+        Returns:
+            Memory dicts with content, memory_type and importance_score
+        """
+        with self._lock:
+            pending = list(self._pending_memories.values())
+
+        query_terms = set(query.lower().split())
+        results = [
+            {**memory, "relevance": None}
+            for memory in reversed(pending)
+            if not query_terms or query_terms & set(memory["content"].lower().split())
+        ][:limit]
+        seen = {memory["id"] for memory in pending}
+        for memory in self.long_term_store.recall(query, limit):
+            if len(results) >= limit:
+                break
+            if memory["id"] not in seen:
+                results.append(memory)
+        return results
+
+    def enhance_message_with_memory_context(self, message: str) -> str:
+        """
+        Add conversation history and relevant memories to a message.
+
+        Args:
+            message: Current user message
+
+        Returns:
+            Prompt with the memory context, within the builder's token budget
+        """
+        budget = self._context_builder.budget
+        history = self.get_conversation_context(budget.history_limit)
+        summary = self._summary
+        summary_text = None
+        if summary is not None:
+            summary_text = summary["content"]
+            for index, entry in enumerate(history):
+                if entry["id"] == summary["covered_through"]:
+                    history = history[:index]
+                    break
+
+        memories = self.get_long_term_memories(message, budget.memory_limit)
+        return self._context_builder.build(
+            message, history, memories, summary=summary_text
+        ).prompt
+
+    def load_conversation_history(self, chat_widget: object) -> bool:
+        """
+        Show the current session's recent messages in a chat widget.
+
+        Args:
+            chat_widget: Widget with add_user_message and add_assistant_message
+
+        Returns:
+            True if any messages were loaded
+        """
+        with self._lock:
+            messages = list(self._recent)
+        for message in messages:
+            if message["role"] == "user":
+                chat_widget.add_user_message(message["content"])
+            elif message["role"] == "assistant":
+                chat_widget.add_assistant_message(message["content"])
+        return bool(messages)
+
+    def get_project_context_for_ai(
+        self,
+        file_path: str | None = None,
+        recent_hours: int = 24,
+        max_events: int = 10,
+    ) -> str:
+        """Get project context for the AI; project history is not stored here."""
+        return ""
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until every queued write has been stored.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the writes were stored within the timeout
+        """
+        return self._writer.flush(timeout)
+
+    async def clear_all_memory(self) -> bool:
+        """Delete all conversations and long-term memories."""
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._session_id = session_id
+            self._recent.clear()
+            self._session_message_count = 0
+            self._summary = None
+            self._pending_memories.clear()
+        self._writer.put(("clear", (session_id, time.time())))
+        return await asyncio.to_thread(self._writer.flush)
+
+    async def close(self) -> None:
+        """Store all queued writes and stop the writer thread."""
+        await asyncio.to_thread(self.shutdown)
+
+    def shutdown(self) -> None:
+        """Store all queued writes, stop the writer and close the database."""
+        self._writer.close()
+        if self._write_connection is not None:
+            self._write_connection.close()
+            self._write_connection = None
+        self._read_connection.close()
+
+    def get_memory_statistics(self) -> dict[str, Any]:
+        """Get memory system statistics."""
+        return {
+            "memory_enabled": self.memory_aware_enabled,
+            "current_session_id": self._session_id,
+            "session_messages": self._session_message_count,
+            "long_term_memories": len(self.long_term_store)
+            + len(self._pending_memories),
+            "write_queue": self._writer.get_stats(),
+        }
+
+    def get_health_status(self) -> dict[str, Any]:
+        """Get memory service health status."""
+        return {
+            "service_name": "MemoryContextService",
+            "memory_enabled": self.memory_aware_enabled,
+            "memory_system_initialized": True,
+            "current_session_id": self._session_id,
+            "is_healthy": self._writer.is_running and self._writer.failures == 0,
+            "write_queue": self._writer.get_stats(),
+        }
@@ -0,0 +1,428 @@
+"""
+In-process latency metrics for AI and MCP requests.
+
+This module provides:
+- Log-linear latency histograms with bounded relative error, in the style of
+  HdrHistogram, reporting p50/p95/p99 without storing every sample
+- Counters and histograms tagged by provider, deployment and MCP server
+- A process-wide registry shared by the AI services and the MCP registry
+- An optional local HTTP endpoint serving the Prometheus text format
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the cumulative buckets in the Prometheus export
+DEFAULT_EXPORT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+METRIC_DESCRIPTIONS = {
+    "ai_request_duration_seconds": "Duration of tracked AI service operations",
+    "ai_requests_total": "Tracked AI service operations by outcome",
+    "ai_abandoned_operations_total": "Tracked operations that never finished",
+    "ai_time_to_first_token_seconds": "Time from sending a query to its first chunk",
+    "ai_inter_chunk_gap_seconds": "Time between consecutive streamed chunks",
+    "ai_stream_chunks_total": "Streamed response chunks received",
+    "mcp_call_duration_seconds": "Duration of MCP tool calls and resource reads",
+    "mcp_calls_total": "MCP tool calls and resource reads by outcome",
+    "mcp_queue_wait_seconds": "Time MCP calls waited for a bulkhead slot",
+}
+
+SeriesKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations.
+
+    Values are recorded as integer ticks of resolution seconds. Ticks below
+    2**precision_bits are counted exactly; larger values share a bucket with
+    values that agree in their top precision_bits bits, so every reported
+    percentile is within a relative error of 2**-(precision_bits - 1).
+    Buckets are stored sparsely, so memory grows with the spread of the
+    values rather than with the number of samples.
+    """
+
+    def __init__(self, precision_bits: int = 6, resolution: float = 1e-6) -> None:
+        """
+        Initialize the histogram.
+
+        Args:
+            precision_bits: Bits of each value kept exactly
+            resolution: Smallest distinguishable duration, in seconds
+        """
+        if precision_bits < 2:
+            raise ValueError("precision_bits must be at least 2")
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+
+        self.precision_bits = precision_bits
+        self.resolution = resolution
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Record a duration.
+
+        Args:
+            seconds: Duration to record; negative values are clamped to zero
+        """
+        seconds = max(seconds, 0.0)
+        index = self._index(int(seconds / self.resolution))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        """Mean of the recorded durations."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get the duration at a percentile.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Duration in seconds, or 0.0 if nothing was recorded
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(max(self._midpoint(index), self.min), self.max)
+        return self.max
+
+    def count_at_or_below(self, seconds: float) -> int:
+        """
+        Count recorded durations no longer than a bound.
+
+        Values sharing a bucket are assigned to its midpoint, so the result
+        has the same relative error as the percentiles.
+        """
+        return sum(
+            count
+            for index, count in self._counts.items()
+            if self._midpoint(index) <= seconds
+        )
+
+    def summary(self) -> dict[str, float]:
+        """Get count, mean, percentiles and maximum."""
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 6),
+            "p50": round(self.percentile(50), 6),
+            "p95": round(self.percentile(95), 6),
+            "p99": round(self.percentile(99), 6),
+            "max": round(self.max, 6),
+        }
+
+    def _index(self, ticks: int) -> int:
+        """Map ticks to a bucket index that increases with the value."""
+        shift = max(0, ticks.bit_length() - self.precision_bits)
+        return (shift << self.precision_bits) + (ticks >> shift)
+
+    def _midpoint(self, index: int) -> float:
+        """Duration represented by a bucket."""
+        shift = index >> self.precision_bits
+        mantissa = index - (shift << self.precision_bits)
+        low = mantissa << shift
+        high = ((mantissa + 1) << shift) - 1
+        return (low + high) / 2 * self.resolution
+
+
+class MetricsRegistry:
+    """
+    Thread-safe collection of tagged histograms and counters.
+
+    A series is identified by a metric name and its tags; tags with a None
+    value are left out so callers can pass optional context directly.
+    """
+
+    def __init__(self, precision_bits: int = 6) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            precision_bits: Precision of the histograms created by the registry
+        """
+        self.precision_bits = precision_bits
+        self._lock = threading.Lock()
+        self._histograms: dict[SeriesKey, LatencyHistogram] = {}
+        self._counters: dict[SeriesKey, float] = {}
+
+    def observe(self, name: str, seconds: float, **tags: object) -> None:
+        """
+        Record a duration in a histogram.
+
+        Args:
+            name: Metric name
+            seconds: Duration to record
+            **tags: Tags identifying the series
+        """
+        key = (name, _normalize_tags(tags))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram(self.precision_bits)
+                self._histograms[key] = histogram
+            histogram.record(seconds)
+
+    def increment(self, name: str, amount: float = 1.0, **tags: object) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name: Metric name
+            amount: Amount to add
+            **tags: Tags identifying the series
+        """
+        key = (name, _normalize_tags(tags))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    @contextmanager
+    def time(self, name: str, **tags: object) -> Iterator[None]:
+        """Record the duration of a block, including blocks that raise."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **tags)
+
+    def get_histogram(self, name: str, **tags: object) -> LatencyHistogram | None:
+        """Get the histogram of one series, or None if nothing was recorded."""
+        return self._histograms.get((name, _normalize_tags(tags)))
+
+    def get_counter(self, name: str, **tags: object) -> float:
+        """Get the value of one counter series."""
+        return self._counters.get((name, _normalize_tags(tags)), 0.0)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Summarize every series.
+
+        Returns:
+            Dictionary with "histograms" and "counters", each mapping metric
+            names to a list of series with their tags
+        """
+        histograms: dict[str, list[dict[str, Any]]] = {}
+        counters: dict[str, list[dict[str, Any]]] = {}
+        with self._lock:
+            for (name, tags), histogram in sorted(self._histograms.items()):
+                histograms.setdefault(name, []).append(
+                    {"tags": dict(tags), **histogram.summary()}
+                )
+            for (name, tags), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append(
+                    {"tags": dict(tags), "value": value}
+                )
+        return {"histograms": histograms, "counters": counters}
+
+    def render_prometheus(
+        self, buckets: tuple[float, ...] = DEFAULT_EXPORT_BUCKETS
+    ) -> str:
+        """
+        Render every series in the Prometheus text exposition format.
+
+        Args:
+            buckets: Upper bounds of the exported cumulative buckets
+
+        Returns:
+            Exposition text, ending with a newline
+        """
+        lines: list[str] = []
+        with self._lock:
+            histogram_items = sorted(self._histograms.items())
+            counter_items = sorted(self._counters.items())
+
+            current = None
+            for (name, tags), histogram in histogram_items:
+                if name != current:
+                    current = name
+                    lines.extend(_metric_header(name, "histogram"))
+                for bound in buckets:
+                    labels = _format_labels((*tags, ("le", repr(bound))))
+                    count = histogram.count_at_or_below(bound)
+                    lines.append(f"{name}_bucket{labels} {count}")
+                labels = _format_labels((*tags, ("le", "+Inf")))
+                lines.append(f"{name}_bucket{labels} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(tags)} {histogram.total}")
+                lines.append(f"{name}_count{_format_labels(tags)} {histogram.count}")
+
+            current = None
+            for (name, tags), value in counter_items:
+                if name != current:
+                    current = name
+                    lines.extend(_metric_header(name, "counter"))
+                lines.append(f"{name}{_format_labels(tags)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Discard every series."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+def _normalize_tags(tags: dict[str, object]) -> tuple[tuple[str, str], ...]:
+    """Turn tags into a hashable, ordered series key."""
+    return tuple(sorted((k, str(v)) for k, v in tags.items() if v is not None))
+
+
+def _format_labels(tags: tuple[tuple[str, str], ...]) -> str:
+    """Format tags as a Prometheus label set."""
+    if not tags:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in tags) + "}"
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _metric_header(name: str, metric_type: str) -> list[str]:
+    """HELP and TYPE lines for a metric."""
+    description = METRIC_DESCRIPTIONS.get(name, name.replace("_", " "))
+    return [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}"]
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _default_registry
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics from the server's registry."""
+
+    server: _MetricsHTTPServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Handle a scrape request."""
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.server.registry.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Send access logs to the module logger instead of stderr."""
+        logger.debug(f"Metrics request: {format % args}")
+
+
+class _MetricsHTTPServer(ThreadingHTTPServer):
+    """HTTP server holding the registry it exposes."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], registry: MetricsRegistry) -> None:
+        self.registry = registry
+        super().__init__(address, _MetricsRequestHandler)
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint exposing a registry in the Prometheus text format.
+
+    The server runs on a daemon thread and only binds to localhost by
+    default; it is not started unless requested.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry | None = None,
+        host: str = "127.0.0.1",
+        port: int = 9464,
+    ) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            registry: Registry to expose, defaults to the process-wide one
+            host: Interface to bind
+            port: Port to bind, or 0 to pick a free one
+        """
+        self.registry = registry or get_metrics_registry()
+        self.host = host
+        self.port = port
+        self._server: _MetricsHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the server is running."""
+        return self._server is not None
+
+    @property
+    def url(self) -> str:
+        """URL of the metrics endpoint."""
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self) -> None:
+        """Bind the port and start serving on a background thread."""
+        if self._server is not None:
+            return
+
+        self._server = _MetricsHTTPServer((self.host, self.port), self.registry)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Serving metrics at {self.url}")
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self._server = None
+        self._thread = None
@@ -0,0 +1,493 @@
+"""
+Time-indexed store of project file changes.
+
+This module provides the project history used by the agent's history tools
+including:
+- Records fed by FileChangeDetector events
+- Sorted timestamp arrays for the whole project and for every file
+- Range queries with newest-first pagination
+- Text search over paths and change summaries
+- Timelines assembled from cached, per-day formatted segments
+- Optional persistence to an append-only JSON lines file
+
+Range queries use binary search on the sorted arrays, so a timeline over
+months of edits only formats the days that changed since it was last built.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+
+from .file_change_detector import FileChangeEvent
+
+logger = logging.getLogger(__name__)
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass
+class HistoryRecord:
+    """One change to one file."""
+
+    timestamp: float
+    file_path: str
+    event_type: str
+    summary: str = ""
+    content: str = ""
+    lines_added: int = 0
+    lines_removed: int = 0
+    old_path: str | None = None
+    record_id: int = 0
+    _search_text: str | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def search_text(self) -> str:
+        """Lowercased text matched by searches."""
+        if self._search_text is None:
+            self._search_text = " ".join(
+                (self.file_path, self.event_type, self.summary, self.content)
+            ).lower()
+        return self._search_text
+
+    def to_dict(self) -> dict[str, object]:
+        """Convert the record to a plain dictionary."""
+        data = asdict(self)
+        del data["_search_text"]
+        return data
+
+
+@dataclass
+class HistoryPage:
+    """A page of records from a query."""
+
+    records: list[HistoryRecord]
+    total: int
+    offset: int = 0
+
+    @property
+    def has_more(self) -> bool:
+        """Check whether more records follow this page."""
+        return self.offset + len(self.records) < self.total
+
+
+def format_record(record: HistoryRecord, include_path: bool = True) -> str:
+    """Format a record as a single timeline line."""
+    time_str = datetime.fromtimestamp(record.timestamp).strftime(TIME_FORMAT)
+    where = f"{record.file_path} - " if include_path else ""
+    summary = record.summary or "No summary available"
+    return f"[{time_str}] {where}{record.event_type.upper()}: {summary}"
+
+
+def day_of(timestamp: float) -> date:
+    """Get the local calendar day of a timestamp."""
+    return datetime.fromtimestamp(timestamp).date()
+
+
+def day_bounds(day: date) -> tuple[float, float]:
+    """Get the first timestamp of a day and of the day after it."""
+    midnight = datetime.min.time()
+    start = datetime.combine(day, midnight)
+    end = datetime.combine(date.fromordinal(day.toordinal() + 1), midnight)
+    return start.timestamp(), end.timestamp()
+
+
+class _TimeIndex:
+    """Records kept sorted by timestamp alongside a parallel key array."""
+
+    __slots__ = ("records", "timestamps")
+
+    def __init__(self) -> None:
+        self.timestamps: list[float] = []
+        self.records: list[HistoryRecord] = []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, record: HistoryRecord) -> None:
+        """Insert a record after any others with the same timestamp."""
+        if not self.timestamps or record.timestamp >= self.timestamps[-1]:
+            self.timestamps.append(record.timestamp)
+            self.records.append(record)
+            return
+        position = bisect_right(self.timestamps, record.timestamp)
+        self.timestamps.insert(position, record.timestamp)
+        self.records.insert(position, record)
+
+    def bounds(self, start: float | None, end: float | None) -> tuple[int, int]:
+        """Get the slice of records with start <= timestamp < end."""
+        low = 0 if start is None else bisect_left(self.timestamps, start)
+        high = (
+            len(self.timestamps) if end is None else bisect_left(self.timestamps, end)
+        )
+        return low, max(low, high)
+
+
+class ProjectHistoryStore:
+    """In-memory, time-indexed history of project file changes."""
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        root: Path | str | None = None,
+        segment_cache_size: int = 512,
+    ) -> None:
+        """
+        Initialize the store, loading earlier records if a file is given.
+
+        Args:
+            path: JSON lines file that records are appended to, or None to
+                keep history in memory only
+            root: Project root; paths under it are stored relative to it
+            segment_cache_size: Number of formatted day segments to keep
+        """
+        self.path = Path(path) if path is not None else None
+        self.root = Path(root).resolve() if root is not None else None
+        self.segment_cache_size = segment_cache_size
+
+        self._all = _TimeIndex()
+        self._by_file: dict[str, _TimeIndex] = {}
+        self._next_id = 1
+        self._lock = threading.RLock()
+
+        # (file path or "", day ordinal) -> (event count, formatted lines)
+        self._segments: OrderedDict[tuple[str, int], tuple[int, str]] = OrderedDict()
+        self._segment_hits = 0
+        self._segment_misses = 0
+
+        if self.path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def _load(self) -> None:
+        """Read records persisted by earlier sessions."""
+        assert self.path is not None
+        if not self.path.exists():
+            return
+
+        with self.path.open(encoding="utf-8") as lines:
+            for number, line in enumerate(lines, 1):
+                try:
+                    data = json.loads(line)
+                    self._insert(HistoryRecord(**data))
+                except (json.JSONDecodeError, TypeError) as e:
+                    logger.warning(f"Skipping bad history line {number}: {e}")
+
+    def normalize_path(self, file_path: Path | str) -> str:
+        """Store paths under the project root relative to it, with / separators."""
+        path = Path(file_path)
+        if self.root is not None and path.is_absolute():
+            with suppress(ValueError):
+                path = path.resolve().relative_to(self.root)
+        return path.as_posix()
+
+    def _insert(self, record: HistoryRecord) -> None:
+        """Index a record and drop formatted segments it changes."""
+        record.record_id = record.record_id or self._next_id
+        self._next_id = max(self._next_id, record.record_id + 1)
+
+        self._all.add(record)
+        self._by_file.setdefault(record.file_path, _TimeIndex()).add(record)
+
+        ordinal = day_of(record.timestamp).toordinal()
+        self._segments.pop(("", ordinal), None)
+        self._segments.pop((record.file_path, ordinal), None)
+
+    def record(
+        self,
+        file_path: Path | str,
+        event_type: str,
+        timestamp: float | None = None,
+        summary: str = "",
+        content: str = "",
+        lines_added: int = 0,
+        lines_removed: int = 0,
+        old_path: Path | str | None = None,
+    ) -> HistoryRecord:
+        """
+        Add a change to the history.
+
+        Args:
+            file_path: Changed file
+            event_type: Kind of change, e.g. "modified"
+            timestamp: When the change happened; defaults to now
+            summary: One-line description of the change
+            content: Optional details shown with file history
+            lines_added: Number of lines added
+            lines_removed: Number of lines removed
+            old_path: Previous path of a moved file
+
+        Returns:
+            The stored record
+        """
+        record = HistoryRecord(
+            timestamp=time.time() if timestamp is None else timestamp,
+            file_path=self.normalize_path(file_path),
+            event_type=event_type,
+            summary=summary,
+            content=content,
+            lines_added=lines_added,
+            lines_removed=lines_removed,
+            old_path=self.normalize_path(old_path) if old_path else None,
+        )
+
+        with self._lock:
+            self._insert(record)
+            self._append([record])
+
+        return record
+
+    def extend(self, records: Iterable[HistoryRecord]) -> None:
+        """
+        Add already built records in one batch, e.g. when importing history.
+
+        Args:
+            records: Records to add; their paths are normalized
+        """
+        with self._lock:
+            added = []
+            for record in records:
+                record.file_path = self.normalize_path(record.file_path)
+                self._insert(record)
+                added.append(record)
+            self._append(added)
+
+    def _append(self, records: list[HistoryRecord]) -> None:
+        """Persist records to the history file, if there is one."""
+        if self.path is None or not records:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as lines:
+                lines.writelines(
+                    json.dumps(record.to_dict()) + "\n" for record in records
+                )
+        except OSError as e:
+            logger.error(f"Failed to persist project history: {e}")
+
+    def record_event(self, event: FileChangeEvent) -> HistoryRecord:
+        """
+        Add an analyzed file change event.
+
+        Args:
+            event: Event emitted by FileChangeDetector.file_changed
+
+        Returns:
+            The stored record
+        """
+        metadata = event.metadata
+        return self.record(
+            event.file_path,
+            event.change_type.value,
+            timestamp=event.timestamp,
+            summary=str(metadata.get("summary", "")),
+            lines_added=int(metadata.get("lines_added", 0) or 0),
+            lines_removed=int(metadata.get("lines_removed", 0) or 0),
+            old_path=event.old_path,
+        )
+
+    def attach(self, detector: object) -> None:
+        """
+        Record every change a FileChangeDetector emits.
+
+        Args:
+            detector: Detector whose file_changed signal feeds the store
+        """
+        detector.file_changed.connect(self.record_event)  # type: ignore[attr-defined]
+
+    def _index(self, file_path: Path | str | None) -> _TimeIndex | None:
+        """Get the index for one file, the whole project, or None if unknown."""
+        if file_path is None or file_path == "":
+            return self._all
+        return self._by_file.get(self.normalize_path(file_path))
+
+    def query(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        file_path: Path | str | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> HistoryPage:
+        """
+        Get records with start <= timestamp < end, newest first.
+
+        Args:
+            start: Earliest timestamp, or None for no lower bound
+            end: Timestamp to stop before, or None for no upper bound
+            file_path: Only return changes to this file
+            offset: Number of newest matching records to skip
+            limit: Maximum number of records to return
+
+        Returns:
+            The requested page and the total number of matches
+        """
+        with self._lock:
+            index = self._index(file_path)
+            if index is None:
+                return HistoryPage([], 0, offset)
+
+            low, high = index.bounds(start, end)
+            stop = high - offset
+            begin = low if limit is None else max(low, stop - limit)
+            records = index.records[begin:stop][::-1] if stop > begin else []
+            return HistoryPage(records, high - low, offset)
+
+    def recent(
+        self, hours: float = 24, limit: int = 15, offset: int = 0
+    ) -> HistoryPage:
+        """Get changes from the last given number of hours, newest first."""
+        return self.query(start=time.time() - hours * 3600, offset=offset, limit=limit)
+
+    def search(self, query: str, limit: int = 25, offset: int = 0) -> HistoryPage:
+        """
+        Find records whose path or summary contains every query term.
+
+        Args:
+            query: Space separated search terms
+            limit: Maximum number of records to return
+            offset: Number of newest matches to skip
+
+        Returns:
+            Matches, newest first, and the total number of matches
+        """
+        terms = query.lower().split()
+        with self._lock:
+            matches = [
+                record
+                for record in reversed(self._all.records)
+                if all(term in record.search_text for term in terms)
+            ]
+        return HistoryPage(matches[offset : offset + limit], len(matches), offset)
+
+    def files(self) -> list[str]:
+        """Get every path with recorded history."""
+        with self._lock:
+            return sorted(self._by_file)
+
+    def _segment(self, file_path: str, day: date) -> tuple[int, str]:
+        """Get the event count and formatted lines for one whole day."""
+        key = (file_path, day.toordinal())
+        cached = self._segments.get(key)
+        if cached is not None:
+            self._segments.move_to_end(key)
+            self._segment_hits += 1
+            return cached
+
+        self._segment_misses += 1
+        start, end = day_bounds(day)
+        segment = self._format_day(file_path, day, start, end)
+        self._segments[key] = segment
+        if len(self._segments) > self.segment_cache_size:
+            self._segments.popitem(last=False)
+        return segment
+
+    def _format_day(
+        self, file_path: str, day: date, start: float, end: float
+    ) -> tuple[int, str]:
+        """Format the records of one day between start and end, newest first."""
+        page = self.query(start, end, file_path or None)
+        if not page.records:
+            return 0, ""
+
+        noun = "change" if page.total == 1 else "changes"
+        lines = [f"{day.isoformat()} ({page.total} {noun})"]
+        lines.extend(
+            "  " + format_record(record, include_path=not file_path)
+            for record in page.records
+        )
+        return page.total, "\n".join(lines)
+
+    def timeline(
+        self,
+        start: float,
+        end: float | None = None,
+        file_path: Path | str | None = None,
+        max_events: int | None = None,
+    ) -> str:
+        """
+        Format the changes between start and end grouped by day, newest first.
+
+        Days that lie fully inside the range are served from the segment
+        cache; only the partial days at the ends are formatted each time.
+
+        Args:
+            start: Earliest timestamp
+            end: Timestamp to stop before; defaults to now
+            file_path: Only include changes to this file
+            max_events: Stop adding days once this many events are shown
+
+        Returns:
+            The formatted timeline, or an empty string if nothing changed
+        """
+        end = time.time() if end is None else end
+        path = self.normalize_path(file_path) if file_path else ""
+
+        with self._lock:
+            index = self._index(path or None)
+            if index is None:
+                return ""
+
+            low, high = index.bounds(start, end)
+            if low == high:
+                return ""
+
+            # Only days that contain records need to be visited
+            first_day = day_of(index.timestamps[low]).toordinal()
+            last_day = day_of(index.timestamps[high - 1]).toordinal()
+
+            segments: list[str] = []
+            shown = 0
+            for ordinal in range(last_day, first_day - 1, -1):
+                day = date.fromordinal(ordinal)
+                day_start_ts, day_end_ts = day_bounds(day)
+                if start <= day_start_ts and day_end_ts <= end:
+                    count, text = self._segment(path, day)
+                else:
+                    count, text = self._format_day(
+                        path, day, max(start, day_start_ts), min(end, day_end_ts)
+                    )
+                if not count:
+                    continue
+
+                segments.append(text)
+                shown += count
+                if max_events is not None and shown >= max_events:
+                    break
+
+            omitted = (high - low) - shown
+            if omitted > 0:
+                segments.append(f"... {omitted} earlier changes not shown")
+            return "\n\n".join(segments)
+
+    def get_stats(self) -> dict[str, object]:
+        """Get store statistics."""
+        with self._lock:
+            return {
+                "records": len(self._all),
+                "files": len(self._by_file),
+                "segments_cached": len(self._segments),
+                "segment_hits": self._segment_hits,
+                "segment_misses": self._segment_misses,
+                "persistent": self.path is not None,
+            }
+
+    def clear(self) -> None:
+        """Remove all records, including the persisted file."""
+        with self._lock:
+            self._all = _TimeIndex()
+            self._by_file.clear()
+            self._segments.clear()
+            if self.path is not None and self.path.exists():
+                self.path.unlink()
@@ -0,0 +1,509 @@
+"""
+Opt-in disk-backed cache of model requests and responses.
+
+This module provides deterministic, offline replays of agent conversations
+including:
+- Cache keys built from the model, message history (with the system prompt),
+  tool catalog and model settings
+- A model wrapper serving cached responses for regular and streamed requests
+- Replay of cached streams with their original chunk timing or at full speed
+- An offline mode that fails instead of reaching the model on a cache miss
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+import pydantic
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelResponse,
+    ModelResponseStreamEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ThinkingPart,
+    ThinkingPartDelta,
+    ToolCallPart,
+    ToolCallPartDelta,
+)
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.profiles import ModelProfile
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.usage import Usage
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+# Fields that differ between otherwise identical requests
+VOLATILE_MESSAGE_FIELDS = frozenset(
+    {"timestamp", "tool_call_id", "usage", "vendor_details", "vendor_id"}
+)
+
+_stream_event_adapter: pydantic.TypeAdapter[ModelResponseStreamEvent] = (
+    pydantic.TypeAdapter(ModelResponseStreamEvent)
+)
+
+
+class ResponseCacheMissError(RuntimeError):
+    """Raised in offline mode when a request has no cached response."""
+
+
+class ReplayMode(Enum):
+    """How cached streams are replayed."""
+
+    TIMED = "timed"  # Original delays between chunks
+    FAST = "fast"  # Every chunk at once
+
+
+def _strip_volatile(value: object) -> object:
+    """Drop fields that vary between identical requests from dumped messages."""
+    if isinstance(value, dict):
+        return {
+            key: _strip_volatile(item)
+            for key, item in value.items()
+            if key not in VOLATILE_MESSAGE_FIELDS
+        }
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def hash_tool_catalog(parameters: ModelRequestParameters) -> str:
+    """
+    Hash the tools and output options offered to the model.
+
+    Args:
+        parameters: Request parameters of the model request
+
+    Returns:
+        Hex digest of the tool catalog
+    """
+    catalog = {
+        "function_tools": sorted(
+            (dataclasses.asdict(tool) for tool in parameters.function_tools),
+            key=lambda tool: tool["name"],
+        ),
+        "output_tools": sorted(
+            (dataclasses.asdict(tool) for tool in parameters.output_tools),
+            key=lambda tool: tool["name"],
+        ),
+        "allow_text_output": parameters.allow_text_output,
+    }
+    encoded = json.dumps(catalog, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def build_cache_key(
+    model_name: str,
+    messages: list[ModelMessage],
+    model_settings: ModelSettings | None,
+    parameters: ModelRequestParameters,
+) -> str:
+    """
+    Build the cache key of a model request.
+
+    The system prompt is part of the first request message, so it is covered
+    by the message history.
+
+    Args:
+        model_name: Name of the model the request is sent to
+        messages: Message history of the request
+        model_settings: Settings such as temperature and max tokens
+        parameters: Tools and output options of the request
+
+    Returns:
+        Hex digest identifying the request
+    """
+    history = _strip_volatile(
+        ModelMessagesTypeAdapter.dump_python(messages, mode="json")
+    )
+    payload = {
+        "model": model_name,
+        "messages": history,
+        "settings": dict(model_settings or {}),
+        "tools": hash_tool_catalog(parameters),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResponseCache:
+    """
+    Directory of cached model responses, one JSON file per request.
+
+    Entries hold the final response and, for streamed requests, every stream
+    event with its offset from the start of the stream.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        replay_mode: ReplayMode | str = ReplayMode.TIMED,
+        offline: bool = False,
+    ) -> None:
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries
+            replay_mode: Replay cached streams with their original timing
+                ("timed") or as fast as possible ("fast")
+            offline: Raise ResponseCacheMissError instead of calling the model
+                when a request is not cached
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.replay_mode = ReplayMode(replay_mode)
+        self.offline = offline
+
+        # Statistics tracking
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _path_for(self, key: str) -> Path:
+        """Path of the entry for a key, sharded by its first two characters."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """
+        Load a cache entry.
+
+        Args:
+            key: Cache key from build_cache_key
+
+        Returns:
+            Cache entry, or None if the request is not cached
+        """
+        path = self._path_for(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable response cache entry {path}: {e}")
+            return None
+        if entry.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        return entry
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        """
+        Store a cache entry, replacing any existing one.
+
+        Args:
+            key: Cache key from build_cache_key
+            entry: Entry built by CachedModel
+        """
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so readers never see partial entries
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"version": CACHE_FORMAT_VERSION, **entry}, file)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        self.writes += 1
+
+    def clear(self) -> int:
+        """
+        Delete every cache entry.
+
+        Returns:
+            Number of entries deleted
+        """
+        removed = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache usage counters."""
+        lookups = self.hits + self.misses
+        return {
+            "cache_dir": str(self.cache_dir),
+            "replay_mode": self.replay_mode.value,
+            "offline": self.offline,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _dump_response(response: ModelResponse) -> dict[str, Any]:
+    """Serialize a model response for a cache entry."""
+    return ModelMessagesTypeAdapter.dump_python([response], mode="json")[0]
+
+
+def _load_response(data: dict[str, Any]) -> ModelResponse:
+    """Deserialize a model response from a cache entry."""
+    response = ModelMessagesTypeAdapter.validate_python([data])[0]
+    assert isinstance(response, ModelResponse)
+    return response
+
+
+@dataclass
+class RecordingStreamedResponse(StreamedResponse):
+    """Passes a model stream through while recording its events and timing."""
+
+    _inner: StreamedResponse
+    _cache: ResponseCache
+    _key: str
+    _started: float = field(default_factory=time.perf_counter)
+    _events: list[tuple[float, Any]] = field(default_factory=list, init=False)
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        async for event in self._inner:
+            self._events.append(
+                (
+                    time.perf_counter() - self._started,
+                    _stream_event_adapter.dump_python(event, mode="json"),
+                )
+            )
+            yield event
+
+        # Only complete streams are cached; interrupted ones are discarded
+        entry = {
+            "response": _dump_response(self._inner.get()),
+            "stream": self._events,
+        }
+        await asyncio.to_thread(self._cache.put, self._key, entry)
+
+    def get(self) -> ModelResponse:
+        """Build the response from the wrapped stream."""
+        return self._inner.get()
+
+    def usage(self) -> Usage:
+        """Usage reported by the wrapped stream."""
+        return self._inner.usage()
+
+    @property
+    def model_name(self) -> str:
+        """Get the model name of the response."""
+        return self._inner.model_name
+
+    @property
+    def timestamp(self) -> datetime:
+        """Get the timestamp of the response."""
+        return self._inner.timestamp
+
+
+@dataclass
+class ReplayedStreamedResponse(StreamedResponse):
+    """Replays a cached stream, optionally with its original timing."""
+
+    _model_name: str
+    _response: ModelResponse
+    _events: list[tuple[float, ModelResponseStreamEvent]]
+    _timed: bool = True
+    _started: float = field(default_factory=time.perf_counter)
+    _timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        for offset, event in self._events:
+            if self._timed:
+                delay = self._started + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            replayed = self._apply(event)
+            if replayed is not None:
+                yield replayed
+        self._usage = self._response.usage
+
+    def _apply(
+        self, event: ModelResponseStreamEvent
+    ) -> ModelResponseStreamEvent | None:
+        """Feed a recorded event through the parts manager."""
+        manager = self._parts_manager
+        index = event.index
+        if isinstance(event, PartStartEvent):
+            part = event.part
+            if isinstance(part, TextPart):
+                return manager.handle_text_delta(
+                    vendor_part_id=index, content=part.content
+                )
+            if isinstance(part, ToolCallPart):
+                return manager.handle_tool_call_part(
+                    vendor_part_id=index,
+                    tool_name=part.tool_name,
+                    args=part.args,
+                    tool_call_id=part.tool_call_id,
+                )
+            if isinstance(part, ThinkingPart):
+                return manager.handle_thinking_delta(
+                    vendor_part_id=index,
+                    content=part.content,
+                    signature=part.signature,
+                )
+            return None
+
+        delta = event.delta
+        if isinstance(delta, TextPartDelta):
+            return manager.handle_text_delta(
+                vendor_part_id=index, content=delta.content_delta
+            )
+        if isinstance(delta, ToolCallPartDelta):
+            return manager.handle_tool_call_delta(
+                vendor_part_id=index,
+                tool_name=delta.tool_name_delta,
+                args=delta.args_delta,
+                tool_call_id=delta.tool_call_id,
+            )
+        if isinstance(delta, ThinkingPartDelta):
+            return manager.handle_thinking_delta(
+                vendor_part_id=index,
+                content=delta.content_delta,
+                signature=delta.signature_delta,
+            )
+        return None
+
+    @property
+    def model_name(self) -> str:
+        """Get the model name of the response."""
+        return self._model_name
+
+    @property
+    def timestamp(self) -> datetime:
+        """Get the timestamp of the response."""
+        return self._timestamp
+
+
+def _events_from_response(
+    response: ModelResponse,
+) -> list[tuple[float, ModelResponseStreamEvent]]:
+    """Build stream events for a response that was cached without streaming."""
+    return [
+        (0.0, PartStartEvent(index=index, part=part))
+        for index, part in enumerate(response.parts)
+    ]
+
+
+class CachedModel(WrapperModel):
+    """
+    Model wrapper answering requests from a ResponseCache.
+
+    Cache misses are sent to the wrapped model and stored; streamed requests
+    are only stored once the stream has been read to the end.
+    """
+
+    def __init__(self, wrapped: Model, cache: ResponseCache) -> None:
+        """
+        Initialize the cached model.
+
+        Args:
+            wrapped: Model receiving requests that are not cached
+            cache: Cache storing the responses
+        """
+        super().__init__(wrapped)
+        self.cache = cache
+
+    @property
+    def profile(self) -> ModelProfile:
+        """Profile of the wrapped model."""
+        return self.wrapped.profile
+
+    def _key(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        parameters: ModelRequestParameters,
+    ) -> str:
+        """Cache key of a request to the wrapped model."""
+        return build_cache_key(
+            self.wrapped.model_name, messages, model_settings, parameters
+        )
+
+    async def _lookup(self, key: str) -> dict[str, Any] | None:
+        """Load an entry, counting the lookup and enforcing offline mode."""
+        entry = await asyncio.to_thread(self.cache.get, key)
+        if entry is not None:
+            self.cache.hits += 1
+            logger.debug(f"Response cache hit: {key[:12]}")
+            return entry
+
+        self.cache.misses += 1
+        if self.cache.offline:
+            raise ResponseCacheMissError(
+                f"No cached response for request {key[:12]} and the response "
+                "cache is offline"
+            )
+        return None
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        """Answer a request from the cache, calling the model on a miss."""
+        key = self._key(messages, model_settings, model_request_parameters)
+        entry = await self._lookup(key)
+        if entry is not None:
+            return _load_response(entry["response"])
+
+        response = await self.wrapped.request(
+            messages, model_settings, model_request_parameters
+        )
+        await asyncio.to_thread(
+            self.cache.put, key, {"response": _dump_response(response), "stream": None}
+        )
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Replay a cached stream, or record the model's stream on a miss."""
+        key = self._key(messages, model_settings, model_request_parameters)
+        entry = await self._lookup(key)
+        if entry is not None:
+            response = _load_response(entry["response"])
+            if entry.get("stream") is None:
+                events = _events_from_response(response)
+            else:
+                events = [
+                    (offset, _stream_event_adapter.validate_python(event))
+                    for offset, event in entry["stream"]
+                ]
+            yield ReplayedStreamedResponse(
+                _model_name=response.model_name or self.wrapped.model_name,
+                _response=response,
+                _events=events,
+                _timed=self.cache.replay_mode is ReplayMode.TIMED,
+            )
+            return
+
+        # Offsets count from the request so the time to first token is kept
+        started = time.perf_counter()
+        async with self.wrapped.request_stream(
+            messages, model_settings, model_request_parameters
+        ) as stream:
+            yield RecordingStreamedResponse(
+                _inner=stream, _cache=self.cache, _key=key, _started=started
+            )
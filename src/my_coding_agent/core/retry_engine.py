@@ -0,0 +1,375 @@
+"""
+Shared retry policy engine for AI and MCP requests.
+
+This module provides deadline-aware retries used by the MCP error handler,
+the query processor and the streaming response service including:
+- Exponential backoff with full jitter
+- A total deadline budget per request that no retry or backoff may exceed
+- Retry budgets capping retries to a fraction of overall traffic
+- Optional hedged attempts for idempotent reads
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RetryPredicate = Callable[[Exception, int], bool]
+RetryCallback = Callable[[Exception, int, float], None]
+
+
+class RetryDeadlineExceededError(TimeoutError):
+    """Raised when a request runs out of its total deadline budget."""
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of request traffic.
+
+    Every first attempt deposits ratio tokens and every retry or hedged
+    attempt withdraws one, so once the initial reserve is spent at most
+    about ratio retries are sent per request. This keeps a failing
+    dependency from being hit with a multiple of its normal load.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0) -> None:
+        """
+        Initialize the retry budget.
+
+        Args:
+            ratio: Retries allowed per request once the reserve is spent
+            reserve: Tokens available up front and the bucket capacity
+        """
+        if ratio < 0:
+            raise ValueError("ratio must be non-negative")
+        self.ratio = ratio
+        self.reserve = reserve
+        self._tokens = reserve
+        self.requests = 0
+        self.retries = 0
+        self.rejected = 0
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available for retries."""
+        return self._tokens
+
+    def record_request(self) -> None:
+        """Record a first attempt, depositing ratio tokens."""
+        self.requests += 1
+        self._tokens = min(self.reserve, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """
+        Withdraw a token for a retry or hedged attempt.
+
+        Returns:
+            True if the retry may be sent, False if the budget is spent
+        """
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.retries += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def get_stats(self) -> dict[str, float]:
+        """Get budget usage counters."""
+        return {
+            "tokens": round(self._tokens, 3),
+            "requests": self.requests,
+            "retries": self.retries,
+            "rejected": self.rejected,
+        }
+
+
+class RetryEngine:
+    """
+    Runs an operation with backoff, a total deadline, a retry budget and hedging.
+
+    The operation receives the zero-based attempt number and is called again
+    after a failure while the predicate allows it, attempts remain, the
+    retry budget has tokens and the backoff fits within the deadline.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        backoff_multiplier: float = 2.0,
+        jitter: bool = True,
+        deadline: float | None = None,
+        retry_budget: RetryBudget | None = None,
+        hedge_delay: float | None = None,
+        max_hedged_attempts: int = 2,
+    ) -> None:
+        """
+        Initialize the retry engine.
+
+        Args:
+            max_attempts: Total attempts including the first one
+            base_delay: Backoff cap before the first retry, in seconds
+            max_delay: Largest backoff cap, in seconds
+            backoff_multiplier: Growth of the backoff cap per retry
+            jitter: Use full jitter (uniform between 0 and the cap)
+            deadline: Default total seconds per request, or None for no limit
+            retry_budget: Budget shared by every request through this engine
+            hedge_delay: Seconds before an idempotent attempt is hedged, or
+                None to disable hedging
+            max_hedged_attempts: Maximum concurrent copies of one attempt
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.backoff_multiplier = backoff_multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_budget = retry_budget
+        self.hedge_delay = hedge_delay
+        self.max_hedged_attempts = max(1, max_hedged_attempts)
+
+        # Statistics tracking
+        self.total_requests = 0
+        self.total_retries = 0
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+        self.budget_exhausted = 0
+
+    def calculate_delay(self, retry_number: int) -> float:
+        """
+        Calculate the backoff before a retry.
+
+        Args:
+            retry_number: Zero-based index of the retry
+
+        Returns:
+            Delay in seconds
+        """
+        cap = min(
+            self.base_delay * self.backoff_multiplier**retry_number, self.max_delay
+        )
+        if self.jitter:
+            return random.uniform(0, cap)
+        return cap
+
+    async def run(
+        self,
+        operation: Callable[[int], Awaitable[T]],
+        should_retry: RetryPredicate | None = None,
+        deadline: float | None = None,
+        idempotent: bool = False,
+        bound_attempts: bool = True,
+        on_retry: RetryCallback | None = None,
+        stop_event: asyncio.Event | None = None,
+        max_attempts: int | None = None,
+    ) -> T:
+        """
+        Run an operation with retries.
+
+        Args:
+            operation: Coroutine function taking the attempt number
+            should_retry: Predicate deciding whether an error is retryable;
+                every error is retried if not provided
+            deadline: Total seconds for this request, overriding the default
+            idempotent: Whether attempts may be hedged
+            bound_attempts: Cancel an attempt still running at the deadline;
+                disable for long streams where only retries are bounded
+            on_retry: Called with the error, next attempt number and delay
+                before each retry
+            stop_event: Abandons backoff and stops retrying once set
+            max_attempts: Total attempts for this request, overriding the default
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            RetryDeadlineExceededError: If an attempt is cut off by the deadline
+            Exception: The last error when retries stop
+        """
+        budget_seconds = self.deadline if deadline is None else deadline
+        expires_at = (
+            time.monotonic() + budget_seconds if budget_seconds is not None else None
+        )
+
+        attempt_limit = self.max_attempts if max_attempts is None else max_attempts
+
+        self.total_requests += 1
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+
+        attempt = 0
+        while True:
+            remaining = self._remaining(expires_at)
+            try:
+                return await self._run_attempt(
+                    operation,
+                    attempt,
+                    remaining if bound_attempts else None,
+                    idempotent,
+                )
+            except asyncio.TimeoutError as e:
+                if expires_at is not None and self._remaining(expires_at) <= 0:
+                    self.deadline_exceeded += 1
+                    raise RetryDeadlineExceededError(
+                        f"Request exceeded its {budget_seconds:.1f}s deadline"
+                    ) from e
+                error: Exception = e
+            except Exception as e:
+                error = e
+
+            next_attempt = attempt + 1
+            if next_attempt >= attempt_limit:
+                raise error
+            if should_retry is not None and not should_retry(error, attempt):
+                raise error
+            if stop_event is not None and stop_event.is_set():
+                raise error
+
+            delay = self.calculate_delay(attempt)
+            remaining = self._remaining(expires_at)
+            if remaining is not None and delay >= remaining:
+                self.deadline_exceeded += 1
+                logger.warning(
+                    f"Not retrying: {delay:.2f}s backoff exceeds the "
+                    f"{remaining:.2f}s left of the request deadline"
+                )
+                raise error
+            if self.retry_budget is not None and not self.retry_budget.try_acquire():
+                self.budget_exhausted += 1
+                logger.warning("Not retrying: retry budget exhausted")
+                raise error
+
+            if on_retry is not None:
+                on_retry(error, next_attempt, delay)
+            self.total_retries += 1
+
+            if await self._backoff(delay, stop_event):
+                raise error
+            attempt = next_attempt
+
+    async def _run_attempt(
+        self,
+        operation: Callable[[int], Awaitable[T]],
+        attempt: int,
+        timeout: float | None,
+        idempotent: bool,
+    ) -> T:
+        """Run one attempt, hedged if allowed, within the remaining time."""
+        if timeout is not None and timeout <= 0:
+            raise asyncio.TimeoutError()
+
+        if idempotent and self.hedge_delay is not None and self.max_hedged_attempts > 1:
+            coro: Awaitable[T] = self._run_hedged(operation, attempt)
+        else:
+            coro = operation(attempt)
+
+        if timeout is None:
+            return await coro
+        return await asyncio.wait_for(coro, timeout=timeout)
+
+    async def _run_hedged(
+        self, operation: Callable[[int], Awaitable[T]], attempt: int
+    ) -> T:
+        """
+        Run an attempt, sending extra copies if it is slow to answer.
+
+        The first successful copy wins and the others are cancelled. An
+        error is only raised once no copy is left running.
+        """
+        tasks: list[asyncio.Task[T]] = [asyncio.ensure_future(operation(attempt))]
+        pending: set[asyncio.Task[T]] = set(tasks)
+        last_error: BaseException | None = None
+        max_copies = self.max_hedged_attempts
+
+        try:
+            while pending:
+                can_hedge = len(tasks) < max_copies
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not tasks[0]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    last_error = error
+
+                if not done and can_hedge:
+                    if (
+                        self.retry_budget is not None
+                        and not self.retry_budget.try_acquire()
+                    ):
+                        self.budget_exhausted += 1
+                        # Wait for the running copies without hedging further
+                        max_copies = len(tasks)
+                        continue
+                    self.hedges_sent += 1
+                    hedge = asyncio.ensure_future(operation(attempt))
+                    tasks.append(hedge)
+                    pending.add(hedge)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        assert last_error is not None
+        raise last_error
+
+    @staticmethod
+    def _remaining(expires_at: float | None) -> float | None:
+        """Seconds left before the deadline, or None without a deadline."""
+        if expires_at is None:
+            return None
+        return expires_at - time.monotonic()
+
+    @staticmethod
+    async def _backoff(delay: float, stop_event: asyncio.Event | None) -> bool:
+        """
+        Wait before the next attempt.
+
+        Returns:
+            True if the stop event was set during the wait
+        """
+        if stop_event is None:
+            await asyncio.sleep(delay)
+            return False
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get retry statistics.
+
+        Returns:
+            Dictionary with request, retry, hedge and budget counters
+        """
+        return {
+            "total_requests": self.total_requests,
+            "total_retries": self.total_retries,
+            "hedges_sent": self.hedges_sent,
+            "hedge_wins": self.hedge_wins,
+            "deadline_exceeded": self.deadline_exceeded,
+            "budget_exhausted": self.budget_exhausted,
+            "retry_budget": (
+                self.retry_budget.get_stats() if self.retry_budget is not None else None
+            ),
+        }
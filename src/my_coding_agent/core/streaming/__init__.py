@@ -4,12 +4,21 @@ Streaming functionality for real-time AI response display.
 This module provides:
 - StreamHandler: Manages chunk-by-chunk response streaming
 - ResponseBuffer: Intelligent buffering for smooth text display
+- StreamDecoder: Incremental NDJSON/SSE framing for streamed responses
 - Stream state management and interruption capabilities
 """
 
 from __future__ import annotations
 
 from .response_buffer import ResponseBuffer
+from .stream_decoder import StreamDecodeError, StreamDecoder, StreamFormat
 from .stream_handler import StreamHandler, StreamState
 
-__all__ = ["StreamHandler", "StreamState", "ResponseBuffer"]
+__all__ = [
+    "StreamHandler",
+    "StreamState",
+    "ResponseBuffer",
+    "StreamDecoder",
+    "StreamDecodeError",
+    "StreamFormat",
+]
@@ -0,0 +1,273 @@
+"""
+StreamDecoder for incremental parsing of streamed JSON responses.
+
+Provides:
+- A bytearray buffer that frames NDJSON lines and SSE events across chunk boundaries
+- Automatic detection of NDJSON or SSE from the first frame or content type
+- orjson parsing when installed, falling back to the standard library
+- Skipping of keep-alive lines and SSE comments without decoding them
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from enum import Enum
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Largest partial frame held in the buffer before the stream is rejected
+DEFAULT_MAX_BUFFER_SIZE = 16 * 1024 * 1024
+
+_SSE_FIELD_PREFIXES = (b"data:", b"event:", b"id:", b"retry:", b":")
+_SSE_DONE = b"[DONE]"
+
+
+class StreamFormat(Enum):
+    """Framing used by a streamed response body."""
+
+    AUTO = "auto"
+    NDJSON = "ndjson"
+    SSE = "sse"
+
+
+class StreamDecodeError(ValueError):
+    """Raised when a streamed response cannot be framed."""
+
+
+def loads_json(data: bytes | bytearray | memoryview) -> object:
+    """
+    Parse a JSON document from bytes using the fastest available backend.
+
+    Args:
+        data: UTF-8 encoded JSON
+
+    Returns:
+        Parsed JSON value
+
+    Raises:
+        ValueError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+class StreamDecoder:
+    """
+    Incremental decoder for NDJSON and Server-Sent Events bodies.
+
+    Chunks are appended to a single bytearray and only complete lines are
+    parsed, so JSON objects split across network reads are reassembled
+    rather than dropped. Consumed bytes are released once per feed() call.
+    """
+
+    def __init__(
+        self,
+        stream_format: StreamFormat = StreamFormat.AUTO,
+        max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE,
+    ) -> None:
+        """
+        Initialize the StreamDecoder.
+
+        Args:
+            stream_format: Expected framing, or AUTO to detect it from the data
+            max_buffer_size: Maximum bytes of an incomplete frame to buffer
+        """
+        self.stream_format = stream_format
+        self.max_buffer_size = max_buffer_size
+
+        self._buffer = bytearray()
+        self._scan_from = 0
+        self._event_data: list[bytes] = []
+
+        # Statistics tracking
+        self.frames_decoded = 0
+        self.keepalives_skipped = 0
+        self.invalid_frames = 0
+
+    @staticmethod
+    def format_for_content_type(content_type: str | None) -> StreamFormat:
+        """
+        Choose the stream format from a response content type.
+
+        Args:
+            content_type: Value of the Content-Type header
+
+        Returns:
+            StreamFormat matching the content type, or AUTO if unknown
+        """
+        if not content_type:
+            return StreamFormat.AUTO
+        content_type = content_type.lower()
+        if "event-stream" in content_type:
+            return StreamFormat.SSE
+        if "ndjson" in content_type or "jsonl" in content_type:
+            return StreamFormat.NDJSON
+        return StreamFormat.AUTO
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """
+        Add a chunk of the response body and decode any complete frames.
+
+        Args:
+            chunk: Raw bytes read from the response
+
+        Returns:
+            List of decoded JSON values, in stream order
+
+        Raises:
+            StreamDecodeError: If an incomplete frame exceeds max_buffer_size
+        """
+        if not chunk:
+            return []
+
+        buffer = self._buffer
+        buffer += chunk
+        frames: list[Any] = []
+        start = 0
+
+        while True:
+            newline = buffer.find(b"\n", self._scan_from)
+            if newline == -1:
+                break
+            end = (
+                newline - 1
+                if newline > start and buffer[newline - 1] == 13
+                else newline
+            )
+            self._process_line(start, end, frames)
+            start = newline + 1
+            self._scan_from = start
+
+        if start:
+            del buffer[:start]
+        self._scan_from = len(buffer)
+
+        if len(buffer) > self.max_buffer_size:
+            self.reset()
+            raise StreamDecodeError(
+                f"Stream frame exceeds {self.max_buffer_size} bytes without a newline"
+            )
+
+        return frames
+
+    def flush(self) -> list[Any]:
+        """
+        Decode whatever remains at the end of the stream.
+
+        Returns:
+            List of decoded JSON values from a trailing unterminated frame
+        """
+        frames: list[Any] = []
+        if self._buffer:
+            end = len(self._buffer)
+            if self._buffer.endswith(b"\r"):
+                end -= 1
+            self._process_line(0, end, frames)
+            self._buffer.clear()
+        if self._event_data:
+            self._dispatch_event(frames)
+        self._scan_from = 0
+        return frames
+
+    def reset(self) -> None:
+        """Discard any buffered partial frame."""
+        self._buffer.clear()
+        self._event_data.clear()
+        self._scan_from = 0
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Get decoder statistics.
+
+        Returns:
+            Dictionary with frame counts and the current buffer size
+        """
+        return {
+            "frames_decoded": self.frames_decoded,
+            "keepalives_skipped": self.keepalives_skipped,
+            "invalid_frames": self.invalid_frames,
+            "buffered_bytes": len(self._buffer),
+        }
+
+    def _process_line(self, start: int, end: int, frames: list[Any]) -> None:
+        """Handle one complete line held in the buffer at [start, end)."""
+        buffer = self._buffer
+
+        if self.stream_format is StreamFormat.AUTO:
+            if start == end or buffer[start:end].isspace():
+                self.keepalives_skipped += 1
+                return
+            is_sse = buffer.startswith(_SSE_FIELD_PREFIXES, start, end)
+            self.stream_format = StreamFormat.SSE if is_sse else StreamFormat.NDJSON
+
+        if self.stream_format is StreamFormat.SSE:
+            self._process_sse_line(start, end, frames)
+            return
+
+        # NDJSON: one document per line; blank lines are keep-alives
+        if end - start <= 2 and (start == end or buffer[start:end].isspace()):
+            self.keepalives_skipped += 1
+            return
+        with memoryview(buffer) as view:
+            self._decode(view[start:end], frames)
+
+    def _process_sse_line(self, start: int, end: int, frames: list[Any]) -> None:
+        """Accumulate SSE data lines and dispatch an event on a blank line."""
+        buffer = self._buffer
+
+        if start == end:
+            if self._event_data:
+                self._dispatch_event(frames)
+            return
+
+        if buffer[start] == 58:  # ":" comment, used by servers as a keep-alive
+            self.keepalives_skipped += 1
+            return
+
+        if buffer.startswith(b"data:", start, end):
+            value_start = start + 5
+            if value_start < end and buffer[value_start] == 32:
+                value_start += 1
+            self._event_data.append(bytes(buffer[value_start:end]))
+        # event:, id: and retry: fields carry nothing the caller needs
+
+    def _dispatch_event(self, frames: list[Any]) -> None:
+        """Decode the data of a completed SSE event."""
+        data = (
+            self._event_data[0]
+            if len(self._event_data) == 1
+            else b"\n".join(self._event_data)
+        )
+        self._event_data.clear()
+
+        if not data.strip():
+            self.keepalives_skipped += 1
+            return
+        if data.strip() == _SSE_DONE:
+            self.frames_decoded += 1
+            frames.append({"content": "", "is_complete": True})
+            return
+        self._decode(data, frames)
+
+    def _decode(self, data: bytes | memoryview, frames: list[Any]) -> None:
+        """Parse one frame, skipping it if it is not valid JSON."""
+        try:
+            frames.append(loads_json(data))
+            self.frames_decoded += 1
+        except ValueError:
+            # Skip invalid JSON frames
+            self.invalid_frames += 1
+            logger.debug("Skipping invalid JSON frame in stream")
@@ -0,0 +1,300 @@
+"""
+Symbol index for fast structural lookups across project files.
+
+This module provides a persistent per-file symbol table including:
+- Extraction of functions, classes and imports with line numbers
+- AST-based parsing for Python sources with a regex fallback
+- Precompiled patterns for JavaScript/TypeScript and other text files
+- Incremental updates keyed on content hashes
+- A "find definition" lookup shared by the code viewer and agent tools
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+
+PYTHON_EXTENSIONS = {".py", ".pyw", ".pyi"}
+
+
+class SymbolKind(Enum):
+    """Kinds of symbols tracked by the index."""
+
+    FUNCTION = "function"
+    CLASS = "class"
+    IMPORT = "import"
+
+
+@dataclass(frozen=True)
+class Symbol:
+    """A named code element and where it is defined."""
+
+    name: str
+    kind: SymbolKind
+    line: int
+    file_path: Path | None = None
+
+
+@dataclass
+class SymbolTable:
+    """Symbols extracted from a single version of a file."""
+
+    file_path: Path | None
+    content_hash: int
+    symbols: list[Symbol] = field(default_factory=list)
+
+    def names(self, kind: SymbolKind) -> list[str]:
+        """Get the names of all symbols of the given kind, in source order."""
+        return [symbol.name for symbol in self.symbols if symbol.kind is kind]
+
+    @property
+    def functions(self) -> list[str]:
+        """Names of functions defined in the file."""
+        return self.names(SymbolKind.FUNCTION)
+
+    @property
+    def classes(self) -> list[str]:
+        """Names of classes defined in the file."""
+        return self.names(SymbolKind.CLASS)
+
+    @property
+    def imports(self) -> list[str]:
+        """Names of modules imported by the file."""
+        return self.names(SymbolKind.IMPORT)
+
+
+# Patterns are compiled once at import time and shared by every index instance.
+_SYMBOL_PATTERNS: dict[SymbolKind, list[re.Pattern[str]]] = {
+    SymbolKind.FUNCTION: [
+        re.compile(r"def\s+(\w+)\s*\(", re.MULTILINE),
+        re.compile(r"function\s+(\w+)\s*\(", re.MULTILINE),
+        re.compile(r"(\w+)\s*=\s*function\s*\(", re.MULTILINE),
+        re.compile(r"(\w+)\s*=>\s*", re.MULTILINE),
+    ],
+    SymbolKind.CLASS: [
+        re.compile(r"class\s+(\w+)\s*[\(\:]", re.MULTILINE),
+        re.compile(r"interface\s+(\w+)\s*\{", re.MULTILINE),
+    ],
+    SymbolKind.IMPORT: [
+        re.compile(r"from\s+(\S+)\s+import", re.MULTILINE),
+        re.compile(r"import\s+(\S+)", re.MULTILINE),
+        re.compile(r'require\s*\(\s*[\'"]([^\'"]+)[\'"]', re.MULTILINE),
+    ],
+}
+
+
+def _content_hash(content: str) -> int:
+    """Hash file content for change detection within this process."""
+    return hash(content)
+
+
+class SymbolIndex:
+    """Persistent, incrementally updated index of symbols per file."""
+
+    def __init__(self) -> None:
+        """Initialize an empty symbol index."""
+        self._tables: dict[str, SymbolTable] = {}
+        self._definitions: dict[str, list[Symbol]] = {}
+        # Change analysis updates the index from worker threads
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Return the number of indexed files."""
+        return len(self._tables)
+
+    def __contains__(self, file_path: object) -> bool:
+        """Check whether a file is currently indexed."""
+        if not isinstance(file_path, str | Path):
+            return False
+        return str(file_path) in self._tables
+
+    def extract_symbols(
+        self, content: str, file_path: Path | None = None
+    ) -> list[Symbol]:
+        """Extract symbols from content without touching the index.
+
+        Args:
+            content: Source text to scan
+            file_path: Optional path used to select the parser
+
+        Returns:
+            Symbols in source order
+        """
+        if not content:
+            return []
+
+        if file_path is not None and file_path.suffix.lower() in PYTHON_EXTENSIONS:
+            try:
+                return self._extract_python_symbols(content, file_path)
+            except (SyntaxError, ValueError, RecursionError):
+                # Half-written files are common while editing; fall back to regexes
+                pass
+
+        return self._extract_pattern_symbols(content, file_path)
+
+    def build_table(self, content: str, file_path: Path | None = None) -> SymbolTable:
+        """Build a symbol table for content without storing it."""
+        return SymbolTable(
+            file_path=file_path,
+            content_hash=_content_hash(content),
+            symbols=self.extract_symbols(content, file_path),
+        )
+
+    def update_file(self, file_path: Path, content: str) -> SymbolTable:
+        """Index a file's content, reusing the cached table if it is unchanged.
+
+        Args:
+            file_path: Path of the file being indexed
+            content: Current content of the file
+
+        Returns:
+            The symbol table for the given content
+        """
+        file_path = Path(file_path)
+        key = str(file_path)
+        content_hash = _content_hash(content)
+
+        cached = self._tables.get(key)
+        if cached is not None and cached.content_hash == content_hash:
+            return cached
+
+        # Parse outside the lock; only the table swap needs to be atomic
+        table = SymbolTable(
+            file_path=file_path,
+            content_hash=content_hash,
+            symbols=self.extract_symbols(content, file_path),
+        )
+
+        with self._lock:
+            previous = self._tables.get(key)
+            if previous is not None:
+                self._remove_definitions(previous)
+            self._tables[key] = table
+            self._add_definitions(table)
+        return table
+
+    def remove_file(self, file_path: Path) -> SymbolTable | None:
+        """Drop a file from the index.
+
+        Returns:
+            The removed symbol table, or None if the file was not indexed
+        """
+        with self._lock:
+            table = self._tables.pop(str(file_path), None)
+            if table is not None:
+                self._remove_definitions(table)
+        return table
+
+    def get_file_symbols(
+        self, file_path: Path, content: str | None = None
+    ) -> SymbolTable | None:
+        """Get the indexed symbol table for a file.
+
+        Args:
+            file_path: Path of the file
+            content: If given, only return the table when it matches this content
+
+        Returns:
+            The cached symbol table, or None if missing or stale
+        """
+        table = self._tables.get(str(file_path))
+        if table is None:
+            return None
+        if content is not None and table.content_hash != _content_hash(content):
+            return None
+        return table
+
+    def find_definition(
+        self, name: str, kind: SymbolKind | None = None
+    ) -> list[Symbol]:
+        """Find where a function, class or import is defined.
+
+        Args:
+            name: Exact symbol name to look up
+            kind: Optional kind to restrict the search to
+
+        Returns:
+            Matching symbols across all indexed files
+        """
+        with self._lock:
+            matches = list(self._definitions.get(name, []))
+        if kind is None:
+            return matches
+        return [symbol for symbol in matches if symbol.kind is kind]
+
+    def clear(self) -> None:
+        """Remove every file from the index."""
+        with self._lock:
+            self._tables.clear()
+            self._definitions.clear()
+
+    def _add_definitions(self, table: SymbolTable) -> None:
+        """Register a table's symbols in the name lookup."""
+        for symbol in table.symbols:
+            self._definitions.setdefault(symbol.name, []).append(symbol)
+
+    def _remove_definitions(self, table: SymbolTable) -> None:
+        """Unregister a table's symbols from the name lookup."""
+        for symbol in table.symbols:
+            entries = self._definitions.get(symbol.name)
+            if not entries:
+                continue
+            remaining = [
+                entry for entry in entries if entry.file_path != table.file_path
+            ]
+            if remaining:
+                self._definitions[symbol.name] = remaining
+            else:
+                del self._definitions[symbol.name]
+
+    def _extract_python_symbols(self, content: str, file_path: Path) -> list[Symbol]:
+        """Extract symbols from Python source using the ast module."""
+        tree = ast.parse(content, filename=str(file_path))
+        symbols: list[Symbol] = []
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+                symbols.append(
+                    Symbol(node.name, SymbolKind.FUNCTION, node.lineno, file_path)
+                )
+            elif isinstance(node, ast.ClassDef):
+                symbols.append(
+                    Symbol(node.name, SymbolKind.CLASS, node.lineno, file_path)
+                )
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    symbols.append(
+                        Symbol(alias.name, SymbolKind.IMPORT, node.lineno, file_path)
+                    )
+            elif isinstance(node, ast.ImportFrom):
+                module = "." * node.level + (node.module or "")
+                symbols.append(
+                    Symbol(module, SymbolKind.IMPORT, node.lineno, file_path)
+                )
+
+        symbols.sort(key=lambda symbol: symbol.line)
+        return symbols
+
+    def _extract_pattern_symbols(
+        self, content: str, file_path: Path | None
+    ) -> list[Symbol]:
+        """Extract symbols using the precompiled regex patterns."""
+        symbols: list[Symbol] = []
+
+        for kind, patterns in _SYMBOL_PATTERNS.items():
+            for pattern in patterns:
+                # Track line numbers incrementally instead of recounting per match
+                line = 1
+                position = 0
+                for match in pattern.finditer(content):
+                    start = match.start(1)
+                    line += content.count("\n", position, start)
+                    position = start
+                    symbols.append(Symbol(match.group(1), kind, line, file_path))
+
+        symbols.sort(key=lambda symbol: symbol.line)
+        return symbols
@@ -1,12 +1,13 @@
 """Theme management for the Simple Code Viewer application.
 
 This module provides the ThemeManager class for handling application themes,
-including dark mode styling and theme persistence.
+including dark mode styling, stylesheet caching and theme persistence.
 """
 
 from __future__ import annotations
 
 import contextlib
+from collections.abc import Iterator
 
 from PyQt6.QtCore import QObject, QSettings, pyqtSignal
 from PyQt6.QtWidgets import QApplication, QWidget
@@ -14,6 +15,25 @@ from PyQt6.QtWidgets import QApplication, QWidget
 from my_coding_agent.assets import get_theme_file
 
 
+def apply_stylesheet(widget: QWidget, stylesheet: str) -> bool:
+    """Set a widget stylesheet only when it differs from the current one.
+
+    Qt re-parses the stylesheet and re-polishes the widget tree on every
+    setStyleSheet call, even if the text is unchanged.
+
+    Args:
+        widget: Widget to style
+        stylesheet: Stylesheet text to apply
+
+    Returns:
+        True if the stylesheet was changed, False if it was already applied
+    """
+    if widget.styleSheet() == stylesheet:
+        return False
+    widget.setStyleSheet(stylesheet)
+    return True
+
+
 class ThemeManager(QObject):
     """Manages application themes including dark mode styling."""
 
@@ -32,6 +52,7 @@ class ThemeManager(QObject):
         self._connected_widgets: list[
             QWidget
         ] = []  # Track widgets for automatic theme updates
+        self._stylesheet_cache: dict[str, str] = {}
 
         # Load saved theme or default to dark
         self._settings = QSettings("my_coding_agent", "Simple Code Viewer")
@@ -44,6 +65,9 @@ class ThemeManager(QObject):
             # Initialize current theme
         self._current_theme = saved_theme
 
+        # Read every theme once so later switches never touch the disk
+        self.preload_stylesheets()
+
         # Apply the initial theme by forcing a stylesheet load
         self._apply_theme_stylesheet(saved_theme)
 
@@ -101,28 +125,55 @@ class ThemeManager(QObject):
             # Load and apply stylesheet
             stylesheet = self._load_stylesheet(theme_name)
 
-            # Apply stylesheet with error handling for CI environments
-            if self.app:
-                self.app.setStyleSheet(stylesheet)
+            # Restyle the app and every listening widget in one pass, with
+            # repaints deferred until all widgets have been updated
+            with self.batch_updates():
+                # Apply stylesheet with error handling for CI environments
+                if self.app:
+                    self.app.setStyleSheet(stylesheet)
 
-            # Only update current theme after successful application
-            self._current_theme = theme_name
+                # Only update current theme after successful application
+                self._current_theme = theme_name
 
-            # Save to settings with error handling
-            with contextlib.suppress(Exception):
-                # Settings might fail in CI, but continue with theme change
-                self._settings.setValue("theme/current", theme_name)
+                # Save to settings with error handling
+                with contextlib.suppress(Exception):
+                    # Settings might fail in CI, but continue with theme change
+                    self._settings.setValue("theme/current", theme_name)
 
-            # Emit signal for automatic theme adaptation with error handling
-            with contextlib.suppress(Exception):
-                # Signal emission might fail in CI, but theme is still changed
-                self.theme_changed.emit(theme_name)
+                # Emit signal for automatic theme adaptation with error handling
+                with contextlib.suppress(Exception):
+                    # Signal emission might fail in CI, but theme is still changed
+                    self.theme_changed.emit(theme_name)
 
             return True
         except Exception:
             # If theme loading fails, keep the previous theme
             return False
 
+    @contextlib.contextmanager
+    def batch_updates(self) -> Iterator[None]:
+        """Suspend repaints of top-level windows while restyling widgets.
+
+        Yields:
+            None; repaints are re-enabled when the block exits
+        """
+        windows: list[QWidget] = []
+        if self.app:
+            with contextlib.suppress(Exception):
+                windows = [
+                    window
+                    for window in self.app.topLevelWidgets()
+                    if window.updatesEnabled()
+                ]
+
+        for window in windows:
+            window.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            for window in windows:
+                window.setUpdatesEnabled(True)
+
     def toggle_theme(self) -> str:
         """Toggle between light and dark themes.
 
@@ -153,13 +204,23 @@ class ThemeManager(QObject):
 
         try:
             stylesheet = self._load_stylesheet(theme_name)
-            widget.setStyleSheet(stylesheet)
+            apply_stylesheet(widget, stylesheet)
             return True
         except Exception:
             return False
 
+    def preload_stylesheets(self) -> None:
+        """Load and cache the stylesheets of all available themes."""
+        for theme_name in self._available_themes:
+            with contextlib.suppress(Exception):
+                self._load_stylesheet(theme_name)
+
+    def clear_stylesheet_cache(self) -> None:
+        """Drop cached stylesheets so they are re-read from disk."""
+        self._stylesheet_cache.clear()
+
     def _load_stylesheet(self, theme_name: str) -> str:
-        """Load stylesheet for the given theme.
+        """Load stylesheet for the given theme, using the cache when possible.
 
         Args:
             theme_name: Name of the theme to load
@@ -167,6 +228,24 @@ class ThemeManager(QObject):
         Returns:
             Stylesheet content as string
 
+        Raises:
+            FileNotFoundError: If theme file doesn't exist
+        """
+        cached = self._stylesheet_cache.get(theme_name)
+        if cached is None:
+            cached = self._read_stylesheet(theme_name)
+            self._stylesheet_cache[theme_name] = cached
+        return cached
+
+    def _read_stylesheet(self, theme_name: str) -> str:
+        """Read stylesheet for the given theme from disk.
+
+        Args:
+            theme_name: Name of the theme to read
+
+        Returns:
+            Stylesheet content as string
+
         Raises:
             FileNotFoundError: If theme file doesn't exist
         """
@@ -191,6 +270,7 @@ class ThemeManager(QObject):
 
     def refresh_theme(self) -> None:
         """Refresh the current theme by reloading and reapplying it."""
+        self.clear_stylesheet_cache()
         current = self._current_theme
         self.set_theme(current)
 
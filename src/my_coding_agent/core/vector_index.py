@@ -0,0 +1,637 @@
+"""
+Embedded vector index for offline similarity search.
+
+This module provides a local, disk-backed vector store including:
+- A hashing embedding that needs no model or network access
+- An optional sentence-transformers embedding for semantic recall
+- Batched embedding of the texts added to the index
+- Vectors stored as float32 rows in a memory-mapped file
+- Exact brute-force search for small indexes
+- An inverted-file (IVF) index over k-means clusters for large ones
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+import zlib
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+INDEX_VERSION = 1
+
+# Maps a batch of texts to an array of shape (len(texts), dim)
+EmbeddingFunction = Callable[[list[str]], np.ndarray]
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Rows scored at a time by brute-force search and IVF assignment
+SEARCH_BLOCK_ROWS = 65536
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so dot products are cosine similarities."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class HashingEmbedding:
+    """
+    Embeds texts by hashing words and character trigrams into a fixed vector.
+
+    Similar texts share words and word fragments, so they land close together
+    without a trained model. Hashes use CRC32 so vectors are the same in every
+    process.
+    """
+
+    def __init__(self, dim: int = 384) -> None:
+        """
+        Initialize the hashing embedding.
+
+        Args:
+            dim: Number of dimensions of each vector
+        """
+        self.dim = dim
+
+    @property
+    def name(self) -> str:
+        """Identifier stored with the index to detect mismatched embeddings."""
+        return f"hashing-{self.dim}"
+
+    def _features(self, text: str) -> list[str]:
+        """Words and character trigrams of a text."""
+        features = []
+        for word in _TOKEN_PATTERN.findall(text.lower()):
+            features.append(word)
+            padded = f"<{word}>"
+            features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        """Embed a batch of texts."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                vectors[row, digest % self.dim] += sign
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedding:
+    """Embeds texts with a local sentence-transformers model."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2") -> None:
+        """
+        Initialize the embedding; the model is loaded on first use.
+
+        Args:
+            model_name: Name or path of the sentence-transformers model
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            raise ImportError(
+                "sentence-transformers is required for SentenceTransformerEmbedding"
+            )
+        self.model_name = model_name
+        self._model: Any = None
+
+    @property
+    def name(self) -> str:
+        """Identifier stored with the index to detect mismatched embeddings."""
+        return f"sentence-transformers/{self.model_name}"
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        """Embed a batch of texts."""
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name)
+        vectors = self._model.encode(
+            texts, convert_to_numpy=True, normalize_embeddings=True
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+@dataclass
+class SearchResult:
+    """A stored item matching a query."""
+
+    id: str
+    score: float
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+class VectorIndex:
+    """
+    Disk-backed vector index with exact and IVF search.
+
+    Files in the index directory:
+    - index.json: dimensions, embedding name and IVF settings
+    - vectors.f32: one float32 row per item, memory-mapped for search
+    - items.jsonl: the id and metadata of each row, then deletions
+    - ivf_centroids.npy, ivf_assign.i32: cluster centroids and row assignments
+
+    Small indexes are searched exhaustively. Once ivf_threshold live items are
+    stored, rows are clustered with k-means and a query only scores the rows
+    of its nprobe closest clusters. The clusters are retrained whenever the
+    index has doubled since the last training.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        embedding_function: EmbeddingFunction | None = None,
+        batch_size: int = 64,
+        ivf_threshold: int = 50_000,
+        nprobe: int = 16,
+    ) -> None:
+        """
+        Open or create a vector index.
+
+        Args:
+            directory: Directory holding the index files
+            embedding_function: Embeds batches of texts, defaults to
+                HashingEmbedding()
+            batch_size: Texts embedded per call to the embedding function
+            ivf_threshold: Live items from which the IVF index is used
+            nprobe: Clusters scored per IVF query
+
+        Raises:
+            ValueError: If the index was built with a different embedding
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.embedding_function = embedding_function or HashingEmbedding()
+        self.batch_size = batch_size
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+
+        self._lock = threading.RLock()
+        self._dim: int | None = getattr(self.embedding_function, "dim", None)
+        self._ids: list[str] = []
+        self._metadata: list[dict[str, Any]] = []
+        self._rows: dict[str, int] = {}
+        self._deleted: set[int] = set()
+        self._deleted_mask: np.ndarray | None = None
+        self._matrix: np.ndarray | None = None
+
+        self._centroids: np.ndarray | None = None
+        self._assign: np.ndarray | None = None
+        self._lists: tuple[np.ndarray, np.ndarray] | None = None
+        self._trained_count = 0
+
+        self._load()
+
+    @property
+    def embedding_name(self) -> str:
+        """Name identifying the embedding function."""
+        return getattr(
+            self.embedding_function, "name", type(self.embedding_function).__name__
+        )
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.directory / "index.json"
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / "vectors.f32"
+
+    @property
+    def _items_path(self) -> Path:
+        return self.directory / "items.jsonl"
+
+    @property
+    def _centroids_path(self) -> Path:
+        return self.directory / "ivf_centroids.npy"
+
+    @property
+    def _assign_path(self) -> Path:
+        return self.directory / "ivf_assign.i32"
+
+    def _load(self) -> None:
+        """Read an existing index from disk."""
+        if not self._meta_path.exists():
+            return
+
+        meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+        if meta.get("embedding") != self.embedding_name:
+            raise ValueError(
+                f"Index in {self.directory} was built with embedding "
+                f"'{meta.get('embedding')}', not '{self.embedding_name}'"
+            )
+        self._dim = meta["dim"]
+
+        rows = []
+        deletions = []
+        if self._items_path.exists():
+            with self._items_path.open(encoding="utf-8") as items:
+                for line in items:
+                    if not line.endswith("\n"):
+                        break  # Partially written last line
+                    item = json.loads(line)
+                    if "delete" in item:
+                        deletions.append((len(rows), item["delete"]))
+                    else:
+                        rows.append(item)
+
+        # Vectors are written before items, so drop vectors without an item
+        self._vectors_path.touch()
+        stored = self._vectors_path.stat().st_size // (self._dim * 4)
+        count = min(len(rows), stored)
+        with self._vectors_path.open("r+b") as vectors:
+            vectors.truncate(count * self._dim * 4)
+
+        for row, item in enumerate(rows[:count]):
+            self._set_row(row, item["id"], item.get("metadata", {}))
+        for rows_before, item_id in deletions:
+            row = self._rows.get(item_id)
+            if row is not None and row < rows_before:
+                self._deleted.add(row)
+                del self._rows[item_id]
+
+        ivf = meta.get("ivf")
+        if ivf and self._centroids_path.exists():
+            self._centroids = np.load(self._centroids_path)
+            self._trained_count = ivf["trained_count"]
+            assign = np.fromfile(self._assign_path, dtype=np.int32)
+            if len(assign) >= count:
+                self._assign = assign[:count]
+                self._assign.tofile(self._assign_path)
+            else:
+                self._assign_rows(len(assign), count, existing=assign)
+
+    def _set_row(self, row: int, item_id: str, metadata: dict[str, Any]) -> None:
+        """Record the id and metadata of a row, replacing an older row."""
+        previous = self._rows.get(item_id)
+        if previous is not None:
+            self._deleted.add(previous)
+        self._ids.append(item_id)
+        self._metadata.append(metadata)
+        self._rows[item_id] = row
+        self._deleted_mask = None
+
+    def _write_meta(self) -> None:
+        """Atomically write index.json."""
+        meta = {
+            "version": INDEX_VERSION,
+            "dim": self._dim,
+            "embedding": self.embedding_name,
+            "ivf": (
+                {"nlist": len(self._centroids), "trained_count": self._trained_count}
+                if self._centroids is not None
+                else None
+            ),
+        }
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+        os.replace(temp_path, self._meta_path)
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts with the configured function."""
+        return _normalize(self.embedding_function(texts))
+
+    def _matrix_view(self) -> np.ndarray:
+        """Memory-mapped view of all stored vectors."""
+        if self._matrix is None:
+            count = len(self._ids)
+            if count == 0:
+                self._matrix = np.zeros((0, self._dim or 0), dtype=np.float32)
+            else:
+                self._matrix = np.memmap(
+                    self._vectors_path,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(count, self._dim),
+                )
+        return self._matrix
+
+    def _live_mask(self) -> np.ndarray:
+        """Boolean mask of rows that have been deleted or replaced."""
+        if self._deleted_mask is None:
+            mask = np.zeros(len(self._ids), dtype=bool)
+            if self._deleted:
+                mask[list(self._deleted)] = True
+            self._deleted_mask = mask
+        return self._deleted_mask
+
+    def __len__(self) -> int:
+        """Number of live items."""
+        return len(self._rows)
+
+    def __contains__(self, item_id: object) -> bool:
+        """Check if an item is stored."""
+        return item_id in self._rows
+
+    def get(self, item_id: str) -> dict[str, Any] | None:
+        """
+        Get the metadata of an item.
+
+        Args:
+            item_id: Id of the item
+
+        Returns:
+            The metadata, or None if the item is not stored
+        """
+        row = self._rows.get(item_id)
+        return None if row is None else self._metadata[row]
+
+    def items(self) -> list[tuple[str, dict[str, Any]]]:
+        """Get the id and metadata of every live item, oldest first."""
+        return [
+            (self._ids[row], self._metadata[row]) for row in sorted(self._rows.values())
+        ]
+
+    def add(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Sequence[dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Embed texts in batches and add them; existing ids are replaced.
+
+        Args:
+            ids: Unique id of each item
+            texts: Text embedded for each item
+            metadatas: Optional metadata stored with each item
+        """
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have the same length")
+        if metadatas is None:
+            metadatas = [{} for _ in ids]
+
+        for start in range(0, len(texts), self.batch_size):
+            end = start + self.batch_size
+            vectors = self._embed(list(texts[start:end]))
+            self.add_vectors(ids[start:end], vectors, metadatas[start:end])
+
+    def add_vectors(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        metadatas: Sequence[dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Add precomputed vectors; existing ids are replaced.
+
+        Args:
+            ids: Unique id of each item
+            vectors: Array of shape (len(ids), dim)
+            metadatas: Optional metadata stored with each item
+        """
+        vectors = _normalize(np.atleast_2d(vectors))
+        if len(vectors) != len(ids):
+            raise ValueError("ids and vectors must have the same length")
+        if len(ids) == 0:
+            return
+        if metadatas is None:
+            metadatas = [{} for _ in ids]
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = vectors.shape[1]
+            if vectors.shape[1] != self._dim:
+                raise ValueError(
+                    f"Expected vectors with {self._dim} dimensions, "
+                    f"got {vectors.shape[1]}"
+                )
+            if not self._meta_path.exists():
+                self._write_meta()
+
+            first_row = len(self._ids)
+            self._matrix = None
+            with self._vectors_path.open("ab") as handle:
+                handle.write(vectors.tobytes())
+            with self._items_path.open("a", encoding="utf-8") as handle:
+                handle.writelines(
+                    json.dumps({"id": item_id, "metadata": metadata}) + "\n"
+                    for item_id, metadata in zip(ids, metadatas, strict=True)
+                )
+            for offset, (item_id, metadata) in enumerate(
+                zip(ids, metadatas, strict=True)
+            ):
+                self._set_row(first_row + offset, item_id, metadata)
+
+            if self._centroids is not None:
+                self._assign_rows(first_row, len(self._ids), existing=self._assign)
+            self._maybe_train()
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """
+        Delete items.
+
+        Args:
+            ids: Ids of the items to delete
+
+        Returns:
+            Number of items that were deleted
+        """
+        with self._lock:
+            present = [item_id for item_id in ids if item_id in self._rows]
+            if not present:
+                return 0
+            with self._items_path.open("a", encoding="utf-8") as handle:
+                handle.writelines(
+                    json.dumps({"delete": item_id}) + "\n" for item_id in present
+                )
+            for item_id in present:
+                self._deleted.add(self._rows.pop(item_id))
+            self._deleted_mask = None
+            return len(present)
+
+    def clear(self) -> None:
+        """Delete every item and the index files."""
+        with self._lock:
+            self._matrix = None
+            for path in (
+                self._meta_path,
+                self._vectors_path,
+                self._items_path,
+                self._centroids_path,
+                self._assign_path,
+            ):
+                path.unlink(missing_ok=True)
+            self._dim = getattr(self.embedding_function, "dim", None)
+            self._ids.clear()
+            self._metadata.clear()
+            self._rows.clear()
+            self._deleted.clear()
+            self._deleted_mask = None
+            self._centroids = None
+            self._assign = None
+            self._lists = None
+            self._trained_count = 0
+
+    @property
+    def uses_ivf(self) -> bool:
+        """Check if searches use the IVF index."""
+        return self._centroids is not None
+
+    def _maybe_train(self) -> None:
+        """Train or retrain the IVF index once the index is large enough."""
+        if len(self) < self.ivf_threshold:
+            return
+        if self._centroids is None or len(self._ids) >= 2 * self._trained_count:
+            self.build_ivf()
+
+    def build_ivf(self, nlist: int | None = None, iterations: int = 10) -> None:
+        """
+        Cluster the stored vectors with spherical k-means.
+
+        Args:
+            nlist: Number of clusters, defaults to the square root of the
+                number of live items
+            iterations: k-means iterations
+        """
+        with self._lock:
+            live_rows = np.flatnonzero(~self._live_mask())
+            if len(live_rows) == 0:
+                return
+            nlist = min(nlist or max(1, int(np.sqrt(len(live_rows)))), len(live_rows))
+
+            rng = np.random.default_rng(0)
+            sample_size = min(len(live_rows), nlist * 64)
+            sample = np.sort(rng.choice(live_rows, sample_size, replace=False))
+            data = np.asarray(self._matrix_view()[sample])
+            centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+
+            for _ in range(iterations):
+                assign = np.argmax(data @ centroids.T, axis=1)
+                order = np.argsort(assign, kind="stable")
+                clusters, starts = np.unique(assign[order], return_index=True)
+                sums = np.add.reduceat(data[order], starts, axis=0)
+                # Empty clusters keep their previous centroid
+                centroids[clusters] = _normalize(sums)
+
+            self._centroids = centroids
+            self._trained_count = len(self._ids)
+            self._assign_rows(0, len(self._ids), existing=None)
+            np.save(self._centroids_path, centroids)
+            self._write_meta()
+
+    def _assign_rows(self, start: int, end: int, existing: np.ndarray | None) -> None:
+        """Assign rows [start, end) to their closest centroid and store them."""
+        matrix = self._matrix_view()
+        assigned = [
+            np.argmax(
+                matrix[block : min(block + SEARCH_BLOCK_ROWS, end)] @ self._centroids.T,
+                axis=1,
+            ).astype(np.int32)
+            for block in range(start, end, SEARCH_BLOCK_ROWS)
+        ]
+        new = np.concatenate(assigned) if assigned else np.zeros(0, dtype=np.int32)
+
+        if existing is None:
+            new.tofile(self._assign_path)
+            self._assign = new
+        else:
+            with self._assign_path.open("ab") as handle:
+                handle.write(new.tobytes())
+            self._assign = np.concatenate([existing[:start], new])
+        self._lists = None
+
+    def _inverted_lists(self) -> tuple[np.ndarray, np.ndarray]:
+        """Rows sorted by cluster and the offset of each cluster's rows."""
+        if self._lists is None:
+            order = np.argsort(self._assign, kind="stable")
+            counts = np.bincount(self._assign, minlength=len(self._centroids))
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            self._lists = (order, offsets)
+        return self._lists
+
+    def _candidate_rows(self, query: np.ndarray) -> np.ndarray:
+        """Rows in the clusters closest to the query."""
+        order, offsets = self._inverted_lists()
+        nprobe = min(self.nprobe, len(self._centroids))
+        closest = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        rows = np.concatenate(
+            [order[offsets[cluster] : offsets[cluster + 1]] for cluster in closest]
+        )
+        rows.sort()  # Read the memory map in file order
+        return rows
+
+    def search(
+        self, query: str | np.ndarray, k: int = 10, exact: bool = False
+    ) -> list[SearchResult]:
+        """
+        Find the items most similar to a query.
+
+        Args:
+            query: Query text, or a precomputed query vector
+            k: Maximum number of results
+            exact: Score every item even when the IVF index is trained
+
+        Returns:
+            Matching items, most similar first
+        """
+        with self._lock:
+            if len(self) == 0 or k <= 0:
+                return []
+            if isinstance(query, str):
+                query_vector = self._embed([query])[0]
+            else:
+                query_vector = _normalize(np.asarray(query).reshape(-1))
+
+            matrix = self._matrix_view()
+            deleted = self._live_mask()
+            if self._centroids is not None and not exact:
+                rows = self._candidate_rows(query_vector)
+                rows = rows[~deleted[rows]]
+                scores = np.asarray(matrix[rows] @ query_vector)
+            else:
+                rows = np.arange(len(self._ids))
+                scores = np.concatenate(
+                    [
+                        np.asarray(
+                            matrix[start : start + SEARCH_BLOCK_ROWS] @ query_vector
+                        )
+                        for start in range(0, len(rows), SEARCH_BLOCK_ROWS)
+                    ]
+                )
+                rows = rows[~deleted]
+                scores = scores[~deleted]
+
+            if len(rows) == 0:
+                return []
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                SearchResult(
+                    id=self._ids[rows[index]],
+                    score=float(scores[index]),
+                    metadata=self._metadata[rows[index]],
+                )
+                for index in top
+            ]
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get index statistics."""
+        return {
+            "items": len(self),
+            "rows": len(self._ids),
+            "dim": self._dim,
+            "embedding": self.embedding_name,
+            "ivf_clusters": (
+                len(self._centroids) if self._centroids is not None else 0
+            ),
+        }
@@ -1,5 +1,6 @@
 """Clean, simplified chat widget implementation."""
 
+from functools import cache
 from typing import TYPE_CHECKING, Any
 
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
@@ -16,6 +17,7 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from ..core.theme_manager import apply_stylesheet
 from .chat_message_model import (
     ChatMessage,
     ChatMessageModel,
@@ -62,6 +64,61 @@ class EnhancedTextEdit(QTextEdit):
         super().keyPressEvent(e)
 
 
+@cache
+def _bubble_stylesheets(theme: str, role: MessageRole) -> tuple[str, str]:
+    """Build the bubble and label stylesheets for a theme and role.
+
+    Results are cached so every bubble of the same role shares one string.
+    """
+    if theme == "dark":
+        if role == MessageRole.USER:
+            bg_color = "#444444"
+            text_color = "#ffffff"
+            border_color = "#555555"
+        elif role == MessageRole.ASSISTANT:
+            bg_color = "#2d2d2d"
+            text_color = "#ffffff"
+            border_color = "#444444"
+        else:  # SYSTEM
+            bg_color = "#1a1a1a"
+            text_color = "#aaaaaa"
+            border_color = "#333333"
+    else:  # light theme
+        if role == MessageRole.USER:
+            bg_color = "#e3f2fd"
+            text_color = "#000000"
+            border_color = "#bbdefb"
+        elif role == MessageRole.ASSISTANT:
+            bg_color = "#f5f5f5"
+            text_color = "#000000"
+            border_color = "#e0e0e0"
+        else:  # SYSTEM
+            bg_color = "#fff3e0"
+            text_color = "#666666"
+            border_color = "#ffcc02"
+
+    bubble_style = f"""
+            SimplifiedMessageBubble {{
+                background-color: {bg_color};
+                border: 1px solid {border_color};
+                border-radius: 8px;
+                margin: 4px 0px;
+            }}
+        """
+
+    # Text color for the content label
+    label_style = f"""
+            QLabel {{
+                color: {text_color};
+                background-color: transparent;
+                border: none;
+                padding: 0px;
+            }}
+        """
+
+    return bubble_style, label_style
+
+
 class SimplifiedMessageBubble(QWidget):
     """Clean, simple message bubble with proper sizing."""
 
@@ -122,51 +179,9 @@ class SimplifiedMessageBubble(QWidget):
 
     def apply_styling(self) -> None:
         """Apply role-based styling."""
-        if self._current_theme == "dark":
-            if self.role == MessageRole.USER:
-                bg_color = "#444444"
-                text_color = "#ffffff"
-                border_color = "#555555"
-            elif self.role == MessageRole.ASSISTANT:
-                bg_color = "#2d2d2d"
-                text_color = "#ffffff"
-                border_color = "#444444"
-            else:  # SYSTEM
-                bg_color = "#1a1a1a"
-                text_color = "#aaaaaa"
-                border_color = "#333333"
-        else:  # light theme
-            if self.role == MessageRole.USER:
-                bg_color = "#e3f2fd"
-                text_color = "#000000"
-                border_color = "#bbdefb"
-            elif self.role == MessageRole.ASSISTANT:
-                bg_color = "#f5f5f5"
-                text_color = "#000000"
-                border_color = "#e0e0e0"
-            else:  # SYSTEM
-                bg_color = "#fff3e0"
-                text_color = "#666666"
-                border_color = "#ffcc02"
-
-        self.setStyleSheet(f"""
-            SimplifiedMessageBubble {{
-                background-color: {bg_color};
-                border: 1px solid {border_color};
-                border-radius: 8px;
-                margin: 4px 0px;
-            }}
-        """)
-
-        # Apply text color to the label
-        self.content_display.setStyleSheet(f"""
-            QLabel {{
-                color: {text_color};
-                background-color: transparent;
-                border: none;
-                padding: 0px;
-            }}
-        """)
+        bubble_style, label_style = _bubble_stylesheets(self._current_theme, self.role)
+        apply_stylesheet(self, bubble_style)
+        apply_stylesheet(self.content_display, label_style)
 
     def apply_theme(self, theme: str) -> None:
         """Apply theme to the message bubble."""
@@ -435,10 +450,14 @@ class SimplifiedMessageDisplayArea(QScrollArea):
                 }
             """)
 
-        # Update all existing bubbles
-        for bubble in self._message_bubbles.values():
-            # All bubbles are SimplifiedMessageBubble - apply_theme(theme) takes a parameter
-            bubble.apply_theme(self._current_theme)
+        # Update all existing bubbles in one pass, repainting once at the end
+        self.setUpdatesEnabled(False)
+        try:
+            for bubble in self._message_bubbles.values():
+                # All bubbles are SimplifiedMessageBubble - apply_theme(theme) takes a parameter
+                bubble.apply_theme(self._current_theme)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def _on_app_theme_changed(self, theme: str) -> None:
         """Handle theme change."""
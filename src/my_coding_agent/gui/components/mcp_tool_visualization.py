@@ -31,7 +31,99 @@ from PyQt6.QtWidgets import (
 )
 
 from ...core.code_viewer import PygmentsSyntaxHighlighter
-from ...core.theme_manager import ThemeManager
+from ...core.theme_manager import ThemeManager, apply_stylesheet
+
+# Stylesheets are shared by every tool call widget rather than rebuilt per instance
+_DARK_THEME_STYLESHEET = """
+MCPToolCallWidget {
+    background-color: #3a3a3a;
+    border: 1px solid #555555;
+    border-radius: 6px;
+    margin: 2px 0px;
+}
+
+QFrame {
+    background-color: #404040;
+    border: 1px solid #666666;
+    border-radius: 4px;
+}
+
+QLabel {
+    color: #ffffff;
+    background-color: transparent;
+    border: none;
+}
+
+QPushButton {
+    background-color: #555555;
+    color: #ffffff;
+    border: 1px solid #777777;
+    border-radius: 3px;
+    font-weight: bold;
+}
+
+QPushButton:hover {
+    background-color: #666666;
+}
+
+QTextEdit {
+    background-color: #2a2a2a;
+    color: #ffffff;
+    border: 1px solid #555555;
+    border-radius: 3px;
+    padding: 4px;
+}
+"""
+
+_LIGHT_THEME_STYLESHEET = """
+MCPToolCallWidget {
+    background-color: #f8f9fa;
+    border: 1px solid #dee2e6;
+    border-radius: 6px;
+    margin: 2px 0px;
+}
+
+QFrame {
+    background-color: #ffffff;
+    border: 1px solid #e9ecef;
+    border-radius: 4px;
+}
+
+QLabel {
+    color: #333333;
+    background-color: transparent;
+    border: none;
+}
+
+QPushButton {
+    background-color: #e9ecef;
+    color: #333333;
+    border: 1px solid #ced4da;
+    border-radius: 3px;
+    font-weight: bold;
+}
+
+QPushButton:hover {
+    background-color: #dee2e6;
+}
+
+QTextEdit {
+    background-color: #ffffff;
+    color: #333333;
+    border: 1px solid #ced4da;
+    border-radius: 3px;
+    padding: 4px;
+}
+"""
+
+_STATUS_STYLES = {
+    "pending": "color: #ffc107; font-weight: bold;",
+    "success": "color: #28a745; font-weight: bold;",
+    "error": "color: #dc3545; font-weight: bold;",
+    "timeout": "color: #fd7e14; font-weight: bold;",
+    "cancelled": "color: #6c757d; font-weight: bold;",
+}
+_DEFAULT_STATUS_STYLE = "color: #6c757d; font-weight: bold;"
 
 
 class MCPToolCallWidget(QWidget):
@@ -530,104 +622,18 @@ class MCPToolCallWidget(QWidget):
 
     def _apply_dark_theme(self) -> None:
         """Apply dark theme styling."""
-        self.setStyleSheet("""
-            MCPToolCallWidget {
-                background-color: #3a3a3a;
-                border: 1px solid #555555;
-                border-radius: 6px;
-                margin: 2px 0px;
-            }
-
-            QFrame {
-                background-color: #404040;
-                border: 1px solid #666666;
-                border-radius: 4px;
-            }
-
-            QLabel {
-                color: #ffffff;
-                background-color: transparent;
-                border: none;
-            }
-
-            QPushButton {
-                background-color: #555555;
-                color: #ffffff;
-                border: 1px solid #777777;
-                border-radius: 3px;
-                font-weight: bold;
-            }
-
-            QPushButton:hover {
-                background-color: #666666;
-            }
-
-            QTextEdit {
-                background-color: #2a2a2a;
-                color: #ffffff;
-                border: 1px solid #555555;
-                border-radius: 3px;
-                padding: 4px;
-            }
-        """)
+        apply_stylesheet(self, _DARK_THEME_STYLESHEET)
 
     def _apply_light_theme(self) -> None:
         """Apply light theme styling."""
-        self.setStyleSheet("""
-            MCPToolCallWidget {
-                background-color: #f8f9fa;
-                border: 1px solid #dee2e6;
-                border-radius: 6px;
-                margin: 2px 0px;
-            }
-
-            QFrame {
-                background-color: #ffffff;
-                border: 1px solid #e9ecef;
-                border-radius: 4px;
-            }
-
-            QLabel {
-                color: #333333;
-                background-color: transparent;
-                border: none;
-            }
-
-            QPushButton {
-                background-color: #e9ecef;
-                color: #333333;
-                border: 1px solid #ced4da;
-                border-radius: 3px;
-                font-weight: bold;
-            }
-
-            QPushButton:hover {
-                background-color: #dee2e6;
-            }
-
-            QTextEdit {
-                background-color: #ffffff;
-                color: #333333;
-                border: 1px solid #ced4da;
-                border-radius: 3px;
-                padding: 4px;
-            }
-        """)
+        apply_stylesheet(self, _LIGHT_THEME_STYLESHEET)
 
     def _apply_status_styling(self) -> None:
         """Apply status-specific styling to the status label."""
         status = self.tool_call.get("status", "unknown").lower()
 
-        status_styles = {
-            "pending": "color: #ffc107; font-weight: bold;",
-            "success": "color: #28a745; font-weight: bold;",
-            "error": "color: #dc3545; font-weight: bold;",
-            "timeout": "color: #fd7e14; font-weight: bold;",
-            "cancelled": "color: #6c757d; font-weight: bold;",
-        }
-
-        style = status_styles.get(status, "color: #6c757d; font-weight: bold;")
-        self.status_label.setStyleSheet(style)
+        style = _STATUS_STYLES.get(status, _DEFAULT_STATUS_STYLE)
+        apply_stylesheet(self.status_label, style)
 
     def _setup_accessibility(self) -> None:
         """Set up accessibility features."""
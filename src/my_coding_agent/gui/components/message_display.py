@@ -1,6 +1,7 @@
 """MessageDisplay component for consistent AI and user message rendering (Task 3.4)."""
 
 from enum import Enum
+from functools import cache
 
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import QLabel, QVBoxLayout, QWidget
@@ -16,6 +17,89 @@ class MessageDisplayTheme(Enum):
     DARK = "dark"
 
 
+_THEME_COLORS: dict[MessageDisplayTheme, dict[str, str]] = {
+    MessageDisplayTheme.DARK: {
+        "user_bg": "#2a2a2a",
+        "user_border": "#1E88E5",
+        "user_text": "#ffffff",
+        "assistant_bg": "transparent",
+        "assistant_text": "#ffffff",
+        "system_bg": "#404040",
+        "system_text": "#ffffff",
+        "error_color": "#ff6b6b",
+    },
+    MessageDisplayTheme.LIGHT: {
+        "user_bg": "#f8f9fa",
+        "user_border": "#4285F4",
+        "user_text": "#333",
+        "assistant_bg": "transparent",
+        "assistant_text": "#333",
+        "system_bg": "#666666",
+        "system_text": "#ffffff",
+        "error_color": "#d73527",
+    },
+}
+
+
+@cache
+def _role_stylesheet(theme: MessageDisplayTheme, role: MessageRole) -> str:
+    """Build the stylesheet for a theme and message role.
+
+    Results are cached so displays of the same role share one string.
+
+    Args:
+        theme: Theme to style for
+        role: Role of the displayed message
+
+    Returns:
+        Stylesheet text for MessageDisplay and its labels
+    """
+    colors = _THEME_COLORS[theme]
+
+    if role == MessageRole.USER:
+        return f"""
+                MessageDisplay {{
+                    background-color: {colors["user_bg"]};
+                    border: 2px solid {colors["user_border"]};
+                    border-radius: 8px;
+                    max-width: 500px;
+                    margin: 4px;
+                }}
+                QLabel {{
+                    color: {colors["user_text"]};
+                    background-color: transparent;
+                    padding: 4px;
+                }}
+            """
+    elif role == MessageRole.ASSISTANT:
+        return f"""
+                MessageDisplay {{
+                    background-color: {colors["assistant_bg"]};
+                    border: none;
+                    margin: 4px 0px;
+                }}
+                QLabel {{
+                    color: {colors["assistant_text"]};
+                    background-color: transparent;
+                    padding: 4px;
+                }}
+            """
+    else:  # SYSTEM
+        return f"""
+                MessageDisplay {{
+                    background-color: {colors["system_bg"]};
+                    border-radius: 4px;
+                    margin: 4px;
+                }}
+                QLabel {{
+                    color: {colors["system_text"]};
+                    background-color: transparent;
+                    font-style: italic;
+                    padding: 4px;
+                }}
+            """
+
+
 class MessageDisplay(QWidget):
     """Reusable component for rendering chat messages with consistent styling."""
 
@@ -117,81 +201,21 @@ class MessageDisplay(QWidget):
 
     def _apply_theme_colors(self):
         """Apply theme-specific colors and styling."""
-        if self._theme == MessageDisplayTheme.DARK:
-            self._theme_colors = {
-                "user_bg": "#2a2a2a",
-                "user_border": "#1E88E5",
-                "user_text": "#ffffff",
-                "assistant_bg": "transparent",
-                "assistant_text": "#ffffff",
-                "system_bg": "#404040",
-                "system_text": "#ffffff",
-                "error_color": "#ff6b6b",
-            }
-        else:  # LIGHT theme
-            self._theme_colors = {
-                "user_bg": "#f8f9fa",
-                "user_border": "#4285F4",
-                "user_text": "#333",
-                "assistant_bg": "transparent",
-                "assistant_text": "#333",
-                "system_bg": "#666666",
-                "system_text": "#ffffff",
-                "error_color": "#d73527",
-            }
+        self._theme_colors = dict(_THEME_COLORS[self._theme])
 
     def _update_styling(self):
         """Update component styling based on message role and theme."""
-        role = self._message.role
-
-        if role == MessageRole.USER:
-            style = f"""
-                MessageDisplay {{
-                    background-color: {self._theme_colors["user_bg"]};
-                    border: 2px solid {self._theme_colors["user_border"]};
-                    border-radius: 8px;
-                    max-width: 500px;
-                    margin: 4px;
-                }}
-                QLabel {{
-                    color: {self._theme_colors["user_text"]};
-                    background-color: transparent;
-                    padding: 4px;
-                }}
-            """
-        elif role == MessageRole.ASSISTANT:
-            style = f"""
-                MessageDisplay {{
-                    background-color: {self._theme_colors["assistant_bg"]};
-                    border: none;
-                    margin: 4px 0px;
-                }}
-                QLabel {{
-                    color: {self._theme_colors["assistant_text"]};
-                    background-color: transparent;
-                    padding: 4px;
-                }}
-            """
-        else:  # SYSTEM
-            style = f"""
-                MessageDisplay {{
-                    background-color: {self._theme_colors["system_bg"]};
-                    border-radius: 4px;
-                    margin: 4px;
-                }}
-                QLabel {{
-                    color: {self._theme_colors["system_text"]};
-                    background-color: transparent;
-                    font-style: italic;
-                    padding: 4px;
-                }}
-            """
+        style = _role_stylesheet(self._theme, self._message.role)
 
         # Combine theme styling with any custom styling
         combined_style = style
         if self._custom_stylesheet:
             combined_style += "\n" + self._custom_stylesheet
 
+        # Skip the re-parse and re-polish when nothing changed
+        if combined_style == self.styleSheet():
+            return
+
         self.setStyleSheet(combined_style)
 
     def setStyleSheet(self, styleSheet: str | None):
@@ -229,50 +253,7 @@ class MessageDisplay(QWidget):
         if not hasattr(self, "_theme_colors"):
             return ""
 
-        role = self._message.role
-
-        if role == MessageRole.USER:
-            return f"""
-                MessageDisplay {{
-                    background-color: {self._theme_colors["user_bg"]};
-                    border: 2px solid {self._theme_colors["user_border"]};
-                    border-radius: 8px;
-                    max-width: 500px;
-                    margin: 4px;
-                }}
-                QLabel {{
-                    color: {self._theme_colors["user_text"]};
-                    background-color: transparent;
-                    padding: 4px;
-                }}
-            """
-        elif role == MessageRole.ASSISTANT:
-            return f"""
-                MessageDisplay {{
-                    background-color: {self._theme_colors["assistant_bg"]};
-                    border: none;
-                    margin: 4px 0px;
-                }}
-                QLabel {{
-                    color: {self._theme_colors["assistant_text"]};
-                    background-color: transparent;
-                    padding: 4px;
-                }}
-            """
-        else:  # SYSTEM
-            return f"""
-                MessageDisplay {{
-                    background-color: {self._theme_colors["system_bg"]};
-                    border-radius: 4px;
-                    margin: 4px;
-                }}
-                QLabel {{
-                    color: {self._theme_colors["system_text"]};
-                    background-color: transparent;
-                    font-style: italic;
-                    padding: 4px;
-                }}
-            """
+        return _role_stylesheet(self._theme, self._message.role)
 
     def set_theme(self, theme: MessageDisplayTheme):
         """Change the theme of the component.
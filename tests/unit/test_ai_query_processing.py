@@ -84,18 +84,9 @@ class TestRetryPolicy:
         assert AIServiceTimeoutError in policy.retry_on_errors
         assert AIServiceRateLimitError in policy.retry_on_errors
 
-    def test_calculate_delay(self):
-        """Test retry delay calculation."""
-        policy = RetryPolicy(base_delay=1.0, backoff_multiplier=2.0, max_delay=10.0)
-
-        # Test exponential backoff
-        assert policy.calculate_delay(0) == 1.0
-        assert policy.calculate_delay(1) == 2.0
-        assert policy.calculate_delay(2) == 4.0
-        assert policy.calculate_delay(3) == 8.0
-
-        # Test max delay cap
-        assert policy.calculate_delay(10) == 10.0
+    def test_no_total_timeout_by_default(self):
+        """Test that requests are only time-limited when a caller opts in."""
+        assert RetryPolicy().create_engine().deadline is None
 
     def test_should_retry(self):
         """Test retry decision logic."""
@@ -6,6 +6,7 @@ and structured logging features for AI service operations.
 """
 
 import asyncio
+import json
 import logging
 import time
 from unittest.mock import MagicMock, patch
@@ -18,6 +19,8 @@ from src.my_coding_agent.core.ai_services.ai_service_adapter import (
 )
 from src.my_coding_agent.core.ai_services.logging_utils import (
     AIServiceLogger,
+    AsyncLogPipeline,
+    JsonLinesFormatter,
     LogContext,
     PerformanceMetrics,
     SensitiveDataSanitizer,
@@ -404,6 +407,120 @@ class TestAIServiceLogger:
         assert logger._sanitize_endpoint(None) is None
 
 
+class TestLowOverheadLogging:
+    """Test level gating, sampling and the background log pipeline."""
+
+    def test_disabled_level_skips_sanitization(self):
+        """Test that no record is built when the level is disabled."""
+        logger = AIServiceLogger("test_gated_logger")
+        logger.logger.setLevel(logging.WARNING)
+        logger.sanitizer.sanitize_dict = MagicMock()
+        context = LogContext(operation="test", metadata={"api_key": "secret"})
+
+        with patch.object(logger.logger, "log") as mock_log:
+            logger.debug("Not emitted", context=context, extra_data={"a": 1})
+            logger.log_query_request(context, "query", {"param": "value"})
+
+        mock_log.assert_not_called()
+        logger.sanitizer.sanitize_dict.assert_not_called()
+        assert logger.is_enabled_for(logging.WARNING)
+
+    def test_streaming_chunks_are_sampled(self):
+        """Test that only sampled and final chunks are logged."""
+        logger = AIServiceLogger("test_sampled_logger", chunk_sample_interval=4)
+        logger.logger.setLevel(logging.DEBUG)
+        context = LogContext(operation="streaming")
+
+        with patch.object(logger.logger, "log") as mock_log:
+            for index in range(10):
+                chunk = AIStreamingResponse(
+                    content="chunk", is_complete=index == 9, chunk_index=index
+                )
+                logger.log_streaming_chunk(context, chunk)
+
+        logged = [
+            call.kwargs["extra"]["structured_data"]["extra"]["chunk_index"]
+            for call in mock_log.call_args_list
+        ]
+        assert logged == [0, 4, 8, 9]
+
+    def test_inline_secrets_are_redacted(self):
+        """Test that credentials embedded in content are redacted."""
+        sanitizer = SensitiveDataSanitizer()
+
+        content = sanitizer.sanitize_content(
+            "curl -H 'Authorization: Bearer abc.123' ?api_key=xyz&q=1"
+        )
+
+        assert "abc.123" not in content
+        assert "xyz" not in content
+        assert "q=1" in content
+
+    def test_pipeline_writes_json_lines(self, tmp_path):
+        """Test that records are written as JSON lines by the listener thread."""
+        log_file = tmp_path / "ai.jsonl"
+        pipeline = AsyncLogPipeline(
+            log_file=log_file, logger_name="test_pipeline", level=logging.INFO
+        )
+        logger = AIServiceLogger("test_pipeline.service")
+
+        pipeline.start()
+        try:
+            assert pipeline.is_running
+            assert logging.getLogger("test_pipeline").propagate is False
+            logger.info(
+                "Query done",
+                context=LogContext(operation="query", correlation_id="c1"),
+                extra_data={"token": "secret", "tokens_used": 12},
+            )
+        finally:
+            pipeline.stop()
+
+        records = [json.loads(line) for line in log_file.read_text().splitlines()]
+        assert len(records) == 1
+        assert records[0]["message"] == "Query done"
+        assert records[0]["level"] == "INFO"
+        assert records[0]["correlation_id"] == "c1"
+        assert records[0]["extra"] == {"token": "***REDACTED***", "tokens_used": 12}
+        assert pipeline.get_stats()["dropped_records"] == 0
+        assert not pipeline.is_running
+        assert logging.getLogger("test_pipeline").propagate is True
+
+    def test_pipeline_rotates_log_file(self, tmp_path):
+        """Test that the log file is rotated once it reaches max_bytes."""
+        log_file = tmp_path / "ai.jsonl"
+        pipeline = AsyncLogPipeline(
+            log_file=log_file,
+            logger_name="test_rotation",
+            level=logging.INFO,
+            max_bytes=200,
+            backup_count=1,
+        )
+        logger = logging.getLogger("test_rotation")
+
+        pipeline.start()
+        try:
+            for index in range(10):
+                logger.info(f"record {index}")
+        finally:
+            pipeline.stop()
+
+        assert log_file.stat().st_size <= 200
+        assert (tmp_path / "ai.jsonl.1").exists()
+        assert not (tmp_path / "ai.jsonl.2").exists()
+
+    def test_formatter_without_structured_data(self):
+        """Test that plain records are formatted with their message."""
+        record = logging.LogRecord(
+            "plain", logging.WARNING, __file__, 1, "value %s", (42,), None
+        )
+
+        payload = json.loads(JsonLinesFormatter().format(record))
+
+        assert payload["message"] == "value 42"
+        assert payload["level"] == "WARNING"
+
+
 class TestLoggedOperationDecorator:
     """Test the logged operation decorator."""
 
@@ -133,3 +133,122 @@ def test_main_module_has_docstring() -> None:
         assert len(main_module.__doc__.strip()) > 0, "Main module has empty docstring"
     except ImportError:
         pytest.skip("Main module not yet implemented")
+
+
+def test_package_import_is_lazy() -> None:
+    """Test that importing the package does not load the GUI or AI stacks.
+
+    Runs in a fresh interpreter so modules imported by other tests
+    do not affect the result.
+    """
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, my_coding_agent; "
+        "print(any(name.startswith(('my_coding_agent.core', 'PyQt6')) "
+        "for name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_profile_startup_flag() -> None:
+    """Test that the --profile-startup flag is accepted."""
+    from my_coding_agent.__main__ import create_argument_parser
+
+    parser = create_argument_parser()
+    assert parser.parse_args(["--profile-startup"]).profile_startup is True
+    assert parser.parse_args([]).profile_startup is False
+
+
+def test_startup_profiler_report() -> None:
+    """Test that the startup profiler reports each phase and a total."""
+    import io
+
+    from my_coding_agent.__main__ import StartupProfiler
+
+    profiler = StartupProfiler(enabled=True)
+    profiler.record("import Qt", 0.25)
+    with profiler.phase("create main window"):
+        pass
+
+    output = io.StringIO()
+    profiler.report(output)
+    report = output.getvalue()
+
+    assert [name for name, _ in profiler.timings] == [
+        "import Qt",
+        "create main window",
+    ]
+    assert "import Qt" in report
+    assert "250.0 ms" in report
+    assert "total" in report
+
+
+def test_startup_profiler_disabled() -> None:
+    """Test that a disabled profiler records and prints nothing."""
+    import io
+
+    from my_coding_agent.__main__ import StartupProfiler
+
+    profiler = StartupProfiler()
+    with profiler.phase("load settings"):
+        pass
+
+    output = io.StringIO()
+    profiler.report(output)
+
+    assert profiler.timings == []
+    assert output.getvalue() == ""
+
+
+def test_log_file_is_opt_in() -> None:
+    """Test that the JSON lines log file is only written when requested."""
+    from my_coding_agent.__main__ import create_argument_parser
+
+    parser = create_argument_parser()
+    assert parser.parse_args([]).log_file is None
+    assert parser.parse_args(["--log-file", "ai.jsonl"]).log_file == Path("ai.jsonl")
+
+
+def test_start_log_pipeline(tmp_path) -> None:
+    """Test that AI service logs go to the log file off the calling thread."""
+    import logging
+
+    from my_coding_agent.__main__ import start_log_pipeline
+
+    log_file = tmp_path / "logs" / "ai_services.jsonl"
+    target = logging.getLogger("my_coding_agent.core.ai_services")
+
+    pipeline = start_log_pipeline(log_file, debug=False)
+    try:
+        assert pipeline.is_running
+        assert target.level == logging.NOTSET
+        assert target.propagate is False
+        target.warning("pipeline started")
+    finally:
+        pipeline.stop()
+
+    assert "pipeline started" in log_file.read_text()
+    assert target.propagate is True
+
+
+def test_start_log_pipeline_keeps_debug_console(tmp_path) -> None:
+    """Test that --debug records debug events and still shows them on the console."""
+    import logging
+
+    from my_coding_agent.__main__ import start_log_pipeline
+
+    target = logging.getLogger("my_coding_agent.core.ai_services")
+
+    pipeline = start_log_pipeline(tmp_path / "ai_services.jsonl", debug=True)
+    try:
+        assert target.level == logging.DEBUG
+        assert target.propagate is True
+    finally:
+        pipeline.stop()
+
+    assert target.level == logging.NOTSET
@@ -0,0 +1,145 @@
+"""
+Tests for the shared asyncio loop thread.
+
+This module tests the persistent event loop used for agent and MCP I/O including:
+- Reuse of a single loop across submissions
+- Blocking helpers and their guard against deadlock
+- Cancellation of outstanding work on shutdown
+- Delivery of results and errors to the Qt thread
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+from src.my_coding_agent.core.async_loop import AsyncLoopThread, QtFutureBridge
+
+
+def _wait_until(condition, timeout=2.0):
+    """Process Qt events until the condition holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def loop_thread():
+    """Create a loop thread and stop it after the test."""
+    loop_thread = AsyncLoopThread(name="test-asyncio")
+    yield loop_thread
+    loop_thread.stop()
+
+
+class TestAsyncLoopThread:
+    """Test the background event loop."""
+
+    def test_submissions_share_one_loop(self, loop_thread):
+        """Test that every coroutine runs on the same loop and thread."""
+
+        async def current():
+            return asyncio.get_running_loop(), threading.current_thread()
+
+        first = loop_thread.run_sync(current())
+        second = loop_thread.submit(current()).result(timeout=2)
+
+        assert first == second
+        assert first[0] is loop_thread.loop
+        assert first[1] is not threading.current_thread()
+
+    def test_run_sync_propagates_errors(self, loop_thread):
+        """Test that exceptions raised by the coroutine reach the caller."""
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            loop_thread.run_sync(fail())
+
+    def test_run_sync_rejected_on_loop_thread(self, loop_thread):
+        """Test that blocking on the loop from inside it is refused."""
+
+        async def nested():
+            async def noop():
+                return None
+
+            loop_thread.run_sync(noop())
+
+        with pytest.raises(RuntimeError, match="loop thread"):
+            loop_thread.run_sync(nested())
+
+    def test_stop_cancels_pending_tasks(self, loop_thread):
+        """Test that stopping the loop cancels work that is still running."""
+        future = loop_thread.submit(asyncio.sleep(30))
+
+        loop_thread.stop(timeout=2)
+
+        assert future.cancelled()
+        assert not loop_thread.is_running
+
+    def test_restart_after_stop(self, loop_thread):
+        """Test that a stopped loop thread starts again on next use."""
+
+        async def answer():
+            return 42
+
+        loop_thread.run_sync(answer())
+        loop_thread.stop()
+
+        assert loop_thread.run_sync(answer()) == 42
+
+
+@pytest.mark.qt
+class TestQtFutureBridge:
+    """Test delivery of coroutine outcomes to the Qt thread."""
+
+    def test_result_delivered_on_qt_thread(self, qapp, loop_thread):
+        """Test that the result callback runs on the thread owning the bridge."""
+        bridge = QtFutureBridge(loop_thread)
+        received = []
+
+        async def compute():
+            return "done"
+
+        bridge.submit(
+            compute(),
+            on_result=lambda value: received.append(
+                (value, threading.current_thread())
+            ),
+        )
+
+        assert _wait_until(lambda: received)
+        assert received == [("done", threading.current_thread())]
+        assert bridge.pending_count == 0
+
+    def test_error_delivered_to_error_callback(self, qapp, loop_thread):
+        """Test that failures are passed to the error callback."""
+        bridge = QtFutureBridge(loop_thread)
+        errors = []
+
+        async def fail():
+            raise RuntimeError("connection lost")
+
+        bridge.submit(fail(), on_result=pytest.fail, on_error=errors.append)
+
+        assert _wait_until(lambda: errors)
+        assert str(errors[0]) == "connection lost"
+
+    def test_cancel_all_skips_callbacks(self, qapp, loop_thread):
+        """Test that cancelled work invokes neither callback."""
+        bridge = QtFutureBridge(loop_thread)
+        calls = []
+
+        future = bridge.submit(
+            asyncio.sleep(30), on_result=calls.append, on_error=calls.append
+        )
+
+        assert bridge.cancel_all() == 1
+        _wait_until(future.done)
+        QCoreApplication.processEvents()
+
+        assert future.cancelled()
+        assert calls == []
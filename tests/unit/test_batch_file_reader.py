@@ -0,0 +1,263 @@
+"""
+Tests for concurrent, size-aware multi-file reads.
+
+This module tests batched file reads including:
+- Head and tail truncation of files over the size cap
+- Deduplication of repeated paths
+- Bounded concurrency for async readers
+- Streaming results in completion order
+- AIAgent reading through MCP and through the workspace
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from src.my_coding_agent.core.ai_agent import (
+    AIAgent,
+    AIAgentConfig,
+    FileOperationError,
+)
+from src.my_coding_agent.core.batch_file_reader import (
+    BatchFileReader,
+    read_local_file,
+    truncate_head_tail,
+)
+
+
+class FakeMCPFileServer:
+    """MCP file server that records how many reads run at once."""
+
+    def __init__(self, contents: dict[str, str], delay: float = 0.02) -> None:
+        self.contents = contents
+        self.delay = delay
+        self.is_connected = True
+        self.calls: list[str] = []
+        self.active = 0
+        self.peak = 0
+
+    async def read_file(self, file_path: str) -> str:
+        self.calls.append(file_path)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if file_path not in self.contents:
+                raise FileOperationError(f"File not found: {file_path}")
+            return self.contents[file_path]
+        finally:
+            self.active -= 1
+
+
+class FakeWorkspaceService:
+    """Workspace service that only resolves paths inside its root."""
+
+    def __init__(self, root: Path) -> None:
+        self.workspace_root = root
+
+    def resolve_workspace_path(self, file_path: str) -> Path:
+        resolved = (self.workspace_root / file_path).resolve()
+        if self.workspace_root.resolve() not in resolved.parents:
+            raise ValueError(f"Path outside workspace: {file_path}")
+        return resolved
+
+
+@pytest.fixture
+def config():
+    """Create a test configuration with a small concurrency limit."""
+    return AIAgentConfig(
+        azure_endpoint="https://test.openai.azure.com/",
+        azure_api_key="test-key",
+        deployment_name="gpt-4o",
+        file_read_concurrency=4,
+    )
+
+
+class TestTruncation:
+    """Test keeping the head and tail of large files."""
+
+    def test_text_under_cap_is_unchanged(self):
+        """Test that short text is returned as is."""
+        assert truncate_head_tail("short", 10) == ("short", False)
+
+    def test_text_over_cap_keeps_head_and_tail(self):
+        """Test that long text keeps both ends and reports the cut."""
+        text, truncated = truncate_head_tail("a" * 10 + "b" * 80 + "c" * 10, 20)
+
+        assert truncated
+        assert text.startswith("a" * 10)
+        assert text.endswith("c" * 10)
+        assert "[80 characters omitted]" in text
+
+    def test_large_local_file_reads_only_head_and_tail(self, tmp_path):
+        """Test that a large file on disk is cut in the middle."""
+        path = tmp_path / "big.log"
+        path.write_text("HEAD" + "x" * 10_000 + "TAIL")
+
+        result = read_local_file(path, max_bytes=100)
+
+        assert result.truncated
+        assert result.size == 10_008
+        assert result.content.startswith("HEAD")
+        assert result.content.endswith("TAIL")
+        assert "[9908 bytes omitted]" in result.content
+
+    def test_split_multibyte_characters_are_dropped(self, tmp_path):
+        """Test that cutting inside a character leaves no broken pieces."""
+        path = tmp_path / "accents.txt"
+        path.write_text("é" * 100)
+
+        result = read_local_file(path, max_bytes=11)
+
+        assert "�" not in result.content
+        assert result.content.startswith("é")
+
+    def test_missing_file_is_reported(self, tmp_path):
+        """Test that read errors are returned, not raised."""
+        result = read_local_file(tmp_path / "missing.py", max_bytes=100)
+
+        assert not result.ok
+        assert result.as_text().startswith("Error reading file:")
+
+
+class TestBatchFileReader:
+    """Test batched reads."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test that reads overlap but never exceed the limit."""
+        server = FakeMCPFileServer({f"f{i}.py": str(i) for i in range(20)})
+        reader = BatchFileReader(max_concurrency=5)
+
+        results = await reader.read_all(server.contents, read=server.read_file)
+
+        assert len(results) == 20
+        assert server.peak == 5
+
+    @pytest.mark.asyncio
+    async def test_repeated_paths_are_read_once(self):
+        """Test that duplicates are removed while keeping request order."""
+        server = FakeMCPFileServer({"a.py": "a", "b.py": "b"})
+        reader = BatchFileReader()
+
+        results = await reader.read_all(
+            ["b.py", "a.py", "b.py", "a.py"], read=server.read_file
+        )
+
+        assert list(results) == ["b.py", "a.py"]
+        assert sorted(server.calls) == ["a.py", "b.py"]
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_in_completion_order(self):
+        """Test that fast reads are yielded before slow ones."""
+        delays = {"slow.py": 0.2, "fast.py": 0.0}
+
+        async def read(path: str) -> str:
+            await asyncio.sleep(delays[path])
+            return path
+
+        reader = BatchFileReader()
+        order = [result.path async for result in reader.stream(delays, read=read)]
+
+        assert order == ["fast.py", "slow.py"]
+
+    @pytest.mark.asyncio
+    async def test_failed_read_does_not_stop_batch(self):
+        """Test that one failure is reported alongside the other results."""
+        server = FakeMCPFileServer({"ok.py": "fine"})
+        reader = BatchFileReader()
+
+        results = await reader.read_all(["ok.py", "gone.py"], read=server.read_file)
+
+        assert results["ok.py"].content == "fine"
+        assert "File not found" in results["gone.py"].error
+
+    @pytest.mark.asyncio
+    async def test_local_stream_uses_resolver(self, tmp_path):
+        """Test that local reads resolve paths but report the requested path."""
+        (tmp_path / "a.py").write_text("print('a')")
+        reader = BatchFileReader()
+
+        results = await reader.read_all(["a.py"], resolve=lambda path: tmp_path / path)
+
+        assert results["a.py"].content == "print('a')"
+        reader.close()
+
+    def test_sync_read_works_inside_running_loop(self, tmp_path):
+        """Test that local batch reads do not need or refuse an event loop."""
+        (tmp_path / "a.py").write_text("a")
+        reader = BatchFileReader()
+
+        async def read_from_loop():
+            return reader.read_all_sync([str(tmp_path / "a.py")])
+
+        results = asyncio.run(read_from_loop())
+
+        assert results[str(tmp_path / "a.py")].content == "a"
+        reader.close()
+
+
+class TestAgentMultiFileReads:
+    """Test AIAgent routing batch reads."""
+
+    @pytest.mark.asyncio
+    async def test_mcp_reads_run_concurrently(self, config):
+        """Test that MCP reads use one round of parallel I/O."""
+        server = FakeMCPFileServer(
+            {f"src/f{i}.py": f"content {i}" for i in range(40)}, delay=0.05
+        )
+        agent = AIAgent(config, enable_filesystem_tools=False)
+        agent.mcp_file_server = server
+
+        results = await agent.read_multiple_files_mcp(list(server.contents))
+
+        assert results["src/f7.py"] == "content 7"
+        assert server.peak == 4
+
+    @pytest.mark.asyncio
+    async def test_mcp_errors_are_returned_per_file(self, config):
+        """Test that missing files produce error text in the result."""
+        server = FakeMCPFileServer({"a.py": "a"})
+        agent = AIAgent(config, enable_filesystem_tools=False)
+        agent.mcp_file_server = server
+
+        results = await agent.read_multiple_files_mcp(["a.py", "b.py", "a.py"])
+
+        assert results == {
+            "a.py": "a",
+            "b.py": "Error reading file: File not found: b.py",
+        }
+
+    def test_workspace_reads_stay_inside_workspace(self, config, tmp_path):
+        """Test that workspace reads are resolved and validated."""
+        (tmp_path / "main.py").write_text("main")
+        agent = AIAgent(
+            config,
+            enable_filesystem_tools=False,
+            workspace_service=FakeWorkspaceService(tmp_path),
+        )
+
+        results = agent.read_multiple_files(["main.py", "../secret.txt"])
+
+        assert results["main.py"] == "main"
+        assert "outside workspace" in results["../secret.txt"]
+        with pytest.raises(FileOperationError, match="secret.txt"):
+            agent.read_multiple_files(["main.py", "../secret.txt"], fail_fast=True)
+
+    @pytest.mark.asyncio
+    async def test_stream_multiple_files_from_workspace(self, config, tmp_path):
+        """Test streaming local reads through the agent."""
+        for name in ("a.py", "b.py"):
+            (tmp_path / name).write_text(name)
+        agent = AIAgent(
+            config,
+            enable_filesystem_tools=False,
+            workspace_service=FakeWorkspaceService(tmp_path),
+        )
+
+        paths = [
+            result.path
+            async for result in agent.stream_multiple_files(["a.py", "b.py", "a.py"])
+        ]
+
+        assert sorted(paths) == ["a.py", "b.py"]
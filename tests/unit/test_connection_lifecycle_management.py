@@ -19,8 +19,12 @@ from src.my_coding_agent.core.mcp.mcp_client import (
     MCPClient,
     MCPConnectionError,
     MCPTimeoutError,
+    MCPTool,
+)
+from src.my_coding_agent.core.mcp.server_registry import (
+    MCPServerRegistry,
+    ToolRegistry,
 )
-from src.my_coding_agent.core.mcp.server_registry import MCPServerRegistry
 
 
 class TestConnectionLifecycleManagement:
@@ -523,3 +527,140 @@ class TestConnectionManager:
 
         with pytest.raises(ValueError):
             connection_manager.configure(invalid_config)
+
+
+class TestAdaptiveHealthScheduling:
+    """Test suite for traffic-aware health check scheduling."""
+
+    @pytest.fixture
+    def connection_manager(self):
+        """Create connection manager with short intervals for testing."""
+        from src.my_coding_agent.core.mcp.connection_manager import ConnectionManager
+
+        return ConnectionManager(
+            {
+                "monitoring_interval": 1.0,
+                "max_idle_interval": 4.0,
+                "failure_probe_interval": 0.25,
+            }
+        )
+
+    @pytest.fixture
+    def client(self):
+        """Create a connected mock client."""
+        client = Mock(spec=MCPClient)
+        client.server_name = "test-server"
+        client.is_connected = Mock(return_value=True)
+        client.ping = AsyncMock()
+        client.connect = AsyncMock()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_idle_pings_back_off_exponentially(self, connection_manager, client):
+        """Test that healthy idle clients are pinged less and less often."""
+        connection_manager.add_client(client)
+
+        delays = []
+        for _ in range(4):
+            await connection_manager._run_scheduled_check(client)
+            delays.append(connection_manager.get_next_check_delay(client))
+
+        assert client.ping.call_count == 4
+        assert delays[0] == pytest.approx(1.0, abs=0.05)
+        assert delays[1] == pytest.approx(2.0, abs=0.05)
+        assert delays[2] == pytest.approx(4.0, abs=0.05)
+        assert delays[3] == pytest.approx(4.0, abs=0.05)  # capped
+
+    @pytest.mark.asyncio
+    async def test_activity_counts_as_heartbeat(self, connection_manager, client):
+        """Test that a successful call resets idle spacing and defers pings."""
+        connection_manager.add_client(client)
+        for _ in range(3):
+            await connection_manager._run_scheduled_check(client)
+
+        connection_manager.record_activity(client)
+
+        assert connection_manager.get_next_check_delay(client) == pytest.approx(
+            1.0, abs=0.05
+        )
+        await connection_manager._run_scheduled_check(client)
+        assert connection_manager.get_next_check_delay(client) == pytest.approx(
+            1.0, abs=0.05
+        )
+
+    @pytest.mark.asyncio
+    async def test_failing_client_uses_fast_probe(self, connection_manager, client):
+        """Test that failures switch the client to the fast-probe cadence."""
+        client.ping = AsyncMock(side_effect=MCPTimeoutError("Ping timeout"))
+        connection_manager.add_client(client)
+
+        await connection_manager._run_scheduled_check(client)
+        first = connection_manager.get_next_check_delay(client)
+        await connection_manager._run_scheduled_check(client)
+        second = connection_manager.get_next_check_delay(client)
+
+        assert first == pytest.approx(0.25, abs=0.05)
+        assert second == pytest.approx(0.5, abs=0.05)
+        assert connection_manager.get_statistics()["probing_clients"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_call_schedules_probe(self, connection_manager, client):
+        """Test that a failed call brings the next probe forward."""
+        connection_manager.add_client(client)
+        connection_manager.record_activity(client)
+
+        connection_manager.record_activity(client, success=False, error="reset")
+
+        assert connection_manager.get_next_check_delay(client) <= 0.25
+        assert connection_manager.get_client_status(client)["last_error"] == "reset"
+
+    @pytest.mark.asyncio
+    async def test_never_connected_client_not_started(self, connection_manager):
+        """Test that monitoring does not spawn servers that were never connected."""
+        client = Mock(spec=MCPClient)
+        client.server_name = "idle-stdio"
+        client.is_connected = Mock(return_value=False)
+        client.ping = AsyncMock()
+        client.connect = AsyncMock()
+        connection_manager.add_client(client)
+
+        await connection_manager.start_monitoring()
+        await asyncio.sleep(0.1)
+        await connection_manager.stop_monitoring()
+
+        client.connect.assert_not_called()
+        client.ping.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_registry_shares_scheduler(self, client):
+        """Test that registry monitoring and traffic go through one scheduler."""
+        client.config = {"transport": "stdio"}
+        client.call_tool = AsyncMock(return_value=[{"type": "text", "text": "ok"}])
+        registry = MCPServerRegistry()
+        registry.register_server(client)
+        registry._tools_cache["test-server:echo"] = ToolRegistry(
+            tool=MCPTool(name="echo", description="Echo", input_schema={}),
+            server_name="test-server",
+        )
+        manager = registry.connection_manager
+
+        registry.start_health_monitoring()
+        status = registry.get_server_status("test-server")
+        for _ in range(100):
+            if status.last_ping is not None:
+                break
+            await asyncio.sleep(0.02)
+
+        assert manager.is_monitoring
+        assert client.ping.call_count == 1
+        assert status.last_ping is not None
+
+        await registry.call_tool("echo", {})
+        assert manager.get_next_check_delay(client) > 30.0
+
+        registry.stop_health_monitoring()
+        for _ in range(100):
+            if not manager.is_monitoring:
+                break
+            await asyncio.sleep(0.02)
+        assert not manager.is_monitoring
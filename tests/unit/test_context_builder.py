@@ -0,0 +1,251 @@
+"""
+Tests for token-budgeted context assembly.
+
+This module tests the context builder including:
+- Token counting with the length estimate
+- Keeping the history window within the token budget
+- A stable history prefix between turns
+- Relevant earlier messages and long-term memories
+- Memory-aware streaming using the assembled prompt
+"""
+
+import threading
+
+import pytest
+from src.my_coding_agent.core.ai_agent import AIResponse
+from src.my_coding_agent.core.ai_services import context_builder
+from src.my_coding_agent.core.ai_services.context_builder import (
+    ContextBudget,
+    ContextBuilder,
+    TokenCounter,
+)
+from src.my_coding_agent.core.ai_services.streaming_response_service import (
+    StreamingResponseService,
+)
+
+
+def make_history(count: int, words: int = 20) -> list[dict]:
+    """Create a conversation, newest message first."""
+    messages = [
+        {
+            "id": index,
+            "role": "user" if index % 2 == 0 else "assistant",
+            "content": f"message {index} " + "filler " * words,
+        }
+        for index in range(count)
+    ]
+    return list(reversed(messages))
+
+
+def make_builder(**budget: int | float) -> ContextBuilder:
+    """Create a builder that estimates tokens from the text length."""
+    return ContextBuilder(
+        budget=ContextBudget(**budget), token_counter=TokenCounter(None)
+    )
+
+
+class FakeMemorySystem:
+    """In-memory stand-in for the conversation memory system."""
+
+    def __init__(self):
+        self.messages = []
+
+    def store_user_message(self, content):
+        self.messages.append({"role": "user", "content": content})
+
+    def store_assistant_message(self, content):
+        self.messages.append({"role": "assistant", "content": content})
+
+    def store_long_term_memory(self, **kwargs):
+        pass
+
+    def get_conversation_context(self, limit):
+        return list(reversed(self.messages))[:limit]
+
+    def get_long_term_memories(self, query, limit):
+        return [{"content": "User prefers Python", "importance_score": 0.9}]
+
+
+class TestTokenCounter:
+    """Test token counting."""
+
+    def test_estimate_without_encoding(self):
+        """Test that the estimate uses about four characters per token."""
+        counter = TokenCounter(None)
+
+        assert counter.backend == "estimate"
+        assert counter.count("") == 0
+        assert counter.count("abcd") == 1
+        assert counter.count("abcde") == 2
+
+    def test_estimates_while_encoding_loads(self, monkeypatch):
+        """Test that counting does not wait for the encoding to load."""
+        release = threading.Event()
+
+        class FakeEncoding:
+            def encode(self, text: str, disallowed_special: tuple = ()) -> list:
+                return text.split()
+
+        class FakeTiktoken:
+            @staticmethod
+            def get_encoding(name: str) -> FakeEncoding:
+                release.wait(5)
+                return FakeEncoding()
+
+        monkeypatch.setattr(context_builder, "TIKTOKEN_AVAILABLE", True)
+        monkeypatch.setattr(context_builder, "tiktoken", FakeTiktoken)
+        monkeypatch.setattr(context_builder, "_encodings", {})
+        monkeypatch.setattr(context_builder, "_loaders", {})
+        counter = TokenCounter("fake")
+
+        assert counter.count("one two three four five six seven") == 9
+        assert counter.backend == "estimate"
+
+        release.set()
+        assert counter.wait_until_loaded(timeout=5)
+        assert counter.backend == "tiktoken"
+        assert counter.count("one two three four five six seven") == 7
+
+
+class TestContextBudget:
+    """Test fitting the history into the token budget."""
+
+    def test_small_history_is_included_in_full(self):
+        """Test that a history within budget is kept whole and in order."""
+        builder = make_builder(max_tokens=4000)
+
+        result = builder.build("hello", make_history(6))
+
+        assert result.history_messages == 6
+        assert result.prompt.index("message 0") < result.prompt.index("message 5")
+        assert "=== CURRENT USER MESSAGE ===\nhello" in result.prompt
+
+    def test_current_message_is_not_repeated(self):
+        """Test that the stored copy of the current message is dropped."""
+        builder = make_builder()
+        history = [{"id": 9, "role": "user", "content": "what next?"}]
+        history += make_history(2)
+
+        result = builder.build("what next?", history)
+
+        assert result.history_messages == 2
+        assert result.prompt.count("what next?") == 1
+
+    def test_long_history_stays_within_budget(self):
+        """Test that the oldest messages are dropped when over budget."""
+        builder = make_builder(max_tokens=500, min_recent_messages=2)
+
+        result = builder.build("hello", make_history(100))
+
+        assert result.context_tokens <= 500
+        assert 0 < result.history_messages < 100
+        assert "message 99 " in result.prompt
+        assert "message 0 " not in result.prompt
+
+    def test_no_context_returns_message(self):
+        """Test that a first message is sent unchanged."""
+        result = make_builder().build("hello", [])
+
+        assert result.prompt == "hello"
+        assert result.context_tokens == 0
+
+
+class TestStablePrefix:
+    """Test reusing the rendered history between turns."""
+
+    def test_prefix_is_reused_while_window_fits(self):
+        """Test that new turns only append to the previous history."""
+        builder = make_builder(max_tokens=2000)
+        history = make_history(10)
+
+        first = builder.build("next", history)
+        second = builder.build("next", make_history(12))
+
+        assert not first.reused_prefix
+        assert second.reused_prefix
+        assert builder.get_stats()["prefix_reuses"] == 1
+
+    def test_window_moves_with_headroom(self):
+        """Test that an overflowing window leaves room for later turns."""
+        builder = make_builder(max_tokens=600, refill_ratio=0.5)
+        builder.build("next", make_history(40))
+        moves = builder.window_moves
+
+        # Each message is about 42 tokens, so a few more turns still fit
+        for count in range(41, 44):
+            result = builder.build("next", make_history(count))
+            assert result.reused_prefix
+
+        assert builder.window_moves == moves
+
+    def test_reset_forgets_prefix(self):
+        """Test that reset starts a fresh window."""
+        builder = make_builder()
+        builder.build("next", make_history(4))
+        builder.reset()
+
+        assert not builder.build("next", make_history(5)).reused_prefix
+
+
+class TestRelevanceAndMemories:
+    """Test relevant earlier messages and long-term memories."""
+
+    def test_relevant_older_message_is_recalled(self):
+        """Test that an old message sharing terms with the query is included."""
+        builder = make_builder(max_tokens=400, relevant_tokens=100)
+        history = make_history(60)
+        history[-1] = {"id": 0, "role": "user", "content": "the database is postgres"}
+
+        result = builder.build("which database do we use?", history)
+
+        assert result.relevant_messages == 1
+        assert "RELEVANT EARLIER MESSAGES" in result.prompt
+        assert "the database is postgres" in result.prompt
+
+    def test_memories_respect_their_budget(self):
+        """Test that memories beyond the memory budget are left out."""
+        builder = make_builder(memory_tokens=30)
+        memories = [
+            {"content": f"fact {index} " + "detail " * 10, "importance_score": 0.5}
+            for index in range(5)
+        ]
+
+        result = builder.build("hello", [], memories)
+
+        assert result.memories == 1
+        assert "LONG-TERM MEMORY" in result.prompt
+
+
+class TestMemoryAwareStreaming:
+    """Test the streaming service using the context builder."""
+
+    @pytest.mark.asyncio
+    async def test_stream_sends_assembled_prompt(self, monkeypatch):
+        """Test that the budgeted prompt is streamed and the reply stored."""
+        memory = FakeMemorySystem()
+        memory.store_user_message("my project uses PyQt6")
+        memory.store_assistant_message("Noted.")
+        service = StreamingResponseService(
+            memory_system=memory,
+            enable_memory_awareness=True,
+            context_builder=make_builder(),
+        )
+        sent = []
+
+        async def fake_stream(message, on_chunk, on_error, enable_filesystem):
+            sent.append(message)
+            return AIResponse(success=True, content="Sure.")
+
+        monkeypatch.setattr(service, "send_message_with_tools_stream", fake_stream)
+
+        response = await service.send_memory_aware_message_stream(
+            "what do I use?", lambda chunk, final: None
+        )
+
+        assert response.success
+        assert "user: my project uses PyQt6" in sent[0]
+        assert "User prefers Python" in sent[0]
+        assert sent[0].count("what do I use?") == 1
+        assert memory.messages[-1] == {"role": "assistant", "content": "Sure."}
+        status = service.get_health_status()
+        assert status["context_builder"]["turns"] == 1
@@ -0,0 +1,252 @@
+"""
+Tests for background conversation compaction.
+
+This module tests rolling summaries including:
+- Compaction only once the unsummarized history crosses the threshold
+- Keeping the most recent messages out of the summary
+- Substituting the summary for the messages it covers
+- Summarizing with a model and storing summaries in the memory system
+- Memory-aware streaming compacting after the response is returned
+"""
+
+import asyncio
+
+import pytest
+from pydantic_ai.models.test import TestModel
+from src.my_coding_agent.core.ai_agent import AIResponse
+from src.my_coding_agent.core.ai_services.context_builder import (
+    ContextBudget,
+    ContextBuilder,
+    TokenCounter,
+)
+from src.my_coding_agent.core.ai_services.conversation_compactor import (
+    ConversationCompactor,
+    summarize_with_model,
+    trim_summary,
+)
+from src.my_coding_agent.core.ai_services.streaming_response_service import (
+    StreamingResponseService,
+)
+
+
+def make_history(count: int, words: int = 20) -> list[dict]:
+    """Create a conversation, newest message first."""
+    messages = [
+        {
+            "id": index,
+            "role": "user" if index % 2 == 0 else "assistant",
+            "content": f"message {index} " + "filler " * words,
+        }
+        for index in range(count)
+    ]
+    return list(reversed(messages))
+
+
+def make_compactor(**kwargs) -> ConversationCompactor:
+    """Create a compactor that estimates tokens from the text length."""
+    return ConversationCompactor(token_counter=TokenCounter(None), **kwargs)
+
+
+class SummaryStore:
+    """Memory system stand-in that keeps summaries next to messages."""
+
+    def __init__(self):
+        self.messages = []
+        self.summary = None
+
+    def store_user_message(self, content):
+        self.messages.append(
+            {"id": len(self.messages), "role": "user", "content": content}
+        )
+
+    def store_assistant_message(self, content):
+        self.messages.append(
+            {"id": len(self.messages), "role": "assistant", "content": content}
+        )
+
+    def store_long_term_memory(self, **kwargs):
+        pass
+
+    def get_conversation_context(self, limit):
+        return list(reversed(self.messages))[:limit]
+
+    def get_long_term_memories(self, query, limit):
+        return []
+
+    def store_conversation_summary(self, **summary):
+        self.summary = summary
+
+    def get_conversation_summary(self):
+        return self.summary
+
+
+class TestCompaction:
+    """Test folding older messages into a rolling summary."""
+
+    @pytest.mark.asyncio
+    async def test_below_threshold_does_nothing(self):
+        """Test that a short conversation is left alone."""
+        compactor = make_compactor(threshold_tokens=3000)
+
+        task = compactor.schedule(lambda: make_history(10))
+
+        assert await task is None
+        assert compactor.get_summary() is None
+
+    @pytest.mark.asyncio
+    async def test_older_messages_are_summarized(self):
+        """Test that all but the recent messages are folded and substituted."""
+        compactor = make_compactor(
+            threshold_tokens=500, keep_recent_tokens=200, max_summary_tokens=10_000
+        )
+        history = make_history(30)
+
+        summary = await compactor.schedule(lambda: history)
+
+        assert summary is not None
+        assert "message 0 " in summary.content
+        summary_text, remaining = compactor.apply(history)
+        assert summary_text == summary.content
+        assert 4 <= len(remaining) < 30
+        assert summary.message_count + len(remaining) == 30
+        assert remaining[-1]["id"] == summary.covered_through + 1
+
+    @pytest.mark.asyncio
+    async def test_summaries_roll_forward(self):
+        """Test that a second compaction extends the previous summary."""
+        compactor = make_compactor(
+            threshold_tokens=500, keep_recent_tokens=200, max_summary_tokens=10_000
+        )
+        first = await compactor.schedule(lambda: make_history(30))
+        second = await compactor.schedule(lambda: make_history(60))
+
+        assert second.content.startswith(first.content)
+        assert second.covered_through > first.covered_through
+        assert compactor.get_stats()["compactions"] == 2
+
+    @pytest.mark.asyncio
+    async def test_summary_stays_within_token_budget(self):
+        """Test that rolling summaries are trimmed, dropping the oldest lines."""
+        compactor = make_compactor(
+            threshold_tokens=500, keep_recent_tokens=200, max_summary_tokens=300
+        )
+
+        for count in (30, 60, 90):
+            summary = await compactor.schedule(lambda count=count: make_history(count))
+            assert compactor.token_counter.count(summary.content) <= 300
+
+        assert "message 0 " not in summary.content
+        assert f"message {summary.covered_through} " in summary.content
+        assert summary.message_count == summary.covered_through + 1
+
+    def test_trim_summary_shortens_a_single_long_line(self):
+        """Test that a one-paragraph summary over budget is cut to fit."""
+        counter = TokenCounter(None)
+        text = "decision " * 200
+
+        trimmed = trim_summary(text, 50, counter)
+
+        assert counter.count(trimmed) <= 50
+        assert text.startswith(trimmed)
+
+    @pytest.mark.asyncio
+    async def test_one_compaction_at_a_time(self):
+        """Test that scheduling while running does not start another task."""
+        release = asyncio.Event()
+
+        async def slow_summarizer(previous, messages):
+            await release.wait()
+            return "summary"
+
+        compactor = make_compactor(
+            summarizer=slow_summarizer, threshold_tokens=10, keep_recent_tokens=10
+        )
+        task = compactor.schedule(lambda: make_history(10))
+        await asyncio.sleep(0)
+
+        assert compactor.is_running
+        assert compactor.schedule(lambda: make_history(10)) is None
+        release.set()
+        await task
+
+    @pytest.mark.asyncio
+    async def test_failure_is_counted(self):
+        """Test that a failing summarizer is logged and counted."""
+
+        async def failing_summarizer(previous, messages):
+            raise RuntimeError("model unavailable")
+
+        compactor = make_compactor(
+            summarizer=failing_summarizer, threshold_tokens=10, keep_recent_tokens=10
+        )
+        compactor.schedule(lambda: make_history(10))
+        await compactor.wait()
+
+        assert compactor.get_stats()["failures"] == 1
+        assert compactor.get_summary() is None
+
+
+class TestSummaryStorage:
+    """Test model summaries and summary persistence."""
+
+    @pytest.mark.asyncio
+    async def test_model_summary(self):
+        """Test that the model's output becomes the summary."""
+        model = TestModel(custom_output_text="User is building a PyQt app.")
+
+        summary = await summarize_with_model(model, None, make_history(3))
+
+        assert summary == "User is building a PyQt app."
+
+    @pytest.mark.asyncio
+    async def test_summary_stored_in_memory_system(self):
+        """Test that summaries are stored and loaded by the memory system."""
+        store = SummaryStore()
+        for index in range(30):
+            store.store_user_message(f"message {index} " + "filler " * 20)
+
+        compactor = make_compactor(
+            threshold_tokens=500, keep_recent_tokens=200, memory_system=store
+        )
+        summary = await compactor.schedule(lambda: store.get_conversation_context(100))
+
+        assert store.summary["content"] == summary.content
+        restored = make_compactor(memory_system=store).get_summary()
+        assert restored.covered_through == summary.covered_through
+
+
+class TestCompactingStream:
+    """Test compaction triggered by memory-aware streaming."""
+
+    @pytest.mark.asyncio
+    async def test_stream_compacts_after_response(self, monkeypatch):
+        """Test that the next turn uses the summary instead of old messages."""
+        store = SummaryStore()
+        for index in range(30):
+            store.store_user_message(f"message {index} " + "filler " * 20)
+        counter = TokenCounter(None)
+        service = StreamingResponseService(
+            memory_system=store,
+            enable_memory_awareness=True,
+            context_builder=ContextBuilder(
+                budget=ContextBudget(max_tokens=4000), token_counter=counter
+            ),
+            compactor=make_compactor(threshold_tokens=500, keep_recent_tokens=200),
+        )
+        sent = []
+
+        async def fake_stream(message, on_chunk, on_error, enable_filesystem):
+            sent.append(message)
+            return AIResponse(success=True, content="Done.")
+
+        monkeypatch.setattr(service, "send_message_with_tools_stream", fake_stream)
+
+        await service.send_memory_aware_message_stream("first", lambda c, f: None)
+        assert service._compactor.is_running or service._compactor.compactions
+        await service._compactor.wait()
+        await service.send_memory_aware_message_stream("second", lambda c, f: None)
+
+        assert "CONVERSATION SUMMARY" not in sent[0]
+        assert "CONVERSATION SUMMARY" in sent[1]
+        assert "\nuser: message 0 " not in sent[1]
+        assert service.get_health_status()["compaction"]["compactions"] == 1
@@ -279,6 +279,45 @@ class TestFileChangeDetector:
         detector.stop_watching()
         assert detector.is_watching is False
 
+    def test_queued_events_analyzed_in_background(self, qapp, detector, temp_dir):
+        """Test that queued events are analyzed off the GUI thread."""
+        spy = QSignalSpy(detector.file_changed)
+        event = FileChangeEvent(
+            file_path=temp_dir / "module.py",
+            change_type=ChangeType.MODIFIED,
+            old_content="line 1\nline 2",
+            new_content="line 1\nline 2\nline 3",
+        )
+
+        detector._emit_change_event(event)
+        detector._process_event_queue()
+        assert detector.wait_for_analysis(2000)
+        qapp.processEvents()
+
+        assert len(spy) == 1
+        assert spy[0][0].metadata["lines_added"] == 1
+
+    def test_newer_event_supersedes_pending_analysis(self, qapp, detector, temp_dir):
+        """Test that only the latest event for a path is emitted."""
+        spy = QSignalSpy(detector.file_changed)
+        file_path = temp_dir / "module.py"
+
+        for version in range(5):
+            detector._emit_change_event(
+                FileChangeEvent(
+                    file_path=file_path,
+                    change_type=ChangeType.MODIFIED,
+                    old_content="original",
+                    new_content=f"version {version}",
+                )
+            )
+        detector._process_event_queue()
+        assert detector.wait_for_analysis(2000)
+        qapp.processEvents()
+
+        assert len(spy) == 1
+        assert spy[0][0].new_content == "version 4"
+
     @pytest.mark.asyncio
     async def test_file_creation_detection(self, detector, temp_dir):
         """Test detection of file creation."""
@@ -0,0 +1,255 @@
+"""
+Tests for latency histograms and the metrics registry.
+
+This module tests the latency metrics surface including:
+- Histogram percentile accuracy
+- Tagged series, snapshots and the Prometheus text format
+- The local metrics HTTP endpoint
+- Metrics recorded by AI streaming, operation tracking and MCP calls
+"""
+
+import asyncio
+import random
+import time
+import urllib.request
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from src.my_coding_agent.core.ai_services.ai_service_adapter import (
+    AIServiceAdapter,
+    AIStreamingResponse,
+)
+from src.my_coding_agent.core.ai_services.logging_utils import (
+    AIServiceLogger,
+    LogContext,
+)
+from src.my_coding_agent.core.ai_services.query_processor import (
+    QueryProcessor,
+    QueryRequest,
+)
+from src.my_coding_agent.core.mcp.mcp_client import MCPClient, MCPTool
+from src.my_coding_agent.core.mcp.resilience import MCPBulkhead
+from src.my_coding_agent.core.mcp.server_registry import (
+    MCPServerRegistry,
+    ToolRegistry,
+)
+from src.my_coding_agent.core.metrics import (
+    LatencyHistogram,
+    MetricsRegistry,
+    MetricsServer,
+)
+
+
+class TestLatencyHistogram:
+    """Test histogram recording and percentiles."""
+
+    def test_percentiles_within_relative_error(self):
+        """Test that percentiles match exact values within the bucket error."""
+        rng = random.Random(7)
+        values = sorted(rng.expovariate(5.0) for _ in range(20000))
+        histogram = LatencyHistogram(precision_bits=6)
+        for value in values:
+            histogram.record(value)
+
+        for percent in (50, 95, 99):
+            exact = values[int(len(values) * percent / 100) - 1]
+            assert histogram.percentile(percent) == pytest.approx(exact, rel=0.04)
+        assert histogram.count == len(values)
+        assert histogram.max == values[-1]
+
+    def test_small_values_are_exact(self):
+        """Test that durations below the precision threshold are exact."""
+        histogram = LatencyHistogram(precision_bits=6, resolution=0.001)
+        for value in (0.001, 0.002, 0.003, 0.004):
+            histogram.record(value)
+
+        assert histogram.percentile(50) == pytest.approx(0.002)
+        assert histogram.percentile(100) == pytest.approx(0.004)
+
+    def test_empty_histogram(self):
+        """Test that an empty histogram reports zeros."""
+        summary = LatencyHistogram().summary()
+
+        assert summary["count"] == 0
+        assert summary["p99"] == 0.0
+
+
+class TestMetricsRegistry:
+    """Test tagged series and exports."""
+
+    def test_series_are_tagged(self):
+        """Test that tags separate series and None tags are dropped."""
+        registry = MetricsRegistry()
+        registry.observe("mcp_call_duration_seconds", 0.1, server="a", tool=None)
+        registry.observe("mcp_call_duration_seconds", 0.2, server="b")
+        registry.increment("mcp_calls_total", server="a", outcome="success")
+        registry.increment("mcp_calls_total", server="a", outcome="success")
+
+        snapshot = registry.snapshot()
+        series = snapshot["histograms"]["mcp_call_duration_seconds"]
+        assert [entry["tags"] for entry in series] == [{"server": "a"}, {"server": "b"}]
+        assert (
+            registry.get_histogram("mcp_call_duration_seconds", server="a").count == 1
+        )
+        assert (
+            registry.get_counter("mcp_calls_total", server="a", outcome="success") == 2
+        )
+
+    def test_time_records_failed_blocks(self):
+        """Test that timed blocks are recorded even when they raise."""
+        registry = MetricsRegistry()
+
+        with pytest.raises(RuntimeError), registry.time("ai_request_duration_seconds"):
+            raise RuntimeError("failed")
+
+        assert registry.get_histogram("ai_request_duration_seconds").count == 1
+
+    def test_render_prometheus(self):
+        """Test the Prometheus text exposition output."""
+        registry = MetricsRegistry()
+        registry.observe("ai_time_to_first_token_seconds", 0.3, deployment="gpt-4o")
+        registry.increment("ai_stream_chunks_total", 12, deployment="gpt-4o")
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE ai_time_to_first_token_seconds histogram" in text
+        assert (
+            'ai_time_to_first_token_seconds_bucket{deployment="gpt-4o",le="0.25"} 0'
+            in text
+        )
+        assert (
+            'ai_time_to_first_token_seconds_bucket{deployment="gpt-4o",le="0.5"} 1'
+            in text
+        )
+        assert 'ai_time_to_first_token_seconds_count{deployment="gpt-4o"} 1' in text
+        assert "# TYPE ai_stream_chunks_total counter" in text
+        assert 'ai_stream_chunks_total{deployment="gpt-4o"} 12.0' in text
+        assert text.endswith("\n")
+
+    def test_metrics_server(self):
+        """Test that the local endpoint serves the registry."""
+        registry = MetricsRegistry()
+        registry.increment("mcp_calls_total", server="files", outcome="success")
+        server = MetricsServer(registry, port=0)
+
+        server.start()
+        try:
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.stop()
+
+        assert content_type.startswith("text/plain")
+        assert 'mcp_calls_total{outcome="success",server="files"} 1.0' in body
+        assert not server.is_running
+
+
+class TestRecordedLatencies:
+    """Test latencies recorded by the AI and MCP request paths."""
+
+    @pytest.mark.asyncio
+    async def test_streaming_records_time_to_first_token(self):
+        """Test that streaming queries record first-token and gap latencies."""
+        adapter = Mock(spec=AIServiceAdapter)
+
+        async def stream(query, **kwargs):
+            for index in range(3):
+                await asyncio.sleep(0.01)
+                yield AIStreamingResponse(
+                    content=f"chunk {index}", is_complete=index == 2, chunk_index=index
+                )
+
+        adapter.send_streaming_query = stream
+        processor = QueryProcessor(adapter=adapter)
+        processor._metrics = MetricsRegistry()
+
+        chunks = [
+            chunk
+            async for chunk in processor.process_streaming_query(
+                QueryRequest(query="Hi")
+            )
+        ]
+
+        assert len(chunks) == 3
+        tags = processor._metric_tags
+        first_token = processor._metrics.get_histogram(
+            "ai_time_to_first_token_seconds", **tags
+        )
+        gaps = processor._metrics.get_histogram("ai_inter_chunk_gap_seconds", **tags)
+        assert first_token.count == 1
+        assert first_token.max >= 0.005
+        assert gaps.count == 2
+        assert processor._metrics.get_counter("ai_stream_chunks_total", **tags) == 3
+
+    def test_operation_tracking_records_durations(self):
+        """Test that finished operations are recorded with their tags."""
+        registry = MetricsRegistry()
+        logger = AIServiceLogger("test_metrics_logger", metrics_registry=registry)
+        context = LogContext(
+            operation="query", provider="azure", deployment_name="gpt-4o"
+        )
+
+        metrics_id = logger.start_performance_tracking("query", context)
+        logger.finish_performance_tracking(metrics_id, context, success=False)
+
+        tags = {"operation": "query", "provider": "azure", "deployment": "gpt-4o"}
+        histogram = registry.get_histogram("ai_request_duration_seconds", **tags)
+        assert histogram.count == 1
+        assert registry.get_counter("ai_requests_total", outcome="failure", **tags) == 1
+
+    def test_unfinished_tracking_is_discarded(self):
+        """Test that operations that never finish do not accumulate."""
+        registry = MetricsRegistry()
+        logger = AIServiceLogger(
+            "test_metrics_logger", metrics_registry=registry, max_tracking_age=60.0
+        )
+        stale_id = logger.start_performance_tracking("abandoned")
+        logger._metrics[stale_id].start_time = time.time() - 120.0
+
+        fresh_id = logger.start_performance_tracking("query")
+
+        assert list(logger._metrics) == [fresh_id]
+        assert (
+            registry.get_counter("ai_abandoned_operations_total", operation="abandoned")
+            == 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_mcp_calls_record_latency_and_outcome(self):
+        """Test that registry tool calls record latency tagged by server."""
+        client = Mock(spec=MCPClient)
+        client.server_name = "files"
+        client.config = {"transport": "stdio"}
+        client.is_connected = Mock(return_value=True)
+        client.call_tool = AsyncMock(return_value=[{"type": "text", "text": "ok"}])
+        registry = MCPServerRegistry()
+        registry._metrics = MetricsRegistry()
+        registry.register_server(client)
+        registry._tools_cache["files:read"] = ToolRegistry(
+            tool=MCPTool(name="read", description="", input_schema={}),
+            server_name="files",
+        )
+
+        await registry.call_tool("read", {})
+
+        tags = {"server": "files", "operation": "call_tool", "tool": "read"}
+        metrics = registry._metrics
+        assert metrics.get_histogram("mcp_call_duration_seconds", **tags).count == 1
+        assert metrics.get_counter("mcp_calls_total", outcome="success", **tags) == 1
+
+    @pytest.mark.asyncio
+    async def test_bulkhead_records_queue_wait(self):
+        """Test that queued calls record how long they waited for a slot."""
+        registry = MetricsRegistry()
+        bulkhead = MCPBulkhead(max_concurrent=1, metrics_registry=registry)
+
+        async def hold(seconds):
+            async with bulkhead.slot("files"):
+                await asyncio.sleep(seconds)
+
+        await asyncio.gather(hold(0.05), hold(0))
+
+        histogram = registry.get_histogram("mcp_queue_wait_seconds", target="files")
+        assert histogram.count == 2
+        assert histogram.max >= 0.04
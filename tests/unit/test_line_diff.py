@@ -0,0 +1,130 @@
+"""
+Tests for the line diff engine.
+
+This module tests the hashed-line diff used for change analysis including:
+- Exact addition and removal counts
+- Unified diff output compatible with difflib
+- Budgeted fallback for large rewrites
+- Lazy rendering of diff text in FileChangeAnalyzer
+"""
+
+import difflib
+from pathlib import Path
+
+from src.my_coding_agent.core import line_diff
+from src.my_coding_agent.core.file_change_detector import FileChangeAnalyzer
+from src.my_coding_agent.core.line_diff import LazyUnifiedDiff, diff_lines
+
+OLD_LINES = ["line 1", "line 2", "line 3"]
+NEW_LINES = ["line 1", "modified line 2", "line 3", "line 4"]
+
+
+class TestLineDiffCounts:
+    """Test addition and removal counting."""
+
+    def test_modification_counts(self):
+        """Test counts for a mixed modification."""
+        result = diff_lines(OLD_LINES, NEW_LINES)
+
+        assert result.lines_added == 2
+        assert result.lines_removed == 1
+        assert result.lines_changed == 1
+        assert not result.approximate
+
+    def test_pure_insertion_and_deletion(self):
+        """Test counts when lines are only appended or only removed."""
+        assert diff_lines(["a"], ["a", "b", "c"]).lines_added == 2
+        assert diff_lines(["a", "b", "c"], ["c"]).lines_removed == 2
+
+    def test_identical_content(self):
+        """Test that identical content has no changes and no diff text."""
+        result = diff_lines(OLD_LINES, list(OLD_LINES))
+
+        assert result.lines_added == 0
+        assert result.lines_removed == 0
+        assert result.unified_diff("a", "b") == []
+
+    def test_over_budget_falls_back_to_estimate(self):
+        """Test that exceeding the work budget still yields counts."""
+        old_lines = [f"old {i}" for i in range(200)]
+        new_lines = [f"new {i}" for i in range(150)]
+
+        result = diff_lines(old_lines, new_lines, max_cost=10)
+
+        assert result.approximate
+        assert result.lines_added == 150
+        assert result.lines_removed == 200
+
+    def test_large_changed_region_skips_search(self):
+        """Test that rewrites beyond the line cutoff are estimated up front."""
+        old_lines = [f"line {i} a" for i in range(20)]
+        new_lines = [f"line {i} b" for i in range(20)]
+
+        result = diff_lines(old_lines, new_lines, max_lines=30)
+
+        assert result.approximate
+        assert result.lines_added == result.lines_removed == 20
+
+    def test_estimated_diff_is_not_searched_again(self, monkeypatch):
+        """Test that rendering an estimated diff goes straight to the summary."""
+        result = diff_lines(
+            [f"old {i}" for i in range(50)],
+            [f"new {i}" for i in range(50)],
+            max_cost=10,
+        )
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Myers search repeated")
+
+        monkeypatch.setattr(line_diff, "_myers", fail)
+        diff = result.unified_diff("a", "b")
+
+        assert diff[:2] == ["--- a", "+++ b"]
+        assert "approximate" in diff[2]
+
+
+class TestUnifiedDiff:
+    """Test rendering of unified diff text."""
+
+    def test_matches_difflib_output(self):
+        """Test that simple diffs render the same as difflib."""
+        expected = list(
+            difflib.unified_diff(OLD_LINES, NEW_LINES, "a/f", "b/f", lineterm="")
+        )
+
+        assert diff_lines(OLD_LINES, NEW_LINES).unified_diff("a/f", "b/f") == expected
+
+    def test_separate_hunks_for_distant_changes(self):
+        """Test that changes far apart produce separate hunks."""
+        old_lines = [f"line {i}" for i in range(40)]
+        new_lines = list(old_lines)
+        new_lines[2] = "changed near top"
+        new_lines[35] = "changed near bottom"
+
+        diff = diff_lines(old_lines, new_lines).unified_diff("a", "b")
+        expected = list(
+            difflib.unified_diff(old_lines, new_lines, "a", "b", lineterm="")
+        )
+
+        assert diff == expected
+        assert sum(1 for line in diff if line.startswith("@@")) == 2
+
+
+class TestLazyDiffInAnalyzer:
+    """Test that the analyzer defers building diff text."""
+
+    def test_diff_lines_rendered_on_demand(self):
+        """Test that diff text is only generated when accessed."""
+        analyzer = FileChangeAnalyzer()
+        analysis = analyzer.analyze_change(
+            Path("/test/file.txt"), "\n".join(OLD_LINES), "\n".join(NEW_LINES)
+        )
+
+        diff = analysis["diff_lines"]
+        assert isinstance(diff, LazyUnifiedDiff)
+        assert not diff.is_materialized
+        assert analysis["lines_added"] == 2
+
+        assert diff[0] == "--- a/file.txt"
+        assert diff.is_materialized
+        assert "+line 4" in list(diff)
@@ -0,0 +1,67 @@
+"""
+Tests for long-term memory recall.
+
+This module tests the memory store including:
+- Recall ranked by relevance and importance
+- Filtering by memory type
+- Listing the most important memories without a query
+- Persistence across reopening
+"""
+
+from src.my_coding_agent.core.long_term_memory import LongTermMemoryStore
+
+
+class TestLongTermMemoryStore:
+    """Test storing and recalling memories."""
+
+    def test_recall_relevant_memory(self, tmp_path):
+        """Test that the memory matching the query is recalled first."""
+        store = LongTermMemoryStore(tmp_path)
+        store.store_many(
+            [
+                {"content": "My name is Alex", "importance_score": 0.9},
+                {"content": "The project uses PyQt6 for the UI"},
+                {"content": "Deployments happen on Fridays", "memory_type": "fact"},
+            ]
+        )
+
+        memories = store.recall("which UI toolkit does the project use?", limit=1)
+
+        assert memories[0]["content"] == "The project uses PyQt6 for the UI"
+        assert memories[0]["relevance"] > 0
+        assert {"id", "memory_type", "importance_score", "created_at"} <= set(
+            memories[0]
+        )
+
+    def test_filter_by_type(self, tmp_path):
+        """Test that only memories of the requested type are returned."""
+        store = LongTermMemoryStore(tmp_path)
+        store.store("I like short answers", memory_type="preference")
+        store.store("Answers about the project go in docs", memory_type="fact")
+
+        memories = store.recall("answers", memory_type="preference")
+
+        assert [memory["content"] for memory in memories] == ["I like short answers"]
+
+    def test_recall_without_query_orders_by_importance(self, tmp_path):
+        """Test that an empty query returns the most important memories."""
+        store = LongTermMemoryStore(tmp_path)
+        store.store("minor detail", importance_score=0.1)
+        store.store("critical fact", importance_score=1.0)
+
+        memories = store.recall(limit=1)
+
+        assert memories[0]["content"] == "critical fact"
+        assert memories[0]["relevance"] is None
+
+    def test_memories_persist(self, tmp_path):
+        """Test that memories and deletions survive reopening the store."""
+        store = LongTermMemoryStore(tmp_path)
+        kept = store.store("keep this")
+        removed = store.store("remove this")
+        assert store.delete(removed)
+
+        reopened = LongTermMemoryStore(tmp_path)
+
+        assert len(reopened) == 1
+        assert reopened.recall("this")[0]["id"] == kept
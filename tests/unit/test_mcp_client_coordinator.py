@@ -4,13 +4,19 @@ Unit tests for MCPClientCoordinator - the simplified MCP client interface.
 This coordinator replaces the complex AIAgent with a focused MCP communication layer.
 """
 
+import asyncio
+import gzip
+import json
+import threading
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from src.my_coding_agent.core.mcp_client_coordinator import (
+    CancellationToken,
     MCPClientCoordinator,
     MCPCoordinatorConfig,
+    MCPRequestCancelledError,
     MCPResponse,
     StreamingMCPResponse,
 )
@@ -208,3 +214,200 @@ class TestMCPClientCoordinator:
                 await self.coordinator.send_message("Hello")
 
             assert mock_send.call_count == 3  # max_retries
+
+
+class TestMCPTransport:
+    """Test suite for the pooled HTTP transport settings."""
+
+    def test_retry_delay_backs_off_exponentially(self):
+        """Test that retry delays double and are capped without jitter."""
+        config = MCPCoordinatorConfig(
+            server_url="http://localhost:8080",
+            retry_delay=0.5,
+            max_retry_delay=3.0,
+            retry_jitter=0.0,
+        )
+        coordinator = MCPClientCoordinator(config)
+
+        delays = [coordinator._get_retry_delay(attempt) for attempt in range(5)]
+
+        assert delays == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    def test_retry_delay_jitter_stays_in_range(self):
+        """Test that jittered delays never exceed the backoff ceiling."""
+        config = MCPCoordinatorConfig(
+            server_url="http://localhost:8080", retry_delay=1.0, retry_jitter=0.5
+        )
+        coordinator = MCPClientCoordinator(config)
+
+        delays = [coordinator._get_retry_delay(2) for _ in range(50)]
+
+        assert all(2.0 <= delay <= 4.0 for delay in delays)
+
+    def test_large_payloads_are_compressed(self):
+        """Test that request bodies over the threshold are gzipped."""
+        config = MCPCoordinatorConfig(
+            server_url="http://localhost:8080",
+            compress_requests=True,
+            compression_threshold=1024,
+        )
+        coordinator = MCPClientCoordinator(config)
+
+        small_body, small_headers = coordinator._encode_payload({"message": "hi"})
+        large_payload = {"message": "x" * 4096}
+        large_body, large_headers = coordinator._encode_payload(large_payload)
+
+        assert small_headers == {}
+        assert json.loads(small_body) == {"message": "hi"}
+        assert large_headers == {"Content-Encoding": "gzip"}
+        assert len(large_body) < 1024
+        assert json.loads(gzip.decompress(large_body)) == large_payload
+
+    @pytest.mark.asyncio
+    async def test_session_uses_pooled_connector(self):
+        """Test that the session connector honours the configured limits."""
+        config = MCPCoordinatorConfig(
+            server_url="http://localhost:8080",
+            connection_limit=20,
+            connection_limit_per_host=4,
+        )
+        coordinator = MCPClientCoordinator(config)
+
+        session = coordinator._create_session()
+        try:
+            assert session.connector.limit == 20
+            assert session.connector.limit_per_host == 4
+            assert session.connector.use_dns_cache is True
+        finally:
+            await session.close()
+
+
+class TestMCPConcurrency:
+    """Test suite for multiplexed requests, cancellation and backpressure."""
+
+    def make_coordinator(self, **overrides):
+        """Create a connected coordinator with the given config overrides."""
+        config = MCPCoordinatorConfig(server_url="http://localhost:8080", **overrides)
+        coordinator = MCPClientCoordinator(config)
+        coordinator.is_connected = True
+        return coordinator
+
+    @pytest.mark.asyncio
+    async def test_in_flight_requests_are_bounded(self):
+        """Test that concurrent requests never exceed max_in_flight."""
+        coordinator = self.make_coordinator(max_in_flight=2)
+        peak = 0
+
+        async def slow_send(message, streaming=False):
+            nonlocal peak
+            peak = max(peak, coordinator.in_flight_count)
+            await asyncio.sleep(0.01)
+            return MCPResponse(content=message)
+
+        with patch.object(coordinator, "_send_mcp_message", side_effect=slow_send):
+            responses = await asyncio.gather(
+                *(coordinator.send_message(f"msg {i}") for i in range(6))
+            )
+
+        assert [r.content for r in responses] == [f"msg {i}" for i in range(6)]
+        assert peak == 2
+        assert coordinator.in_flight_count == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_token_from_another_thread(self):
+        """Test that a token cancelled off-loop aborts only its own request."""
+        coordinator = self.make_coordinator(max_retries=1)
+        started = asyncio.Event()
+
+        async def hanging_send(message, streaming=False):
+            started.set()
+            await asyncio.sleep(30)
+
+        token = CancellationToken()
+        with patch.object(coordinator, "_send_mcp_message", side_effect=hanging_send):
+            request = asyncio.create_task(coordinator.send_message("hi", token))
+            await started.wait()
+            threading.Thread(target=token.cancel).start()
+
+            with pytest.raises(MCPRequestCancelledError):
+                await request
+
+        assert coordinator.in_flight_count == 0
+        with pytest.raises(MCPRequestCancelledError):
+            await coordinator.send_message("again", token)
+
+    @pytest.mark.asyncio
+    async def test_stream_queue_applies_backpressure(self):
+        """Test that a slow consumer stops the producer at the queue bound."""
+        coordinator = self.make_coordinator(stream_queue_size=2)
+        produced = 0
+
+        async def fast_stream(message):
+            nonlocal produced
+            for i in range(20):
+                produced += 1
+                yield StreamingMCPResponse(content=str(i))
+            yield StreamingMCPResponse(content="", is_complete=True)
+
+        with patch.object(
+            coordinator, "_send_mcp_message_streaming", side_effect=fast_stream
+        ):
+            stream = coordinator.send_message_streaming("hi")
+            first = await stream.__anext__()
+            await asyncio.sleep(0.01)
+
+            # One chunk consumed, two queued, one waiting on a full queue
+            assert first.content == "0"
+            assert produced <= 4
+
+            rest = [chunk.content async for chunk in stream]
+
+        assert rest[:-1] == [str(i) for i in range(1, 20)]
+        assert coordinator.in_flight_count == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_streaming_request(self):
+        """Test cancelling a stream while waiting for the next chunk."""
+        coordinator = self.make_coordinator()
+        token = CancellationToken()
+
+        async def stalled_stream(message):
+            yield StreamingMCPResponse(content="partial")
+            await asyncio.sleep(30)
+
+        with patch.object(
+            coordinator, "_send_mcp_message_streaming", side_effect=stalled_stream
+        ):
+            chunks = []
+            with pytest.raises(MCPRequestCancelledError):
+                async for chunk in coordinator.send_message_streaming("hi", token):
+                    chunks.append(chunk.content)
+                    asyncio.get_running_loop().call_later(0.01, token.cancel)
+
+        assert chunks == ["partial"]
+        assert coordinator.in_flight_count == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_streaming_request_between_chunks(self):
+        """Test cancelling a stream while the consumer is busy between chunks."""
+        coordinator = self.make_coordinator()
+        token = CancellationToken()
+
+        async def chunk_stream(message):
+            for i in range(5):
+                yield StreamingMCPResponse(content=str(i))
+            yield StreamingMCPResponse(content="", is_complete=True)
+
+        with patch.object(
+            coordinator, "_send_mcp_message_streaming", side_effect=chunk_stream
+        ):
+            chunks = []
+            with pytest.raises(MCPRequestCancelledError):
+                async for chunk in coordinator.send_message_streaming("hi", token):
+                    chunks.append(chunk.content)
+                    # Cancel off-loop and let it land before the next chunk
+                    threading.Thread(target=token.cancel).start()
+                    await asyncio.sleep(0.01)
+
+        assert chunks == ["0"]
+        assert coordinator.in_flight_count == 0
@@ -25,6 +25,7 @@ from src.my_coding_agent.core.mcp.error_handler import (
     MCPErrorContext,
     MCPErrorHandler,
     MCPErrorMetrics,
+    SlidingWindowCounter,
 )
 from src.my_coding_agent.core.mcp.mcp_client import (
     MCPClient,
@@ -352,6 +353,120 @@ class TestMCPErrorMetrics:
         assert recent_errors[0] == recent_error
 
 
+class TestMCPErrorRateWindows:
+    """Test suite for bucketed sliding-window error rates."""
+
+    @staticmethod
+    def _context(
+        server="test-server", category=ErrorCategory.NETWORK, age=None
+    ) -> MCPErrorContext:
+        """Create an error context, optionally aged by a timedelta."""
+        return MCPErrorContext(
+            error=ConnectionError("boom"),
+            server_name=server,
+            operation="call_tool",
+            category=category,
+            severity=ErrorSeverity.MEDIUM,
+            timestamp=datetime.now() - (age or timedelta(0)),
+        )
+
+    def test_window_counter_expires_old_buckets(self):
+        """Test that buckets outside the window are not counted."""
+        counter = SlidingWindowCounter(bucket_seconds=1.0, bucket_count=60)
+        now = 1_000_000.0
+
+        counter.add(now - 30)
+        counter.add(now - 5, count=2)
+        counter.add(now - 120)  # Older than the ring
+
+        assert counter.count(10, now=now) == 2
+        assert counter.count(60, now=now) == 3
+        assert counter.count(60, now=now + 30) == 2
+        assert counter.count(60, now=now + 60) == 0
+
+    def test_rates_beyond_recent_error_cap(self):
+        """Test that hour-long rates stay correct past the recent error cap."""
+        metrics = MCPErrorMetrics()
+
+        for _ in range(150):
+            metrics.record_error(self._context(age=timedelta(minutes=30)))
+        for _ in range(50):
+            metrics.record_error(self._context())
+
+        assert len(metrics.recent_errors) == 100
+        assert metrics.get_error_rate(window_minutes=60) == pytest.approx(200 / 60)
+        assert metrics.get_error_rate(window_minutes=1) == pytest.approx(50)
+
+    def test_rates_by_server_and_category(self):
+        """Test that rates are tracked per server and per category."""
+        metrics = MCPErrorMetrics()
+        metrics.record_error(self._context(server="a"))
+        metrics.record_error(self._context(server="a", category=ErrorCategory.TIMEOUT))
+        metrics.record_error(self._context(server="b", category=ErrorCategory.TIMEOUT))
+
+        assert metrics.get_server_error_rate("a", window_minutes=1) == 2
+        assert metrics.get_category_error_rate(ErrorCategory.TIMEOUT, 1) == 2
+        assert (
+            metrics.get_category_error_rate(ErrorCategory.TIMEOUT, 1, server_name="b")
+            == 1
+        )
+        assert metrics.get_server_error_rate("unknown") == 0.0
+
+    def test_windowed_breaker_trips_on_flapping(self):
+        """Test that interleaved successes do not hide a failing server."""
+        breaker = MCPCircuitBreaker(failure_threshold=5, window_failure_threshold=3)
+
+        for _ in range(3):
+            breaker.record_failure()
+            if breaker.state == CircuitBreakerState.CLOSED:
+                breaker.record_success()
+
+        assert breaker.state == CircuitBreakerState.OPEN
+        assert breaker.get_window_failures() == 3
+
+    def test_windowed_breaker_forgets_failures_after_recovery(self):
+        """Test that failures from before recovery do not re-open the circuit."""
+        breaker = MCPCircuitBreaker(
+            failure_threshold=5, window_failure_threshold=3, recovery_timeout=0
+        )
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.state == CircuitBreakerState.OPEN
+
+        assert breaker.can_execute()
+        assert breaker.state == CircuitBreakerState.HALF_OPEN
+        breaker.record_success()
+        assert breaker.state == CircuitBreakerState.CLOSED
+        assert breaker.get_window_failures() == 0
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreakerState.CLOSED
+
+    def test_error_rate_retry_limit_is_opt_in(self):
+        """Test that retries are not limited by error rate unless configured."""
+        assert MCPErrorHandler().retry_error_rate_limit is None
+
+    def test_request_deadline_is_opt_in(self):
+        """Test that long operations are not cut off unless a deadline is set."""
+        assert MCPErrorHandler().retry_engine.deadline is None
+        assert MCPErrorHandler({"retry_deadline": 5.0}).retry_engine.deadline == 5.0
+
+    @pytest.mark.asyncio
+    async def test_retries_suppressed_at_high_error_rate(self):
+        """Test that a server failing at a high rate is not retried."""
+        handler = MCPErrorHandler(
+            {"retry_error_rate_limit": 5, "enable_circuit_breaker": False}
+        )
+        for _ in range(5):
+            handler.metrics.record_error(self._context(server="busy"))
+
+        operation = AsyncMock(side_effect=ConnectionError("down"))
+        with pytest.raises(ConnectionError):
+            await handler.execute_with_retry(operation, "busy", "call_tool", 3)
+
+        assert operation.call_count == 1
+
+
 class TestMCPClientErrorIntegration:
     """Test suite for MCP client error handling integration."""
 
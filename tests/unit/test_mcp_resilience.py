@@ -0,0 +1,235 @@
+"""
+Tests for per-server circuit breakers and bulkheads.
+
+This module tests fault isolation for MCP calls including:
+- Bulkhead limits on running and queued calls
+- Circuit breaker fail-fast and half-open trial calls
+- Registry enforcement per server and per tool
+- Breaker state reported in registry statistics
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from src.my_coding_agent.core.mcp.error_handler import CircuitBreakerState
+from src.my_coding_agent.core.mcp.mcp_client import (
+    MCPClient,
+    MCPConnectionError,
+    MCPProtocolError,
+    MCPTimeoutError,
+    MCPTool,
+)
+from src.my_coding_agent.core.mcp.resilience import (
+    MCPBulkhead,
+    MCPBulkheadFullError,
+    MCPCallGuard,
+    MCPCircuitOpenError,
+)
+from src.my_coding_agent.core.mcp.server_registry import (
+    MCPServerRegistry,
+    ToolRegistry,
+)
+
+
+def _make_registry(config, *tools):
+    """Create a registry with one connected mock server exposing tools."""
+    client = Mock(spec=MCPClient)
+    client.server_name = "slow-server"
+    client.config = {"transport": "stdio"}
+    client.is_connected = Mock(return_value=True)
+    client.reconnect = AsyncMock()
+    client.call_tool = AsyncMock(return_value=[{"type": "text", "text": "ok"}])
+
+    registry = MCPServerRegistry(resilience_config=config)
+    registry.register_server(client)
+    for tool_name in tools:
+        registry._tools_cache[f"slow-server:{tool_name}"] = ToolRegistry(
+            tool=MCPTool(name=tool_name, description="", input_schema={}),
+            server_name="slow-server",
+        )
+    return registry, client
+
+
+class TestMCPBulkhead:
+    """Test concurrency and queue limits."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Test that calls beyond running plus queued capacity fail immediately."""
+        bulkhead = MCPBulkhead(max_concurrent=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with bulkhead.slot():
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(MCPBulkheadFullError):
+            async with bulkhead.slot():
+                pass
+
+        assert bulkhead.get_stats()["active_calls"] == 1
+        assert bulkhead.get_stats()["queued_calls"] == 1
+        assert bulkhead.get_stats()["rejected_calls"] == 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert bulkhead.get_stats()["active_calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        """Test that a queued call gives up after queue_timeout."""
+        bulkhead = MCPBulkhead(max_concurrent=1, max_queue=4, queue_timeout=0.05)
+        release = asyncio.Event()
+
+        async def hold():
+            async with bulkhead.slot():
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(MCPBulkheadFullError, match="Timed out"):
+            async with bulkhead.slot():
+                pass
+
+        assert bulkhead.queued_calls == 0
+        release.set()
+        await running
+
+
+class TestMCPCallGuard:
+    """Test circuit breaker behaviour of a call guard."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test that an open circuit rejects calls without running them."""
+        guard = MCPCallGuard("server", {"failure_threshold": 2})
+        guard.record_failure()
+        guard.record_failure()
+
+        with pytest.raises(MCPCircuitOpenError):
+            async with guard.call():
+                pytest.fail("call should not run")
+
+        assert guard.get_stats()["state"] == "open"
+        assert guard.get_stats()["fast_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_half_open_allows_single_trial(self):
+        """Test that only one trial call passes while half-open."""
+        guard = MCPCallGuard(
+            "server", {"failure_threshold": 1, "recovery_timeout": 0.0}
+        )
+        guard.record_failure()
+
+        async with guard.call():
+            assert guard.circuit_breaker.state == CircuitBreakerState.HALF_OPEN
+            with pytest.raises(MCPCircuitOpenError):
+                guard.check_circuit()
+            guard.record_success()
+
+        assert guard.circuit_breaker.state == CircuitBreakerState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_abandoned_trial_is_released(self):
+        """Test that a cancelled trial call frees the half-open slot."""
+        guard = MCPCallGuard(
+            "server", {"failure_threshold": 1, "recovery_timeout": 0.0}
+        )
+        guard.record_failure()
+
+        with pytest.raises(RuntimeError):
+            async with guard.call():
+                raise RuntimeError("cancelled")
+
+        assert guard.circuit_breaker.half_open_calls == 0
+        assert guard.check_circuit() is True
+
+
+class TestRegistryFaultIsolation:
+    """Test circuit breakers and bulkheads enforced by the registry."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_reconnect(self):
+        """Test that calls to an open circuit fail without reconnecting."""
+        registry, client = _make_registry({"failure_threshold": 2}, "search")
+        client.call_tool = AsyncMock(side_effect=MCPConnectionError("reset"))
+
+        for _ in range(2):
+            with pytest.raises(MCPConnectionError):
+                await registry.call_tool("search", {})
+
+        client.is_connected = Mock(return_value=False)
+        with pytest.raises(MCPCircuitOpenError):
+            await registry.call_tool("search", {})
+
+        client.reconnect.assert_not_called()
+        assert client.call_tool.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_protocol_errors_do_not_open_circuit(self):
+        """Test that tool errors from a reachable server are not failures."""
+        registry, client = _make_registry({"failure_threshold": 1}, "search")
+        client.call_tool = AsyncMock(side_effect=MCPProtocolError("bad args"))
+
+        for _ in range(3):
+            with pytest.raises(MCPProtocolError):
+                await registry.call_tool("search", {})
+
+        assert registry.get_call_guard("slow-server").get_stats()["state"] == "closed"
+
+    @pytest.mark.asyncio
+    async def test_hung_server_cannot_absorb_all_calls(self):
+        """Test that a hung server times out calls and sheds excess load."""
+        registry, client = _make_registry(
+            {"max_concurrent_calls": 1, "max_queued_calls": 0, "call_timeout": 0.05},
+            "search",
+        )
+        hang = asyncio.Event()
+
+        async def hung_call(*args):
+            await hang.wait()
+
+        client.call_tool = AsyncMock(side_effect=hung_call)
+
+        first = asyncio.create_task(registry.call_tool("search", {}))
+        await asyncio.sleep(0)
+        with pytest.raises(MCPBulkheadFullError):
+            await registry.call_tool("search", {})
+        with pytest.raises(MCPTimeoutError):
+            await first
+
+        stats = registry.get_registry_stats()["circuit_breakers"]["slow-server"]
+        assert stats["rejected_calls"] == 1
+        assert stats["failure_count"] == 1
+        assert stats["active_calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_per_tool_guards(self):
+        """Test that per_tool isolates tools of the same server."""
+        registry, client = _make_registry(
+            {"per_tool": True, "failure_threshold": 1}, "search", "fetch"
+        )
+
+        async def call_tool(tool_name, arguments):
+            if tool_name == "search":
+                raise MCPConnectionError("search backend down")
+            return [{"type": "text", "text": "ok"}]
+
+        client.call_tool = AsyncMock(side_effect=call_tool)
+
+        with pytest.raises(MCPConnectionError):
+            await registry.call_tool("search", {})
+        with pytest.raises(MCPCircuitOpenError):
+            await registry.call_tool("search", {})
+        assert await registry.call_tool("fetch", {}) == [{"type": "text", "text": "ok"}]
+
+        stats = registry.get_registry_stats()
+        assert stats["open_circuits"] == 1
+        assert stats["circuit_breakers"]["slow-server:search"]["state"] == "open"
+        assert stats["circuit_breakers"]["slow-server:fetch"]["state"] == "closed"
@@ -0,0 +1,224 @@
+"""
+Tests for the write-behind memory service.
+
+This module tests conversation memory persistence including:
+- Batching queued writes by size and by interval
+- Reads seeing writes that are still queued
+- Flushing all writes when the service is closed
+- Resuming the latest session and its summary after a restart
+- Long-term memories recalled before and after they are indexed
+- AIAgent delegating to the memory service
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+from src.my_coding_agent.core.ai_agent import AIAgent, AIAgentConfig
+from src.my_coding_agent.core.memory_service import (
+    MemoryContextService,
+    WriteBehindQueue,
+)
+
+
+def count_messages(service: MemoryContextService) -> int:
+    """Count the messages stored in the service's database."""
+    with sqlite3.connect(service.db_path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+
+class TestWriteBehindQueue:
+    """Test batching in the write queue."""
+
+    def test_writes_are_batched_by_size(self):
+        """Test that queued writes are applied max_batch at a time."""
+        batches = []
+        writer = WriteBehindQueue(batches.append, flush_interval=10, max_batch=5)
+
+        for item in range(12):
+            writer.put(item)
+        writer.close()
+
+        assert [len(batch) for batch in batches] == [5, 5, 2]
+        assert [item for batch in batches for item in batch] == list(range(12))
+
+    def test_writes_are_applied_after_interval(self):
+        """Test that a small batch is applied once the interval passes."""
+        applied = threading.Event()
+        writer = WriteBehindQueue(lambda batch: applied.set(), flush_interval=0.05)
+
+        writer.put("write")
+
+        assert applied.wait(2)
+        writer.close()
+
+    def test_put_does_not_wait_for_slow_writes(self):
+        """Test that queuing returns while a batch is still being applied."""
+        release = threading.Event()
+        writer = WriteBehindQueue(lambda batch: release.wait(), flush_interval=0)
+
+        writer.put("first")
+        started = time.perf_counter()
+        writer.put("second")
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.05
+        release.set()
+        writer.close()
+
+    def test_failed_batch_is_counted(self):
+        """Test that a failing batch does not stop the writer."""
+
+        def apply(batch):
+            if "bad" in batch:
+                raise ValueError("cannot store")
+
+        writer = WriteBehindQueue(apply, flush_interval=0)
+        writer.put("bad")
+        writer.flush()
+        writer.put("good")
+        writer.close()
+
+        assert writer.failures == 1
+        assert writer.writes == 1
+
+    def test_put_after_close_raises(self):
+        """Test that a closed queue rejects writes."""
+        writer = WriteBehindQueue(lambda batch: None)
+        writer.close()
+
+        with pytest.raises(RuntimeError):
+            writer.put("late")
+
+
+class TestMemoryContextService:
+    """Test conversation storage through the service."""
+
+    def test_reads_see_queued_messages(self, tmp_path):
+        """Test that context includes messages not yet written to disk."""
+        service = MemoryContextService(tmp_path, flush_interval=10)
+
+        service.store_user_message("hello")
+        service.store_assistant_message("hi there")
+        context = service.get_conversation_context(limit=10)
+
+        assert [message["content"] for message in context] == ["hi there", "hello"]
+        assert count_messages(service) == 0
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_writes(self, tmp_path):
+        """Test that closing the service stores every queued write."""
+        service = MemoryContextService(tmp_path, flush_interval=10)
+        for index in range(50):
+            service.store_user_message(f"message {index}")
+
+        await service.close()
+
+        assert count_messages(service) == 50
+        assert service._writer.batches == 1
+
+    def test_session_resumes_after_restart(self, tmp_path):
+        """Test that the latest session, messages and summary are reloaded."""
+        service = MemoryContextService(tmp_path)
+        first_id = service.store_user_message("remember me")
+        service.store_assistant_message("I will")
+        service.store_conversation_summary("Greetings", first_id, 1)
+        session_id = service.get_current_session_id()
+        service.shutdown()
+
+        reopened = MemoryContextService(tmp_path)
+
+        assert reopened.get_current_session_id() == session_id
+        context = reopened.get_conversation_context()
+        assert [message["content"] for message in context] == ["I will", "remember me"]
+        assert reopened.get_conversation_summary()["covered_through"] == first_id
+        reopened.shutdown()
+
+    def test_history_beyond_cache_is_read_from_disk(self, tmp_path):
+        """Test that requests larger than the cache fall back to the database."""
+        service = MemoryContextService(tmp_path, history_cache_size=5)
+        for index in range(20):
+            service.store_user_message(f"message {index}")
+
+        context = service.get_conversation_context(limit=15)
+
+        assert len(context) == 15
+        assert context[0]["content"] == "message 19"
+        assert context[-1]["content"] == "message 5"
+        service.shutdown()
+
+    def test_new_session_starts_empty(self, tmp_path):
+        """Test that a new session has no history."""
+        service = MemoryContextService(tmp_path)
+        service.store_user_message("old conversation")
+
+        service.start_new_session()
+
+        assert service.get_conversation_context() == []
+        service.shutdown()
+
+    def test_long_term_memory_recall(self, tmp_path):
+        """Test that memories are recalled before and after being indexed."""
+        service = MemoryContextService(tmp_path, flush_interval=10)
+        service.store_long_term_memory("My name is Sam", importance_score=0.9)
+
+        queued = service.get_long_term_memories("what is my name", limit=5)
+        service.flush()
+        indexed = service.get_long_term_memories("what is my name", limit=5)
+
+        assert [memory["content"] for memory in queued] == ["My name is Sam"]
+        assert [memory["content"] for memory in indexed] == ["My name is Sam"]
+        assert len(service.long_term_store) == 1
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_clear_all_memory(self, tmp_path):
+        """Test that clearing removes messages and memories."""
+        service = MemoryContextService(tmp_path)
+        service.store_user_message("forget this")
+        service.store_long_term_memory("and this")
+
+        assert await service.clear_all_memory()
+
+        assert count_messages(service) == 0
+        assert service.get_long_term_memories() == []
+        assert service.get_conversation_context() == []
+        await service.close()
+
+    def test_enhanced_message_includes_history(self, tmp_path):
+        """Test that the enhanced prompt contains earlier messages."""
+        service = MemoryContextService(tmp_path)
+        service.store_user_message("The project uses PyQt6")
+        service.store_assistant_message("Noted")
+
+        prompt = service.enhance_message_with_memory_context("What UI toolkit?")
+
+        assert "user: The project uses PyQt6" in prompt
+        assert "=== CURRENT USER MESSAGE ===\nWhat UI toolkit?" in prompt
+        service.shutdown()
+
+
+class TestAgentMemoryService:
+    """Test AIAgent delegating to the memory service."""
+
+    @pytest.mark.asyncio
+    async def test_agent_stores_and_closes(self, tmp_path):
+        """Test that the agent's memory methods reach the service."""
+        service = MemoryContextService(tmp_path, flush_interval=10)
+        config = AIAgentConfig(
+            azure_endpoint="https://test.openai.azure.com/",
+            azure_api_key="test-key",
+            deployment_name="gpt-4o",
+        )
+        agent = AIAgent(
+            config, enable_filesystem_tools=False, memory_context_service=service
+        )
+
+        agent.store_user_message("hello agent")
+        assert agent.get_conversation_context()[0]["content"] == "hello agent"
+        await agent.close_memory_service()
+
+        assert count_messages(service) == 1
+        assert agent.get_memory_health_status()["write_queue"]["writes"] == 1
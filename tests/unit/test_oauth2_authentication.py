@@ -14,6 +14,8 @@ import urllib.parse
 from datetime import datetime
 from unittest.mock import AsyncMock, patch
 
+import aiohttp
+import httpx
 import pytest
 from src.my_coding_agent.core.mcp.mcp_client import MCPClient, MCPConnectionError
 from src.my_coding_agent.core.mcp.oauth2_auth import (
@@ -22,6 +24,7 @@ from src.my_coding_agent.core.mcp.oauth2_auth import (
     OAuth2Config,
     OAuth2Error,
     OAuth2Token,
+    OAuth2TokenCache,
 )
 
 
@@ -490,6 +493,36 @@ class TestMCPClientOAuth2Integration:
 
             assert "new-access-token" in header
 
+    @pytest.mark.asyncio
+    async def test_transport_auth_reads_current_token_per_request(
+        self, mcp_config_with_oauth2
+    ):
+        """Test that renewed tokens reach the transport without rebuilding it."""
+        mcp_config_with_oauth2["headers"] = {"X-Client": "tests"}
+        client = MCPClient(mcp_config_with_oauth2)
+        client.oauth2_authenticator.current_token = OAuth2Token(
+            access_token="first-token", expires_in=3600
+        )
+        auth = client._create_transport_auth()
+
+        async def authorize() -> str:
+            request = httpx.Request("POST", "https://api.example.com/mcp")
+            flow = auth.async_auth_flow(request)
+            sent = await flow.__anext__()
+            await flow.aclose()
+            return sent.headers["Authorization"]
+
+        assert await authorize() == "Bearer first-token"
+
+        client.oauth2_authenticator.current_token = OAuth2Token(
+            access_token="second-token", expires_in=3600
+        )
+        assert await authorize() == "Bearer second-token"
+
+        client._create_http_client()
+        # The configured headers are copied, never extended with the token
+        assert client.config["headers"] == {"X-Client": "tests"}
+
     def test_oauth2_configuration_validation_in_mcp_client(self):
         """Test OAuth 2.0 configuration validation in MCP client."""
         # Test invalid OAuth 2.0 configuration
@@ -532,3 +565,150 @@ class TestMCPClientOAuth2Integration:
         code_verifier, code_challenge = authenticator.generate_pkce_challenge()
         assert len(code_verifier) >= 43
         assert code_challenge != code_verifier
+
+
+class TestOAuth2TokenRenewal:
+    """Test suite for shared sessions, proactive refresh and token caching."""
+
+    @pytest.fixture
+    def oauth2_config(self):
+        """Create OAuth 2.0 configuration for testing."""
+        return OAuth2Config(
+            client_id="test-client-id",
+            client_secret="test-client-secret",
+            token_url="https://auth.example.com/oauth/token",
+            scope="read write",
+        )
+
+    @staticmethod
+    def make_token(
+        access_token, expires_in=3600, refresh_token="refresh-1"
+    ) -> OAuth2Token:
+        """Create a token for renewal tests."""
+        return OAuth2Token(
+            access_token=access_token,
+            expires_in=expires_in,
+            refresh_token=refresh_token,
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_are_single_flighted(self, oauth2_config):
+        """Test that simultaneous callers share one refresh request."""
+        authenticator = OAuth2Authenticator(oauth2_config)
+        authenticator.current_token = self.make_token("old", expires_in=60)
+
+        async def slow_request(data):
+            await asyncio.sleep(0.05)
+            return self.make_token("new", refresh_token=None)
+
+        with patch.object(
+            authenticator, "_request_token", side_effect=slow_request
+        ) as mock_request:
+            headers = await asyncio.gather(
+                *(authenticator.get_authorization_header() for _ in range(5))
+            )
+
+        assert headers == ["Bearer new"] * 5
+        assert mock_request.call_count == 1
+        # The refresh token is kept when the provider does not rotate it
+        assert authenticator.current_token.refresh_token == "refresh-1"
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_renews_before_expiry(self, oauth2_config):
+        """Test that auto refresh renews a token before it expires."""
+        authenticator = OAuth2Authenticator(
+            oauth2_config, auto_refresh=True, refresh_margin_seconds=300
+        )
+        renewed = asyncio.Event()
+
+        async def fake_request(data):
+            renewed.set()
+            return self.make_token("renewed")
+
+        with patch.object(authenticator, "_request_token", side_effect=fake_request):
+            authenticator.store_token(self.make_token("expiring", expires_in=1))
+            await asyncio.wait_for(renewed.wait(), timeout=2)
+            await asyncio.sleep(0)
+
+        assert authenticator.current_token.access_token == "renewed"
+        assert not authenticator.current_token.is_expired()
+
+        await authenticator.cleanup()
+        assert authenticator._auto_refresh_task is None
+
+    @pytest.mark.asyncio
+    async def test_shared_session_is_not_closed(self, oauth2_config):
+        """Test that an injected session is reused and left open on cleanup."""
+        async with aiohttp.ClientSession() as session:
+            authenticator = OAuth2Authenticator(oauth2_config, session=session)
+
+            assert await authenticator._get_session() is session
+            await authenticator.cleanup()
+
+            assert not session.closed
+
+    def test_encrypted_token_cache_warm_start(self, oauth2_config, tmp_path):
+        """Test that tokens persist encrypted and are restored on restart."""
+        cache_path = tmp_path / "tokens.enc"
+        authenticator = OAuth2Authenticator(
+            oauth2_config, token_cache=OAuth2TokenCache(cache_path)
+        )
+        authenticator.store_token(self.make_token("cached-access-token"))
+
+        assert b"cached-access-token" not in cache_path.read_bytes()
+        assert cache_path.with_suffix(".key").stat().st_mode & 0o777 == 0o600
+
+        restarted = OAuth2Authenticator(
+            oauth2_config, token_cache=OAuth2TokenCache(cache_path)
+        )
+        assert restarted.current_token is not None
+        assert restarted.current_token.access_token == "cached-access-token"
+        assert (
+            restarted.current_token.expires_at == authenticator.current_token.expires_at
+        )
+
+        restarted.clear_authentication()
+        assert (
+            OAuth2TokenCache(cache_path).load(OAuth2TokenCache.cache_key(oauth2_config))
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_warm_started_client_credentials_token_renews_early(
+        self, oauth2_config, tmp_path
+    ):
+        """Test that a cached client-credentials token keeps its grant and renews."""
+        cache_path = tmp_path / "tokens.enc"
+        first = OAuth2Authenticator(
+            oauth2_config, token_cache=OAuth2TokenCache(cache_path)
+        )
+        with patch.object(
+            first,
+            "_request_token",
+            return_value=self.make_token("issued", expires_in=2, refresh_token=None),
+        ):
+            await first.client_credentials_flow()
+
+        restarted = OAuth2Authenticator(
+            oauth2_config,
+            token_cache=OAuth2TokenCache(cache_path),
+            auto_refresh=True,
+            refresh_margin_seconds=300,
+        )
+        assert restarted._grant_type == "client_credentials"
+        assert restarted._auto_refresh_task is None
+
+        renewed = asyncio.Event()
+
+        async def fake_request(data):
+            assert data["grant_type"] == "client_credentials"
+            renewed.set()
+            return self.make_token("renewed", refresh_token=None)
+
+        with patch.object(restarted, "_request_token", side_effect=fake_request):
+            assert await restarted.get_authorization_header() == "Bearer issued"
+            await asyncio.wait_for(renewed.wait(), timeout=2)
+            await asyncio.sleep(0)
+
+        assert restarted.current_token.access_token == "renewed"
+        await restarted.cleanup()
@@ -0,0 +1,251 @@
+"""
+Tests for the time-indexed project history store.
+
+This module tests project history including:
+- Range queries and newest-first pagination
+- Per-file indexes and out-of-order inserts
+- Recording FileChangeDetector events
+- Timelines built from cached day segments
+- Persistence across reopening
+- AIAgent project history tools backed by the store
+"""
+
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from src.my_coding_agent.core.ai_agent import AIAgent, AIAgentConfig
+from src.my_coding_agent.core.file_change_detector import ChangeType, FileChangeEvent
+from src.my_coding_agent.core.project_history import ProjectHistoryStore
+
+BASE = datetime(2025, 3, 10, 12, 0).timestamp()
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def fill(store: ProjectHistoryStore, days: int = 5, per_day: int = 4) -> None:
+    """Record a few edits per day to two files."""
+    for day in range(days):
+        for edit in range(per_day):
+            path = "src/app.py" if edit % 2 == 0 else "src/util.py"
+            store.record(
+                path,
+                "modified",
+                timestamp=BASE + day * DAY + edit * HOUR,
+                summary=f"day {day} edit {edit}",
+            )
+
+
+class TestQueries:
+    """Test range queries and pagination."""
+
+    def test_range_is_half_open_and_newest_first(self):
+        """Test that start is included, end is excluded, newest first."""
+        store = ProjectHistoryStore()
+        fill(store)
+
+        page = store.query(start=BASE + DAY, end=BASE + 2 * DAY)
+
+        assert page.total == 4
+        assert [r.summary for r in page.records] == [
+            "day 1 edit 3",
+            "day 1 edit 2",
+            "day 1 edit 1",
+            "day 1 edit 0",
+        ]
+
+    def test_pagination(self):
+        """Test that offset and limit walk through all matches."""
+        store = ProjectHistoryStore()
+        fill(store)
+
+        first = store.query(limit=8)
+        second = store.query(offset=8, limit=8)
+        last = store.query(offset=16, limit=8)
+
+        assert first.total == 20
+        assert first.has_more and second.has_more
+        assert not last.has_more
+        assert len(last.records) == 4
+        assert first.records[-1].timestamp > second.records[0].timestamp
+
+    def test_file_index_and_out_of_order_insert(self):
+        """Test per-file queries, including records added late."""
+        store = ProjectHistoryStore()
+        fill(store, days=2)
+        store.record("src/app.py", "created", timestamp=BASE - DAY, summary="first")
+
+        page = store.query(file_path="src/app.py")
+
+        assert page.total == 5
+        assert page.records[-1].summary == "first"
+        assert store.query(file_path="missing.py").total == 0
+
+    def test_search_matches_all_terms(self):
+        """Test that search requires every term and pages its results."""
+        store = ProjectHistoryStore()
+        fill(store)
+
+        page = store.search("util day 4", limit=1)
+
+        assert page.total == 2
+        assert page.records[0].summary == "day 4 edit 3"
+
+    def test_records_detector_events(self, tmp_path):
+        """Test that analyzed events become records relative to the root."""
+        store = ProjectHistoryStore(root=tmp_path)
+        event = FileChangeEvent(
+            tmp_path / "pkg" / "mod.py",
+            ChangeType.MODIFIED,
+            timestamp=BASE,
+            metadata={"summary": "Modified mod.py: +3/-1 lines", "lines_added": 3},
+        )
+
+        record = store.record_event(event)
+
+        assert record.file_path == "pkg/mod.py"
+        assert record.event_type == "modified"
+        assert record.lines_added == 3
+        assert store.query(file_path=tmp_path / "pkg" / "mod.py").total == 1
+
+
+class TestTimeline:
+    """Test timelines and their segment cache."""
+
+    def test_timeline_groups_by_day(self):
+        """Test that the timeline lists days newest first."""
+        store = ProjectHistoryStore()
+        fill(store, days=3)
+
+        timeline = store.timeline(BASE - DAY, BASE + 3 * DAY)
+
+        assert timeline.index("2025-03-12 (4 changes)") < timeline.index(
+            "2025-03-10 (4 changes)"
+        )
+        assert "src/util.py - MODIFIED: day 0 edit 1" in timeline
+
+    def test_whole_days_are_cached_until_changed(self):
+        """Test that repeated timelines reuse segments and new records refresh them."""
+        store = ProjectHistoryStore()
+        fill(store, days=3)
+        start, end = BASE - DAY, BASE + 3 * DAY
+
+        store.timeline(start, end)
+        misses = store.get_stats()["segment_misses"]
+        store.timeline(start, end)
+        assert store.get_stats()["segment_misses"] == misses
+
+        store.record("src/new.py", "created", timestamp=BASE + 5, summary="fresh")
+        timeline = store.timeline(start, end)
+
+        assert "fresh" in timeline
+        assert store.get_stats()["segment_misses"] == misses + 1
+
+    def test_partial_days_and_event_limit(self):
+        """Test clipping to the range and stopping after max_events."""
+        store = ProjectHistoryStore()
+        fill(store, days=5)
+
+        clipped = store.timeline(BASE + 2 * HOUR, BASE + 3 * HOUR)
+        limited = store.timeline(BASE - DAY, BASE + 5 * DAY, max_events=6)
+
+        assert "(1 change)" in clipped
+        assert "day 0 edit 2" in clipped
+        assert "day 0 edit 1" not in clipped
+        assert "12 earlier changes not shown" in limited
+
+    def test_file_timeline_omits_path(self):
+        """Test that a file timeline only shows that file's changes."""
+        store = ProjectHistoryStore()
+        fill(store, days=1)
+
+        timeline = store.timeline(BASE - DAY, BASE + DAY, file_path="src/app.py")
+
+        assert "(2 changes)" in timeline
+        assert "src/app.py -" not in timeline
+
+
+class TestPersistence:
+    """Test the append-only history file."""
+
+    def test_history_survives_reopen(self, tmp_path):
+        """Test that records are reloaded and ids keep increasing."""
+        path = tmp_path / "history.jsonl"
+        store = ProjectHistoryStore(path)
+        fill(store, days=2)
+
+        reopened = ProjectHistoryStore(path)
+        record = reopened.record("src/app.py", "modified", summary="later")
+
+        assert len(reopened) == 9
+        assert record.record_id == 9
+        assert reopened.query(file_path="src/util.py").total == 4
+
+    def test_bad_lines_are_skipped(self, tmp_path):
+        """Test that a damaged line does not prevent loading."""
+        path = tmp_path / "history.jsonl"
+        ProjectHistoryStore(path).record("a.py", "created", summary="ok")
+        with path.open("a") as lines:
+            lines.write("{not json\n")
+
+        assert len(ProjectHistoryStore(path)) == 1
+
+
+class TestAgentProjectHistoryTools:
+    """Test the agent's project history tools backed by the store."""
+
+    @pytest.fixture
+    def agent(self):
+        """Create an agent whose history tools use a filled store."""
+        store = ProjectHistoryStore()
+        now = time.time()
+        for index in range(30):
+            store.record(
+                Path("src/app.py"),
+                "modified",
+                timestamp=now - index * HOUR,
+                summary=f"change {index}",
+            )
+        config = AIAgentConfig(
+            azure_endpoint="https://test.openai.azure.com/",
+            azure_api_key="test-key",
+            deployment_name="gpt-4o",
+        )
+        return AIAgent(
+            config,
+            enable_filesystem_tools=False,
+            enable_project_history=True,
+            project_history_store=store,
+        )
+
+    def test_tools_are_available_without_memory(self, agent):
+        """Test that the store alone enables the history tools."""
+        assert "get_project_timeline" in agent.get_available_tools()
+
+    @pytest.mark.asyncio
+    async def test_file_history_pages(self, agent):
+        """Test that file history reports its page and the next offset."""
+        result = await agent._tool_get_file_project_history("src/app.py", limit=10)
+
+        assert "[" in result and "MODIFIED: change 0" in result
+        assert "Showing 1-10 of 30 changes; use offset=10 for more" in result
+
+    @pytest.mark.asyncio
+    async def test_recent_changes_and_search(self, agent):
+        """Test recent changes by hours and searching summaries."""
+        recent = await agent._tool_get_recent_project_changes(hours=5, limit=15)
+        search = await agent._tool_search_project_history("change 2", limit=5)
+
+        assert "of 5 changes" in recent
+        assert "src/app.py - MODIFIED: change 2" in search
+
+    @pytest.mark.asyncio
+    async def test_timeline(self, agent):
+        """Test the timeline tool and its empty case."""
+        timeline = await agent._tool_get_project_timeline(days_back=2)
+        empty = await agent._tool_get_project_timeline("other.py", days_back=2)
+
+        assert timeline.startswith("Project Timeline (Last 2 days):")
+        assert "change 29" in timeline
+        assert empty == "No timeline data found for the specified period"
@@ -0,0 +1,212 @@
+"""
+Tests for the disk-backed response cache.
+
+This module tests deterministic replays including:
+- Cache hits for repeated requests and misses for changed prompts or tools
+- Streamed responses replayed with and without their original timing
+- Offline mode failing on cache misses
+- Interrupted streams not being cached
+- AIAgent answering repeated messages from a configured cache
+"""
+
+import asyncio
+import time
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+from src.my_coding_agent.core.ai_agent import AIAgent, AIAgentConfig
+from src.my_coding_agent.core.response_cache import (
+    CachedModel,
+    ReplayMode,
+    ResponseCache,
+    ResponseCacheMissError,
+)
+
+
+class CountingModel:
+    """FunctionModel factory counting how often the model is reached."""
+
+    def __init__(self, chunk_delay: float = 0.0):
+        self.calls = 0
+        self.chunk_delay = chunk_delay
+
+    def respond(self, messages, info):
+        self.calls += 1
+        return ModelResponse(parts=[TextPart(f"answer {self.calls}")])
+
+    async def stream(self, messages, info):
+        self.calls += 1
+        for token in ["one ", "two ", "three"]:
+            await asyncio.sleep(self.chunk_delay)
+            yield token
+
+    def model(self) -> FunctionModel:
+        return FunctionModel(
+            self.respond, stream_function=self.stream, model_name="cached-test"
+        )
+
+
+class TestCachedRequests:
+    """Test caching of regular model requests."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_is_served_from_cache(self, tmp_path):
+        """Test that an identical request does not reach the model again."""
+        counting = CountingModel()
+        cache = ResponseCache(tmp_path)
+        agent = Agent(CachedModel(counting.model(), cache), system_prompt="Be brief")
+
+        first = await agent.run("What is 2 + 2?")
+        second = await agent.run("What is 2 + 2?")
+
+        assert first.output == second.output == "answer 1"
+        assert counting.calls == 1
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["writes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_prompt_and_tools_change_the_key(self, tmp_path):
+        """Test that a different system prompt or tool catalog is a miss."""
+        counting = CountingModel()
+        cache = ResponseCache(tmp_path)
+
+        await Agent(CachedModel(counting.model(), cache), system_prompt="A").run("hi")
+        await Agent(CachedModel(counting.model(), cache), system_prompt="B").run("hi")
+
+        with_tool = Agent(CachedModel(counting.model(), cache), system_prompt="A")
+
+        @with_tool.tool_plain
+        def lookup(name: str) -> str:
+            """Look up a name."""
+            return name
+
+        await with_tool.run("hi")
+
+        assert counting.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_offline_miss_raises(self, tmp_path):
+        """Test that offline mode never reaches the model."""
+        counting = CountingModel()
+        cache = ResponseCache(tmp_path, offline=True)
+        agent = Agent(CachedModel(counting.model(), cache))
+
+        with pytest.raises(ResponseCacheMissError):
+            await agent.run("not cached")
+        assert counting.calls == 0
+
+
+class TestCachedStreams:
+    """Test recording and replaying streamed responses."""
+
+    @staticmethod
+    async def stream_text(agent: Agent, prompt: str) -> tuple[str, float]:
+        started = time.perf_counter()
+        async with agent.run_stream(prompt) as result:
+            text = await result.get_output()
+        return text, time.perf_counter() - started
+
+    @pytest.mark.asyncio
+    async def test_timed_replay_keeps_chunk_timing(self, tmp_path):
+        """Test that a timed replay takes about as long as the original."""
+        counting = CountingModel(chunk_delay=0.05)
+        agent = Agent(CachedModel(counting.model(), ResponseCache(tmp_path)))
+
+        recorded, _ = await self.stream_text(agent, "stream please")
+        replayed, elapsed = await self.stream_text(agent, "stream please")
+
+        assert replayed == recorded == "one two three"
+        assert counting.calls == 1
+        assert elapsed >= 0.12
+
+    @pytest.mark.asyncio
+    async def test_fast_replay_skips_delays(self, tmp_path):
+        """Test that a fast replay returns the stream without waiting."""
+        counting = CountingModel(chunk_delay=0.1)
+        recorder = Agent(CachedModel(counting.model(), ResponseCache(tmp_path)))
+        await self.stream_text(recorder, "stream please")
+
+        fast_cache = ResponseCache(tmp_path, replay_mode="fast", offline=True)
+        replayer = Agent(CachedModel(counting.model(), fast_cache))
+        replayed, elapsed = await self.stream_text(replayer, "stream please")
+
+        assert replayed == "one two three"
+        assert fast_cache.replay_mode is ReplayMode.FAST
+        assert elapsed < 0.2
+
+    @pytest.mark.asyncio
+    async def test_non_streamed_entry_replays_as_stream(self, tmp_path):
+        """Test that a response cached without streaming can be streamed."""
+        counting = CountingModel()
+        agent = Agent(CachedModel(counting.model(), ResponseCache(tmp_path)))
+
+        result = await agent.run("hello")
+        replayed, _ = await self.stream_text(agent, "hello")
+
+        assert replayed == result.output
+        assert counting.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_interrupted_stream_is_not_cached(self, tmp_path):
+        """Test that a stream cancelled part way through is not stored."""
+        counting = CountingModel(chunk_delay=0.01)
+        cache = ResponseCache(tmp_path)
+        agent = Agent(CachedModel(counting.model(), cache))
+
+        first_chunk = asyncio.Event()
+
+        async def consume():
+            async with agent.run_stream("stream please") as result:
+                async for _ in result.stream_text(delta=True, debounce_by=None):
+                    first_chunk.set()
+
+        task = asyncio.create_task(consume())
+        await first_chunk.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert cache.get_stats()["writes"] == 0
+
+
+class TestAgentResponseCache:
+    """Test the response cache configured on AIAgent."""
+
+    @pytest.mark.asyncio
+    async def test_configured_cache_replays_offline(self, tmp_path):
+        """Test that a recorded conversation replays without the network."""
+        config = AIAgentConfig(
+            azure_endpoint="https://test.openai.azure.com/",
+            azure_api_key="test-key",
+            deployment_name="cached-test",
+            response_cache_dir=str(tmp_path),
+            response_cache_offline=True,
+        )
+        agent = AIAgent(config, enable_filesystem_tools=False)
+        assert isinstance(agent._model, CachedModel)
+
+        counting = CountingModel()
+        recorder = CachedModel(counting.model(), ResponseCache(tmp_path))
+        with agent._agent.override(model=recorder):
+            recorded = await agent.send_message("Summarize the project")
+
+        replayed = await agent.send_message("Summarize the project")
+
+        assert replayed.success
+        assert replayed.content == recorded.content == "answer 1"
+        assert counting.calls == 1
+        assert agent.get_health_status()["response_cache"]["hits"] == 1
+
+    def test_cache_disabled_by_default(self):
+        """Test that the cache is opt-in."""
+        config = AIAgentConfig(
+            azure_endpoint="https://test.openai.azure.com/",
+            azure_api_key="test-key",
+            deployment_name="gpt-4o",
+        )
+        agent = AIAgent(config, enable_filesystem_tools=False)
+
+        assert agent.response_cache is None
+        assert not isinstance(agent._model, CachedModel)
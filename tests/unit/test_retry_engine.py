@@ -0,0 +1,201 @@
+"""
+Tests for the shared retry policy engine.
+
+This module tests deadline-aware retries including:
+- Full jitter backoff bounds
+- Total deadlines bounding attempts and backoff
+- Retry budgets limiting retries
+- Hedged attempts for idempotent operations
+- Stop events interrupting backoff
+"""
+
+import asyncio
+import time
+
+import pytest
+from src.my_coding_agent.core.mcp.error_handler import MCPErrorHandler
+from src.my_coding_agent.core.retry_engine import (
+    RetryBudget,
+    RetryDeadlineExceededError,
+    RetryEngine,
+)
+
+
+class TestRetryBackoff:
+    """Test backoff delay calculation."""
+
+    def test_full_jitter_within_cap(self):
+        """Test that jittered delays stay between zero and the capped backoff."""
+        engine = RetryEngine(base_delay=1.0, max_delay=5.0, backoff_multiplier=2.0)
+
+        for retry_number, cap in [(0, 1.0), (2, 4.0), (6, 5.0)]:
+            delays = [engine.calculate_delay(retry_number) for _ in range(200)]
+            assert all(0 <= delay <= cap for delay in delays)
+            assert max(delays) > cap / 2
+
+    def test_no_jitter(self):
+        """Test that disabling jitter gives the capped exponential delay."""
+        engine = RetryEngine(base_delay=1.0, max_delay=5.0, jitter=False)
+
+        assert engine.calculate_delay(0) == 1.0
+        assert engine.calculate_delay(1) == 2.0
+        assert engine.calculate_delay(5) == 5.0
+
+
+class TestRetryEngineRun:
+    """Test retrying operations."""
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        """Test that failed attempts are retried with the attempt number."""
+        engine = RetryEngine(max_attempts=3, base_delay=0.001)
+        attempts = []
+
+        async def operation(attempt):
+            attempts.append(attempt)
+            if attempt < 2:
+                raise ConnectionError("reset")
+            return "ok"
+
+        assert await engine.run(operation) == "ok"
+        assert attempts == [0, 1, 2]
+        assert engine.get_stats()["total_retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_predicate_stops_retries(self):
+        """Test that non-retryable errors are raised immediately."""
+        engine = RetryEngine(max_attempts=3, base_delay=0.001)
+        calls = 0
+
+        async def operation(attempt):
+            nonlocal calls
+            calls += 1
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            await engine.run(
+                operation,
+                should_retry=lambda error, attempt: not isinstance(error, ValueError),
+            )
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_cuts_off_slow_attempt(self):
+        """Test that an attempt still running at the deadline is cancelled."""
+        engine = RetryEngine(max_attempts=5, deadline=0.05)
+
+        async def operation(attempt):
+            await asyncio.sleep(1)
+
+        start = time.monotonic()
+        with pytest.raises(RetryDeadlineExceededError):
+            await engine.run(operation)
+        assert time.monotonic() - start < 0.5
+        assert engine.get_stats()["deadline_exceeded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_backoff_beyond_deadline_is_not_attempted(self):
+        """Test that a retry is skipped when its backoff would pass the deadline."""
+        engine = RetryEngine(max_attempts=5, base_delay=10.0, jitter=False)
+        calls = 0
+
+        async def operation(attempt):
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("reset")
+
+        start = time.monotonic()
+        with pytest.raises(ConnectionError):
+            await engine.run(operation, deadline=1.0)
+        assert calls == 1
+        assert time.monotonic() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_exhaustion(self):
+        """Test that retries stop once the budget has no tokens left."""
+        budget = RetryBudget(ratio=0.0, reserve=1.0)
+        engine = RetryEngine(max_attempts=5, base_delay=0.001, retry_budget=budget)
+        calls = 0
+
+        async def operation(attempt):
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError):
+            await engine.run(operation)
+        assert calls == 2
+        assert budget.get_stats()["rejected"] == 1
+        assert engine.get_stats()["budget_exhausted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_event_interrupts_backoff(self):
+        """Test that setting the stop event abandons a pending backoff."""
+        engine = RetryEngine(max_attempts=3, base_delay=10.0, jitter=False)
+        stop_event = asyncio.Event()
+
+        async def operation(attempt):
+            asyncio.get_running_loop().call_later(0.01, stop_event.set)
+            raise ConnectionError("reset")
+
+        start = time.monotonic()
+        with pytest.raises(ConnectionError):
+            await engine.run(operation, stop_event=stop_event)
+        assert time.monotonic() - start < 1.0
+
+
+class TestHedgedAttempts:
+    """Test hedging of idempotent operations."""
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_over_slow_attempt(self):
+        """Test that a hedged copy answers when the first copy is slow."""
+        engine = RetryEngine(hedge_delay=0.01, max_hedged_attempts=2)
+        started = 0
+
+        async def operation(attempt):
+            nonlocal started
+            started += 1
+            if started == 1:
+                await asyncio.sleep(1)
+                return "slow"
+            return "fast"
+
+        assert await engine.run(operation, idempotent=True) == "fast"
+        stats = engine.get_stats()
+        assert stats["hedges_sent"] == 1
+        assert stats["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_non_idempotent_operations_are_not_hedged(self):
+        """Test that hedging only applies to idempotent operations."""
+        engine = RetryEngine(hedge_delay=0.01)
+        started = 0
+
+        async def operation(attempt):
+            nonlocal started
+            started += 1
+            await asyncio.sleep(0.05)
+            return "done"
+
+        assert await engine.run(operation) == "done"
+        assert started == 1
+
+
+class TestErrorHandlerRetryDeadline:
+    """Test the retry engine as used by the MCP error handler."""
+
+    @pytest.mark.asyncio
+    async def test_execute_with_retry_respects_deadline(self):
+        """Test that execute_with_retry stops at the per-request deadline."""
+        handler = MCPErrorHandler({"base_delay": 0.01, "max_retries": 10})
+
+        async def hung_operation():
+            await asyncio.sleep(1)
+
+        start = time.monotonic()
+        with pytest.raises(RetryDeadlineExceededError):
+            await handler.execute_with_retry(
+                hung_operation, "server", "list_tools", deadline=0.05
+            )
+        assert time.monotonic() - start < 0.5
@@ -0,0 +1,146 @@
+"""
+Tests for the incremental stream decoder.
+
+This module tests NDJSON and SSE framing for streamed responses including:
+- Reassembly of JSON objects split across chunk boundaries
+- Keep-alive and comment frames being skipped
+- Format detection from content and content type
+- Coalescing of decoded frames into coordinator response chunks
+"""
+
+import pytest
+from src.my_coding_agent.core.mcp_client_coordinator import MCPClientCoordinator
+from src.my_coding_agent.core.streaming import stream_decoder
+from src.my_coding_agent.core.streaming.stream_decoder import (
+    StreamDecodeError,
+    StreamDecoder,
+    StreamFormat,
+)
+
+
+class TestNDJSONDecoding:
+    """Test newline-delimited JSON framing."""
+
+    def test_object_split_across_chunks(self):
+        """Test that a document split mid-object is reassembled."""
+        decoder = StreamDecoder()
+
+        assert decoder.feed(b'{"content": "hel') == []
+        assert decoder.feed(b'lo"}\n{"content": "!"}\n') == [
+            {"content": "hello"},
+            {"content": "!"},
+        ]
+        assert decoder.stream_format is StreamFormat.NDJSON
+
+    def test_byte_at_a_time(self):
+        """Test decoding when every byte arrives separately."""
+        decoder = StreamDecoder()
+        payload = b'{"content": "caf\xc3\xa9"}\r\n{"is_complete": true}\n'
+
+        frames = []
+        for i in range(len(payload)):
+            frames.extend(decoder.feed(payload[i : i + 1]))
+
+        assert frames == [{"content": "café"}, {"is_complete": True}]
+
+    def test_keepalives_and_invalid_lines_skipped(self):
+        """Test that blank lines and invalid JSON do not produce frames."""
+        decoder = StreamDecoder()
+
+        frames = decoder.feed(b'\n\r\n{"a": 1}\nnot json\n{"b": 2}\n')
+
+        assert frames == [{"a": 1}, {"b": 2}]
+        stats = decoder.get_stats()
+        assert stats["keepalives_skipped"] == 2
+        assert stats["invalid_frames"] == 1
+        assert stats["buffered_bytes"] == 0
+
+    def test_flush_decodes_unterminated_frame(self):
+        """Test that a final line without a newline is decoded on flush."""
+        decoder = StreamDecoder()
+
+        assert decoder.feed(b'{"content": "tail"}') == []
+        assert decoder.flush() == [{"content": "tail"}]
+
+    def test_oversized_frame_rejected(self):
+        """Test that an unterminated frame over the limit raises."""
+        decoder = StreamDecoder(max_buffer_size=16)
+
+        with pytest.raises(StreamDecodeError):
+            decoder.feed(b'{"content": "' + b"x" * 32)
+
+    def test_standard_library_fallback(self, monkeypatch):
+        """Test decoding without orjson installed."""
+        monkeypatch.setattr(stream_decoder, "orjson", None)
+        decoder = StreamDecoder()
+
+        assert decoder.feed(b'{"content": "plain"}\n') == [{"content": "plain"}]
+
+
+class TestSSEDecoding:
+    """Test Server-Sent Events framing."""
+
+    def test_events_with_comments_and_multiline_data(self):
+        """Test SSE events, keep-alive comments and multi-line data."""
+        decoder = StreamDecoder()
+
+        frames = decoder.feed(
+            b": keep-alive\n\n"
+            b'event: delta\ndata: {"content": "a"}\n\n'
+            b'data: {"content":\ndata:  "b"}\n\n'
+        )
+
+        assert decoder.stream_format is StreamFormat.SSE
+        assert frames == [{"content": "a"}, {"content": "b"}]
+        assert decoder.keepalives_skipped == 1
+
+    def test_event_split_across_chunks_and_done_marker(self):
+        """Test that events split across reads and [DONE] are handled."""
+        decoder = StreamDecoder(StreamFormat.SSE)
+
+        assert decoder.feed(b'data: {"content": "x') == []
+        assert decoder.feed(b'"}\n') == []
+        assert decoder.feed(b"\ndata: [DONE]\n\n") == [
+            {"content": "x"},
+            {"content": "", "is_complete": True},
+        ]
+
+    @pytest.mark.parametrize(
+        ("content_type", "expected"),
+        [
+            ("text/event-stream; charset=utf-8", StreamFormat.SSE),
+            ("application/x-ndjson", StreamFormat.NDJSON),
+            ("application/json", StreamFormat.AUTO),
+            (None, StreamFormat.AUTO),
+        ],
+    )
+    def test_format_for_content_type(self, content_type, expected):
+        """Test choosing the framing from the response content type."""
+        assert StreamDecoder.format_for_content_type(content_type) is expected
+
+
+class TestFrameCoalescing:
+    """Test conversion of decoded frames into coordinator chunks."""
+
+    def test_text_deltas_merged_and_empty_frames_dropped(self):
+        """Test that plain deltas merge and empty deltas are skipped."""
+        frames = [
+            {"content": "Hel"},
+            {"content": ""},
+            {"content": "lo"},
+            {"content": " world", "metadata": {"tokens": 3}},
+            {"content": "", "is_complete": True},
+        ]
+
+        chunks = MCPClientCoordinator._coalesce_frames(frames)
+
+        assert [(c.content, c.is_complete) for c in chunks] == [
+            ("Hello", False),
+            (" world", False),
+            ("", True),
+        ]
+        assert chunks[1].metadata == {"tokens": 3}
+
+    def test_keepalive_only_frames_produce_nothing(self):
+        """Test that a read containing only empty deltas yields no chunks."""
+        assert MCPClientCoordinator._coalesce_frames([{"content": ""}, {}]) == []
@@ -0,0 +1,141 @@
+"""
+Tests for the symbol index.
+
+This module tests the persistent per-file symbol table including:
+- AST-based extraction for Python with line numbers
+- Regex-based extraction for other languages
+- Incremental updates and find-definition lookups
+- Integration with FileChangeAnalyzer
+"""
+
+from pathlib import Path
+
+import pytest
+from src.my_coding_agent.core.file_change_detector import FileChangeAnalyzer
+from src.my_coding_agent.core.symbol_index import SymbolIndex, SymbolKind
+
+PYTHON_SOURCE = """import os
+from pathlib import Path
+
+
+class Greeter:
+    def greet(self, name):
+        return f"Hello {name}"
+
+
+async def main():
+    pass
+"""
+
+
+class TestSymbolExtraction:
+    """Test symbol extraction for different languages."""
+
+    @pytest.fixture
+    def index(self):
+        """Create an empty SymbolIndex."""
+        return SymbolIndex()
+
+    def test_python_symbols_with_line_numbers(self, index):
+        """Test that Python symbols are extracted with their line numbers."""
+        symbols = index.extract_symbols(PYTHON_SOURCE, Path("/test/app.py"))
+        found = {(symbol.kind, symbol.name): symbol.line for symbol in symbols}
+
+        assert found[(SymbolKind.IMPORT, "os")] == 1
+        assert found[(SymbolKind.IMPORT, "pathlib")] == 2
+        assert found[(SymbolKind.CLASS, "Greeter")] == 5
+        assert found[(SymbolKind.FUNCTION, "greet")] == 6
+        assert found[(SymbolKind.FUNCTION, "main")] == 10
+
+    def test_invalid_python_falls_back_to_patterns(self, index):
+        """Test that half-written Python is still indexed."""
+        content = "def complete():\n    pass\n\ndef broken(:\n"
+        table = index.build_table(content, Path("/test/broken.py"))
+
+        assert "complete" in table.functions
+
+    def test_javascript_symbols(self, index):
+        """Test regex extraction for JavaScript sources."""
+        content = (
+            "const fs = require('fs');\n"
+            "\n"
+            "function loadConfig(path) {\n"
+            "  return fs.readFileSync(path);\n"
+            "}\n"
+        )
+        table = index.build_table(content, Path("/test/config.js"))
+
+        assert table.imports == ["fs"]
+        assert table.functions == ["loadConfig"]
+        assert table.symbols[-1].line == 3
+
+
+class TestSymbolIndexUpdates:
+    """Test incremental updates and lookups."""
+
+    @pytest.fixture
+    def index(self):
+        """Create an empty SymbolIndex."""
+        return SymbolIndex()
+
+    def test_find_definition(self, index):
+        """Test finding a definition across files."""
+        index.update_file(Path("/test/app.py"), PYTHON_SOURCE)
+        index.update_file(Path("/test/other.py"), "def helper():\n    pass\n")
+
+        matches = index.find_definition("Greeter")
+        assert len(matches) == 1
+        assert matches[0].file_path == Path("/test/app.py")
+        assert matches[0].line == 5
+
+        assert index.find_definition("helper", SymbolKind.CLASS) == []
+        assert index.find_definition("missing") == []
+
+    def test_unchanged_content_reuses_table(self, index):
+        """Test that re-indexing identical content returns the cached table."""
+        first = index.update_file(Path("/test/app.py"), PYTHON_SOURCE)
+        second = index.update_file(Path("/test/app.py"), PYTHON_SOURCE)
+
+        assert first is second
+
+    def test_update_replaces_stale_definitions(self, index):
+        """Test that renamed symbols disappear from lookups."""
+        path = Path("/test/app.py")
+        index.update_file(path, "def old_name():\n    pass\n")
+        index.update_file(path, "def new_name():\n    pass\n")
+
+        assert index.find_definition("old_name") == []
+        assert len(index.find_definition("new_name")) == 1
+
+    def test_remove_file(self, index):
+        """Test removing a file from the index."""
+        path = Path("/test/app.py")
+        index.update_file(path, PYTHON_SOURCE)
+
+        assert path in index
+        index.remove_file(path)
+
+        assert path not in index
+        assert index.find_definition("main") == []
+
+
+class TestAnalyzerIntegration:
+    """Test that FileChangeAnalyzer keeps the index up to date."""
+
+    def test_analyzer_updates_shared_index(self):
+        """Test that analyzed changes are reflected in the shared index."""
+        index = SymbolIndex()
+        analyzer = FileChangeAnalyzer(symbol_index=index)
+        path = Path("/test/code.py")
+
+        analyzer.analyze_change(path, None, "def first():\n    pass\n")
+        assert len(index.find_definition("first")) == 1
+
+        analyzer.analyze_change(
+            path, "def first():\n    pass\n", "def second():\n    pass\n"
+        )
+        assert index.find_definition("first") == []
+        assert len(index.find_definition("second")) == 1
+
+        analyzer.analyze_change(path, "def second():\n    pass\n", None)
+        assert path not in index
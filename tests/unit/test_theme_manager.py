@@ -184,3 +184,28 @@ class TestThemeManager:
             keyword in content.lower()
             for keyword in ["background-color", "color", "qwidget", "qtextedit"]
         )
+
+    def test_theme_manager_caches_stylesheets(self, qtbot, monkeypatch):
+        """Test that theme switches reuse stylesheets loaded at startup."""
+        app = QApplication.instance()
+        theme_manager = ThemeManager(app)
+
+        def fail_read(theme_name):
+            raise AssertionError(f"{theme_name} stylesheet read from disk again")
+
+        monkeypatch.setattr(theme_manager, "_read_stylesheet", fail_read)
+
+        assert theme_manager.set_theme("light") is True
+        assert theme_manager.set_theme("dark") is True
+        assert theme_manager._load_stylesheet("dark") == app.styleSheet()
+
+    def test_apply_stylesheet_skips_unchanged(self, qtbot):
+        """Test that reapplying the same stylesheet is a no-op."""
+        from my_coding_agent.core.theme_manager import apply_stylesheet
+
+        widget = QMainWindow()
+        qtbot.addWidget(widget)
+
+        assert apply_stylesheet(widget, "QMainWindow { color: red; }") is True
+        assert apply_stylesheet(widget, "QMainWindow { color: red; }") is False
+        assert widget.styleSheet() == "QMainWindow { color: red; }"
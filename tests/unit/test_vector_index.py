@@ -0,0 +1,144 @@
+"""
+Tests for the embedded vector index.
+
+This module tests local similarity search including:
+- The offline hashing embedding
+- Adding, replacing and deleting items
+- Reopening an index from its memory-mapped files
+- IVF search agreeing with exact search on clustered data
+"""
+
+import numpy as np
+import pytest
+from src.my_coding_agent.core.vector_index import HashingEmbedding, VectorIndex
+
+
+def clustered_vectors(count: int, clusters: int = 20, dim: int = 32) -> np.ndarray:
+    """Create vectors scattered around a few random centers."""
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=count)
+    return centers[labels] + 0.3 * rng.normal(size=(count, dim))
+
+
+class TestHashingEmbedding:
+    """Test the offline hashing embedding."""
+
+    def test_vectors_are_normalized_and_stable(self):
+        """Test that vectors have unit length and do not vary between calls."""
+        embedding = HashingEmbedding(dim=64)
+
+        first = embedding(["The user prefers dark themes", ""])
+        second = embedding(["The user prefers dark themes"])
+
+        assert first.shape == (2, 64)
+        assert np.isclose(np.linalg.norm(first[0]), 1.0)
+        assert np.array_equal(first[0], second[0])
+        assert not first[1].any()
+
+    def test_similar_texts_score_higher(self):
+        """Test that shared words make texts more similar."""
+        embedding = HashingEmbedding()
+        query, close, far = embedding(
+            ["favourite editor", "my favourite editor is vim", "deploy on friday"]
+        )
+
+        assert query @ close > query @ far
+
+
+class TestVectorIndex:
+    """Test storing and searching items."""
+
+    def test_search_returns_closest_text(self, tmp_path):
+        """Test that the most similar text ranks first with its metadata."""
+        index = VectorIndex(tmp_path, batch_size=2)
+        index.add(
+            ["a", "b", "c"],
+            ["python testing with pytest", "baking sourdough bread", "git rebase"],
+            [{"topic": "code"}, {"topic": "food"}, {"topic": "code"}],
+        )
+
+        results = index.search("how do I run pytest", k=2)
+
+        assert results[0].id == "a"
+        assert results[0].metadata == {"topic": "code"}
+        assert len(results) == 2
+
+    def test_replace_and_delete(self, tmp_path):
+        """Test that re-adding an id replaces it and deleted items are gone."""
+        index = VectorIndex(tmp_path)
+        index.add(["a", "b"], ["first text", "second text"])
+        index.add(["a"], ["replacement text"])
+        assert index.delete(["b", "missing"]) == 1
+
+        results = index.search("text", k=10)
+
+        assert [result.id for result in results] == ["a"]
+        assert len(index) == 1
+        assert index.get("b") is None
+
+    def test_reopen_from_disk(self, tmp_path):
+        """Test that items, deletions and vectors survive reopening."""
+        index = VectorIndex(tmp_path)
+        index.add(["a", "b", "c"], ["red apple", "green pear", "blue sky"])
+        index.delete(["b"])
+
+        reopened = VectorIndex(tmp_path)
+
+        assert len(reopened) == 2
+        assert "b" not in reopened
+        assert reopened.search("apple", k=1)[0].id == "a"
+
+    def test_partial_write_is_discarded(self, tmp_path):
+        """Test that vectors written without their item line are dropped."""
+        index = VectorIndex(tmp_path)
+        index.add(["a"], ["complete item"])
+        with (tmp_path / "vectors.f32").open("ab") as vectors:
+            vectors.write(np.zeros(384, dtype=np.float32).tobytes())
+
+        reopened = VectorIndex(tmp_path)
+        reopened.add(["b"], ["later item"])
+
+        assert len(VectorIndex(tmp_path)) == 2
+        assert VectorIndex(tmp_path).search("later item", k=1)[0].id == "b"
+
+    def test_embedding_mismatch_is_rejected(self, tmp_path):
+        """Test that an index cannot be opened with another embedding."""
+        VectorIndex(tmp_path).add(["a"], ["text"])
+
+        with pytest.raises(ValueError, match="hashing-384"):
+            VectorIndex(tmp_path, embedding_function=HashingEmbedding(dim=128))
+
+
+class TestIVFIndex:
+    """Test the clustered index used for large collections."""
+
+    def test_ivf_matches_exact_search(self, tmp_path):
+        """Test that IVF search finds nearly the same neighbours."""
+        vectors = clustered_vectors(4000)
+        index = VectorIndex(
+            tmp_path, HashingEmbedding(dim=32), ivf_threshold=2000, nprobe=8
+        )
+        index.add_vectors([str(row) for row in range(4000)], vectors)
+        assert index.uses_ivf
+
+        hits = 0
+        for query in vectors[:50]:
+            exact = {result.id for result in index.search(query, k=10, exact=True)}
+            approximate = {result.id for result in index.search(query, k=10)}
+            hits += len(exact & approximate)
+
+        assert hits / 500 >= 0.9
+
+    def test_ivf_survives_reopen_and_appends(self, tmp_path):
+        """Test that cluster assignments are stored and extended."""
+        vectors = clustered_vectors(3000)
+        index = VectorIndex(tmp_path, HashingEmbedding(dim=32), ivf_threshold=2000)
+        index.add_vectors([str(row) for row in range(2500)], vectors[:2500])
+
+        reopened = VectorIndex(tmp_path, HashingEmbedding(dim=32), ivf_threshold=2000)
+        reopened.add_vectors([str(row) for row in range(2500, 3000)], vectors[2500:])
+
+        assert reopened.uses_ivf
+        assert reopened.search(vectors[2999], k=1)[0].id == "2999"
+        assert reopened.get_stats()["rows"] == 3000